@@ -3,30 +3,40 @@ Database viewer interface for exploring PostgreSQL tables and data.
 
 This module provides Flask routes and functionality for viewing database schemas,
 table data, and executing ad-hoc queries.
+
+Schema metadata is cached for DATABASE_VIEWER_SCHEMA_TTL seconds and row counts
+are planner estimates unless an exact count is requested (see
+src.aegis.utils.database_overview). Query results are read from server-side
+cursors in batches; tables are paged by primary key and full results are
+exported as streamed CSV/NDJSON (see src.aegis.utils.database_streaming).
 """
 
-import json
-from datetime import datetime
-from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import pandas as pd
-from flask import jsonify, request, render_template
+from flask import Response, jsonify, request, render_template, stream_with_context
 from sqlalchemy import create_engine, inspect, text
 
+from src.aegis.utils.database_overview import (
+    SCHEMA_OVERVIEW_SQL,
+    TTLCache,
+    estimate_row_count,
+    quote_identifier,
+)
+from src.aegis.utils.database_streaming import (
+    EXPORT_FORMATS,
+    build_table_page_query,
+    clean_rows,
+    encode_csv,
+    encode_keyset_cursor,
+    encode_ndjson,
+)
 from src.aegis.utils.settings import config
 from src.aegis.utils.logging import get_logger
 
 logger = get_logger()
 
 
-def decimal_to_float(obj):
-    """Convert Decimal objects to float for JSON serialization."""
-    if isinstance(obj, Decimal):
-        return float(obj)
-    raise TypeError
-
-
 class DatabaseViewer:
     """
     Database viewer for exploring PostgreSQL tables and data.
@@ -34,12 +44,14 @@ class DatabaseViewer:
     Attributes:
         engine: SQLAlchemy engine for database connection
         inspector: SQLAlchemy inspector for schema introspection
+        cache: Schema metadata and row estimates, expiring after the configured TTL
     """
     
     def __init__(self):
         """Initialize database connection."""
         self.engine = None
         self.inspector = None
+        self.cache = TTLCache(config.database_viewer.schema_cache_ttl)
         self._connect()
     
     def _connect(self):
@@ -56,6 +68,11 @@ class DatabaseViewer:
             logger.error(f"Failed to connect to database: {e}")
             raise
     
+    def _refresh_inspector(self):
+        """Start a new inspector so expired metadata is re-read from the catalog."""
+        # The inspector memoizes every reflection call for its lifetime
+        self.inspector = inspect(self.engine)
+    
     def get_tables(self) -> List[str]:
         """
         Get list of all tables in the database.
@@ -64,106 +81,264 @@ class DatabaseViewer:
             List of table names
         """
         try:
-            return self.inspector.get_table_names()
+            tables = self.cache.get("tables")
+            if tables is None:
+                self._refresh_inspector()
+                tables = self.inspector.get_table_names()
+                self.cache.set("tables", tables)
+            return list(tables)
         except Exception as e:
             logger.error(f"Failed to get tables: {e}")
             return []
     
-    def get_table_info(self, table_name: str) -> Dict[str, Any]:
+    def get_row_estimates(self) -> Dict[str, int]:
+        """
+        Get planner row estimates for every table (no table scans).
+        
+        Returns:
+            Dictionary of table name to estimated row count
+        """
+        estimates = self.cache.get("row_estimates")
+        if estimates is None:
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(SCHEMA_OVERVIEW_SQL)).mappings().all()
+            estimates = {
+                row["table"]: estimate_row_count(row["reltuples"], row["live_tuples"])
+                for row in rows
+            }
+            self.cache.set("row_estimates", estimates)
+        return dict(estimates)
+    
+    def count_rows(self, table_name: str) -> Optional[int]:
+        """
+        Count a table's rows exactly, bounded by DATABASE_VIEWER_COUNT_TIMEOUT.
+        
+        Args:
+            table_name: Name of the table (must be a known table)
+            
+        Returns:
+            Exact row count, or None if the count timed out or failed
+        """
+        timeout_ms = max(int(config.database_viewer.exact_count_timeout * 1000), 1)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+                result = conn.execute(
+                    text(f"SELECT COUNT(*) FROM {quote_identifier(table_name)}")
+                )
+                return int(result.scalar() or 0)
+        except Exception as e:
+            logger.warning(f"Exact row count failed for {table_name}: {e}")
+            return None
+    
+    def count_rows_exact(self, table_names: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Count several tables exactly, concurrently.
+        
+        Args:
+            table_names: Names of known tables
+            
+        Returns:
+            Dictionary of table name to exact count (None where the count failed)
+        """
+        if not table_names:
+            return {}
+        workers = max(config.database_viewer.exact_count_concurrency, 1)
+        with ThreadPoolExecutor(max_workers=min(workers, len(table_names))) as executor:
+            return dict(zip(table_names, executor.map(self.count_rows, table_names)))
+    
+    def get_table_info(self, table_name: str, exact: bool = False) -> Dict[str, Any]:
         """
         Get detailed information about a table.
         
         Args:
             table_name: Name of the table
+            exact: Count rows exactly instead of using the planner estimate
             
         Returns:
             Dictionary containing table schema information
         """
         try:
-            # Get fresh column info each time (don't cache)
-            columns_raw = self.inspector.get_columns(table_name)
-            # Create new list with converted types (don't modify original)
-            columns = []
-            for col in columns_raw:
-                col_copy = dict(col)  # Create a copy of the column dict
-                col_copy["type"] = str(col_copy["type"])  # Convert type to string
-                columns.append(col_copy)
+            if table_name not in self.get_tables():
+                return {}
             
-            pk_constraint = self.inspector.get_pk_constraint(table_name)
-            foreign_keys = self.inspector.get_foreign_keys(table_name)
-            indexes = self.inspector.get_indexes(table_name)
+            info = self.cache.get(f"table:{table_name}")
+            if info is None:
+                self._refresh_inspector()
+                columns_raw = self.inspector.get_columns(table_name)
+                # Create new list with converted types (don't modify original)
+                columns = []
+                for col in columns_raw:
+                    col_copy = dict(col)  # Create a copy of the column dict
+                    col_copy["type"] = str(col_copy["type"])  # Convert type to string
+                    columns.append(col_copy)
+                
+                info = {
+                    "columns": columns,
+                    "primary_key": self.inspector.get_pk_constraint(table_name),
+                    "foreign_keys": self.inspector.get_foreign_keys(table_name),
+                    "indexes": self.inspector.get_indexes(table_name),
+                }
+                self.cache.set(f"table:{table_name}", info)
             
-            # Get row count
-            with self.engine.connect() as conn:
-                result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                row_count = result.scalar()
+            row_count = self.count_rows(table_name) if exact else None
+            row_count_estimated = row_count is None
+            if row_count_estimated:
+                row_count = self.get_row_estimates().get(table_name, 0)
             
             return {
-                "columns": columns,
-                "primary_key": pk_constraint,
-                "foreign_keys": foreign_keys,
-                "indexes": indexes,
-                "row_count": int(row_count) if row_count is not None else 0
+                **info,
+                "row_count": row_count,
+                "row_count_estimated": row_count_estimated,
             }
         except Exception as e:
             logger.error(f"Failed to get table info for {table_name}: {e}")
             return {}
     
+    def _column_data_types(self, table_name: str) -> Dict[str, str]:
+        """Get information_schema data types per column (used to cast keyset cursors)."""
+        types = self.cache.get(f"types:{table_name}")
+        if types is None:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    text(
+                        "SELECT column_name, data_type FROM information_schema.columns "
+                        "WHERE table_schema = 'public' AND table_name = :table_name"
+                    ),
+                    {"table_name": table_name},
+                ).all()
+            types = {row[0]: row[1] for row in rows}
+            self.cache.set(f"types:{table_name}", types)
+        return types
+    
+    def iter_query_batches(
+        self, query: str, params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream a query's rows in cleaned batches from a server-side cursor.
+        
+        Args:
+            query: SQL query to execute
+            params: Query parameters
+            
+        Yields:
+            Lists of JSON-ready rows, DATABASE_VIEWER_STREAM_BATCH_SIZE at a time
+        """
+        batch_size = config.database_viewer.stream_batch_size
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, max_row_buffer=batch_size
+            ).execute(text(query), params or {})
+            if not result.returns_rows:
+                return
+            for partition in result.mappings().partitions(batch_size):
+                yield clean_rows(partition)
+    
     def get_table_data(
         self, 
         table_name: str, 
         limit: int = 100, 
         offset: int = 0,
         order_by: Optional[str] = None,
-        filter_condition: Optional[str] = None
-    ) -> pd.DataFrame:
+        filter_condition: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Get data from a table with pagination and filtering.
+        Get one page of a table with filtering.
+        
+        Tables with a primary key are paged by key (pass the previous page's
+        next_cursor as after); custom orderings fall back to LIMIT/OFFSET.
         
         Args:
             table_name: Name of the table
             limit: Number of rows to return
-            offset: Number of rows to skip
+            offset: Number of rows to skip (offset pagination only)
             order_by: Column to order by
             filter_condition: SQL WHERE clause condition
+            after: Cursor from the previous page
             
         Returns:
-            DataFrame containing table data
-        """
-        try:
-            query = f"SELECT * FROM {table_name}"
-            
-            if filter_condition:
-                query += f" WHERE {filter_condition}"
-            
-            if order_by:
-                query += f" ORDER BY {order_by}"
+            Dictionary with data, pagination mode and next_cursor
             
-            query += f" LIMIT {limit} OFFSET {offset}"
-            
-            with self.engine.connect() as conn:
-                return pd.read_sql_query(query, conn)
-        except Exception as e:
-            logger.error(f"Failed to get data from {table_name}: {e}")
-            return pd.DataFrame()
+        Raises:
+            ValueError: If the table is unknown or the cursor cannot be used
+        """
+        info = self.get_table_info(table_name)
+        if not info:
+            raise ValueError(f"Unknown table: {table_name}")
+        key_columns = (info.get("primary_key") or {}).get("constrained_columns") or []
+        limit = min(limit, config.database_viewer.max_query_rows)
+        
+        query, params, keyset = build_table_page_query(
+            table_name,
+            key_columns,
+            self._column_data_types(table_name),
+            limit=limit,
+            after=after,
+            offset=offset,
+            order_by=order_by,
+            filter_condition=filter_condition,
+        )
+        
+        with self.engine.connect() as conn:
+            rows = [dict(row) for row in conn.execute(text(query), params).mappings()]
+        
+        next_cursor = None
+        if keyset and len(rows) == limit:
+            next_cursor = encode_keyset_cursor(rows[-1], key_columns)
+        return {
+            "data": clean_rows(rows),
+            "pagination": "keyset" if keyset else "offset",
+            "next_cursor": next_cursor,
+        }
     
-    def execute_query(self, query: str) -> pd.DataFrame:
+    def execute_query(self, query: str) -> Tuple[List[Dict[str, Any]], bool]:
         """
-        Execute a custom SQL query.
+        Execute a custom SQL query, keeping at most DATABASE_VIEWER_MAX_QUERY_ROWS rows.
         
         Args:
             query: SQL query to execute
             
         Returns:
-            DataFrame containing query results
+            Tuple of (cleaned rows, whether the result was truncated)
         """
+        max_rows = config.database_viewer.max_query_rows
+        rows: List[Dict[str, Any]] = []
         try:
-            with self.engine.connect() as conn:
-                return pd.read_sql_query(query, conn)
+            batches = self.iter_query_batches(query)
+            try:
+                for batch in batches:
+                    rows.extend(batch)
+                    if len(rows) > max_rows:
+                        return rows[:max_rows], True
+            finally:
+                batches.close()
+            return rows, False
         except Exception as e:
             logger.error(f"Failed to execute query: {e}")
             raise
     
+    def iter_export(self, query: str, export_format: str) -> Iterator[str]:
+        """
+        Stream a query as NDJSON or CSV text chunks (one chunk per batch).
+        
+        Args:
+            query: SQL query to execute
+            export_format: "ndjson" or "csv"
+            
+        Yields:
+            Encoded text chunks
+        """
+        columns = None
+        for batch in self.iter_query_batches(query):
+            if export_format == "ndjson":
+                yield encode_ndjson(batch)
+                continue
+            header = columns is None
+            if header:
+                columns = list(batch[0].keys()) if batch else []
+            yield encode_csv(batch, columns, header=header)
+    
     def get_sample_queries(self) -> List[Dict[str, str]]:
         """
         Get sample queries for common operations.
@@ -278,7 +453,8 @@ def register_database_routes(app):
             JSON response with table schema
         """
         try:
-            info = viewer.get_table_info(table_name)
+            exact = request.args.get("exact", "false").lower() == "true"
+            info = viewer.get_table_info(table_name, exact=exact)
             return jsonify(info)
         except Exception as e:
             logger.error(f"Failed to get table schema: {e}")
@@ -300,23 +476,22 @@ def register_database_routes(app):
             offset = request.args.get("offset", 0, type=int)
             order_by = request.args.get("order_by", None)
             filter_condition = request.args.get("filter", None)
+            after = request.args.get("after", None)
             
-            data = viewer.get_table_data(
-                table_name, 
-                limit=limit, 
-                offset=offset,
-                order_by=order_by,
-                filter_condition=filter_condition
-            )
+            try:
+                page = viewer.get_table_data(
+                    table_name, 
+                    limit=limit, 
+                    offset=offset,
+                    order_by=order_by,
+                    filter_condition=filter_condition,
+                    after=after
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
             
-            # Convert DataFrame to dict with proper handling of special types
-            result = {
-                "data": json.loads(
-                    data.to_json(orient="records", default_handler=decimal_to_float)
-                ),
-                "total_rows": len(data)
-            }
-            return jsonify(result)
+            page["total_rows"] = len(page["data"])
+            return jsonify(page)
         except Exception as e:
             logger.error(f"Failed to get table data: {e}")
             return jsonify({"error": str(e)}), 500
@@ -340,21 +515,79 @@ def register_database_routes(app):
             if not query.upper().strip().startswith("SELECT"):
                 return jsonify({"error": "Only SELECT queries are allowed"}), 403
             
-            result_df = viewer.execute_query(query)
+            rows, truncated = viewer.execute_query(query)
             
-            # Convert DataFrame to dict with proper handling of special types
             result = {
-                "data": json.loads(
-                    result_df.to_json(orient="records", default_handler=decimal_to_float)
-                ),
-                "columns": list(result_df.columns),
-                "total_rows": len(result_df)
+                "data": rows,
+                "columns": list(rows[0].keys()) if rows else [],
+                "total_rows": len(rows),
+                "truncated": truncated
             }
             return jsonify(result)
         except Exception as e:
             logger.error(f"Failed to execute query: {e}")
             return jsonify({"error": str(e)}), 500
     
+    def _export_response(chunks, export_format: str, filename: str):
+        """Wrap streamed export chunks in a download response."""
+        return Response(
+            stream_with_context(chunks),
+            mimetype=EXPORT_FORMATS[export_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}.{export_format}"'
+            },
+        )
+    
+    @app.route("/api/database/query/export", methods=["POST"])
+    def export_query():
+        """
+        Stream the full result of a SELECT query as CSV or NDJSON.
+        
+        Returns:
+            Streamed download response
+        """
+        data = request.json
+        query = data.get("query", "").strip()
+        export_format = data.get("format", "csv")
+        
+        if not query:
+            return jsonify({"error": "No query provided"}), 400
+        if not query.upper().startswith("SELECT"):
+            return jsonify({"error": "Only SELECT queries are allowed"}), 403
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({"error": f"Unknown export format: {export_format}"}), 400
+        
+        return _export_response(
+            viewer.iter_export(query, export_format), export_format, "query_results"
+        )
+    
+    @app.route("/api/database/table/<table_name>/export", methods=["GET"])
+    def export_table(table_name):
+        """
+        Stream every row of a table (optionally filtered) as CSV or NDJSON.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Streamed download response
+        """
+        export_format = request.args.get("format", "csv")
+        order_by = request.args.get("order_by", None)
+        filter_condition = request.args.get("filter", None)
+        
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({"error": f"Unknown export format: {export_format}"}), 400
+        if table_name not in viewer.get_tables():
+            return jsonify({"error": f"Unknown table: {table_name}"}), 404
+        
+        query = f"SELECT * FROM {quote_identifier(table_name)}"
+        if filter_condition:
+            query += f" WHERE {filter_condition}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        return _export_response(viewer.iter_export(query, export_format), export_format, table_name)
+    
     @app.route("/api/database/samples", methods=["GET"])
     def get_sample_queries():
         """
@@ -375,18 +608,31 @@ def register_database_routes(app):
         """
         Get overview statistics for all tables.
         
+        Row counts are planner estimates unless exact=true (every table) or
+        tables=a,b (a subset) asks for exact counts.
+        
         Returns:
             JSON response with database overview
         """
         try:
             tables = viewer.get_tables()
-            overview = []
+            estimates = viewer.get_row_estimates()
             
+            if request.args.get("exact", "false").lower() == "true":
+                exact_tables = tables
+            else:
+                requested = request.args.get("tables", "").split(",")
+                exact_tables = [table for table in tables if table in requested]
+            exact_counts = viewer.count_rows_exact(exact_tables)
+            
+            overview = []
             for table in tables:
                 info = viewer.get_table_info(table)
+                exact_count = exact_counts.get(table)
                 overview.append({
                     "table": table,
-                    "rows": info.get("row_count", 0),
+                    "rows": estimates.get(table, 0) if exact_count is None else exact_count,
+                    "rows_estimated": exact_count is None,
                     "columns": len(info.get("columns", [])),
                     "indexes": len(info.get("indexes", [])),
                     "has_pk": bool(info.get("primary_key", {}).get("constrained_columns")),
@@ -404,6 +650,7 @@ def register_database_routes(app):
                 "summary": {
                     "total_tables": total_tables,
                     "total_rows": total_rows,
+                    "rows_estimated": any(t["rows_estimated"] for t in overview),
                     "avg_columns": round(avg_columns, 1),
                     "total_indexes": total_indexes
                 }
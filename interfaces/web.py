@@ -7,6 +7,7 @@ for interacting with the Aegis model.
 
 import json
 import os
+import uuid
 from pathlib import Path
 from typing import Generator
 
@@ -14,6 +15,8 @@ from flask import Flask, render_template, request, jsonify, Response
 
 from src.aegis.model.main import model
 from src.aegis.utils.logging import get_logger
+from src.aegis.utils.session_store import SessionCache, new_session_state
+from src.aegis.utils.settings import config
 from interfaces.monitoring import register_monitoring_routes
 from interfaces.database import register_database_routes
 
@@ -29,9 +32,26 @@ register_monitoring_routes(app)
 # Register database viewer routes
 register_database_routes(app)
 
-# Store conversation history in memory (for simplicity)
-# In production, you'd want to use a session-based storage
-conversation_history = []
+# Conversation histories per browser session (cookie), capped by the session store settings
+SESSION_COOKIE = "aegis_session"
+sessions = SessionCache(config.session_store.max_sessions, config.session_store.ttl_seconds)
+
+
+def _session_id() -> str:
+    """
+    Get the caller's session ID from its cookie, or issue a new one.
+
+    Returns:
+        Session ID for the current request
+    """
+    session_id = request.cookies.get(SESSION_COOKIE, "")
+    return session_id if session_id and len(session_id) <= 64 else str(uuid.uuid4())
+
+
+def _with_session_cookie(response, session_id: str):
+    """Attach the session cookie to a response."""
+    response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="Lax")
+    return response
 
 
 @app.route("/")
@@ -72,11 +92,13 @@ def chat():
         if not user_message:
             return jsonify({"error": "No message provided"}), 400
 
-        # Add user message to conversation history
-        conversation_history.append({"role": "user", "content": user_message})
+        # Add user message to this session's conversation history
+        session_id = _session_id()
+        state = sessions.get(session_id) or new_session_state()
+        state["messages"].append({"role": "user", "content": user_message})
 
         # Prepare input for the model
-        model_input = {"messages": conversation_history.copy()}
+        model_input = {"messages": list(state["messages"]), "summary": state["summary"]}
 
         # Call the model with database filters if provided
         model_kwargs = {}
@@ -92,11 +114,13 @@ def chat():
 
         # Add assistant response to conversation history
         if assistant_response:
-            conversation_history.append({"role": "assistant", "content": assistant_response})
+            state["messages"].append({"role": "assistant", "content": assistant_response})
+        state = sessions.put(session_id, state)
 
-        return jsonify(
-            {"response": assistant_response, "conversation_length": len(conversation_history)}
+        response = jsonify(
+            {"response": assistant_response, "conversation_length": len(state["messages"])}
         )
+        return _with_session_cookie(response, session_id)
 
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
@@ -119,8 +143,11 @@ def chat_stream():
         if not user_message:
             return jsonify({"error": "No message provided"}), 400
 
-        # Add user message to conversation history
-        conversation_history.append({"role": "user", "content": user_message})
+        # Add user message to this session's conversation history
+        session_id = _session_id()
+        state = sessions.get(session_id) or new_session_state()
+        state["messages"].append({"role": "user", "content": user_message})
+        sessions.put(session_id, state)
 
         def generate() -> Generator[str, None, None]:
             """
@@ -129,7 +156,7 @@ def chat_stream():
             Yields:
                 Server-sent event formatted strings
             """
-            model_input = {"messages": conversation_history.copy()}
+            model_input = {"messages": list(state["messages"]), "summary": state["summary"]}
 
             # Add database filters if provided
             model_kwargs = {}
@@ -189,7 +216,8 @@ def chat_stream():
                         full_response += f"\n[{name.upper()}]:\n{response}\n"
 
                 if full_response:
-                    conversation_history.append({"role": "assistant", "content": full_response})
+                    state["messages"].append({"role": "assistant", "content": full_response})
+                    sessions.put(session_id, state)
 
                 # Send completion signal
                 yield f"data: {json.dumps({'done': True})}\n\n"
@@ -198,7 +226,7 @@ def chat_stream():
                 logger.error(f"Error in streaming: {str(e)}")
                 yield f"data: {json.dumps({'error': str(e)})}\n\n"
 
-        return Response(generate(), mimetype="text/event-stream")
+        return _with_session_cookie(Response(generate(), mimetype="text/event-stream"), session_id)
 
     except Exception as e:
         logger.error(f"Error in stream endpoint: {str(e)}")
@@ -208,23 +236,23 @@ def chat_stream():
 @app.route("/api/reset", methods=["POST"])
 def reset_conversation():
     """
-    Reset the conversation history.
+    Reset the caller's conversation history.
 
     Returns:
         JSON confirmation of reset
     """
-    global conversation_history
-    conversation_history = []
+    sessions.delete(_session_id())
     return jsonify({"status": "Conversation reset", "conversation_length": 0})
 
 
 @app.route("/api/history", methods=["GET"])
 def get_history():
     """
-    Get the current conversation history.
+    Get the caller's conversation history.
 
     Returns:
         JSON array of conversation messages
     """
-    return jsonify(conversation_history)
+    state = sessions.get(_session_id()) or new_session_state()
+    return jsonify(state["messages"])
 
@@ -16,17 +16,19 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse
 import uvicorn
 
 from src.aegis.model.main import model
+from src.aegis.utils.context_window import compact_conversation
 from src.aegis.utils.logging import setup_logging, get_logger
 from src.aegis.connections.llm_connector import close_all_clients
 from src.aegis.connections.postgres_connector import close_all_connections, fetch_all
+from src.aegis.utils.session_store import create_session_store
 from src.aegis.utils.settings import config
 
 # Import monitoring utilities (will use async postgres_connector for database)
@@ -36,6 +38,9 @@ from interfaces.monitoring import get_monitoring_summary, get_run_details, get_s
 setup_logging()
 logger = get_logger()
 
+# Conversation sessions, keyed by the session ID the chat client keeps across reconnects
+session_store = create_session_store()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -49,20 +54,45 @@ async def lifespan(app: FastAPI):
     logger.info("fastapi.startup", message="Aegis FastAPI server starting up")
     setup_logging()
 
-    # Initialize database connection pool (pre-warm)
-    try:
-        from src.aegis.connections.postgres_connector import _get_async_engine
-        engine = await _get_async_engine()
-        logger.info("fastapi.startup.database", message="Database connection pool initialized")
-    except Exception as e:
-        logger.error("fastapi.startup.database_error", error=str(e))
-        # Don't prevent startup, but log the error
+    if config.server.warmup:
+        # Pool, LLM client, prompt cache and availability snapshot, once per worker
+        from src.aegis.model.warmup import warm_worker_state
+
+        app.state.warmup = await warm_worker_state()
+    else:
+        # Initialize database connection pool (pre-warm)
+        try:
+            from src.aegis.connections.postgres_connector import _get_async_engine
+            engine = await _get_async_engine()
+            logger.info("fastapi.startup.database", message="Database connection pool initialized")
+        except Exception as e:
+            logger.error("fastapi.startup.database_error", error=str(e))
+            # Don't prevent startup, but log the error
+
+    # Start batched session writes (no-op for the memory backend)
+    await session_store.start()
+
+    # Keep the monitoring rollups current for logs the flush path did not merge
+    rollup_task = None
+    if config.monitor_rollups.refresh_seconds > 0:
+        from src.aegis.utils.monitor_rollups import run_rollup_refresh_loop
+
+        rollup_task = asyncio.create_task(run_rollup_refresh_loop())
 
     yield  # Application runs
 
+    if rollup_task is not None:
+        rollup_task.cancel()
+
     # Shutdown
     logger.info("fastapi.shutdown", message="Aegis FastAPI server shutting down")
 
+    # Write pending sessions before the database pool goes away
+    try:
+        await session_store.close()
+    except Exception as e:
+        logger.error("fastapi.shutdown.session_store_error", error=str(e))
+
     # Close all async clients
     try:
         await close_all_clients()
@@ -76,6 +106,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error("fastapi.shutdown.db_error", error=str(e))
 
+    # Prompt cache engine and availability snapshot loaded by the warmup
+    try:
+        from src.aegis.model.warmup import release_worker_state
+
+        release_worker_state()
+    except Exception as e:
+        logger.error("fastapi.shutdown.warm_state_error", error=str(e))
+
 
 # Create FastAPI app with lifespan manager
 app = FastAPI(
@@ -251,6 +289,13 @@ async def root():
     """)
 
 
+def _is_valid_session_id(session_id: Optional[str]) -> bool:
+    """Accept only short opaque IDs from clients (UUIDs or similar tokens)."""
+    return bool(session_id) and len(session_id) <= 64 and all(
+        ch.isalnum() or ch in "-_" for ch in session_id
+    )
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """
@@ -259,20 +304,33 @@ async def websocket_endpoint(websocket: WebSocket):
     Handles bidirectional communication with the client:
     - Receives user messages
     - Streams model responses in real-time
-    - Manages conversation state per connection
+    - Keeps conversation state in the session store, keyed by the
+      session_id query parameter (a new session is issued when it is absent)
     """
     await websocket.accept()
 
-    # Initialize conversation state for this connection
+    # Resume the client's session (possibly started on another worker) or start one
+    session_id = websocket.query_params.get("session_id", "")
+    if not _is_valid_session_id(session_id):
+        session_id = str(uuid.uuid4())
+    stored_state = await session_store.get(session_id)
     conversation_state = {
-        "messages": [],
+        **stored_state,
         "connection_id": str(uuid.uuid4()),
+        "session_id": session_id,
     }
 
     logger.info(
         "websocket.connected",
         connection_id=conversation_state["connection_id"],
+        session_id=session_id,
+        resumed_messages=len(stored_state["messages"]),
     )
+    await websocket.send_json({
+        "type": "session",
+        "session_id": session_id,
+        "message_count": len(stored_state["messages"]),
+    })
 
     try:
         while True:
@@ -280,7 +338,13 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_text()
             message_data = json.loads(data)
 
-            if message_data.get("type") == "message":
+            if message_data.get("type") == "reset":
+                conversation_state["messages"] = []
+                conversation_state["summary"] = ""
+                await session_store.delete(session_id)
+                await websocket.send_json({"type": "status", "content": "Conversation reset"})
+
+            elif message_data.get("type") == "message":
                 user_message = message_data.get("content", "")
                 selected_databases = message_data.get("databases", [])
 
@@ -309,22 +373,35 @@ async def websocket_endpoint(websocket: WebSocket):
                     if selected_databases:
                         model_kwargs["db_names"] = selected_databases
 
-                    # Stream responses from the model
-                    async for chunk in model(conversation_state, **model_kwargs):
-                        # Send each chunk immediately to the client
-                        await websocket.send_json(chunk)
-
-                        # Track assistant responses in conversation
-                        if chunk.get("type") == "agent" and chunk.get("name") == "aegis":
-                            # Accumulate agent responses
-                            if not conversation_state["messages"] or \
-                               conversation_state["messages"][-1]["role"] != "assistant":
-                                conversation_state["messages"].append({
-                                    "role": "assistant",
-                                    "content": chunk.get("content", "")
-                                })
-                            else:
-                                conversation_state["messages"][-1]["content"] += chunk.get("content", "")
+                    # Stream responses from the model. aclosing() shuts the generator down
+                    # as soon as sending fails, cancelling any subagents still running.
+                    async with aclosing(model(conversation_state, **model_kwargs)) as stream:
+                        async for chunk in stream:
+                            # Send each chunk immediately to the client
+                            await websocket.send_json(chunk)
+
+                            # Track assistant responses in conversation
+                            if chunk.get("type") == "agent" and chunk.get("name") == "aegis":
+                                # Accumulate agent responses
+                                if not conversation_state["messages"] or \
+                                   conversation_state["messages"][-1]["role"] != "assistant":
+                                    conversation_state["messages"].append({
+                                        "role": "assistant",
+                                        "content": chunk.get("content", "")
+                                    })
+                                else:
+                                    conversation_state["messages"][-1]["content"] += chunk.get("content", "")
+
+                    # Fold turns that left the token window into the rolling summary
+                    # so the session history stays bounded.
+                    folded = compact_conversation(conversation_state)
+                    if folded:
+                        logger.info(
+                            "websocket.conversation_compacted",
+                            connection_id=conversation_state["connection_id"],
+                            folded_messages=folded,
+                            retained_messages=len(conversation_state["messages"]),
+                        )
 
                     # Send completion status
                     await websocket.send_json({
@@ -342,6 +419,10 @@ async def websocket_endpoint(websocket: WebSocket):
                         "type": "error",
                         "content": f"Model error: {str(e)}"
                     })
+                finally:
+                    # Persist the turn (batched) so a reconnect or another worker can resume
+                    # it, including a turn cut short when a stopping worker closes the socket
+                    await session_store.put(session_id, conversation_state)
 
     except WebSocketDisconnect:
         logger.info(
@@ -387,46 +468,14 @@ async def monitoring_summary(
     hours: int = Query(default=24, description="Hours to look back"),
     limit: int = Query(default=100, description="Maximum number of runs")
 ):
-    """Get monitoring summary data."""
+    """Get monitoring summary data from the run and stage-hour rollups."""
     try:
-        from src.aegis.connections.postgres_connector import fetch_all
-        from datetime import datetime, timedelta, timezone
-
-        # Calculate the time threshold
-        threshold = datetime.now(timezone.utc) - timedelta(hours=hours)
-
-        # Query for recent runs summary
-        recent_runs_query = """
-        WITH run_summary AS (
-            SELECT
-                run_uuid,
-                MIN(stage_start_time) as start_time,
-                MAX(stage_end_time) as end_time,
-                COUNT(*) as stage_count,
-                SUM(duration_ms) as total_duration_ms,
-                SUM(total_tokens) as total_tokens,
-                SUM(total_cost) as total_cost,
-                STRING_AGG(DISTINCT status, ', ') as statuses,
-                BOOL_OR(status != 'Success') as has_errors
-            FROM process_monitor_logs
-            WHERE stage_start_time >= :threshold
-            GROUP BY run_uuid
-            ORDER BY start_time DESC
-            LIMIT :limit
-        )
-        SELECT * FROM run_summary
-        """
+        from src.aegis.utils.monitor_rollups import fetch_recent_runs, fetch_stage_statistics
 
-        # Properly await the async function
-        recent_runs = await fetch_all(
-            recent_runs_query,
-            params={"threshold": threshold, "limit": limit},
-            execution_id="monitoring"
+        runs_list, stage_stats = await asyncio.gather(
+            fetch_recent_runs(hours, limit), fetch_stage_statistics(hours)
         )
 
-        # Process the data for JSON serialization
-        runs_list = recent_runs if recent_runs else []
-
         # Calculate overall stats
         total_runs = len(runs_list)
         successful_runs = sum(1 for r in runs_list if not r.get("has_errors", False))
@@ -437,26 +486,6 @@ async def monitoring_summary(
         durations = [r.get("total_duration_ms", 0) for r in runs_list if r.get("total_duration_ms")]
         avg_duration = sum(durations) / len(durations) if durations else 0
 
-        # Get stage statistics
-        stage_stats_query = """
-        SELECT
-            stage_name,
-            COUNT(*) as count,
-            AVG(duration_ms) as avg_duration,
-            SUM(total_tokens) as total_tokens,
-            SUM(total_cost) as total_cost
-        FROM process_monitor_logs
-        WHERE stage_start_time >= :threshold
-        GROUP BY stage_name
-        ORDER BY count DESC
-        """
-
-        stage_stats = await fetch_all(
-            stage_stats_query,
-            params={"threshold": threshold},
-            execution_id="monitoring"
-        )
-
         summary = {
             "overall_stats": {
                 "total_runs": total_runs,
@@ -466,7 +495,7 @@ async def monitoring_summary(
                 "total_tokens": total_tokens,
                 "avg_duration_ms": avg_duration
             },
-            "stage_statistics": stage_stats if stage_stats else [],
+            "stage_statistics": stage_stats,
             "recent_runs": runs_list,
             "hours": hours
         }
@@ -562,39 +591,14 @@ async def monitoring_stage_trends(
     stage_name: str,
     hours: int = Query(default=24, description="Hours to look back")
 ):
-    """Get stage trends."""
+    """Get hourly stage trends, including p50/p95/p99 durations, from the stage rollups."""
     try:
-        from src.aegis.connections.postgres_connector import fetch_all
-        from datetime import datetime, timedelta, timezone
-
-        threshold = datetime.now(timezone.utc) - timedelta(hours=hours)
-
-        # Query for stage performance over time
-        trends_query = """
-        SELECT
-            DATE_TRUNC('hour', stage_start_time) as hour,
-            COUNT(*) as execution_count,
-            AVG(duration_ms) as avg_duration_ms,
-            MIN(duration_ms) as min_duration_ms,
-            MAX(duration_ms) as max_duration_ms,
-            SUM(CASE WHEN status = 'Success' THEN 1 ELSE 0 END) as success_count,
-            SUM(CASE WHEN status != 'Success' THEN 1 ELSE 0 END) as failure_count
-        FROM process_monitor_logs
-        WHERE stage_name = :stage_name AND stage_start_time >= :threshold
-        GROUP BY DATE_TRUNC('hour', stage_start_time)
-        ORDER BY hour
-        """
-
-        trends = await fetch_all(
-            trends_query,
-            params={"stage_name": stage_name, "threshold": threshold},
-            execution_id="monitoring"
-        )
+        from src.aegis.utils.monitor_rollups import fetch_stage_trend
 
         result = {
             "stage_name": stage_name,
             "time_range_hours": hours,
-            "trends": trends if trends else [],
+            "trends": await fetch_stage_trend(stage_name, hours),
         }
 
         return JSONResponse(content=result, media_type="application/json")
@@ -603,6 +607,46 @@ async def monitoring_stage_trends(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/monitoring/router-cache")
+async def monitoring_router_cache():
+    """Get router decision cache hit-rate metrics for this worker."""
+    from src.aegis.model.agents.router_cache import get_router_cache_stats
+
+    return get_router_cache_stats()
+
+
+@app.get("/api/monitoring/db-pools")
+async def monitoring_db_pools():
+    """Get pool checkout waits and health for each database engine in this worker."""
+    from src.aegis.connections.postgres_connector import get_pool_stats
+
+    return get_pool_stats()
+
+
+@app.get("/api/monitoring/queries")
+async def monitoring_queries(
+    limit: int = Query(default=50, description="Maximum statement fingerprints returned"),
+    stage: Optional[str] = Query(default=None, description="Only fingerprints run from this stage"),
+):
+    """Get per-statement latency histograms, rows and pool waits for this worker."""
+    from src.aegis.connections.query_stats import get_query_stats
+
+    if not config.query_stats.enabled:
+        return {"enabled": False}
+    return {"enabled": True, "queries": get_query_stats().snapshot(limit=limit, stage=stage)}
+
+
+@app.get("/api/monitoring/queries/slow")
+async def monitoring_slow_queries():
+    """Get sampled EXPLAIN (ANALYZE, BUFFERS) plans of slow reads in this worker."""
+    from src.aegis.connections.query_stats import get_query_stats
+
+    return {
+        "explain_threshold_ms": config.query_stats.explain_threshold_ms,
+        "samples": list(reversed(get_query_stats().slow_samples)),
+    }
+
+
 # Database viewer API endpoints
 @app.get("/api/database/tables")
 async def database_tables():
@@ -628,13 +672,26 @@ async def database_tables():
 
 
 @app.get("/api/database/table/{table_name}/schema")
-async def database_table_schema(table_name: str):
+async def database_table_schema(
+    table_name: str,
+    exact: bool = Query(default=False, description="Run an exact COUNT(*) instead of the estimate"),
+    refresh: bool = Query(default=False, description="Bypass the cached schema metadata"),
+):
     """Get schema information for a specific table."""
     try:
-        from src.aegis.connections.postgres_connector import get_table_schema, fetch_one
+        from src.aegis.utils.database_overview import (
+            count_rows_exact,
+            get_table_columns,
+            get_table_overview,
+        )
+
+        # Only tables known to the catalog are inspected or counted
+        table = await get_table_overview(table_name, refresh=refresh)
+        if table is None:
+            raise HTTPException(status_code=404, detail=f"Unknown table: {table_name}")
 
         # Get column information
-        columns_raw = await get_table_schema(table_name, execution_id="database_viewer")
+        columns_raw = await get_table_columns(table_name, refresh=refresh)
 
         # Transform column data to match frontend expectations
         columns = []
@@ -649,180 +706,195 @@ async def database_table_schema(table_name: str):
                 "scale": col.get("numeric_scale")
             })
 
-        # Get row count
-        count_query = f"SELECT COUNT(*) as count FROM {table_name}"
-        count_result = await fetch_one(count_query, execution_id="database_viewer")
-        row_count = count_result["count"] if count_result else 0
-
-        # Get primary key constraint
-        # Using format string for table name since asyncpg doesn't handle ::regclass cast with parameters well
-        pk_query = f"""
-        SELECT a.attname as column_name
-        FROM pg_index i
-        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
-        WHERE i.indrelid = '{table_name}'::regclass AND i.indisprimary
-        """
-        pk_result = await fetch_all(pk_query, execution_id="database_viewer")
-        pk_columns = [row["column_name"] for row in pk_result] if pk_result else []
+        # Planner estimate unless an exact count was requested (and finished in time)
+        row_count = None
+        if exact:
+            row_count = (await count_rows_exact([table_name]))[table_name]
+        row_count_estimated = row_count is None
+        if row_count_estimated:
+            row_count = table["estimated_rows"]
+
+        pk_columns = [name for name in table["primary_key"].split(", ") if name]
 
         info = {
             "columns": columns,
             "row_count": row_count,
+            "row_count_estimated": row_count_estimated,
             "primary_key": pk_columns,
             "table_name": table_name
         }
 
         return info
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting table info: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _resolve_viewer_table(table_name: str) -> Dict[str, Any]:
+    """Get the cached overview entry for a table, or raise 404 if it is unknown."""
+    from src.aegis.utils.database_overview import get_table_overview
+
+    table = await get_table_overview(table_name)
+    if table is None:
+        raise HTTPException(status_code=404, detail=f"Unknown table: {table_name}")
+    return table
+
+
+def _export_response(chunks, export_format: str, filename: str) -> StreamingResponse:
+    """Wrap streamed export chunks in a download response."""
+    from src.aegis.utils.database_streaming import EXPORT_FORMATS
+
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
+
+
 @app.get("/api/database/table/{table_name}/data")
 async def database_table_data(
     table_name: str,
-    limit: int = Query(default=100, description="Maximum rows to return"),
-    offset: int = Query(default=0, description="Offset for pagination"),
+    limit: int = Query(default=100, ge=1, description="Maximum rows to return"),
+    offset: int = Query(default=0, ge=0, description="Offset for pagination without a cursor"),
+    after: Optional[str] = Query(default=None, description="Cursor from the previous page"),
     order_by: Optional[str] = Query(default=None, description="Column to order by"),
     filter: Optional[str] = Query(default=None, description="Filter condition")
 ):
-    """Get data from a specific table."""
-    try:
-        from src.aegis.connections.postgres_connector import fetch_all
-        import json
-        from decimal import Decimal
-        from datetime import datetime, date
-        import uuid
-
-        # Build query
-        query = f"SELECT * FROM {table_name}"
-        params = {}
-
-        if filter:
-            query += f" WHERE {filter}"
+    """
+    Get one page of data from a specific table.
 
-        if order_by:
-            query += f" ORDER BY {order_by}"
+    Tables with a primary key are paged by key: pass next_cursor from the
+    previous page as `after`. Custom orderings fall back to LIMIT/OFFSET.
+    """
+    try:
+        from src.aegis.utils.database_overview import get_table_columns
+        from src.aegis.utils.database_streaming import (
+            build_table_page_query,
+            clean_rows,
+            encode_keyset_cursor,
+        )
 
-        query += " LIMIT :limit OFFSET :offset"
-        params["limit"] = limit
-        params["offset"] = offset
+        table = await _resolve_viewer_table(table_name)
+        columns = await get_table_columns(table_name)
+        key_columns = [name for name in table["primary_key"].split(", ") if name]
+        limit = min(limit, config.database_viewer.max_query_rows)
 
-        # Fetch data using async postgres_connector
+        try:
+            query, params, keyset = build_table_page_query(
+                table_name,
+                key_columns,
+                {col["column_name"]: col["data_type"] for col in columns},
+                limit=limit,
+                after=after,
+                offset=offset,
+                order_by=order_by,
+                filter_condition=filter,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # A page is bounded by limit, so it is fetched in one round trip
         rows = await fetch_all(query, params=params, execution_id="database_viewer")
 
-        if not rows:
-            return {"data": [], "total_rows": 0}
-
-        # Custom JSON encoder for PostgreSQL types
-        def clean_for_json(obj):
-            """Convert PostgreSQL types to JSON-serializable types."""
-            if obj is None:
-                return None
-            elif isinstance(obj, (Decimal, float)):
-                # Handle NaN and infinity
-                import math
-                if math.isnan(obj) or math.isinf(obj):
-                    return None
-                return float(obj)
-            elif isinstance(obj, (datetime, date)):
-                return obj.isoformat()
-            elif isinstance(obj, uuid.UUID):
-                return str(obj)
-            elif isinstance(obj, bytes):
-                try:
-                    return obj.decode('utf-8', errors='ignore')
-                except:
-                    return str(obj)
-            elif isinstance(obj, dict):
-                # Recursively clean nested dicts (for JSONB columns)
-                return {k: clean_for_json(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                # Recursively clean lists (for array columns)
-                return [clean_for_json(item) for item in obj]
-            else:
-                return obj
-
-        # Clean all rows
-        cleaned_data = []
-        for row in rows:
-            cleaned_row = {key: clean_for_json(value) for key, value in row.items()}
-            cleaned_data.append(cleaned_row)
+        next_cursor = None
+        if keyset and len(rows) == limit:
+            next_cursor = encode_keyset_cursor(rows[-1], key_columns)
 
-        result = {
-            "data": cleaned_data,
-            "total_rows": len(cleaned_data)
+        return {
+            "data": clean_rows(rows),
+            "total_rows": len(rows),
+            "pagination": "keyset" if keyset else "offset",
+            "next_cursor": next_cursor,
         }
-
-        return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting table data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/database/table/{table_name}/export")
+async def database_table_export(
+    table_name: str,
+    format: str = Query(default="csv", description="Export format: csv or ndjson"),
+    order_by: Optional[str] = Query(default=None, description="Column to order by"),
+    filter: Optional[str] = Query(default=None, description="Filter condition")
+):
+    """Stream every row of a table (optionally filtered) as CSV or NDJSON."""
+    from src.aegis.utils.database_overview import quote_identifier
+    from src.aegis.utils.database_streaming import EXPORT_FORMATS, iter_export
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown export format: {format}")
+    await _resolve_viewer_table(table_name)
+
+    query = f"SELECT * FROM {quote_identifier(table_name)}"
+    if filter:
+        query += f" WHERE {filter}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    return _export_response(iter_export(query, format), format, table_name)
+
+
 @app.post("/api/database/query")
 async def database_query(request: Dict[str, Any]):
-    """Execute a custom SQL query."""
+    """
+    Execute a custom SQL query.
+
+    Read statements are streamed from a server-side cursor and cut off after
+    DATABASE_VIEWER_MAX_QUERY_ROWS rows (truncated=true); use
+    /api/database/query/export for the full result.
+    """
     try:
-        from src.aegis.connections.postgres_connector import fetch_all
-        from decimal import Decimal
-        from datetime import datetime, date
-        import uuid
+        from src.aegis.connections.postgres_connector import is_read_statement
+        from src.aegis.utils.database_streaming import clean_rows, collect_query_rows
 
         query = request.get("query", "")
         if not query:
             raise HTTPException(status_code=400, detail="No query provided")
 
-        # Execute query using async postgres_connector
-        rows = await fetch_all(query, execution_id="database_viewer")
+        truncated = False
+        if is_read_statement(query):
+            rows, truncated = await collect_query_rows(query)
+        else:
+            # Statements with side effects (e.g. INSERT ... RETURNING) run as before
+            rows = clean_rows(await fetch_all(query, execution_id="database_viewer"))
 
         if not rows:
-            return {"data": [], "total_rows": 0, "columns": []}
-
-        # Custom JSON encoder for PostgreSQL types
-        def clean_for_json(obj):
-            """Convert PostgreSQL types to JSON-serializable types."""
-            if obj is None:
-                return None
-            elif isinstance(obj, (Decimal, float)):
-                import math
-                if math.isnan(obj) or math.isinf(obj):
-                    return None
-                return float(obj)
-            elif isinstance(obj, (datetime, date)):
-                return obj.isoformat()
-            elif isinstance(obj, uuid.UUID):
-                return str(obj)
-            elif isinstance(obj, bytes):
-                try:
-                    return obj.decode('utf-8', errors='ignore')
-                except:
-                    return str(obj)
-            elif isinstance(obj, dict):
-                return {k: clean_for_json(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [clean_for_json(item) for item in obj]
-            else:
-                return obj
+            return {"data": [], "total_rows": 0, "columns": [], "truncated": False}
 
-        # Clean all rows
-        cleaned_data = []
-        for row in rows:
-            cleaned_row = {key: clean_for_json(value) for key, value in row.items()}
-            cleaned_data.append(cleaned_row)
-
-        result = {
-            "data": cleaned_data,
-            "total_rows": len(cleaned_data),
-            "columns": list(rows[0].keys()) if rows else []
+        return {
+            "data": rows,
+            "total_rows": len(rows),
+            "columns": list(rows[0].keys()),
+            "truncated": truncated,
         }
-
-        return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error executing query: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/database/query/export")
+async def database_query_export(request: Dict[str, Any]):
+    """Stream the full result of a read query as CSV or NDJSON."""
+    from src.aegis.connections.postgres_connector import is_read_statement
+    from src.aegis.utils.database_streaming import EXPORT_FORMATS, iter_export
+
+    query = request.get("query", "")
+    export_format = request.get("format", "csv")
+    if not query:
+        raise HTTPException(status_code=400, detail="No query provided")
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown export format: {export_format}")
+    if not is_read_statement(query):
+        raise HTTPException(status_code=400, detail="Only read queries can be exported")
+    return _export_response(iter_export(query, export_format), export_format, "query_results")
+
+
 @app.get("/api/database/samples")
 async def database_samples():
     """Get sample queries for the database interface."""
@@ -882,106 +954,32 @@ ORDER BY quarters_available DESC"""
 
 
 @app.get("/api/database/overview")
-async def database_overview():
-    """Get database overview statistics."""
-    try:
-        from src.aegis.connections.postgres_connector import fetch_all, fetch_one
-
-        # Query to get all table names and their details
-        tables_query = """
-        WITH table_info AS (
-            SELECT
-                t.table_name,
-                COUNT(DISTINCT c.column_name) as column_count
-            FROM information_schema.tables t
-            LEFT JOIN information_schema.columns c
-                ON t.table_name = c.table_name AND t.table_schema = c.table_schema
-            WHERE t.table_schema = 'public'
-            GROUP BY t.table_name
-        ),
-        index_info AS (
-            SELECT
-                tablename as table_name,
-                COUNT(*) as index_count
-            FROM pg_indexes
-            WHERE schemaname = 'public'
-            GROUP BY tablename
-        ),
-        pk_info AS (
-            SELECT
-                tc.table_name,
-                string_agg(kcu.column_name, ', ') as primary_key
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu
-                ON tc.constraint_name = kcu.constraint_name
-            WHERE tc.constraint_type = 'PRIMARY KEY'
-            AND tc.table_schema = 'public'
-            GROUP BY tc.table_name
-        ),
-        fk_info AS (
-            SELECT
-                tc.table_name,
-                COUNT(*) as foreign_key_count
-            FROM information_schema.table_constraints tc
-            WHERE tc.constraint_type = 'FOREIGN KEY'
-            AND tc.table_schema = 'public'
-            GROUP BY tc.table_name
-        )
-        SELECT
-            ti.table_name as table,
-            ti.column_count as columns,
-            COALESCE(ii.index_count, 0) as indexes,
-            pk.primary_key,
-            COALESCE(fk.foreign_key_count, 0) as foreign_keys
-        FROM table_info ti
-        LEFT JOIN index_info ii ON ti.table_name = ii.table_name
-        LEFT JOIN pk_info pk ON ti.table_name = pk.table_name
-        LEFT JOIN fk_info fk ON ti.table_name = fk.table_name
-        ORDER BY ti.table_name
-        """
+async def database_overview(
+    exact: bool = Query(default=False, description="Count every table exactly"),
+    tables: Optional[str] = Query(
+        default=None, description="Comma-separated tables to count exactly"
+    ),
+    refresh: bool = Query(default=False, description="Bypass the cached schema metadata"),
+):
+    """
+    Get database overview statistics.
 
-        tables_result = await fetch_all(tables_query, execution_id="database_viewer")
-
-        # Get row counts for each table (separate query for performance)
-        table_details = []
-        total_rows = 0
-        total_columns = 0
-        total_indexes = 0
-
-        for table in tables_result if tables_result else []:
-            # Get row count for this table
-            count_query = f"SELECT COUNT(*) as count FROM {table['table']}"
-            count_result = await fetch_one(count_query, execution_id="database_viewer")
-            row_count = count_result["count"] if count_result else 0
-
-            total_rows += row_count
-            total_columns += table["columns"]
-            total_indexes += table["indexes"]
-
-            table_details.append({
-                "table": table["table"],
-                "rows": row_count,
-                "columns": table["columns"],
-                "indexes": table["indexes"],
-                "primary_key": table.get("primary_key", ""),
-                "foreign_keys": table.get("foreign_keys", 0)
-            })
+    Row counts are planner estimates unless exact counts are requested for
+    all tables (exact=true) or a subset (tables=a,b). Exact counts run
+    concurrently, each with a timeout, and fall back to the estimate.
+    """
+    try:
+        from src.aegis.utils.database_overview import build_database_overview, get_schema_overview
 
-        # Calculate averages
-        num_tables = len(table_details)
-        avg_columns = round(total_columns / num_tables) if num_tables > 0 else 0
+        exact_tables = None
+        if exact:
+            exact_tables = [table["table"] for table in await get_schema_overview(refresh=refresh)]
+        elif tables:
+            exact_tables = [name.strip() for name in tables.split(",") if name.strip()]
 
-        overview = {
-            "summary": {
-                "total_tables": num_tables,
-                "total_rows": total_rows,
-                "avg_columns": avg_columns,
-                "total_indexes": total_indexes
-            },
-            "tables": table_details,
-            "database_name": config.postgres_database,
-            "host": config.postgres_host
-        }
+        overview = await build_database_overview(exact_tables=exact_tables, refresh=refresh)
+        overview["database_name"] = config.postgres_database
+        overview["host"] = config.postgres_host
         return overview
     except Exception as e:
         logger.error(f"Error getting database overview: {e}")
@@ -990,18 +988,25 @@ async def database_overview():
 
 # Conversation management endpoints
 @app.post("/api/reset")
-async def reset_conversation():
-    """Reset the conversation history (for session-based management)."""
-    # Note: In WebSocket implementation, each connection has its own state
-    # This endpoint is kept for compatibility with the original interface
+async def reset_conversation(
+    session_id: Optional[str] = Query(default=None, description="Session to reset")
+):
+    """Reset a session's conversation history."""
+    # Open connections for the session also clear their copy via a websocket "reset" message
+    if _is_valid_session_id(session_id):
+        await session_store.delete(session_id)
     return {"status": "Conversation reset", "conversation_length": 0}
 
 
 @app.get("/api/history")
-async def get_history():
-    """Get conversation history (placeholder for compatibility)."""
-    # Note: In WebSocket implementation, history is managed per connection
-    return []
+async def get_history(
+    session_id: Optional[str] = Query(default=None, description="Session to read")
+):
+    """Get a session's retained conversation messages."""
+    if not _is_valid_session_id(session_id):
+        return []
+    state = await session_store.get(session_id)
+    return state["messages"]
 
 
 @app.get("/health")
@@ -1040,12 +1045,24 @@ def main():
     parser.add_argument(
         "--workers",
         type=int,
-        default=1,
-        help="Number of worker processes (default: 1)"
+        default=None,
+        help="Number of worker processes (default: 1, or SERVER_WORKERS with --production)"
+    )
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        default=os.getenv("SERVER_MODE", "").lower() == "production",
+        help="Serve with several warmed workers (SERVER_WORKERS, default one per CPU)"
     )
 
     args = parser.parse_args()
 
+    workers = args.workers
+    if workers is None:
+        workers = (config.server.workers or os.cpu_count() or 1) if args.production else 1
+    if args.reload:
+        workers = 1  # Can't use multiple workers with reload
+
     print(f"Starting Aegis FastAPI server on http://{args.host}:{args.port}")
     print("Available endpoints:")
     print(f"  - WebSocket: ws://{args.host}:{args.port}/ws")
@@ -1055,15 +1072,24 @@ def main():
     print("  - Real-time streaming responses")
     print("  - Concurrent request handling")
     print("  - Automatic reconnection")
-    print("  - Per-connection conversation state")
+    print(f"  - Session conversation state ({config.session_store.backend} store)")
+    print(f"\nWorkers: {workers} (warmup {'on' if config.server.warmup else 'off'})")
+    if workers > 1 and config.session_store.backend == "memory":
+        print(
+            "  Warning: SESSION_STORE_BACKEND=memory keeps each session in one worker; "
+            "use postgres or sqlite so reconnects can resume on any worker"
+        )
 
-    # Run with uvicorn
+    # Run with uvicorn. Each worker imports the app and runs the lifespan warmup
+    # before it accepts connections; on shutdown it waits for open requests and
+    # chat turns before the lifespan drains the session store and pools.
     uvicorn.run(
         "run_fastapi:app",
         host=args.host,
         port=args.port,
         reload=args.reload,
-        workers=args.workers if not args.reload else 1,  # Can't use multiple workers with reload
+        workers=workers,
+        timeout_graceful_shutdown=config.server.graceful_shutdown or None,
         log_level="info"
     )
 
@@ -0,0 +1,15 @@
+-- Conversation Sessions Table Schema
+-- Durable store for websocket conversation sessions (SESSION_STORE_BACKEND=postgres).
+-- Rows are upserted in batches by src/aegis/utils/session_store.py so that a session
+-- survives reconnects and is visible to every uvicorn worker.
+
+CREATE TABLE aegis_conversation_sessions (
+    session_id VARCHAR(64) PRIMARY KEY,
+    -- Capped conversation state: {"messages": [...], "summary": "..."}
+    state JSONB NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Expired sessions are purged by updated_at
+CREATE INDEX idx_aegis_conversation_sessions_updated_at
+    ON aegis_conversation_sessions(updated_at);
@@ -0,0 +1,42 @@
+-- Process Monitor Rollup Tables Schema
+-- Incrementally maintained aggregates of process_monitor_logs for the monitoring
+-- dashboard. Rows are merged by the monitor flush path and rebuilt for a recent
+-- window by the periodic refresh job (src/aegis/utils/monitor_rollups.py).
+
+-- One row per workflow run
+CREATE TABLE process_monitor_run_rollups (
+    run_uuid UUID PRIMARY KEY,
+    model_name VARCHAR(100),
+    start_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    end_time TIMESTAMP WITH TIME ZONE,
+    stage_count INTEGER NOT NULL DEFAULT 0,
+    total_duration_ms BIGINT NOT NULL DEFAULT 0,
+    total_tokens BIGINT NOT NULL DEFAULT 0,
+    total_cost NUMERIC(14,6) NOT NULL DEFAULT 0,
+    statuses TEXT[] NOT NULL DEFAULT '{}',
+    has_errors BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_process_monitor_run_rollups_start_time
+    ON process_monitor_run_rollups(start_time DESC);
+
+-- One row per stage per UTC hour (by stage_start_time)
+CREATE TABLE process_monitor_stage_hourly (
+    stage_name VARCHAR(100) NOT NULL,
+    hour TIMESTAMP WITH TIME ZONE NOT NULL,
+    execution_count INTEGER NOT NULL DEFAULT 0,
+    success_count INTEGER NOT NULL DEFAULT 0,
+    failure_count INTEGER NOT NULL DEFAULT 0,
+    total_duration_ms BIGINT NOT NULL DEFAULT 0,
+    min_duration_ms INTEGER,
+    max_duration_ms INTEGER,
+    total_tokens BIGINT NOT NULL DEFAULT 0,
+    total_cost NUMERIC(14,6) NOT NULL DEFAULT 0,
+    -- Counts per duration bucket; bounds are STAGE_DURATION_BUCKETS_MS plus an overflow bucket
+    duration_histogram INTEGER[] NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (stage_name, hour)
+);
+
+CREATE INDEX idx_process_monitor_stage_hourly_hour ON process_monitor_stage_hourly(hour);
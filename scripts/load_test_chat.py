@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+"""
+Measure how many concurrent chat sessions the FastAPI server sustains per core.
+
+Each simulated session opens the /ws websocket, sends a message, reads the
+streamed response until the server reports "Ready" (or an error), waits the
+think time and sends the next message. The load runs in levels of increasing
+concurrency; a level is sustained when its error rate and p95 turn latency
+stay within the limits. The report gives the highest sustained level divided
+by the server's CPU cores.
+
+Start the server first, for example:
+    python run_fastapi.py --production
+
+Usage:
+    # 8, 16, 32 and 64 concurrent sessions for 60 seconds each
+    python scripts/load_test_chat.py --levels 8,16,32,64 --duration 60
+
+    # Server on another host with 16 cores
+    python scripts/load_test_chat.py --url ws://aegis:8000/ws --cores 16
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_MESSAGE = "What was RBC's net income in the latest quarter?"
+
+
+@dataclass
+class LevelResult:
+    """Turns recorded for one concurrency level."""
+
+    sessions: int
+    duration: float
+    latencies: List[float] = field(default_factory=list)
+    first_chunk_latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    dropped_sessions: int = 0
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Samples (unsorted)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile, or None when there are no samples
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize_level(result: LevelResult, max_p95: float, max_error_rate: float) -> Dict[str, Any]:
+    """
+    Summarize one level and decide whether it was sustained.
+
+    Args:
+        result: Recorded turns for the level
+        max_p95: Highest acceptable p95 turn latency in seconds
+        max_error_rate: Highest acceptable fraction of failed turns
+
+    Returns:
+        Dictionary with throughput, latency percentiles, error rate and "sustained"
+    """
+    turns = len(result.latencies) + result.errors
+    error_rate = (result.errors + result.dropped_sessions) / max(turns + result.dropped_sessions, 1)
+    p95 = percentile(result.latencies, 95)
+    return {
+        "sessions": result.sessions,
+        "turns": turns,
+        "turns_per_second": (
+            round(len(result.latencies) / result.duration, 2) if result.duration else 0.0
+        ),
+        "p50": percentile(result.latencies, 50),
+        "p95": p95,
+        "first_chunk_p95": percentile(result.first_chunk_latencies, 95),
+        "error_rate": round(error_rate, 4),
+        "sustained": bool(result.latencies)
+        and error_rate <= max_error_rate
+        and p95 is not None
+        and p95 <= max_p95,
+    }
+
+
+def sustained_sessions(summaries: Sequence[Dict[str, Any]]) -> int:
+    """
+    Highest level sustained before the first level that was not.
+
+    Args:
+        summaries: Level summaries in increasing concurrency
+
+    Returns:
+        Concurrent sessions sustained (0 if even the first level failed)
+    """
+    best = 0
+    for summary in summaries:
+        if not summary["sustained"]:
+            break
+        best = summary["sessions"]
+    return best
+
+
+async def _run_turn(websocket, message: str, databases: List[str], result: LevelResult) -> None:
+    """Send one message and read the stream until the turn ends."""
+    started = time.perf_counter()
+    first_chunk = None
+    await websocket.send(
+        json.dumps({"type": "message", "content": message, "databases": databases})
+    )
+    while True:
+        event = json.loads(await websocket.recv())
+        if event.get("type") == "error":
+            result.errors += 1
+            return
+        if event.get("type") == "status" and event.get("content") == "Ready":
+            break
+        if first_chunk is None and event.get("type") != "status":
+            first_chunk = time.perf_counter() - started
+    result.latencies.append(time.perf_counter() - started)
+    if first_chunk is not None:
+        result.first_chunk_latencies.append(first_chunk)
+
+
+async def _run_session(
+    args: argparse.Namespace, deadline: float, start_delay: float, result: LevelResult
+) -> None:
+    """One simulated user: connect, then send messages until the deadline."""
+    import websockets  # pylint: disable=import-outside-toplevel
+
+    await asyncio.sleep(start_delay)
+    url = f"{args.url}?session_id=loadtest-{uuid.uuid4().hex[:16]}"
+    try:
+        async with websockets.connect(url, max_size=None, open_timeout=30) as websocket:
+            json.loads(await websocket.recv())  # session handshake
+            while time.perf_counter() < deadline:
+                try:
+                    await asyncio.wait_for(
+                        _run_turn(websocket, args.message, args.databases, result),
+                        timeout=args.turn_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    result.errors += 1
+                    return
+                await asyncio.sleep(args.think_time)
+    except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+        result.dropped_sessions += 1
+
+
+async def run_level(args: argparse.Namespace, sessions: int) -> LevelResult:
+    """Run one concurrency level for args.duration seconds."""
+    result = LevelResult(sessions=sessions, duration=args.duration)
+    ramp = min(args.ramp, args.duration / 2)
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(
+        *(
+            _run_session(args, deadline, ramp * index / sessions, result)
+            for index in range(sessions)
+        )
+    )
+    return result
+
+
+def _print_summary(summary: Dict[str, Any]) -> None:
+    def seconds(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.2f}s"
+
+    print(
+        f"{summary['sessions']:>8} {summary['turns']:>7} {summary['turns_per_second']:>9} "
+        f"{seconds(summary['p50']):>8} {seconds(summary['p95']):>8} "
+        f"{seconds(summary['first_chunk_p95']):>10} {summary['error_rate']:>8.2%} "
+        f"{'yes' if summary['sustained'] else 'no':>9}"
+    )
+
+
+def _comma_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        description="Load test concurrent chat sessions against run_fastapi.py",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws", help="Chat websocket URL")
+    parser.add_argument(
+        "--levels",
+        type=_comma_list,
+        default="4,8,16,32",
+        help="Comma-separated concurrent sessions per level",
+    )
+    parser.add_argument("--duration", type=float, default=60, help="Seconds per level")
+    parser.add_argument(
+        "--ramp", type=float, default=5, help="Seconds over which a level's sessions connect"
+    )
+    parser.add_argument(
+        "--think-time", type=float, default=2, help="Seconds a session waits between messages"
+    )
+    parser.add_argument(
+        "--turn-timeout", type=float, default=180, help="Seconds before a turn counts as failed"
+    )
+    parser.add_argument("--message", default=DEFAULT_MESSAGE, help="Message every session sends")
+    parser.add_argument(
+        "--databases",
+        type=_comma_list,
+        default="",
+        help="Comma-separated database filter sent with each message",
+    )
+    parser.add_argument(
+        "--max-p95", type=float, default=30, help="Sustained levels keep p95 latency under this"
+    )
+    parser.add_argument(
+        "--max-error-rate", type=float, default=0.01, help="Sustained levels fail fewer turns"
+    )
+    parser.add_argument(
+        "--cores",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="CPU cores available to the server (default: this machine's)",
+    )
+    return parser
+
+
+async def async_main(argv: Optional[List[str]] = None) -> int:
+    """Parse arguments, run every level and print the report."""
+    args = build_parser().parse_args(argv)
+    levels = sorted({int(level) for level in args.levels})
+
+    print(f"Load testing {args.url} ({args.cores} server cores, {args.duration:.0f}s per level)")
+    print(
+        f"{'sessions':>8} {'turns':>7} {'turns/s':>9} {'p50':>8} {'p95':>8} "
+        f"{'1st p95':>10} {'errors':>8} {'sustained':>9}"
+    )
+
+    summaries = []
+    for sessions in levels:
+        summary = summarize_level(
+            await run_level(args, sessions), args.max_p95, args.max_error_rate
+        )
+        summaries.append(summary)
+        _print_summary(summary)
+        if not summary["sustained"]:
+            break
+
+    best = sustained_sessions(summaries)
+    print(
+        f"\nSustained {best} concurrent chat sessions "
+        f"({best / args.cores:.2f} per core, p95 <= {args.max_p95:.0f}s, "
+        f"errors <= {args.max_error_rate:.0%})"
+    )
+    return 0 if best else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point that runs the async main function."""
+    return asyncio.run(async_main(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Rebuild the monitoring dashboard rollups from process_monitor_logs.
+
+The server refreshes the most recent hours on its own (see
+MONITOR_ROLLUP_REFRESH_SECONDS); run this after creating the rollup tables
+to backfill history, or to repair a longer window.
+
+Usage:
+    # Backfill the last 30 days
+    python scripts/refresh_monitor_rollups.py --hours 720
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+# Add parent directory to path to import aegis modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.aegis.connections.postgres_connector import close_all_connections
+from src.aegis.utils.logging import setup_logging, get_logger
+from src.aegis.utils.monitor_rollups import refresh_monitor_rollups
+
+setup_logging()
+logger = get_logger()
+
+
+async def async_main():
+    """Parse arguments and rebuild the requested window."""
+    parser = argparse.ArgumentParser(
+        description="Rebuild monitoring rollups from raw process monitor logs",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument(
+        "--hours", type=int, default=24, help="Hours of raw logs to rebuild (default 24)"
+    )
+    args = parser.parse_args()
+
+    try:
+        # Wait for a server worker's periodic refresh rather than skipping the backfill
+        counts = await refresh_monitor_rollups(
+            lookback_hours=args.hours, execution_id="backfill", wait=True
+        )
+        print(f"Rebuilt {counts['runs']} run rollups and {counts['stage_hours']} stage-hours")
+    except Exception as e:
+        logger.error(f"Rollup refresh failed: {e}")
+        sys.exit(1)
+    finally:
+        await close_all_connections()
+
+
+def main():
+    """Main entry point that runs the async main function."""
+    asyncio.run(async_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -35,7 +35,7 @@ from pathlib import Path
 # Add parent directory to path to import aegis modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from aegis.connections.postgres_connector import get_connection
+from aegis.connections.postgres_connector import get_connection, stage_records
 from aegis.utils.logging import setup_logging, get_logger
 
 # Initialize logging
@@ -141,6 +141,9 @@ TABLE_CONFIGS = [
 # END CONFIGURATION
 # ============================================================================
 
+# Columns copied into the staging table for each tag sync
+STAGED_COLUMNS = ['bank_id', 'bank_name', 'bank_symbol', 'fiscal_year', 'quarter']
+
 
 def load_bank_mappings():
     """
@@ -437,53 +440,43 @@ async def update_database_tag(
     if dry_run:
         return {'added': add_count, 'removed': remove_count, 'inserted': insert_count}
 
-    # Execute the changes
+    # Execute the changes set-wise: COPY the source keys into a staging table,
+    # then remove and add the tag with one statement each
+    staged_rows = [
+        {column: data[column] for column in STAGED_COLUMNS}
+        for data in table_data.values()
+    ]
+    key_match = (
+        "t.bank_id = s.bank_id AND t.fiscal_year = s.fiscal_year AND t.quarter = s.quarter"
+    )
+
     async with get_connection() as conn:
         try:
-            # Process updates
-            for action, key in records_to_update:
-                if action == 'add':
-                    await conn.execute(text(f"""
-                        UPDATE aegis_data_availability
-                        SET database_names = array_append(database_names, :tag)
-                        WHERE bank_id = :bank_id
-                        AND fiscal_year = :fiscal_year
-                        AND quarter = :quarter
-                        AND NOT (:tag = ANY(database_names))
-                    """), {
-                        'bank_id': key[0],
-                        'fiscal_year': key[1],
-                        'quarter': key[2],
-                        'tag': tag
-                    })
-                else:  # remove
-                    await conn.execute(text(f"""
-                        UPDATE aegis_data_availability
-                        SET database_names = array_remove(database_names, :tag)
-                        WHERE bank_id = :bank_id
-                        AND fiscal_year = :fiscal_year
-                        AND quarter = :quarter
-                    """), {
-                        'bank_id': key[0],
-                        'fiscal_year': key[1],
-                        'quarter': key[2],
-                        'tag': tag
-                    })
-
-            # Process inserts
-            for key, data in records_to_insert:
-                await conn.execute(text("""
-                    INSERT INTO aegis_data_availability
+            staging = await stage_records(
+                conn, 'aegis_data_availability', staged_rows, STAGED_COLUMNS
+            )
+
+            # Rebuild strips the tag everywhere; update only where the source has no data
+            remove_filter = '' if mode == 'rebuild' else (
+                f"AND NOT EXISTS (SELECT 1 FROM {staging} s WHERE {key_match})"
+            )
+            await conn.execute(text(f"""
+                UPDATE aegis_data_availability t
+                SET database_names = array_remove(t.database_names, :tag)
+                WHERE :tag = ANY(t.database_names)
+                {remove_filter}
+            """), {'tag': tag})
+
+            # Add the tag to existing records and insert new bank/periods
+            await conn.execute(text(f"""
+                INSERT INTO aegis_data_availability AS t
                     (bank_id, bank_name, bank_symbol, fiscal_year, quarter, database_names)
-                    VALUES (:bank_id, :bank_name, :bank_symbol, :fiscal_year, :quarter, :database_names)
-                """), {
-                    'bank_id': data['bank_id'],
-                    'bank_name': data['bank_name'],
-                    'bank_symbol': data['bank_symbol'],
-                    'fiscal_year': data['fiscal_year'],
-                    'quarter': data['quarter'],
-                    'database_names': [tag]
-                })
+                SELECT bank_id, bank_name, bank_symbol, fiscal_year, quarter, ARRAY[:tag]::text[]
+                FROM {staging}
+                ON CONFLICT (bank_id, fiscal_year, quarter) DO UPDATE
+                SET database_names = array_append(COALESCE(t.database_names, '{{}}'), :tag)
+                WHERE NOT (:tag = ANY(COALESCE(t.database_names, '{{}}')))
+            """), {'tag': tag})
 
             logger.info(f"  ✅ Successfully updated '{tag}'")
 
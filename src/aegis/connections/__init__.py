@@ -8,6 +8,7 @@ from .oauth_connector import setup_authentication, get_oauth_token
 # Postgres exports
 from .postgres_connector import (
     get_connection,
+    get_read_connection,
     close_all_connections,
     insert_record,
     insert_many,
@@ -36,6 +37,7 @@ __all__ = [
     "get_oauth_token",
     # Postgres
     "get_connection",
+    "get_read_connection",
     "close_all_connections",
     "insert_record",
     "insert_many",
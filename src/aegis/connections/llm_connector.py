@@ -6,7 +6,8 @@ OAuth and API key authentication, with configurable model tiers.
 Fully async implementation with proper timeouts and error handling.
 """
 
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+import json
 import time
 import httpx
 from openai import AsyncOpenAI
@@ -683,6 +684,320 @@ async def complete_with_tools(
         raise
 
 
+class ToolArgumentParser:
+    """
+    Incremental parser for streamed tool-call JSON arguments.
+
+    Tool arguments arrive as string fragments. The parser tracks JSON structure
+    as fragments are fed in and returns each element of a top-level array
+    property (e.g. every entry of {"findings": [...]}) as soon as that element's
+    closing character has arrived, so callers can validate long structured
+    outputs before the model has finished writing them.
+    """
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        self.buffer = ""
+        self._position = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_key_literal = ""
+        self._current_key = ""
+        self._array_key = ""
+        self._item_start: Optional[int] = None
+
+    def feed(self, fragment: str) -> List[Tuple[str, Any]]:
+        """
+        Consume an arguments fragment.
+
+        Args:
+            fragment: Next piece of the tool-call arguments string.
+
+        Returns:
+            (property name, element) pairs for array elements completed by this fragment.
+        """
+        self.buffer += fragment
+        completed: List[Tuple[str, Any]] = []
+        while self._position < len(self.buffer):
+            index = self._position
+            char = self.buffer[index]
+            self._position += 1
+            depth = len(self._stack)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if depth == 1:
+                        self._last_key_literal = self.buffer[self._string_start : index + 1]
+                continue
+
+            in_top_array = depth == 2 and self._stack == ["{", "["]
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+                if in_top_array and self._item_start is None:
+                    self._item_start = index
+            elif char in "{[":
+                if in_top_array and self._item_start is None:
+                    self._item_start = index
+                self._stack.append(char)
+                if self._stack == ["{", "["]:
+                    self._array_key = self._current_key
+                    self._item_start = None
+            elif char in "}]":
+                if in_top_array:
+                    # Closing the top-level array ends any pending scalar element
+                    self._emit(index, completed)
+                if self._stack:
+                    self._stack.pop()
+                if len(self._stack) == 2 and self._stack == ["{", "["]:
+                    self._emit(index + 1, completed)
+            elif char == ":" and depth == 1:
+                try:
+                    self._current_key = json.loads(self._last_key_literal)
+                except ValueError:
+                    self._current_key = ""
+            elif char == "," and in_top_array:
+                self._emit(index, completed)
+            elif in_top_array and self._item_start is None and not char.isspace():
+                self._item_start = index
+        return completed
+
+    def _emit(self, end: int, completed: List[Tuple[str, Any]]) -> None:
+        """Decode the element that started at _item_start and ends before end.
+
+        A malformed element is skipped rather than raised; the complete
+        arguments then fail to decode in result() and callers handle that.
+        """
+        if self._item_start is None:
+            return
+        literal = self.buffer[self._item_start : end].strip()
+        self._item_start = None
+        if not literal:
+            return
+        try:
+            completed.append((self._array_key, json.loads(literal)))
+        except ValueError:
+            return
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Decode the complete arguments.
+
+        Returns:
+            Parsed arguments object.
+
+        Raises:
+            json.JSONDecodeError: If the accumulated arguments are not valid JSON.
+        """
+        return json.loads(self.buffer or "{}")
+
+
+async def stream_with_tools(
+    messages: List[Dict[str, str]],
+    tools: List[Dict[str, Any]],
+    context: Dict[str, Any],
+    llm_params: Optional[Dict[str, Any]] = None,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Generate a streaming completion with tool/function calling capabilities.
+
+    Streams tool-call argument deltas so long structured outputs keep the
+    connection active instead of waiting silently past the client read
+    timeout. Arguments are parsed incrementally: every completed element of a
+    top-level array argument is yielded as soon as it arrives. Closing the
+    generator early (e.g. after a caller rejects an element) closes the
+    underlying HTTP stream.
+
+    Args:
+        messages: List of message dictionaries with 'role' and 'content'.
+        tools: List of tool definitions for function calling.
+        context: Runtime context containing:
+                 - execution_id: Unique identifier for this execution
+                 - auth_config: Authentication configuration
+                 - ssl_config: SSL configuration
+        llm_params: Optional LLM parameters:
+                    - model: Model to use (defaults to large tier for tools)
+                    - temperature: Temperature setting
+                    - max_tokens: Maximum tokens
+                    - Additional OpenAI API parameters
+
+    Yields:
+        {"type": "item", "tool_index", "name", "key", "item"} for each completed
+        array element, then one {"type": "response", "response": ...} whose
+        response has the same shape as complete_with_tools (choices, usage, metrics).
+
+    Raises:
+        Exception: If the API call fails.
+    """
+    logger = get_logger()
+    llm_params = llm_params or {}
+
+    # Get model configuration using helper (default to large for tools)
+    model, temperature, max_tokens, model_tier = _get_model_config(
+        llm_params.get("model"),
+        llm_params.get("temperature"),
+        llm_params.get("max_tokens"),
+        default_tier="large",  # Tools need better reasoning
+    )
+
+    logger.info(
+        "Starting async LLM tool streaming",
+        execution_id=context["execution_id"],
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        message_count=len(messages),
+        tool_count=len(tools),
+    )
+
+    stream_response = None
+    completed = False
+    chunk_count = 0
+    start_time = time.time()
+    try:
+        client = await _get_or_create_async_client(
+            context["auth_config"].get("token", "no-token"),
+            context.get("ssl_config")
+        )
+
+        # Check if it's an o-series model (reasoning models)
+        # These models don't support temperature parameter
+        is_o_series = (
+            model in ['o1', 'o3', 'o4'] or
+            model.startswith('o1-') or
+            model.startswith('o3-') or
+            model.startswith('o4-')
+        )
+
+        # Build API parameters based on model type
+        api_params = {
+            "model": model,
+            "messages": messages,
+            "tools": tools,
+            "stream": True,
+            # Usage arrives in a final chunk with no choices
+            "stream_options": {"include_usage": True},
+        }
+
+        if is_o_series:
+            # O-series models: no temperature, use max_completion_tokens
+            if max_tokens:
+                api_params["max_completion_tokens"] = max_tokens
+        else:
+            # Regular models: standard parameters
+            api_params["temperature"] = temperature
+            api_params["max_tokens"] = max_tokens
+
+        # Add any extra parameters
+        api_params.update({
+            k: v
+            for k, v in llm_params.items()
+            if k not in ["model", "temperature", "max_tokens"]
+        })
+
+        stream_response = await client.chat.completions.create(**api_params)
+
+        content_parts: List[str] = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        parsers: Dict[int, ToolArgumentParser] = {}
+        finish_reason = None
+        usage = None
+
+        async for chunk in stream_response:
+            chunk_count += 1
+            chunk_dict = chunk.model_dump()
+            if chunk_dict.get("usage"):
+                usage = chunk_dict["usage"]
+
+            for choice in chunk_dict.get("choices") or []:
+                finish_reason = choice.get("finish_reason") or finish_reason
+                delta = choice.get("delta") or {}
+                if delta.get("content"):
+                    content_parts.append(delta["content"])
+
+                for tool_delta in delta.get("tool_calls") or []:
+                    tool_index = tool_delta.get("index", 0)
+                    tool_call = tool_calls.setdefault(
+                        tool_index,
+                        {"id": None, "type": "function", "function": {"name": "", "arguments": ""}},
+                    )
+                    parser = parsers.setdefault(tool_index, ToolArgumentParser())
+                    if tool_delta.get("id"):
+                        tool_call["id"] = tool_delta["id"]
+                    function_delta = tool_delta.get("function") or {}
+                    if function_delta.get("name"):
+                        tool_call["function"]["name"] += function_delta["name"]
+                    arguments_delta = function_delta.get("arguments") or ""
+                    if not arguments_delta:
+                        continue
+                    tool_call["function"]["arguments"] += arguments_delta
+                    for key, item in parser.feed(arguments_delta):
+                        yield {
+                            "type": "item",
+                            "tool_index": tool_index,
+                            "name": tool_call["function"]["name"],
+                            "key": key,
+                            "item": item,
+                        }
+
+        elapsed = time.time() - start_time
+        message = {
+            "role": "assistant",
+            "content": "".join(content_parts) or None,
+            "tool_calls": [tool_calls[index] for index in sorted(tool_calls)] or None,
+        }
+        response_dict = {
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": usage or {},
+        }
+        response_dict["metrics"] = _calculate_and_log_metrics(
+            usage=usage or {},
+            model_tier=model_tier,
+            context={
+                "model": model,
+                "response_time": elapsed,
+                "execution_id": context["execution_id"],
+                "logger": logger,
+            },
+            operation_type=(
+                f"async tool streaming completed (chunks={chunk_count}, "
+                f"has_tool_calls={bool(tool_calls)})"
+            ),
+        )
+        completed = True
+
+        yield {"type": "response", "response": response_dict}
+
+    except Exception as e:
+        logger.error(
+            "Async LLM tool streaming failed",
+            execution_id=context["execution_id"],
+            model=model,
+            error=str(e),
+        )
+        raise
+
+    finally:
+        if not completed and stream_response is not None:
+            logger.info(
+                "Async LLM tool streaming stopped early",
+                execution_id=context["execution_id"],
+                model=model,
+                chunks=chunk_count,
+                response_time=time.time() - start_time,
+            )
+        if stream_response is not None:
+            await stream_response.close()
+
+
 async def embed(
     input_text: str,
     context: Dict[str, Any],
@@ -3,10 +3,43 @@ PostgreSQL database connector using SQLAlchemy async.
 
 This module provides an async functional interface for PostgreSQL operations
 using SQLAlchemy's async support for connection management and query execution.
+
+Writes run inside a transaction (get_connection). Reads use get_read_connection,
+which runs in autocommit so no BEGIN/COMMIT round trips are issued, and rely on
+the asyncpg prepared-statement cache (POSTGRES_STATEMENT_CACHE_SIZE) so repeated
+queries skip the parse/describe step. Writes are never retried, so primary
+connections are always pinged on checkout. Replica connections are not pinged
+unless POSTGRES_POOL_PRE_PING is set: a dropped connection is detected when a
+statement fails, the pool is invalidated, and idempotent reads are retried
+once on a fresh connection.
+
+Engines are named ("primary", and "replica" when POSTGRES_REPLICA_HOST is set),
+each with its own pool. Writes always use the primary. Reads prefer a healthy
+replica and fall back to the primary when the replica cannot hand out a
+connection; a failed replica is skipped for POSTGRES_REPLICA_COOLDOWN seconds.
+
+Bulk writes (copy_records, stage_records, bulk_upsert) use asyncpg's binary
+COPY, merging through a temporary staging table when rows may already exist.
+
+Large reads can be streamed with stream_rows, which fetches from a server-side
+cursor in fixed-size batches inside a read-only transaction, so memory stays
+bounded by the batch size rather than the result size.
+
+Every engine is instrumented by query_stats (QUERY_STATS_ENABLED): statements
+are timed per fingerprint and attributed to the stage passed to get_connection
+or get_read_connection.
 """
 
-from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Dict, List, Optional
+import asyncio
+import json
+import re
+import time
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 from sqlalchemy import MetaData, Table, delete, insert, text, update
 from sqlalchemy.ext.asyncio import (
@@ -16,104 +49,483 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from sqlalchemy.pool import NullPool, QueuePool
 
 from ..utils.logging import get_logger
 from ..utils.settings import config
+from .query_stats import WRITE_KEYWORD_PATTERN, install_query_instrumentation, query_stage
 
 logger = get_logger()
 
-_async_engine: Optional[AsyncEngine] = None
+PRIMARY_ENGINE = "primary"
+REPLICA_ENGINE = "replica"
+
+_engines: Dict[str, AsyncEngine] = {}
 _async_session_factory: Optional[async_sessionmaker] = None
 
 
-async def _get_async_engine() -> AsyncEngine:
+@dataclass
+class _EngineState:
+    """Health and pool checkout statistics for one named engine."""
+
+    unhealthy_until: float = 0.0
+    consecutive_failures: int = 0
+    last_error: Optional[str] = None
+    checkouts: int = 0
+    checkout_failures: int = 0
+    fallbacks: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    def is_healthy(self) -> bool:
+        """Whether the engine is outside its failure cooldown."""
+        return time.monotonic() >= self.unhealthy_until
+
+    def record_wait(self, wait_ms: float) -> None:
+        """Record a successful pool checkout and how long it waited."""
+        self.checkouts += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.consecutive_failures = 0
+
+    def mark_unhealthy(self, error: Exception) -> None:
+        """Start a cooldown after a connection-level failure."""
+        self.consecutive_failures += 1
+        self.last_error = str(error)[:500]
+        self.unhealthy_until = time.monotonic() + config.postgres_replica_cooldown
+
+
+_engine_states: Dict[str, _EngineState] = {}
+
+
+def _engine_state(name: str) -> _EngineState:
+    """Get (or create) the health/metrics record for an engine."""
+    return _engine_states.setdefault(name, _EngineState())
+
+
+async def _get_async_engine(name: str = PRIMARY_ENGINE) -> AsyncEngine:
     """
-    Get or create the async SQLAlchemy engine with connection pooling.
+    Get or create a named async SQLAlchemy engine with connection pooling.
+
+    Args:
+        name: Engine name from config.postgres_engines ("primary" or "replica")
 
     Returns:
         Async SQLAlchemy Engine instance
 
     Raises:
+        KeyError: If no engine with that name is configured
         SQLAlchemyError: If unable to create engine
     """
-    global _async_engine, _async_session_factory  # pylint: disable=global-statement
-    # Engine must be global singleton for connection pooling across the application.
+    global _async_session_factory  # pylint: disable=global-statement
+    # Engines are module-level singletons so each pool is shared across the application.
 
-    if _async_engine is None:
-        try:
-            # Use postgresql+asyncpg:// for async connections
-            database_url = (
-                f"postgresql+asyncpg://{config.postgres_user}:{config.postgres_password}"
-                f"@{config.postgres_host}:{config.postgres_port}/{config.postgres_database}"
-            )
+    engine = _engines.get(name)
+    if engine is not None:
+        return engine
 
-            _async_engine = create_async_engine(
-                database_url,
-                pool_size=20,  # Increased for async concurrency
-                max_overflow=40,  # Increased for async concurrency
-                pool_timeout=30,
-                pool_recycle=3600,
-                pool_pre_ping=True,
-                echo=False,
-            )
+    settings = config.postgres_engines[name]
+    # The primary takes writes, which have no invalidate-and-retry path
+    pre_ping = name == PRIMARY_ENGINE or config.postgres_pool_pre_ping
+    try:
+        # Use postgresql+asyncpg:// for async connections
+        database_url = (
+            f"postgresql+asyncpg://{settings.user}:{settings.password}"
+            f"@{settings.host}:{settings.port}/{settings.database}"
+        )
 
+        engine = create_async_engine(
+            database_url,
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=3600,
+            pool_pre_ping=pre_ping,
+            echo=False,
+            connect_args={
+                "prepared_statement_cache_size": config.postgres_statement_cache_size,
+            },
+        )
+        _engines[name] = engine
+        if config.query_stats.enabled:
+            install_query_instrumentation(engine, name, explain_runner=_explain_statement)
+
+        if name == PRIMARY_ENGINE:
             _async_session_factory = async_sessionmaker(
-                _async_engine,
+                engine,
                 class_=AsyncSession,
                 expire_on_commit=False,
             )
 
-            logger.info(
-                "Async PostgreSQL engine created",
-                host=config.postgres_host,
-                port=config.postgres_port,
-                database=config.postgres_database,
-                pool_size=20,
-            )
+        logger.info(
+            "Async PostgreSQL engine created",
+            engine=name,
+            host=settings.host,
+            port=settings.port,
+            database=settings.database,
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            statement_cache_size=config.postgres_statement_cache_size,
+            pool_pre_ping=pre_ping,
+        )
+    except SQLAlchemyError as e:
+        logger.error(
+            "Failed to create async PostgreSQL engine",
+            engine=name,
+            error=str(e),
+            host=settings.host,
+            port=settings.port,
+            database=settings.database,
+        )
+        raise
+
+    return engine
+
+
+def _read_engine_candidates(engine: Optional[str] = None) -> List[str]:
+    """
+    Order the engines a read should try.
+
+    Args:
+        engine: Explicit engine name to pin the read to, if any
+
+    Returns:
+        Engine names in preference order (healthy replica first, then primary)
+    """
+    if engine is not None:
+        return [engine]
+    if REPLICA_ENGINE in config.postgres_engines and _engine_state(REPLICA_ENGINE).is_healthy():
+        return [REPLICA_ENGINE, PRIMARY_ENGINE]
+    return [PRIMARY_ENGINE]
+
+
+async def _checkout(stack: AsyncExitStack, name: str) -> AsyncConnection:
+    """Check out a pooled connection from a named engine, recording the pool wait."""
+    engine = await _get_async_engine(name)
+    state = _engine_state(name)
+    started = time.perf_counter()
+    try:
+        conn = await stack.enter_async_context(engine.connect())
+    except (SQLAlchemyError, OSError, asyncio.TimeoutError):
+        state.checkout_failures += 1
+        raise
+    wait_ms = (time.perf_counter() - started) * 1000
+    state.record_wait(wait_ms)
+    # Picked up by query_stats and charged to the first statement on this checkout
+    conn.info["aegis_pool_wait_ms"] = wait_ms
+    return conn
+
+
+@asynccontextmanager
+async def get_connection(
+    execution_id: Optional[str] = None,
+    stage: Optional[str] = None,
+) -> AsyncGenerator[AsyncConnection, None]:
+    """
+    Get an async database connection from the primary pool.
+
+    Args:
+        execution_id: Optional execution ID for logging
+        stage: Stage that statements on this connection are attributed to in query stats
+
+    Yields:
+        Async SQLAlchemy connection object inside a transaction
+
+    Raises:
+        SQLAlchemyError: If unable to get connection
+    """
+    async with AsyncExitStack() as stack:
+        stack.enter_context(query_stage(stage))
+        conn = await _checkout(stack, PRIMARY_ENGINE)
+        await stack.enter_async_context(conn.begin())
+        try:
+            logger.debug("Got async connection from pool", execution_id=execution_id)
+            yield conn
         except SQLAlchemyError as e:
             logger.error(
-                "Failed to create async PostgreSQL engine",
+                "Error with async database connection",
+                execution_id=execution_id,
                 error=str(e),
-                host=config.postgres_host,
-                port=config.postgres_port,
-                database=config.postgres_database,
             )
             raise
+        finally:
+            logger.debug("Returned async connection to pool", execution_id=execution_id)
 
-    return _async_engine
+
+async def _checkout_for_read(
+    stack: AsyncExitStack, engine: Optional[str], execution_id: Optional[str]
+) -> Tuple[AsyncConnection, str]:
+    """Check out a read connection, falling back from the replica to the primary."""
+    candidates = _read_engine_candidates(engine)
+    for index, name in enumerate(candidates):
+        try:
+            return await _checkout(stack, name), name
+        except (SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+            if index == len(candidates) - 1:
+                raise
+            _engine_state(name).mark_unhealthy(e)
+            _engine_state(name).fallbacks += 1
+            logger.warning(
+                "postgres.read_engine_fallback",
+                execution_id=execution_id,
+                engine=name,
+                fallback=candidates[index + 1],
+                error=str(e),
+            )
+    raise RuntimeError("No database engine available for read")
 
 
 @asynccontextmanager
-async def get_connection(execution_id: Optional[str] = None) -> AsyncGenerator[AsyncConnection, None]:
+async def get_read_connection(
+    execution_id: Optional[str] = None,
+    engine: Optional[str] = None,
+    stage: Optional[str] = None,
+) -> AsyncGenerator[AsyncConnection, None]:
     """
-    Get an async database connection from the pool.
+    Get an autocommit connection for read-only queries.
+
+    Statements run without an explicit transaction, saving the BEGIN and
+    COMMIT round trips that get_connection pays on every checkout. Reads go
+    to the replica when one is configured and healthy, otherwise the primary.
 
     Args:
         execution_id: Optional execution ID for logging
+        engine: Pin the read to a named engine (e.g. "primary" for read-after-write)
+        stage: Stage that statements on this connection are attributed to in query stats
 
     Yields:
-        Async SQLAlchemy connection object
+        Async SQLAlchemy connection object in AUTOCOMMIT mode
 
     Raises:
         SQLAlchemyError: If unable to get connection
     """
-    engine = await _get_async_engine()
-
-    async with engine.begin() as conn:
+    async with AsyncExitStack() as stack:
+        stack.enter_context(query_stage(stage))
+        conn, engine_name = await _checkout_for_read(stack, engine, execution_id)
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
         try:
-            logger.debug("Got async connection from pool", execution_id=execution_id)
+            logger.debug(
+                "Got async read connection from pool",
+                execution_id=execution_id,
+                engine=engine_name,
+            )
             yield conn
         except SQLAlchemyError as e:
+            if engine_name != PRIMARY_ENGINE and getattr(e, "connection_invalidated", False):
+                # Replica dropped mid-query; skip it until the cooldown expires.
+                _engine_state(engine_name).mark_unhealthy(e)
             logger.error(
-                "Error with async database connection",
+                "Error with async read connection",
                 execution_id=execution_id,
+                engine=engine_name,
                 error=str(e),
             )
             raise
         finally:
-            logger.debug("Returned async connection to pool", execution_id=execution_id)
+            logger.debug("Returned async read connection to pool", execution_id=execution_id)
+
+
+async def _explain_statement(engine_name: str, statement: str, parameters: Any) -> Any:
+    """
+    Re-run a slow read under EXPLAIN (ANALYZE, BUFFERS) on the engine that served it.
+
+    Args:
+        engine_name: Engine the original statement ran on
+        statement: SQL as sent to the driver
+        parameters: Driver-level parameters of the original execution
+
+    Returns:
+        JSON query plan
+    """
+    # ANALYZE executes the statement: run it in a READ ONLY transaction that is
+    # always rolled back, so a statement that writes fails instead of writing twice.
+    async with AsyncExitStack() as stack:
+        conn = await _checkout(stack, engine_name)
+        transaction = await conn.begin()
+        try:
+            await conn.execute(text("SET TRANSACTION READ ONLY"))
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+            )
+            return result.scalar()
+        finally:
+            await transaction.rollback()
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Report pool usage, checkout waits and health per named engine.
+
+    Returns:
+        Mapping of engine name to pool and health metrics
+    """
+    stats = {}
+    for name in config.postgres_engines:
+        state = _engine_state(name)
+        engine_stats: Dict[str, Any] = {
+            "created": name in _engines,
+            "healthy": state.is_healthy(),
+            "consecutive_failures": state.consecutive_failures,
+            "last_error": state.last_error,
+            "checkouts": state.checkouts,
+            "checkout_failures": state.checkout_failures,
+            "fallbacks": state.fallbacks,
+            "avg_wait_ms": (
+                round(state.total_wait_ms / state.checkouts, 2) if state.checkouts else 0.0
+            ),
+            "max_wait_ms": round(state.max_wait_ms, 2),
+        }
+        pool = _engines[name].pool if name in _engines else None
+        if pool is not None and hasattr(pool, "checkedout"):
+            engine_stats.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        stats[name] = engine_stats
+    return stats
+
+
+def is_read_statement(query: str) -> bool:
+    """
+    Check whether a statement is a plain read that is safe to retry.
+
+    The statement must start with a read keyword and contain no INSERT,
+    UPDATE, DELETE or MERGE anywhere, which rules out data-modifying CTEs and
+    SELECT ... FOR UPDATE. A read that merely mentions one of those words
+    (for example in a string literal) is treated as a write and runs once on
+    the primary, which is the safe direction.
+    """
+    first_word = query.lstrip().split(None, 1)[0].lower() if query.strip() else ""
+    if first_word not in ("select", "with", "show", "explain"):
+        return False
+    return not WRITE_KEYWORD_PATTERN.search(query)
+
+
+async def _fetch(
+    query: str,
+    params: Optional[Dict[str, Any]],
+    execution_id: Optional[str],
+    first_only: bool,
+    engine: Optional[str] = None,
+) -> Any:
+    """
+    Run a read query on an autocommit connection, retrying once if the connection was dead.
+
+    Statements that are not plain reads (e.g. INSERT ... RETURNING) always run
+    on the primary and are never retried.
+
+    Args:
+        query: SQL query
+        params: Query parameters as dictionary
+        execution_id: Optional execution ID for logging
+        first_only: Return only the first row (or None) instead of all rows
+        engine: Optional engine name to pin the query to
+
+    Returns:
+        Row mapping(s) as dictionaries
+
+    Raises:
+        SQLAlchemyError: If query execution fails
+    """
+    is_read = is_read_statement(query)
+    if not is_read:
+        engine = PRIMARY_ENGINE
+    attempts = 2 if is_read else 1
+    for attempt in range(1, attempts + 1):
+        try:
+            async with get_read_connection(execution_id, engine=engine) as conn:
+                result = await conn.execute(text(query), params or {})
+                # SQLAlchemy's Row._mapping is the official way to convert to dict
+                # It's a public API despite the underscore prefix
+                # pylint: disable=protected-access
+                if first_only:
+                    row = result.fetchone()
+                    return dict(row._mapping) if row else None
+                return [dict(row._mapping) for row in result.fetchall()]
+        except DBAPIError as e:
+            # SQLAlchemy marks the connection invalidated when the server went away;
+            # the pool is reset, so a second attempt gets a live connection.
+            if e.connection_invalidated and attempt < attempts:
+                logger.warning(
+                    "postgres.read_connection_invalidated",
+                    execution_id=execution_id,
+                    attempt=attempt,
+                    error=str(e),
+                )
+                continue
+            raise
+    return None
+
+
+async def stream_rows(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    execution_id: Optional[str] = None,
+    batch_size: int = 1000,
+    engine: Optional[str] = None,
+    statement_timeout_ms: int = 0,
+    stage: Optional[str] = None,
+) -> AsyncGenerator[List[Dict[str, Any]], None]:
+    """
+    Stream the rows of a read query in batches from a server-side cursor.
+
+    The cursor lives in a READ ONLY transaction on a read connection (replica
+    when healthy), so only one batch is held in memory at a time. Closing the
+    generator early closes the cursor and ends the transaction.
+
+    Args:
+        query: SQL SELECT query
+        params: Query parameters as dictionary
+        execution_id: Optional execution ID for logging
+        batch_size: Rows fetched from the server per round trip
+        engine: Optional engine name to pin the query to
+        statement_timeout_ms: Cancel the query after this long (0 leaves the server default)
+        stage: Stage that the statement is attributed to in query stats
+
+    Yields:
+        Lists of up to batch_size row dictionaries
+
+    Raises:
+        ValueError: If the statement is not a plain read
+        SQLAlchemyError: If query execution fails
+    """
+    if not is_read_statement(query):
+        raise ValueError("Only SELECT/WITH/SHOW/EXPLAIN statements can be streamed")
+    async with AsyncExitStack() as stack:
+        stack.enter_context(query_stage(stage))
+        conn, engine_name = await _checkout_for_read(stack, engine, execution_id)
+        # Server-side cursors need a transaction; READ ONLY must be its first statement
+        await stack.enter_async_context(conn.begin())
+        await conn.execute(text("SET TRANSACTION READ ONLY"))
+        if statement_timeout_ms > 0:
+            await conn.execute(text(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}"))
+        try:
+            result = await conn.stream(
+                text(query).execution_options(yield_per=batch_size), params or {}
+            )
+            rows_streamed = 0
+            # pylint: disable=protected-access
+            async for partition in result.partitions(batch_size):
+                rows_streamed += len(partition)
+                yield [dict(row._mapping) for row in partition]
+            logger.debug(
+                "postgres.stream_rows.completed",
+                execution_id=execution_id,
+                engine=engine_name,
+                row_count=rows_streamed,
+            )
+        except SQLAlchemyError as e:
+            logger.error(
+                "postgres.stream_rows.failed",
+                execution_id=execution_id,
+                engine=engine_name,
+                error=str(e),
+                query=query[:500],
+            )
+            raise
 
 
 async def execute_query(
@@ -161,14 +573,18 @@ async def fetch_all(
     query: str,
     params: Optional[Dict[str, Any]] = None,
     execution_id: Optional[str] = None,
+    engine: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     Execute a SELECT query and return all results.
 
+    Runs on an autocommit read connection (see get_read_connection).
+
     Args:
         query: SQL SELECT query
         params: Query parameters as dictionary
         execution_id: Optional execution ID for logging
+        engine: Optional engine name to pin the query to (default: replica if healthy)
 
     Returns:
         List of dictionaries representing rows
@@ -176,44 +592,42 @@ async def fetch_all(
     Raises:
         SQLAlchemyError: If query execution fails
     """
-    async with get_connection(execution_id) as conn:
-        try:
-            result = await conn.execute(text(query), params or {})
-            rows = result.fetchall()
-
-            # SQLAlchemy's Row._mapping is the official way to convert to dict
-            # It's a public API despite the underscore prefix
-            results = [dict(row._mapping) for row in rows]  # pylint: disable=protected-access
+    try:
+        results = await _fetch(query, params, execution_id, first_only=False, engine=engine)
 
-            logger.debug(
-                "Async fetched all results",
-                execution_id=execution_id,
-                row_count=len(results),
-            )
+        logger.debug(
+            "Async fetched all results",
+            execution_id=execution_id,
+            row_count=len(results),
+        )
 
-            return results
-        except SQLAlchemyError as e:
-            logger.error(
-                "Failed to async fetch results",
-                execution_id=execution_id,
-                error=str(e),
-                query=query[:500],
-            )
-            raise
+        return results
+    except SQLAlchemyError as e:
+        logger.error(
+            "Failed to async fetch results",
+            execution_id=execution_id,
+            error=str(e),
+            query=query[:500],
+        )
+        raise
 
 
 async def fetch_one(
     query: str,
     params: Optional[Dict[str, Any]] = None,
     execution_id: Optional[str] = None,
+    engine: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Execute a SELECT query and return the first result.
 
+    Runs on an autocommit read connection (see get_read_connection).
+
     Args:
         query: SQL SELECT query
         params: Query parameters as dictionary
         execution_id: Optional execution ID for logging
+        engine: Optional engine name to pin the query to (default: replica if healthy)
 
     Returns:
         Dictionary representing the first row, or None if no results
@@ -221,27 +635,23 @@ async def fetch_one(
     Raises:
         SQLAlchemyError: If query execution fails
     """
-    async with get_connection(execution_id) as conn:
-        try:
-            result = await conn.execute(text(query), params or {})
-            row = result.fetchone()
+    try:
+        row = await _fetch(query, params, execution_id, first_only=True, engine=engine)
 
-            if row:
-                logger.debug("Async fetched one result", execution_id=execution_id)
-                # SQLAlchemy's Row._mapping is the official way to convert to dict
-                # It's a public API despite the underscore prefix
-                return dict(row._mapping)  # pylint: disable=protected-access
+        if row:
+            logger.debug("Async fetched one result", execution_id=execution_id)
+            return row
 
-            logger.debug("No results found", execution_id=execution_id)
-            return None
-        except SQLAlchemyError as e:
-            logger.error(
-                "Failed to async fetch result",
-                execution_id=execution_id,
-                error=str(e),
-                query=query[:500],
-            )
-            raise
+        logger.debug("No results found", execution_id=execution_id)
+        return None
+    except SQLAlchemyError as e:
+        logger.error(
+            "Failed to async fetch result",
+            execution_id=execution_id,
+            error=str(e),
+            query=query[:500],
+        )
+        raise
 
 
 async def insert_record(
@@ -534,16 +944,19 @@ async def get_table_schema(table: str, execution_id: Optional[str] = None) -> Li
 
 async def close_all_connections():
     """
-    Dispose of the async connection pool and close all connections.
+    Dispose of every named engine's pool and close all connections.
 
     This should be called when shutting down the application.
     """
-    global _async_engine  # pylint: disable=global-statement
-    # Need to modify global engine instance to properly dispose of connection pool.
-
-    if _async_engine:
-        await _async_engine.dispose()
-        _async_engine = None
+    global _async_session_factory  # pylint: disable=global-statement
+    # Need to reset the module-level session factory along with the engines it wraps.
+
+    if _engines:
+        for name, engine in list(_engines.items()):
+            await engine.dispose()
+            del _engines[name]
+        _engine_states.clear()
+        _async_session_factory = None
         logger.info("All async PostgreSQL connections closed")
 
 
@@ -555,6 +968,9 @@ async def insert_many_async(
     """
     Insert multiple records into a database table asynchronously.
 
+    Uses COPY (see copy_records), so dict/list values destined for JSON
+    columns are encoded and everything is sent in a single round trip.
+
     Args:
         table_name: Name of the table to insert into
         records: List of dictionaries representing records to insert
@@ -571,43 +987,7 @@ async def insert_many_async(
         return 0
 
     try:
-        # Get the async engine
-        engine = await _get_async_engine()
-
-        async with engine.begin() as conn:
-            # Convert dict and list fields to JSON for PostgreSQL columns
-            import json
-            processed_records = []
-            for record in records:
-                processed = record.copy()
-                for key, value in processed.items():
-                    if isinstance(value, (dict, list)):
-                        processed[key] = json.dumps(value)
-                processed_records.append(processed)
-
-            # Build insert statement using text SQL
-            columns = list(processed_records[0].keys())
-            placeholders = ", ".join([f":{col}" for col in columns])
-            column_names = ", ".join(columns)
-
-            query = text(f"""
-                INSERT INTO {table_name} ({column_names})
-                VALUES ({placeholders})
-            """)
-
-            # Execute batch insert
-            result = await conn.execute(query, processed_records)
-            rows_inserted = result.rowcount
-
-            logger.info(
-                "postgres.insert_many_success",
-                table=table_name,
-                rows_inserted=rows_inserted,
-                execution_id=execution_id,
-            )
-
-            return rows_inserted
-
+        return await copy_records(table_name, records, execution_id=execution_id)
     except Exception as e:
         logger.error(
             "postgres.insert_many_error",
@@ -617,4 +997,293 @@ async def insert_many_async(
             execution_id=execution_id,
             exc_info=True,
         )
-        raise RuntimeError(f"Failed to insert records into {table_name}: {str(e)}") from e
\ No newline at end of file
+        raise RuntimeError(f"Failed to insert records into {table_name}: {str(e)}") from e
+
+
+# Bulk writes (COPY)
+
+_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+_column_types_cache: Dict[str, Dict[str, str]] = {}
+
+
+def _check_identifier(name: str) -> str:
+    """Reject table/column names that are not plain SQL identifiers."""
+    if not _IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+
+def _to_json(value: Any) -> Any:
+    """Encode a value for a json/jsonb column."""
+    return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def _to_numeric(value: Any) -> Any:
+    """Convert floats for numeric columns, which COPY's binary format requires as Decimal."""
+    return Decimal(str(value)) if isinstance(value, float) else value
+
+
+def _to_uuid(value: Any) -> Any:
+    """Convert string UUIDs for uuid columns."""
+    return uuid.UUID(value) if isinstance(value, str) else value
+
+
+def _to_timestamp(value: Any) -> Any:
+    """Parse ISO-8601 strings for timestamp columns."""
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _to_integer(value: Any) -> Any:
+    """Coerce integral floats (e.g. 12.0 from JSON) for integer columns."""
+    return int(value) if isinstance(value, float) else value
+
+
+_COPY_CONVERTERS = {
+    "json": _to_json,
+    "jsonb": _to_json,
+    "numeric": _to_numeric,
+    "uuid": _to_uuid,
+    "timestamp with time zone": _to_timestamp,
+    "timestamp without time zone": _to_timestamp,
+    "integer": _to_integer,
+    "bigint": _to_integer,
+    "smallint": _to_integer,
+}
+
+
+def build_copy_rows(
+    records: List[Dict[str, Any]], columns: List[str], column_types: Dict[str, str]
+) -> List[Tuple[Any, ...]]:
+    """
+    Convert record dicts into COPY tuples in column order.
+
+    Values are only converted for columns whose type needs it (JSON, numeric,
+    UUID, timestamp, integer); array columns take Python lists as-is.
+
+    Args:
+        records: Records keyed by column name (missing keys become NULL)
+        columns: Column order for the COPY
+        column_types: information_schema data_type per column
+
+    Returns:
+        List of row tuples
+    """
+    converters = [_COPY_CONVERTERS.get(column_types.get(column, "")) for column in columns]
+    return [
+        tuple(
+            value if convert is None or value is None else convert(value)
+            for value, convert in zip((record.get(column) for column in columns), converters)
+        )
+        for record in records
+    ]
+
+
+def _record_columns(records: List[Dict[str, Any]]) -> List[str]:
+    """Union of record keys in first-seen order."""
+    return list(dict.fromkeys(key for record in records for key in record))
+
+
+async def _get_column_types(conn: AsyncConnection, table: str) -> Dict[str, str]:
+    """Look up (and cache) information_schema data types for a table's columns."""
+    cached = _column_types_cache.get(table)
+    if cached is not None:
+        return cached
+
+    schema, _, table_name = table.rpartition(".")
+    result = await conn.execute(
+        text(
+            """
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = :schema AND table_name = :table_name
+            """
+        ),
+        {"schema": schema or "public", "table_name": table_name},
+    )
+    column_types = {row.column_name: row.data_type for row in result}
+    if not column_types:
+        raise ValueError(f"Table {table} not found or has no columns")
+    _column_types_cache[table] = column_types
+    return column_types
+
+
+async def _copy_rows(
+    conn: AsyncConnection, table: str, columns: List[str], rows: List[Tuple[Any, ...]]
+) -> int:
+    """Run asyncpg copy_records_to_table on the connection's driver connection."""
+    raw = await conn.get_raw_connection()
+    schema, _, table_name = table.rpartition(".")
+    status = await raw.driver_connection.copy_records_to_table(
+        table_name, records=rows, columns=columns, schema_name=schema or None
+    )
+    # asyncpg returns the command tag, e.g. "COPY 42"
+    return int(status.split()[-1]) if status else len(rows)
+
+
+async def copy_records(
+    table: str,
+    records: List[Dict[str, Any]],
+    columns: Optional[List[str]] = None,
+    execution_id: Optional[str] = None,
+    conn: Optional[AsyncConnection] = None,
+) -> int:
+    """
+    Bulk insert records with COPY.
+
+    Args:
+        table: Target table name (optionally schema-qualified)
+        records: Records keyed by column name
+        columns: Columns to write (default: every key used by any record)
+        execution_id: Optional execution ID for logging
+        conn: Connection from get_connection() to copy within its transaction
+            (default: a transaction of its own)
+
+    Returns:
+        Number of rows copied
+
+    Raises:
+        ValueError: If the table or a column name is not a plain identifier
+        SQLAlchemyError: If the copy fails
+    """
+    if not records:
+        return 0
+    columns = [_check_identifier(c) for c in (columns or _record_columns(records))]
+    _check_identifier(table)
+
+    async with AsyncExitStack() as stack:
+        if conn is None:
+            conn = await stack.enter_async_context(get_connection(execution_id))
+        column_types = await _get_column_types(conn, table)
+        rows = build_copy_rows(records, columns, column_types)
+        copied = await _copy_rows(conn, table, columns, rows)
+
+    logger.info(
+        "postgres.copy_records",
+        execution_id=execution_id,
+        table=table,
+        rows=copied,
+    )
+    return copied
+
+
+async def stage_records(
+    conn: AsyncConnection,
+    table: str,
+    records: List[Dict[str, Any]],
+    columns: List[str],
+) -> str:
+    """
+    COPY records into a temporary staging table shaped like `table`.
+
+    The staging table has only the requested columns (no defaults or
+    constraints) and is dropped when the surrounding transaction commits,
+    so it must be used inside get_connection().
+
+    Args:
+        conn: Connection from get_connection()
+        table: Table whose column types the staging table copies
+        records: Records keyed by column name
+        columns: Columns to stage
+
+    Returns:
+        Name of the staging table, for use in merge statements
+    """
+    columns = [_check_identifier(c) for c in columns]
+    _check_identifier(table)
+    staging = f"_stage_{table.rpartition('.')[2]}_{uuid.uuid4().hex[:8]}"
+
+    # Running CREATE through SQLAlchemy opens the transaction the COPY then joins
+    await conn.execute(
+        text(
+            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+            f"SELECT {', '.join(columns)} FROM {table} WITH NO DATA"
+        )
+    )
+    column_types = await _get_column_types(conn, table)
+    await _copy_rows(conn, staging, columns, build_copy_rows(records, columns, column_types))
+    return staging
+
+
+def build_upsert_sql(
+    table: str,
+    staging: str,
+    columns: List[str],
+    conflict_columns: List[str],
+    update_columns: Optional[List[str]] = None,
+) -> str:
+    """
+    Build an INSERT ... SELECT ... ON CONFLICT statement merging a staging table.
+
+    Args:
+        table: Target table
+        staging: Staging table from stage_records
+        columns: Columns to insert
+        conflict_columns: Columns of the unique constraint to merge on
+        update_columns: Columns overwritten on conflict (default: all non-conflict
+            columns; an empty list means DO NOTHING)
+
+    Returns:
+        SQL statement text
+    """
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in conflict_columns]
+    column_list = ", ".join(columns)
+    conflict_list = ", ".join(conflict_columns)
+    if update_columns:
+        assignments = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_columns)
+        action = f"DO UPDATE SET {assignments}"
+    else:
+        action = "DO NOTHING"
+    return (
+        f"INSERT INTO {table} ({column_list}) "
+        f"SELECT {column_list} FROM {staging} "
+        f"ON CONFLICT ({conflict_list}) {action}"
+    )
+
+
+async def bulk_upsert(
+    table: str,
+    records: List[Dict[str, Any]],
+    conflict_columns: List[str],
+    update_columns: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    execution_id: Optional[str] = None,
+) -> int:
+    """
+    Insert or update many records with COPY into staging plus one merge statement.
+
+    Args:
+        table: Target table (must have a unique constraint on conflict_columns)
+        records: Records keyed by column name
+        conflict_columns: Unique key columns to merge on
+        update_columns: Columns overwritten on conflict (default: all others)
+        columns: Columns to write (default: every key used by any record)
+        execution_id: Optional execution ID for logging
+
+    Returns:
+        Number of rows inserted or updated
+
+    Raises:
+        ValueError: If the table or a column name is not a plain identifier
+        SQLAlchemyError: If the merge fails
+    """
+    if not records:
+        return 0
+    columns = columns or _record_columns(records)
+    for column in conflict_columns + list(update_columns or []):
+        _check_identifier(column)
+
+    async with get_connection(execution_id) as conn:
+        staging = await stage_records(conn, table, records, columns)
+        result = await conn.execute(
+            text(build_upsert_sql(table, staging, columns, conflict_columns, update_columns))
+        )
+
+    logger.info(
+        "postgres.bulk_upsert",
+        execution_id=execution_id,
+        table=table,
+        staged=len(records),
+        affected_rows=result.rowcount,
+    )
+    return result.rowcount
@@ -0,0 +1,393 @@
+"""
+Per-statement query instrumentation for the PostgreSQL connector.
+
+SQLAlchemy cursor events time every statement and aggregate the results by
+statement fingerprint (SQL with literals and bind parameters collapsed), with
+a latency histogram, rows returned, pool wait and the calling stage. Stages
+are set with query_stage() or the `stage` argument of get_connection /
+get_read_connection.
+
+Statements slower than QUERY_EXPLAIN_THRESHOLD_MS can optionally be sampled
+for EXPLAIN (ANALYZE, BUFFERS). ANALYZE re-runs the statement, so capture is
+off by default, limited to SELECT/WITH statements without data-modifying
+keywords, run inside a rolled-back READ ONLY transaction and rate-limited by
+QUERY_EXPLAIN_SAMPLE_RATE.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import random
+import re
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Set
+
+from sqlalchemy import event
+
+from ..utils.logging import get_logger
+from ..utils.settings import config
+
+logger = get_logger()
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_current_stage: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "aegis_query_stage", default="unknown"
+)
+_explaining: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "aegis_query_explaining", default=False
+)
+
+# Background plan captures; the event loop keeps only weak references to tasks
+_explain_tasks: Set[asyncio.Task] = set()
+
+# Data-modifying keywords; a WITH query containing one writes (e.g. WITH d AS (DELETE ...))
+WRITE_KEYWORD_PATTERN = re.compile(r"\b(?:insert|update|delete|merge)\b", re.IGNORECASE)
+
+_COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_PATTERN = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PARAM_PATTERN = re.compile(r"\$\d+|(?<!:):\w+|%\(\w+\)s|%s|\?")
+_IN_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_GROUP_PATTERN = re.compile(r"(\([^()]*\))(?:\s+(?:or|and)\s+\1)+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_MAX_SQL_CHARS = 400
+
+
+def fingerprint_statement(statement: str) -> str:
+    """
+    Normalize SQL so executions that differ only in values share a fingerprint.
+
+    Literals and bind parameters become "?", IN lists collapse to "(?)" and
+    repeated identical OR/AND groups (e.g. per-bank OR-chains) collapse to one.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        Normalized, lowercased statement text
+    """
+    text = _COMMENT_PATTERN.sub(" ", statement)
+    text = _STRING_PATTERN.sub("?", text)
+    text = _PARAM_PATTERN.sub("?", text)
+    text = _NUMBER_PATTERN.sub("?", text)
+    text = _WHITESPACE_PATTERN.sub(" ", text).strip().lower()
+    text = _IN_LIST_PATTERN.sub("(?)", text)
+    return _REPEATED_GROUP_PATTERN.sub(r"\1 or ...", text)
+
+
+@contextmanager
+def query_stage(stage: Optional[str]) -> Iterator[None]:
+    """
+    Attribute statements executed in this block to a stage.
+
+    Args:
+        stage: Stage label (e.g. "transcripts.expand_speaker_blocks"); None leaves
+            the current stage unchanged
+    """
+    if not stage:
+        yield
+        return
+    token = _current_stage.set(stage)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+def current_stage() -> str:
+    """Return the stage statements are currently attributed to."""
+    return _current_stage.get()
+
+
+@dataclass
+class _FingerprintStats:
+    """Aggregated timings for one statement fingerprint."""
+
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    pool_wait_ms: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(HISTOGRAM_BUCKETS_MS) + 1))
+    stages: Counter = field(default_factory=Counter)
+
+    def record(self, elapsed_ms: float, rows: Optional[int], pool_wait_ms: float, stage: str):
+        """Add one execution."""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows or 0
+        self.pool_wait_ms += pool_wait_ms
+        self.stages[stage] += 1
+        for index, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Estimate a latency percentile as the upper bound of its histogram bucket."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return (
+                    float(HISTOGRAM_BUCKETS_MS[index])
+                    if index < len(HISTOGRAM_BUCKETS_MS)
+                    else self.max_ms
+                )
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Format for the monitoring API."""
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [
+            f">{HISTOGRAM_BUCKETS_MS[-1]}ms"
+        ]
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "avg_rows": round(self.rows / self.count, 1) if self.count else 0.0,
+            "avg_pool_wait_ms": round(self.pool_wait_ms / self.count, 2) if self.count else 0.0,
+            "histogram": dict(zip(labels, self.buckets)),
+            "stages": dict(self.stages.most_common()),
+        }
+
+
+class QueryStatsRegistry:
+    """Process-wide statement statistics and slow-query samples."""
+
+    def __init__(self, max_fingerprints: int, slow_sample_limit: int):
+        """
+        Initialize empty statistics.
+
+        Args:
+            max_fingerprints: Distinct fingerprints tracked before new ones are
+                folded into an "other" bucket
+            slow_sample_limit: Number of most recent slow-query samples kept
+        """
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, _FingerprintStats] = {}
+        self.slow_samples: Deque[Dict[str, Any]] = deque(maxlen=slow_sample_limit)
+
+    def record(
+        self,
+        statement: str,
+        elapsed_ms: float,
+        rows: Optional[int],
+        pool_wait_ms: float,
+        stage: str,
+    ) -> str:
+        """
+        Record one statement execution.
+
+        Returns:
+            Fingerprint ID the execution was aggregated under
+        """
+        normalized = fingerprint_statement(statement)
+        fingerprint_id = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+        stats = self._stats.get(fingerprint_id)
+        if stats is None:
+            if len(self._stats) >= self.max_fingerprints:
+                fingerprint_id = "other"
+                stats = self._stats.setdefault("other", _FingerprintStats(sql="(other statements)"))
+            else:
+                stats = _FingerprintStats(sql=normalized[:_MAX_SQL_CHARS])
+                self._stats[fingerprint_id] = stats
+        stats.record(elapsed_ms, rows, pool_wait_ms, stage)
+        return fingerprint_id
+
+    def snapshot(self, limit: int = 50, stage: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Report the most expensive fingerprints by total time.
+
+        Args:
+            limit: Maximum fingerprints returned
+            stage: Only include fingerprints executed from this stage
+
+        Returns:
+            List of fingerprint statistics, highest total time first
+        """
+        items = [
+            {"fingerprint": fingerprint_id, **stats.to_dict()}
+            for fingerprint_id, stats in self._stats.items()
+            if stage is None or stage in stats.stages
+        ]
+        items.sort(key=lambda item: item["total_ms"], reverse=True)
+        return items[:limit]
+
+    def clear(self) -> None:
+        """Reset statistics and samples."""
+        self._stats.clear()
+        self.slow_samples.clear()
+
+
+_registry: Optional[QueryStatsRegistry] = None
+
+
+def get_query_stats() -> QueryStatsRegistry:
+    """
+    Get the process-wide query statistics registry.
+
+    Returns:
+        Shared QueryStatsRegistry instance
+    """
+    global _registry  # pylint: disable=global-statement
+    # One registry per process so every engine reports into the same view.
+    if _registry is None:
+        _registry = QueryStatsRegistry(
+            max_fingerprints=config.query_stats.max_fingerprints,
+            slow_sample_limit=config.query_stats.slow_sample_limit,
+        )
+    return _registry
+
+
+def _rows_returned(cursor: Any) -> Optional[int]:
+    """Rows fetched by the asyncpg adapter cursor, or the rowcount for DML."""
+    buffered = getattr(cursor, "_rows", None)
+    if buffered is not None:
+        return len(buffered)
+    rowcount = getattr(cursor, "rowcount", -1)
+    return rowcount if rowcount is not None and rowcount >= 0 else None
+
+
+def _is_explainable(statement: str) -> bool:
+    """Only plain reads are safe to re-run under EXPLAIN ANALYZE (no writing CTEs)."""
+    first_word = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    return first_word in ("select", "with") and not WRITE_KEYWORD_PATTERN.search(statement)
+
+
+def _should_explain(statement: str, elapsed_ms: float) -> bool:
+    """Decide whether to capture a plan for this execution."""
+    threshold = config.query_stats.explain_threshold_ms
+    return (
+        threshold > 0
+        and elapsed_ms >= threshold
+        and not _explaining.get()
+        and _is_explainable(statement)
+        and random.random() < config.query_stats.explain_sample_rate
+    )
+
+
+ExplainRunner = Callable[[str, str, Any], Awaitable[Any]]
+
+
+def install_query_instrumentation(
+    engine: Any, engine_name: str, explain_runner: Optional[ExplainRunner] = None
+) -> None:
+    """
+    Register cursor event listeners that time every statement on an engine.
+
+    Args:
+        engine: AsyncEngine or sync Engine to instrument
+        engine_name: Name reported with slow-query samples
+        explain_runner: Coroutine (engine_name, statement, parameters) returning
+            an EXPLAIN plan, used for sampled slow queries
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    registry = get_query_stats()
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
+        conn.info.setdefault("aegis_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
+        started = conn.info.get("aegis_query_started")
+        if not started:
+            return
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+        # The pool wait of this checkout is charged to its first statement
+        pool_wait_ms = conn.info.pop("aegis_pool_wait_ms", 0.0)
+        if _explaining.get():
+            return
+        stage = _current_stage.get()
+        fingerprint_id = registry.record(
+            statement, elapsed_ms, _rows_returned(cursor), pool_wait_ms, stage
+        )
+
+        if explain_runner is not None and _should_explain(statement, elapsed_ms):
+            _schedule_explain(
+                explain_runner,
+                engine_name,
+                fingerprint_id,
+                stage,
+                statement,
+                parameters,
+                elapsed_ms,
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(exception_context):
+        started = (
+            exception_context.connection.info.get("aegis_query_started")
+            if (exception_context.connection is not None)
+            else None
+        )
+        if started:
+            started.pop()
+
+
+def _schedule_explain(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    explain_runner: ExplainRunner,
+    engine_name: str,
+    fingerprint_id: str,
+    stage: str,
+    statement: str,
+    parameters: Any,
+    elapsed_ms: float,
+) -> None:
+    """Capture an EXPLAIN plan in the background so the caller is not delayed."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    async def _capture() -> None:
+        _explaining.set(True)
+        try:
+            plan = await explain_runner(engine_name, statement, parameters)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Plan capture is diagnostic only and must never affect the request.
+            logger.warning("query_stats.explain_failed", fingerprint=fingerprint_id, error=str(e))
+            return
+        get_query_stats().slow_samples.append(
+            {
+                "fingerprint": fingerprint_id,
+                "engine": engine_name,
+                "stage": stage,
+                "elapsed_ms": round(elapsed_ms, 2),
+                "captured_at": datetime.now(timezone.utc).isoformat(),
+                "sql": statement[:2000],
+                "plan": plan if not isinstance(plan, str) else json.loads(plan),
+            }
+        )
+        logger.info(
+            "query_stats.slow_query_captured",
+            fingerprint=fingerprint_id,
+            engine=engine_name,
+            stage=stage,
+            elapsed_ms=round(elapsed_ms, 2),
+        )
+
+    task = loop.create_task(_capture())
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
@@ -27,6 +27,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
 from aegis.connections.oauth_connector import setup_authentication
+from aegis.etls.rendering import render
 from aegis.connections.postgres_connector import get_connection
 from aegis.utils.logging import get_logger, setup_logging
 from aegis.utils.ssl import setup_ssl
@@ -915,7 +916,7 @@ async def generate_bank_earnings_report(bank_name: str, fiscal_year: int, quarte
         filename = f"{bank_info['bank_symbol']}_{fiscal_year}_{quarter}.html"
         output_path = output_dir / filename
 
-        render_report(sections, output_path)
+        await render(render_report, sections=sections, output_path=output_path)
 
         logger.info(
             "etl.bank_earnings_report.rendered",
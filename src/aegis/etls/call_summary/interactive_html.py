@@ -9,6 +9,8 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from aegis.etls.report_state_codec import STATE_ENCODINGS, encode_report_state
+
 BUCKET_COLORS: List[Tuple[str, str]] = [
     ("#E3F2FD", "#1565C0"),
     ("#F3E5F5", "#6A1B9A"),
@@ -190,8 +192,19 @@ def generate_html(
     fiscal_quarter: str,
     min_importance: float,
     banner_path: Optional[Path] = None,
+    state_encoding: str = "compact",
 ) -> str:
-    """Render the mock HTML shell with injected report state."""
+    """
+    Render the mock HTML shell with injected report state.
+
+    state_encoding selects how the state is inlined: "plain" JSON, "compact"
+    rows with interned strings, or "compact-gzip", which also gzips each bank
+    into its own base64 chunk. The template decodes all three on load.
+    """
+    if state_encoding not in STATE_ENCODINGS:
+        raise ValueError(
+            f"Unknown state encoding: {state_encoding} (expected one of {STATE_ENCODINGS})"
+        )
     # Resolve the banner before serialization so the data: URL travels through
     # the same JSON-escaping path as the rest of the state. The previous
     # implementation post-patched the serialized string by string-replacing
@@ -203,8 +216,12 @@ def generate_html(
     if banner_b64 and not state_with_banner.get("banner_src"):
         state_with_banner["banner_src"] = banner_b64
 
+    payload = state_with_banner
+    if state_encoding != "plain":
+        payload = encode_report_state(state_with_banner, compress=state_encoding == "compact-gzip")
+
     state_json = json.dumps(
-        state_with_banner,
+        payload,
         ensure_ascii=False,
         separators=(",", ":"),
     ).translate(
@@ -13,12 +13,14 @@ import asyncio
 import json
 import re
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Tuple
+from contextlib import aclosing
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from xml.sax.saxutils import escape as _xml_escape
 
 from pydantic import BaseModel, Field
 
-from aegis.connections.llm_connector import complete_with_tools
+from aegis.connections.llm_connector import stream_with_tools
+from aegis.etls.category_registry import memoize_category_prompt
 from aegis.utils.logging import get_logger
 
 logger = get_logger()
@@ -880,6 +882,7 @@ def _append_prompt_list(
     lines.append(f"  </{parent_tag}>")
 
 
+@memoize_category_prompt
 def format_categories_for_prompt(
     categories: List[Dict[str, Any]], section_filter: str = "ALL"
 ) -> str:
@@ -1161,19 +1164,43 @@ async def _call_tool(
     label: str,
     context: Dict[str, Any],
     llm_params: Dict[str, Any],
+    validate_item: Optional[Callable[[str, Any], Optional[str]]] = None,
 ) -> Optional[Dict[str, Any]]:
-    """Run one structured LLM call and return parsed tool arguments."""
+    """Run one structured LLM call and return parsed tool arguments.
+
+    Tool arguments are streamed so long structured outputs keep the connection
+    active instead of running into the client read timeout. When
+    ``validate_item`` is given it receives each element of a top-level array
+    argument as soon as it is complete; returning an error message stops the
+    call early and the result is ``None``.
+    """
     call_llm_params = dict(llm_params)
     call_llm_params.setdefault(
         "tool_choice",
         {"type": "function", "function": {"name": tool["function"]["name"]}},
     )
-    response = await complete_with_tools(
-        messages=messages,
-        tools=[tool],
-        context=context,
-        llm_params=call_llm_params,
-    )
+    response: Dict[str, Any] = {}
+    async with aclosing(
+        stream_with_tools(
+            messages=messages,
+            tools=[tool],
+            context=context,
+            llm_params=call_llm_params,
+        )
+    ) as events:
+        async for event in events:
+            if event["type"] == "response":
+                response = event["response"]
+            elif validate_item is not None:
+                error = validate_item(event["key"], event["item"])
+                if error:
+                    logger.warning(
+                        "LLM tool response failed streaming validation",
+                        stage=label,
+                        key=event["key"],
+                        error=error,
+                    )
+                    return None
 
     metrics = response.get("metrics", {})
     if metrics:
@@ -1613,6 +1640,42 @@ def _qa_boundary_retry_message(total_blocks: int, errors: List[str]) -> str:
     )
 
 
+def _qa_boundary_item_validator(
+    total_blocks: int,
+    errors: List[str],
+) -> Callable[[str, Any], Optional[str]]:
+    """Build a streaming check that each conversation continues the block sequence.
+
+    Valid groupings cover 1..total_blocks exactly once in order, so every
+    conversation must start at the block after the previous one ended. The first
+    violation is recorded in ``errors`` for the retry message.
+    """
+    state = {"conversations": 0, "next_index": 1}
+
+    def _validate(key: str, item: Any) -> Optional[str]:
+        if key != "conversations":
+            return None
+        state["conversations"] += 1
+        indices = item.get("block_indices") if isinstance(item, dict) else None
+        if not indices:
+            error = f"Conversation {state['conversations']} has no block indices"
+        elif not all(isinstance(idx, int) for idx in indices):
+            error = f"Conversation {state['conversations']} has non-integer block indices"
+        else:
+            expected = list(range(state["next_index"], state["next_index"] + len(indices)))
+            if indices == expected and indices[-1] <= total_blocks:
+                state["next_index"] = indices[-1] + 1
+                return None
+            error = (
+                f"Conversation {state['conversations']} block indices {indices} do not continue "
+                f"from block {state['next_index']} within 1..{total_blocks}"
+            )
+        errors.append(error)
+        return error
+
+    return _validate
+
+
 def _resolve_block_indices(
     conversation: QAConversationGroup,
 ) -> List[int]:
@@ -1733,15 +1796,17 @@ async def detect_qa_boundaries(
     last_validation_errors: List[str] = []
 
     for attempt in range(max_attempts):
+        stream_errors: List[str] = []
         raw = await _call_tool(
             messages=messages,
             tool=TOOL_QA_BOUNDARY,
             label="qa_boundary",
             context=context,
             llm_params=llm_params,
+            validate_item=_qa_boundary_item_validator(len(qa_raw_blocks), stream_errors),
         )
         if not raw:
-            last_validation_errors = ["No parseable tool response returned"]
+            last_validation_errors = stream_errors or ["No parseable tool response returned"]
             if attempt < max_attempts - 1:
                 messages = base_messages + [
                     {
@@ -2816,13 +2881,10 @@ async def build_interactive_bank_data(
 
     categories_text_md = format_categories_for_prompt(categories, "MD")
     categories_text_qa = format_categories_for_prompt(categories, "QA")
-    qa_conversations_raw = await detect_qa_boundaries(
-        qa_raw_blocks=qa_raw_blocks,
-        categories_text_qa=categories_text_qa,
-        context=context,
-        llm_params=qa_boundary_llm_params,
-    )
 
+    # MD blocks and QA conversations share one pool of classification slots. MD work
+    # needs no Q&A boundaries, so it starts immediately while boundary detection runs
+    # alongside it; QA conversations join the pool as soon as their boundaries exist.
     semaphore = asyncio.Semaphore(max(1, max_concurrent_md_blocks))
     logger.info(
         "Classifying Management Discussion blocks",
@@ -2868,54 +2930,6 @@ async def build_interactive_bank_data(
                     "classification_error": str(exc),
                 }
 
-    md_results = await asyncio.gather(
-        *[_process_md_block(idx, block) for idx, block in enumerate(md_raw_blocks)],
-        return_exceptions=True,
-    )
-
-    processed_md: List[Dict[str, Any]] = []
-    for idx, result in enumerate(md_results, start=1):
-        if isinstance(result, BaseException):
-            block = md_raw_blocks[idx - 1]
-            logger.error(
-                "Management Discussion block raised an unhandled exception",
-                ticker=ticker,
-                block_index=idx,
-                block_id=block.get("id", ""),
-                error=str(result),
-            )
-            processed_md.append(
-                {
-                    "id": block.get("id", f"{ticker}_MD_{idx}"),
-                    "speaker": block.get("speaker", ""),
-                    "speaker_title": block.get("speaker_title", ""),
-                    "speaker_affiliation": block.get("speaker_affiliation", ""),
-                    "sentences": [],
-                    "classification_error": str(result),
-                }
-            )
-        else:
-            processed_md.append(result)
-
-    md_summary = _summarise_md_results(processed_md)
-    logger.info(
-        "Management Discussion classification complete",
-        ticker=ticker,
-        blocks=md_summary["blocks"],
-        sentences=md_summary["sentences"],
-        selected=md_summary["selected"],
-        candidate=md_summary["candidate"],
-        rejected=md_summary["rejected"],
-        errored_blocks=md_summary["errored_blocks"],
-        sentence_errors=md_summary["errors"],
-    )
-
-    logger.info(
-        "Classifying Q&A conversations",
-        ticker=ticker,
-        conversations=len(qa_conversations_raw),
-    )
-
     async def _process_qa_conversation(
         conv_idx: int, conversation: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
@@ -2957,12 +2971,75 @@ async def build_interactive_bank_data(
                     "classification_error": str(exc),
                 }
 
-    qa_results = await asyncio.gather(
-        *[
-            _process_qa_conversation(idx, conversation)
-            for idx, conversation in enumerate(qa_conversations_raw, start=1)
-        ],
-        return_exceptions=True,
+    md_tasks = [
+        asyncio.create_task(_process_md_block(idx, block))
+        for idx, block in enumerate(md_raw_blocks)
+    ]
+    try:
+        qa_conversations_raw = await detect_qa_boundaries(
+            qa_raw_blocks=qa_raw_blocks,
+            categories_text_qa=categories_text_qa,
+            context=context,
+            llm_params=qa_boundary_llm_params,
+        )
+    except BaseException:
+        for task in md_tasks:
+            task.cancel()
+        await asyncio.gather(*md_tasks, return_exceptions=True)
+        raise
+
+    logger.info(
+        "Classifying Q&A conversations",
+        ticker=ticker,
+        conversations=len(qa_conversations_raw),
+        md_blocks_pending=sum(1 for task in md_tasks if not task.done()),
+    )
+    qa_tasks = [
+        asyncio.create_task(_process_qa_conversation(idx, conversation))
+        for idx, conversation in enumerate(qa_conversations_raw, start=1)
+    ]
+
+    # Awaiting both pools together means cancelling this bank cancels every task in it
+    md_results, qa_results = await asyncio.gather(
+        asyncio.gather(*md_tasks, return_exceptions=True),
+        asyncio.gather(*qa_tasks, return_exceptions=True),
+    )
+
+    processed_md: List[Dict[str, Any]] = []
+    for idx, result in enumerate(md_results, start=1):
+        if isinstance(result, BaseException):
+            block = md_raw_blocks[idx - 1]
+            logger.error(
+                "Management Discussion block raised an unhandled exception",
+                ticker=ticker,
+                block_index=idx,
+                block_id=block.get("id", ""),
+                error=str(result),
+            )
+            processed_md.append(
+                {
+                    "id": block.get("id", f"{ticker}_MD_{idx}"),
+                    "speaker": block.get("speaker", ""),
+                    "speaker_title": block.get("speaker_title", ""),
+                    "speaker_affiliation": block.get("speaker_affiliation", ""),
+                    "sentences": [],
+                    "classification_error": str(result),
+                }
+            )
+        else:
+            processed_md.append(result)
+
+    md_summary = _summarise_md_results(processed_md)
+    logger.info(
+        "Management Discussion classification complete",
+        ticker=ticker,
+        blocks=md_summary["blocks"],
+        sentences=md_summary["sentences"],
+        selected=md_summary["selected"],
+        candidate=md_summary["candidate"],
+        rejected=md_summary["rejected"],
+        errored_blocks=md_summary["errored_blocks"],
+        sentence_errors=md_summary["errors"],
     )
 
     processed_qa: List[Dict[str, Any]] = []
@@ -37,6 +37,8 @@ from aegis.etls.call_summary.interactive_pipeline import (
     generate_bucket_headlines,
 )
 from aegis.etls.call_summary.docx_export import create_call_summary_docx_from_state
+from aegis.etls.category_registry import load_workbook_categories
+from aegis.etls.rendering import render, render_to_file, warm_rendering_service
 from aegis.etls.call_summary.nas_source import (
     extract_raw_blocks,
     find_transcript_xml,
@@ -277,6 +279,33 @@ def load_categories_from_xlsx(bank_type: str, execution_id: str) -> List[Dict[st
     if not os.path.exists(xlsx_path):
         raise FileNotFoundError(f"Categories file not found: {xlsx_path}")
 
+    categories = load_workbook_categories(
+        xlsx_path, _parse_categories_workbook, namespace="call_summary"
+    )
+
+    logger.info(
+        "Loaded category configuration",
+        bank_type=bank_type,
+        file_name=file_name,
+        categories=len(categories),
+    )
+    return categories
+
+
+def _parse_categories_workbook(xlsx_path: str) -> List[Dict[str, Any]]:
+    """
+    Read and validate a categories workbook.
+
+    Only runs when load_workbook_categories has no cached artifact for the file.
+
+    Args:
+        xlsx_path: Path to the categories workbook
+
+    Returns:
+        Validated category dictionaries in sheet order
+    """
+    file_name = os.path.basename(xlsx_path)
+
     try:
         # Inspect sheet inventory before reading so we can warn when the
         # workbook contains additional sheets that the loader silently ignores
@@ -371,12 +400,6 @@ def load_categories_from_xlsx(bank_type: str, execution_id: str) -> List[Dict[st
             )
         seen_names[key] = idx
 
-    logger.info(
-        "Loaded category configuration",
-        bank_type=bank_type,
-        file_name=file_name,
-        categories=len(categories),
-    )
     return categories
 
 
@@ -474,7 +497,7 @@ LEGACY_REPORT_METADATA: Dict[str, str] = {
 }
 
 
-def _generate_interactive_report(
+async def _generate_interactive_report(
     report_state: Dict[str, Any],
     etl_context: Dict[str, Any],
     min_importance: float,
@@ -495,14 +518,15 @@ def _generate_interactive_report(
     html_filename = f"{filename_base}.html"
     filepath = os.path.join(resolved_output_dir, html_filename)
 
-    html_content = generate_interactive_html(
+    await render(
+        render_to_file,
+        builder=generate_interactive_html,
+        output_path=filepath,
         state=report_state,
         fiscal_year=fiscal_year,
         fiscal_quarter=quarter,
         min_importance=min_importance,
     )
-    with open(filepath, "w", encoding="utf-8") as handle:
-        handle.write(html_content)
 
     logger.info(
         "Saved interactive HTML report",
@@ -514,7 +538,7 @@ def _generate_interactive_report(
     return filepath, html_filename
 
 
-def _generate_legacy_docx_report(
+async def _generate_legacy_docx_report(
     report_state: Dict[str, Any],
     etl_context: Dict[str, Any],
     output_dir: str | None = None,
@@ -533,7 +557,8 @@ def _generate_legacy_docx_report(
     docx_filename = f"{filename_base}.docx"
     filepath = os.path.join(resolved_output_dir, docx_filename)
 
-    create_call_summary_docx_from_state(
+    await render(
+        create_call_summary_docx_from_state,
         report_state=report_state,
         output_path=filepath,
         bank_symbol=bank_info["bank_symbol"],
@@ -793,6 +818,8 @@ async def generate_call_summary(  # pylint: disable=too-many-statements
         CallSummaryUserError: For expected errors (bad input, no data)
         CallSummarySystemError: For unexpected system/infrastructure errors
     """
+    # Start the rendering workers now so they are warm when the documents are built
+    warm_rendering_service()
     marks = [("start", time.monotonic())]
     execution_id = str(uuid.uuid4())
     completed = False
@@ -949,16 +976,19 @@ async def generate_call_summary(  # pylint: disable=too-many-statements
         total_categories = len(categories)
         marks.append(("headlines", time.monotonic()))
 
-        filepath, html_filename = _generate_interactive_report(
-            report_state=report_state,
-            etl_context=etl_context,
-            min_importance=min_importance,
-            output_dir=output_dir,
-        )
-        docx_filepath, docx_filename = _generate_legacy_docx_report(
-            report_state=report_state,
-            etl_context=etl_context,
-            output_dir=output_dir,
+        # Both documents render in the worker pool, so they are built side by side
+        (filepath, html_filename), (docx_filepath, docx_filename) = await asyncio.gather(
+            _generate_interactive_report(
+                report_state=report_state,
+                etl_context=etl_context,
+                min_importance=min_importance,
+                output_dir=output_dir,
+            ),
+            _generate_legacy_docx_report(
+                report_state=report_state,
+                etl_context=etl_context,
+                output_dir=output_dir,
+            ),
         )
         marks.append(("document", time.monotonic()))
 
@@ -19,6 +19,7 @@ from xml.sax.saxutils import escape as _xml_escape
 from pydantic import BaseModel, Field
 
 from aegis.connections.llm_connector import complete_with_tools
+from aegis.etls.category_registry import memoize_category_prompt
 from aegis.utils.logging import get_logger
 
 logger = get_logger()
@@ -869,6 +870,7 @@ def _append_prompt_list(
     lines.append(f"  </{parent_tag}>")
 
 
+@memoize_category_prompt
 def format_categories_for_prompt(
     categories: List[Dict[str, Any]], section_filter: str = "ALL"
 ) -> str:
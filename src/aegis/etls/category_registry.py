@@ -0,0 +1,179 @@
+"""
+Cached loading of ETL category workbooks and their prompt renderings.
+
+Every ETL run used to open its category .xlsx with pandas/openpyxl and
+validate it row by row, and every bank (and transcript section) re-rendered
+the same categories into prompt XML. The registry parses each workbook once
+per content hash into a validated JSON artifact, keeps the result in process
+memory keyed by file mtime/size, and memoizes prompt renderings by a
+fingerprint of the category rows.
+
+Artifacts are written to CATEGORY_CACHE_DIR, or to a .category_cache
+directory next to the workbook when unset. A read-only location only disables
+the on-disk layer. Bump CATEGORY_ARTIFACT_VERSION when a parser's output
+changes so existing artifacts are ignored.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from aegis.utils.logging import get_logger
+from aegis.utils.settings import config
+
+logger = get_logger()
+
+CATEGORY_ARTIFACT_VERSION = 1
+PROMPT_CACHE_SIZE = 64
+
+Categories = List[Dict[str, Any]]
+
+_memory: Dict[Tuple[str, str], Tuple[Tuple[int, int], Categories]] = {}
+_memory_lock = threading.Lock()
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _artifact_path(xlsx_path: str, namespace: str, digest: str) -> str:
+    cache_dir = config.category_cache.cache_dir or os.path.join(
+        os.path.dirname(xlsx_path), ".category_cache"
+    )
+    safe_namespace = "".join(ch if ch.isalnum() else "_" for ch in namespace)
+    stem = os.path.splitext(os.path.basename(xlsx_path))[0]
+    return os.path.join(cache_dir, f"{stem}.{safe_namespace}.{digest[:16]}.json")
+
+
+def _read_artifact(path: str, digest: str) -> Optional[Categories]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            artifact = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if artifact.get("version") != CATEGORY_ARTIFACT_VERSION or artifact.get("sha256") != digest:
+        return None
+    return artifact.get("categories")
+
+
+def _write_artifact(path: str, xlsx_path: str, digest: str, categories: Categories) -> None:
+    artifact = {
+        "version": CATEGORY_ARTIFACT_VERSION,
+        "source": os.path.basename(xlsx_path),
+        "sha256": digest,
+        "categories": categories,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so concurrent runs never read a partial artifact
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(artifact, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning("etl.categories.artifact_write_failed", path=path, error=str(exc))
+
+
+def load_workbook_categories(
+    xlsx_path: str, parse: Callable[[str], Categories], namespace: str
+) -> Categories:
+    """
+    Load validated categories for a workbook, parsing it only when it changed.
+
+    Args:
+        xlsx_path: Path to the category workbook
+        parse: Reads and validates the workbook; raises on invalid content
+        namespace: Distinguishes parsers that read the same workbook differently
+
+    Returns:
+        A fresh copy of the validated category rows (safe for callers to mutate)
+    """
+    xlsx_path = os.path.abspath(xlsx_path)
+    stat = os.stat(xlsx_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    memory_key = (namespace, xlsx_path)
+
+    with _memory_lock:
+        cached = _memory.get(memory_key)
+    if cached is not None and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+
+    digest = _file_digest(xlsx_path)
+    persist = config.category_cache.persist
+    artifact_path = _artifact_path(xlsx_path, namespace, digest)
+    categories = _read_artifact(artifact_path, digest) if persist else None
+    source = "artifact"
+    if categories is None:
+        categories = parse(xlsx_path)
+        source = "workbook"
+        if persist:
+            _write_artifact(artifact_path, xlsx_path, digest, categories)
+
+    with _memory_lock:
+        _memory[memory_key] = (signature, categories)
+    logger.debug(
+        "etl.categories.loaded",
+        xlsx_path=xlsx_path,
+        namespace=namespace,
+        source=source,
+        categories=len(categories),
+    )
+    return copy.deepcopy(categories)
+
+
+def categories_fingerprint(categories: Sequence[Dict[str, Any]]) -> str:
+    """
+    Content fingerprint of category rows, independent of object identity.
+
+    Args:
+        categories: Category rows
+
+    Returns:
+        Hex digest that changes whenever any row's content changes
+    """
+    payload = json.dumps(list(categories), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def memoize_category_prompt(func: Callable[..., str]) -> Callable[..., str]:
+    """
+    Memoize a categories-to-prompt renderer by category content and arguments.
+
+    The wrapped function's first argument must be the category rows; remaining
+    arguments must be hashable. Exposes cache_clear() like functools.lru_cache.
+    """
+    cache: "OrderedDict[Tuple[Any, ...], str]" = OrderedDict()
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(categories: Sequence[Dict[str, Any]], *args: Any, **kwargs: Any) -> str:
+        key = (categories_fingerprint(categories), args, tuple(sorted(kwargs.items())))
+        with lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        rendered = func(categories, *args, **kwargs)
+        with lock:
+            cache[key] = rendered
+            if len(cache) > PROMPT_CACHE_SIZE:
+                cache.popitem(last=False)
+        return rendered
+
+    wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+    return wrapper
+
+
+def clear_category_cache() -> None:
+    """Drop in-memory parsed workbooks (on-disk artifacts are kept)."""
+    with _memory_lock:
+        _memory.clear()
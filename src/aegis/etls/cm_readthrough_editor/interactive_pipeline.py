@@ -23,6 +23,7 @@ from xml.sax.saxutils import escape as _xml_escape
 from pydantic import BaseModel, Field, ValidationError
 
 from aegis.connections.llm_connector import complete_with_tools
+from aegis.etls.category_registry import memoize_category_prompt
 from aegis.etls.prompt_schema import load_prompt_bundle
 from aegis.utils.logging import get_logger
 
@@ -287,6 +288,7 @@ def _categories_for_section(
     return allowed
 
 
+@memoize_category_prompt
 def _format_categories_for_prompt(categories: Sequence[Dict[str, Any]]) -> str:
     """Render category config rows into prompt-friendly XML."""
     lines = ["<categories>"]
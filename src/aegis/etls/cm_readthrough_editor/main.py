@@ -17,7 +17,7 @@ import os
 import sys
 from dataclasses import dataclass
 from datetime import datetime
-from functools import lru_cache
+from functools import lru_cache, partial
 from typing import Any, Dict, List, Optional
 from sqlalchemy import text
 import pandas as pd
@@ -34,6 +34,8 @@ from aegis.etls.cm_readthrough_editor.interactive_pipeline import (
     generate_report_section_subtitles,
 )
 from aegis.etls.cm_readthrough_editor.docx_export import create_cm_readthrough_docx_from_state
+from aegis.etls.category_registry import load_workbook_categories
+from aegis.etls.rendering import render, render_to_file, warm_rendering_service
 from aegis.etls.cm_readthrough_editor.nas_source import (
     extract_raw_blocks,
     find_transcript_xml,
@@ -271,82 +273,19 @@ def load_categories_from_xlsx() -> List[Dict[str, Any]]:
         ("outlook_categories.xlsx", "Outlook"),
         ("qa_categories.xlsx", "Q&A"),
     ]
-    required_columns = ["transcript_sections", "category_name", "category_description"]
-    optional_columns = ["example_1", "example_2", "example_3", "category_group"]
     categories = []
 
     for file_name, report_section in workbook_specs:
         xlsx_path = os.path.join(category_dir, file_name)
         if not os.path.exists(xlsx_path):
             raise FileNotFoundError(f"Categories file not found: {xlsx_path}")
-
-        try:
-            all_sheets = pd.ExcelFile(xlsx_path).sheet_names
-            df = pd.read_excel(xlsx_path, sheet_name=0)
-        except Exception as exc:
-            logger.error(
-                "Failed to read category configuration file",
-                xlsx_path=xlsx_path,
-                error=str(exc),
-            )
-            raise RuntimeError(f"Failed to read categories from {xlsx_path}: {exc}") from exc
-
-        if len(all_sheets) > 1:
-            logger.warning(
-                "Categories workbook contains multiple sheets; only the first is loaded",
-                xlsx_path=xlsx_path,
-                loaded_sheet=all_sheets[0],
-                ignored_sheets=all_sheets[1:],
-            )
-
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"Missing required columns in {file_name}: {missing_columns}")
-
-        for col in optional_columns:
-            if col not in df.columns:
-                df[col] = ""
-
-        for idx, row in df.iterrows():
-            category_name = (
-                str(row["category_name"]).strip() if pd.notna(row["category_name"]) else ""
-            )
-            if category_name.lower() == "category":
-                continue
-
-            for field in required_columns:
-                if pd.isna(row[field]) or str(row[field]).strip() == "":
-                    raise ValueError(f"Missing value for '{field}' in {file_name} (row {idx + 2})")
-
-            transcript_sections = str(row["transcript_sections"]).strip()
-            if transcript_sections not in VALID_SECTION_KEYS:
-                raise ValueError(
-                    f"Invalid transcript_sections '{transcript_sections}' "
-                    f"in {file_name} (row {idx + 2}). Must be one of: {VALID_SECTION_KEYS}"
-                )
-
-            categories.append(
-                {
-                    "transcript_sections": transcript_sections,
-                    "report_section": report_section,
-                    "category_name": category_name,
-                    "category_description": str(row["category_description"]).strip(),
-                    "example_1": (
-                        str(row["example_1"]).strip() if pd.notna(row["example_1"]) else ""
-                    ),
-                    "example_2": (
-                        str(row["example_2"]).strip() if pd.notna(row["example_2"]) else ""
-                    ),
-                    "example_3": (
-                        str(row["example_3"]).strip() if pd.notna(row["example_3"]) else ""
-                    ),
-                    "category_group": (
-                        str(row["category_group"]).strip()
-                        if pd.notna(row["category_group"])
-                        else ""
-                    ),
-                }
+        categories.extend(
+            load_workbook_categories(
+                xlsx_path,
+                partial(_parse_categories_workbook, report_section=report_section),
+                namespace=f"cm_readthrough_editor.{report_section}",
             )
+        )
 
     if not categories:
         raise ValueError("No categories loaded for cm_readthrough_editor")
@@ -380,6 +319,85 @@ def load_categories_from_xlsx() -> List[Dict[str, Any]]:
     return categories
 
 
+def _parse_categories_workbook(xlsx_path: str, report_section: str) -> List[Dict[str, Any]]:
+    """
+    Read and validate one category workbook.
+
+    Only runs when load_workbook_categories has no cached artifact for the file.
+
+    Args:
+        xlsx_path: Path to the Outlook or Q&A categories workbook
+        report_section: Report section assigned to every row of the workbook
+
+    Returns:
+        Validated category dictionaries in sheet order
+    """
+    file_name = os.path.basename(xlsx_path)
+    required_columns = ["transcript_sections", "category_name", "category_description"]
+    optional_columns = ["example_1", "example_2", "example_3", "category_group"]
+    categories = []
+
+    try:
+        all_sheets = pd.ExcelFile(xlsx_path).sheet_names
+        df = pd.read_excel(xlsx_path, sheet_name=0)
+    except Exception as exc:
+        logger.error(
+            "Failed to read category configuration file",
+            xlsx_path=xlsx_path,
+            error=str(exc),
+        )
+        raise RuntimeError(f"Failed to read categories from {xlsx_path}: {exc}") from exc
+
+    if len(all_sheets) > 1:
+        logger.warning(
+            "Categories workbook contains multiple sheets; only the first is loaded",
+            xlsx_path=xlsx_path,
+            loaded_sheet=all_sheets[0],
+            ignored_sheets=all_sheets[1:],
+        )
+
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns in {file_name}: {missing_columns}")
+
+    for col in optional_columns:
+        if col not in df.columns:
+            df[col] = ""
+
+    for idx, row in df.iterrows():
+        category_name = str(row["category_name"]).strip() if pd.notna(row["category_name"]) else ""
+        if category_name.lower() == "category":
+            continue
+
+        for field in required_columns:
+            if pd.isna(row[field]) or str(row[field]).strip() == "":
+                raise ValueError(f"Missing value for '{field}' in {file_name} (row {idx + 2})")
+
+        transcript_sections = str(row["transcript_sections"]).strip()
+        if transcript_sections not in VALID_SECTION_KEYS:
+            raise ValueError(
+                f"Invalid transcript_sections '{transcript_sections}' "
+                f"in {file_name} (row {idx + 2}). Must be one of: {VALID_SECTION_KEYS}"
+            )
+
+        categories.append(
+            {
+                "transcript_sections": transcript_sections,
+                "report_section": report_section,
+                "category_name": category_name,
+                "category_description": str(row["category_description"]).strip(),
+                "example_1": (str(row["example_1"]).strip() if pd.notna(row["example_1"]) else ""),
+                "example_2": (str(row["example_2"]).strip() if pd.notna(row["example_2"]) else ""),
+                "example_3": (str(row["example_3"]).strip() if pd.notna(row["example_3"]) else ""),
+                "category_group": (
+                    str(row["category_group"]).strip() if pd.notna(row["category_group"]) else ""
+                ),
+            }
+        )
+
+    return categories
+
+
 def get_bank_info_from_config(bank_identifier: str) -> Dict[str, Any]:
     """
     Look up bank from monitored institutions configuration file.
@@ -545,7 +563,7 @@ def _count_banks_with_selected_findings(banks_data: Dict[str, Dict[str, Any]]) -
     return selected_banks
 
 
-def _generate_interactive_report(
+async def _generate_interactive_report(
     report_state: Dict[str, Any],
     etl_context: Dict[str, Any],
     min_importance: float,
@@ -565,14 +583,15 @@ def _generate_interactive_report(
     html_filename = f"{filename_base}.html"
     filepath = os.path.join(resolved_output_dir, html_filename)
 
-    html_content = generate_interactive_html(
+    await render(
+        render_to_file,
+        builder=generate_interactive_html,
+        output_path=filepath,
         state=report_state,
         fiscal_year=fiscal_year,
         fiscal_quarter=quarter,
         min_importance=min_importance,
     )
-    with open(filepath, "w", encoding="utf-8") as handle:
-        handle.write(html_content)
 
     logger.info(
         "Saved interactive HTML report",
@@ -584,7 +603,7 @@ def _generate_interactive_report(
     return filepath, html_filename
 
 
-def _generate_legacy_docx_report(
+async def _generate_legacy_docx_report(
     report_state: Dict[str, Any],
     etl_context: Dict[str, Any],
     output_path: str | None = None,
@@ -606,7 +625,9 @@ def _generate_legacy_docx_report(
         docx_filename = f"CM_Readthrough_{fiscal_year}_{quarter}.docx"
         filepath = os.path.join(resolved_output_dir, docx_filename)
 
-    create_cm_readthrough_docx_from_state(report_state=report_state, output_path=filepath)
+    await render(
+        create_cm_readthrough_docx_from_state, report_state=report_state, output_path=filepath
+    )
     logger.info(
         "Saved legacy CM DOCX report",
         filepath=filepath,
@@ -871,6 +892,8 @@ async def generate_cm_readthrough_editor(  # pylint: disable=too-many-statements
         CMReadthroughEditorUserError: For expected errors (bad input, no data)
         CMReadthroughEditorSystemError: For unexpected system/infrastructure errors
     """
+    # Start the rendering workers now so they are warm when the documents are built
+    warm_rendering_service()
     marks = [("start", time.monotonic())]
     execution_id = str(uuid.uuid4())
     completed = False
@@ -1099,17 +1122,20 @@ async def generate_cm_readthrough_editor(  # pylint: disable=too-many-statements
             "section_subtitles": section_subtitles,
         }
 
-        filepath, html_filename = _generate_interactive_report(
-            report_state=report_state,
-            etl_context=etl_context,
-            min_importance=min_importance,
-            output_dir=output_dir,
-        )
-        docx_filepath, docx_filename = _generate_legacy_docx_report(
-            report_state=report_state,
-            etl_context=etl_context,
-            output_path=output_path,
-            output_dir=output_dir,
+        # Both documents render in the worker pool, so they are built side by side
+        (filepath, html_filename), (docx_filepath, docx_filename) = await asyncio.gather(
+            _generate_interactive_report(
+                report_state=report_state,
+                etl_context=etl_context,
+                min_importance=min_importance,
+                output_dir=output_dir,
+            ),
+            _generate_legacy_docx_report(
+                report_state=report_state,
+                etl_context=etl_context,
+                output_path=output_path,
+                output_dir=output_dir,
+            ),
         )
         marks.append(("document", time.monotonic()))
 
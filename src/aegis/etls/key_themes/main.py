@@ -42,6 +42,11 @@ from aegis.etls.key_themes.document_converter import (
     validate_document_content,
     auto_bold_html_metrics,
 )
+from aegis.etls.category_registry import (
+    load_workbook_categories,
+    memoize_category_prompt,
+)
+from aegis.etls.rendering import render, warm_rendering_service
 from aegis.etls.key_themes.transcript_utils import (
     retrieve_full_section,
     SECTIONS_KEY_MD,
@@ -438,6 +443,7 @@ async def verify_and_get_availability(
         )
 
 
+@memoize_category_prompt
 def format_categories_for_prompt(categories: List[Dict[str, Any]]) -> str:
     """
     Format category dictionaries into standardized XML format for prompt injection.
@@ -511,48 +517,9 @@ def load_categories_from_xlsx(execution_id: str) -> List[Dict[str, Any]]:
         raise FileNotFoundError(f"Categories file not found: {xlsx_path}")
 
     try:
-        df = pd.read_excel(xlsx_path, sheet_name=0)
-
-        # Required columns for standard format
-        required_columns = ["transcript_sections", "category_name", "category_description"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"Missing required columns in {file_name}: {missing_columns}")
-
-        # Optional example columns
-        optional_columns = ["example_1", "example_2", "example_3"]
-        for col in optional_columns:
-            if col not in df.columns:
-                df[col] = ""  # Add empty column if not present
-
-        # Convert to list of dicts, ensuring all required fields are non-empty
-        categories = []
-        for idx, row in df.iterrows():
-            for col_name in required_columns:
-                if pd.isna(row[col_name]) or str(row[col_name]).strip() == "":
-                    raise ValueError(
-                        f"Missing value for '{col_name}' in {file_name} (row {idx + 2})"
-                    )
-
-            transcript_sections = str(row["transcript_sections"]).strip()
-            if transcript_sections not in VALID_SECTION_KEYS:
-                raise ValueError(
-                    f"Invalid transcript_sections '{transcript_sections}' "
-                    f"in {file_name} (row {idx + 2}). Must be one of: {VALID_SECTION_KEYS}"
-                )
-
-            category = {
-                "transcript_sections": transcript_sections,
-                "category_name": str(row["category_name"]).strip(),
-                "category_description": str(row["category_description"]).strip(),
-                "example_1": str(row["example_1"]).strip() if pd.notna(row["example_1"]) else "",
-                "example_2": str(row["example_2"]).strip() if pd.notna(row["example_2"]) else "",
-                "example_3": str(row["example_3"]).strip() if pd.notna(row["example_3"]) else "",
-            }
-            categories.append(category)
-
-        if not categories:
-            raise ValueError(f"No categories in {file_name}")
+        categories = load_workbook_categories(
+            xlsx_path, _parse_categories_workbook, namespace="key_themes"
+        )
 
         logger.info(
             "etl.key_themes.categories_loaded",
@@ -572,6 +539,63 @@ def load_categories_from_xlsx(execution_id: str) -> List[Dict[str, Any]]:
         raise RuntimeError(f"Failed to load categories from {xlsx_path}: {str(e)}") from e
 
 
+def _parse_categories_workbook(xlsx_path: str) -> List[Dict[str, Any]]:
+    """
+    Read and validate the key themes categories workbook.
+
+    Only runs when load_workbook_categories has no cached artifact for the file.
+
+    Args:
+        xlsx_path: Path to the categories workbook
+
+    Returns:
+        Validated category dictionaries in sheet order
+    """
+    file_name = os.path.basename(xlsx_path)
+    df = pd.read_excel(xlsx_path, sheet_name=0)
+
+    # Required columns for standard format
+    required_columns = ["transcript_sections", "category_name", "category_description"]
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns in {file_name}: {missing_columns}")
+
+    # Optional example columns
+    optional_columns = ["example_1", "example_2", "example_3"]
+    for col in optional_columns:
+        if col not in df.columns:
+            df[col] = ""  # Add empty column if not present
+
+    # Convert to list of dicts, ensuring all required fields are non-empty
+    categories = []
+    for idx, row in df.iterrows():
+        for col_name in required_columns:
+            if pd.isna(row[col_name]) or str(row[col_name]).strip() == "":
+                raise ValueError(f"Missing value for '{col_name}' in {file_name} (row {idx + 2})")
+
+        transcript_sections = str(row["transcript_sections"]).strip()
+        if transcript_sections not in VALID_SECTION_KEYS:
+            raise ValueError(
+                f"Invalid transcript_sections '{transcript_sections}' "
+                f"in {file_name} (row {idx + 2}). Must be one of: {VALID_SECTION_KEYS}"
+            )
+
+        category = {
+            "transcript_sections": transcript_sections,
+            "category_name": str(row["category_name"]).strip(),
+            "category_description": str(row["category_description"]).strip(),
+            "example_1": str(row["example_1"]).strip() if pd.notna(row["example_1"]) else "",
+            "example_2": str(row["example_2"]).strip() if pd.notna(row["example_2"]) else "",
+            "example_3": str(row["example_3"]).strip() if pd.notna(row["example_3"]) else "",
+        }
+        categories.append(category)
+
+    if not categories:
+        raise ValueError(f"No categories in {file_name}")
+
+    return categories
+
+
 @dataclass
 class QABlock:
     """Represents a single Q&A block with its extracted information."""
@@ -1496,6 +1520,8 @@ async def generate_key_themes(bank_name: str, fiscal_year: int, quarter: str) ->
         KeyThemesUserError: For expected errors (bad input, no data)
         KeyThemesSystemError: For unexpected system/infrastructure errors
     """
+    # Start the rendering workers now so they are warm when the documents are built
+    warm_rendering_service()
     marks = [("start", time.monotonic())]
     execution_id = str(uuid.uuid4())
     logger.info(
@@ -1602,13 +1628,14 @@ async def generate_key_themes(bank_name: str, fiscal_year: int, quarter: str) ->
         docx_filename = f"{filename_base}.docx"
         filepath = os.path.join(output_dir, docx_filename)
 
-        create_document(
-            theme_groups,
-            bank_info["bank_name"],
-            bank_info["bank_symbol"],
-            fiscal_year,
-            quarter,
-            filepath,
+        await render(
+            create_document,
+            theme_groups=theme_groups,
+            bank_name=bank_info["bank_name"],
+            bank_symbol=bank_info["bank_symbol"],
+            fiscal_year=fiscal_year,
+            quarter=quarter,
+            output_path=filepath,
         )
 
         marks.append(("document", time.monotonic()))
@@ -0,0 +1,176 @@
+"""
+Out-of-process rendering for ETL report documents.
+
+DOCX construction (python-docx table and border XML manipulation) and
+interactive HTML generation (serializing the full report state into the
+template) are CPU-bound and used to run directly on the event loop, stalling
+every other in-flight coroutine for the duration of a render. This module runs
+those builders in a shared ProcessPoolExecutor whose workers are started ahead
+of time with python-docx, the ETL document modules and their HTML templates
+already loaded.
+
+Builders must be module-level functions and take picklable arguments. The
+pool size is set with RENDERING_WORKERS; 0 renders on a thread of the calling
+process instead, for environments where spawning processes is not allowed.
+"""
+
+import asyncio
+import functools
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from aegis.utils.logging import get_logger
+from aegis.utils.settings import config
+
+logger = get_logger()
+
+# Modules imported in every worker before its first job. HTML modules also have
+# their templates read into the lru_cache so the first render pays no file I/O.
+WARM_MODULES = (
+    "docx",
+    "aegis.etls.call_summary.docx_export",
+    "aegis.etls.call_summary.interactive_html",
+    "aegis.etls.call_summary_editor.docx_export",
+    "aegis.etls.call_summary_editor.interactive_html",
+    "aegis.etls.cm_readthrough.docx_export",
+    "aegis.etls.cm_readthrough.interactive_html",
+    "aegis.etls.cm_readthrough_editor.docx_export",
+    "aegis.etls.cm_readthrough_editor.interactive_html",
+    "aegis.etls.key_themes.document_converter",
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _warm_worker(modules: tuple) -> None:
+    """
+    Process initializer: import rendering modules and preload their templates.
+
+    Warming is best effort. An exception escaping the initializer breaks the
+    whole pool, so any failure is logged and the module is left to load on
+    first use.
+    """
+    for module_name in modules:
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("etl.rendering.warm_import_failed", module=module_name, error=str(e))
+            continue
+        load_template = getattr(module, "_load_html_template", None)
+        if load_template is not None:
+            try:
+                load_template()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "etl.rendering.warm_template_failed", module=module_name, error=str(e)
+                )
+
+
+def _worker_ready() -> int:
+    """No-op job used to force worker start-up; returns the worker pid."""
+    return os.getpid()
+
+
+def render_to_file(builder: Callable[..., str], output_path: str, **kwargs: Any) -> int:
+    """
+    Run a string-returning builder and write its output inside the worker.
+
+    Writing in the worker avoids pickling the rendered document back to the
+    caller.
+
+    Args:
+        builder: Module-level function returning the document text
+        output_path: File to write
+        **kwargs: Keyword arguments for the builder
+
+    Returns:
+        Number of characters written
+    """
+    content = builder(**kwargs)
+    with open(output_path, "w", encoding="utf-8") as handle:
+        handle.write(content)
+    return len(content)
+
+
+def get_rendering_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the shared rendering pool, creating and warming it on first use.
+
+    Returns:
+        The process pool, or None when RENDERING_WORKERS is 0
+    """
+    global _executor  # pylint: disable=global-statement
+    workers = config.rendering.workers
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                # spawn: never fork a process that holds event-loop and pool threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+                initargs=(WARM_MODULES,),
+            )
+            # One no-op per worker starts the whole pool now rather than on first render
+            for _ in range(workers):
+                _executor.submit(_worker_ready)
+            logger.info("etl.rendering.pool_started", workers=workers)
+        return _executor
+
+
+async def render(builder: Callable[..., Any], /, **kwargs: Any) -> Any:
+    """
+    Run a document builder off the event loop.
+
+    Args:
+        builder: Module-level, picklable function to call
+        **kwargs: Picklable keyword arguments for the builder
+
+    Returns:
+        The builder's return value
+    """
+    call = functools.partial(builder, **kwargs)
+    executor = get_rendering_executor()
+    if executor is None:
+        return await asyncio.to_thread(call)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+    except BrokenProcessPool as e:
+        # A worker died; drop the pool so the next render starts a fresh one
+        _discard_executor(executor)
+        logger.warning(
+            "etl.rendering.pool_broken",
+            error=str(e),
+            builder=getattr(builder, "__name__", repr(builder)),
+        )
+        return await asyncio.to_thread(call)
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """Forget a broken pool (unless another caller already replaced it)."""
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def warm_rendering_service() -> None:
+    """Start the rendering workers ahead of the first report (no-op when disabled)."""
+    get_rendering_executor()
+
+
+def shutdown_rendering_service() -> None:
+    """Stop the rendering workers; the next render starts a fresh pool."""
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,239 @@
+"""
+Compact encoding of interactive report state for inlining into HTML.
+
+The interactive reports embed their full state (every finding of every bank
+with its per-bucket scores and review status) in the HTML file. Stored as
+plain JSON, most of that payload is repeated keys, bucket ids, speaker names
+and copies of the finding text. The compact format keeps the state exactly
+recoverable while removing the repetition:
+
+- Findings become positional rows. A presence mask selects which of
+  SENTENCE_FIELDS are stored, and unknown keys ride along in a trailing dict.
+- Bucket ids, speakers, statuses and section labels are interned into one
+  shared string table.
+- Per-bucket score dicts become flat [bucket, score, ...] arrays.
+- Fields that usually duplicate another field (verbatim_text, condensed,
+  span_id) are stored as 0 when they match.
+
+Each bank can additionally be gzipped and base64-encoded as its own chunk, so
+the report template's JS decompresses banks independently (in parallel, with
+the browser's DecompressionStream).
+
+decode_report_state is the Python mirror of the template decoder and is used
+to verify round trips.
+"""
+
+import base64
+import gzip
+import json
+from typing import Any, Dict, List, Tuple
+
+COMPACT_STATE_FORMAT = "aegis-compact-state/1"
+STATE_ENCODINGS = ("plain", "compact", "compact-gzip")
+
+# (key, kind) in row order. Kinds: raw, intern, intern_list, scores, same:<key>
+SENTENCE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("sid", "raw"),
+    ("text", "raw"),
+    ("verbatim_text", "same:text"),
+    ("condensed", "same:text"),
+    ("span_id", "same:sid"),
+    ("sentence_ids", "raw"),
+    ("source_block_id", "intern"),
+    ("parent_record_id", "intern"),
+    ("transcript_section", "intern"),
+    ("primary", "intern"),
+    ("selected_bucket_id", "intern"),
+    ("candidate_bucket_ids", "intern_list"),
+    ("scores", "scores"),
+    ("importance_score", "raw"),
+    ("status", "intern"),
+    ("emerging_topic", "raw"),
+    ("classification_error", "intern"),
+    ("para_idx", "raw"),
+    ("speaker", "intern"),
+    ("speaker_title", "intern"),
+    ("speaker_affiliation", "intern"),
+)
+_FIELD_KEYS = frozenset(key for key, _kind in SENTENCE_FIELDS)
+# Mask bit set when a row carries a trailing dict of keys outside SENTENCE_FIELDS
+_EXTRAS_BIT = 1 << len(SENTENCE_FIELDS)
+
+# Marker keys for encoded values inside a bank payload
+_ROWS_MARKER = "$s"
+_GZIP_MARKER = "$gz"
+
+
+class _StringTable:
+    """Assigns stable indices to repeated strings."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.strings)
+            self._index[value] = index
+            self.strings.append(value)
+        return index
+
+
+def _is_sentence_list(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and bool(value)
+        and all(isinstance(item, dict) and "sid" in item for item in value)
+    )
+
+
+def _encode_field(kind: str, value: Any, record: Dict[str, Any], table: _StringTable) -> Any:
+    if kind == "raw":
+        return value
+    if kind == "intern":
+        return table.intern(value) if isinstance(value, str) else [value]
+    if kind == "intern_list":
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return [table.intern(item) for item in value]
+        return {"v": value}
+    if kind == "scores":
+        if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+            flat: List[Any] = []
+            for bucket_id, score in value.items():
+                flat.extend((table.intern(bucket_id), score))
+            return flat
+        return {"v": value}
+    # same:<key>
+    reference_key = kind.split(":", 1)[1]
+    if reference_key in record:
+        reference = record[reference_key]
+        if type(value) is type(reference) and value == reference:
+            return 0
+    return value if isinstance(value, str) else [value]
+
+
+def _decode_field(kind: str, value: Any, record: Dict[str, Any], strings: List[str]) -> Any:
+    if kind == "raw":
+        return value
+    if kind == "intern":
+        return strings[value] if isinstance(value, int) else value[0]
+    if kind == "intern_list":
+        return [strings[item] for item in value] if isinstance(value, list) else value["v"]
+    if kind == "scores":
+        if isinstance(value, dict):
+            return value["v"]
+        return {strings[value[i]]: value[i + 1] for i in range(0, len(value), 2)}
+    reference_key = kind.split(":", 1)[1]
+    if value == 0 and not isinstance(value, bool):
+        return record[reference_key]
+    return value if isinstance(value, str) else value[0]
+
+
+def _encode_sentence(record: Dict[str, Any], table: _StringTable) -> List[Any]:
+    mask = 0
+    values: List[Any] = []
+    for bit, (key, kind) in enumerate(SENTENCE_FIELDS):
+        if key in record:
+            mask |= 1 << bit
+            values.append(_encode_field(kind, record[key], record, table))
+    extras = {key: value for key, value in record.items() if key not in _FIELD_KEYS}
+    if extras:
+        mask |= _EXTRAS_BIT
+        values.append(_encode_value(extras, table))
+    return [mask, *values]
+
+
+def _decode_sentence(row: List[Any], strings: List[str]) -> Dict[str, Any]:
+    mask = row[0]
+    position = 1
+    record: Dict[str, Any] = {}
+    for bit, (key, kind) in enumerate(SENTENCE_FIELDS):
+        if mask & (1 << bit):
+            # Reference fields (text, sid) always precede the fields that copy them
+            record[key] = _decode_field(kind, row[position], record, strings)
+            position += 1
+    if mask & _EXTRAS_BIT:
+        record.update(_decode_value(row[position], strings))
+    return record
+
+
+def _encode_value(value: Any, table: _StringTable) -> Any:
+    """Recursively encode every finding list found inside a bank payload."""
+    if _is_sentence_list(value):
+        return {_ROWS_MARKER: [_encode_sentence(record, table) for record in value]}
+    if isinstance(value, dict):
+        return {key: _encode_value(item, table) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_encode_value(item, table) for item in value]
+    return value
+
+
+def _decode_value(value: Any, strings: List[str]) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and _ROWS_MARKER in value:
+            return [_decode_sentence(row, strings) for row in value[_ROWS_MARKER]]
+        return {key: _decode_value(item, strings) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_value(item, strings) for item in value]
+    return value
+
+
+def _gzip_chunk(value: Any) -> Dict[str, str]:
+    raw = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return {_GZIP_MARKER: base64.b64encode(gzip.compress(raw, mtime=0)).decode("ascii")}
+
+
+def encode_report_state(state: Dict[str, Any], compress: bool = False) -> Dict[str, Any]:
+    """
+    Encode report state into the compact inline format.
+
+    Args:
+        state: Report state from build_report_state (not modified)
+        compress: Gzip and base64-encode each bank as a separate chunk
+
+    Returns:
+        Compact payload; decode_report_state(payload) == state
+    """
+    table = _StringTable()
+    banks = {
+        bank_id: _encode_value(bank, table) for bank_id, bank in (state.get("banks") or {}).items()
+    }
+    if compress:
+        banks = {bank_id: _gzip_chunk(bank) for bank_id, bank in banks.items()}
+    encoded_state = dict(state)
+    if "banks" in state:
+        encoded_state["banks"] = banks
+    return {
+        "format": COMPACT_STATE_FORMAT,
+        "strings": table.strings,
+        "sentence_fields": [list(field) for field in SENTENCE_FIELDS],
+        "state": encoded_state,
+    }
+
+
+def decode_report_state(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decode a compact payload back into report state.
+
+    Plain (already decoded) state is returned unchanged, matching the
+    template, which accepts both.
+
+    Args:
+        payload: Output of encode_report_state, or plain report state
+
+    Returns:
+        Report state
+    """
+    if payload.get("format") != COMPACT_STATE_FORMAT:
+        return payload
+    strings = payload["strings"]
+    state = dict(payload["state"])
+    if "banks" in state:
+        banks = {}
+        for bank_id, bank in state["banks"].items():
+            if isinstance(bank, dict) and set(bank) == {_GZIP_MARKER}:
+                bank = json.loads(gzip.decompress(base64.b64decode(bank[_GZIP_MARKER])))
+            banks[bank_id] = _decode_value(bank, strings)
+        state["banks"] = banks
+    return state
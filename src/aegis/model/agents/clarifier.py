@@ -9,14 +9,100 @@ This agent NEVER defaults - it always clarifies when uncertain.
 All bank and period data comes from the aegis_data_availability table.
 """
 
+import asyncio
 import json
-from typing import Any, Dict, List, Optional
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from ...connections.postgres_connector import fetch_all
 from ...connections.llm_connector import complete_with_tools
+from ...utils.context_window import is_summary_message
 from ...utils.logging import get_logger
 from ...utils.prompt_loader import load_prompt_from_db
 from ...utils.settings import config
+from .clarifier_fast_path import resolve_banks_and_periods
+
+BANKS_QUERY = """
+WITH unnested AS (
+    SELECT DISTINCT
+        bank_id,
+        bank_name,
+        bank_symbol,
+        bank_aliases,
+        bank_tags,
+        unnest(database_names) as database_name
+    FROM aegis_data_availability
+)
+SELECT
+    bank_id,
+    bank_name,
+    bank_symbol,
+    bank_aliases,
+    bank_tags,
+    array_agg(DISTINCT database_name) as all_databases
+FROM unnested
+GROUP BY bank_id, bank_name, bank_symbol, bank_aliases, bank_tags
+ORDER BY bank_id
+"""
+
+PERIODS_QUERY = """
+SELECT
+    bank_id,
+    bank_name,
+    bank_symbol,
+    fiscal_year,
+    quarter,
+    database_names
+FROM aegis_data_availability
+ORDER BY bank_id, fiscal_year DESC, quarter DESC
+"""
+
+# Availability snapshot: raw rows per query, shared by every request in this process
+_availability_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+async def _fetch_availability_rows(
+    execution_id: str, query: str, refresh: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Read aegis_data_availability rows through the per-process snapshot.
+
+    The table only changes when the availability sync runs, so the rows are
+    reused for CLARIFIER_AVAILABILITY_TTL seconds instead of being re-read on
+    every clarifier call.
+
+    Args:
+        execution_id: Cache key and execution ID for logging
+        query: Query to run on a miss
+        refresh: Bypass the snapshot and re-read the table
+
+    Returns:
+        Query rows (shared; callers must not modify them)
+    """
+    ttl = config.clarifier.availability_ttl
+    cached = _availability_cache.get(execution_id)
+    if cached and not refresh and ttl > 0 and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    rows = await fetch_all(query, execution_id=execution_id)
+    _availability_cache[execution_id] = (time.monotonic(), rows)
+    return rows
+
+
+async def warm_availability_snapshot() -> Dict[str, int]:
+    """
+    Load the bank and period availability snapshot ahead of the first request.
+
+    Returns:
+        Row counts loaded per query
+
+    Raises:
+        SQLAlchemyError: If the availability table cannot be read
+    """
+    banks = await _fetch_availability_rows("clarifier_banks", BANKS_QUERY, refresh=True)
+    periods = await _fetch_availability_rows("clarifier_periods", PERIODS_QUERY, refresh=True)
+    return {"banks": len(banks), "periods": len(periods)}
 
 
 async def load_banks_from_db(available_databases: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -32,31 +118,7 @@ async def load_banks_from_db(available_databases: Optional[List[str]] = None) ->
     logger = get_logger()
 
     try:
-        # Build query to get unique banks with their info
-        base_query = """
-        WITH unnested AS (
-            SELECT DISTINCT
-                bank_id,
-                bank_name,
-                bank_symbol,
-                bank_aliases,
-                bank_tags,
-                unnest(database_names) as database_name
-            FROM aegis_data_availability
-        )
-        SELECT
-            bank_id,
-            bank_name,
-            bank_symbol,
-            bank_aliases,
-            bank_tags,
-            array_agg(DISTINCT database_name) as all_databases
-        FROM unnested
-        GROUP BY bank_id, bank_name, bank_symbol, bank_aliases, bank_tags
-        ORDER BY bank_id
-        """
-
-        result = await fetch_all(base_query, execution_id="clarifier_banks")
+        result = await _fetch_availability_rows("clarifier_banks", BANKS_QUERY)
 
         banks_data = {"banks": {}, "categories": {}}
 
@@ -139,28 +201,8 @@ async def get_period_availability_from_db(
     logger = get_logger()
 
     try:
-        # Build query
-        query = """
-        SELECT
-            bank_id,
-            bank_name,
-            bank_symbol,
-            fiscal_year,
-            quarter,
-            database_names
-        FROM aegis_data_availability
-        WHERE 1=1
-        """
-
-        params = {}
-
-        if bank_ids:
-            query += " AND bank_id = ANY(:bank_ids)"
-            params["bank_ids"] = bank_ids
-
-        query += " ORDER BY bank_id, fiscal_year DESC, quarter DESC"
-
-        result = await fetch_all(query, params, execution_id="clarifier_periods")
+        result = await _fetch_availability_rows("clarifier_periods", PERIODS_QUERY)
+        wanted_banks = {str(bank_id) for bank_id in bank_ids} if bank_ids else None
 
         availability = {}
         latest_year = None
@@ -168,6 +210,8 @@ async def get_period_availability_from_db(
 
         for row in result:
             bank_id = str(row["bank_id"])
+            if wanted_banks is not None and bank_id not in wanted_banks:
+                continue
             bank_name = row["bank_name"]
             bank_symbol = row["bank_symbol"]
             fiscal_year = row["fiscal_year"]
@@ -553,6 +597,7 @@ async def extract_periods(
     available_databases: Optional[List[str]] = None,
     messages: Optional[List[Dict[str, str]]] = None,
     query_intent: Optional[str] = None,
+    period_availability: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Extract fiscal periods for the identified banks or check if period clarification is needed.
@@ -564,6 +609,7 @@ async def extract_periods(
         available_databases: Optional database filter
         messages: Full conversation history
         query_intent: Intent from banks extraction (includes period context from conversation)
+        period_availability: Optional pre-loaded availability (skips the database lookup)
 
     NEVER defaults - always clarifies when uncertain.
 
@@ -583,8 +629,11 @@ async def extract_periods(
             query_intent_preview=query_intent[:100] if query_intent else None,
         )
 
-        # Load period availability from database
-        period_availability = await get_period_availability_from_db(bank_ids, available_databases)
+        # Load period availability from database unless the caller already has it
+        if period_availability is None:
+            period_availability = await get_period_availability_from_db(
+                bank_ids, available_databases
+            )
 
         # Load clarifier_periods prompt from database with global composition
         clarifier_data = load_prompt_from_db(
@@ -1059,6 +1108,263 @@ def _create_bank_period_combinations(
     return combinations
 
 
+# Explicit period mentions that make speculative period extraction worthwhile.
+# Follow-ups without one rely on the bank extraction's query_intent for period context.
+_PERIOD_MENTION_PATTERN = re.compile(
+    r"\b(?:q[1-4]|fy\s?'?\d{2,4}|(?:19|20)\d{2}|"
+    r"(?:first|second|third|fourth|1st|2nd|3rd|4th|latest|last|most recent)\s+quarter)\b",
+    re.IGNORECASE,
+)
+
+
+def _mentions_explicit_period(query: str) -> bool:
+    """
+    Check whether the query names a fiscal period itself.
+
+    Args:
+        query: Latest user message
+
+    Returns:
+        True if the text contains a quarter, fiscal year or relative quarter reference
+    """
+    return bool(query and _PERIOD_MENTION_PATTERN.search(query))
+
+
+def _periods_available(
+    bank_id: Any, fiscal_year: Any, quarters: List[str], period_availability: Dict[str, Any]
+) -> bool:
+    """
+    Check that every requested quarter is available for a bank in at least one database.
+
+    Args:
+        bank_id: Bank ID to check
+        fiscal_year: Requested fiscal year
+        quarters: Requested quarters
+        period_availability: Output of get_period_availability_from_db
+
+    Returns:
+        True if all quarters for the fiscal year exist for the bank
+    """
+    bank_data = period_availability.get("availability", {}).get(str(bank_id))
+    if not bank_data or not quarters:
+        return False
+
+    available_quarters = set()
+    for years in bank_data.get("databases", {}).values():
+        for year, year_quarters in years.items():
+            if str(year) == str(fiscal_year):
+                available_quarters.update(year_quarters)
+
+    return all(quarter in available_quarters for quarter in quarters)
+
+
+def _validate_speculative_periods(
+    period_result: Optional[Dict[str, Any]],
+    bank_ids: List[Any],
+    period_availability: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """
+    Validate a speculative period extraction against the banks actually selected.
+
+    Speculative extraction runs against every bank in the availability snapshot,
+    so its answer is only reused when each selected bank has every chosen period.
+
+    Args:
+        period_result: Output of the speculative extract_periods call
+        bank_ids: Bank IDs returned by extract_banks
+        period_availability: Availability snapshot the speculative call used
+
+    Returns:
+        Period result narrowed to the selected banks, or None to fall back to
+        sequential extraction
+    """
+    if not period_result or period_result.get("status") != "success":
+        return None
+
+    periods = period_result.get("periods") or {}
+
+    if "apply_all" in periods:
+        fiscal_year = periods["apply_all"].get("fiscal_year")
+        quarters = periods["apply_all"].get("quarters", [])
+        if all(
+            _periods_available(bid, fiscal_year, quarters, period_availability) for bid in bank_ids
+        ):
+            return period_result
+        return None
+
+    selected = {str(bid) for bid in bank_ids}
+    narrowed = {
+        key: period_data
+        for key, period_data in periods.items()
+        if str(period_data.get("bank_id")) in selected
+    }
+    covered = {str(period_data.get("bank_id")) for period_data in narrowed.values()}
+    if covered != selected:
+        return None
+    if not all(
+        _periods_available(
+            period_data.get("bank_id"),
+            period_data.get("fiscal_year"),
+            period_data.get("quarters", []),
+            period_availability,
+        )
+        for period_data in narrowed.values()
+    ):
+        return None
+
+    return {**period_result, "periods": narrowed}
+
+
+async def _extract_banks_and_periods_speculatively(
+    query: str,
+    context: Dict[str, Any],
+    available_databases: Optional[List[str]],
+    messages: Optional[List[Dict[str, str]]],
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Run bank extraction and period extraction concurrently.
+
+    Period extraction starts against the full availability snapshot without
+    waiting for the bank result, then is validated once both calls return.
+
+    Args:
+        query: User's query text (latest message)
+        context: Runtime context
+        available_databases: Optional database filter
+        messages: Optional full conversation history for context
+
+    Returns:
+        Tuple of (bank_result, period_result). period_result is None when the
+        speculative answer cannot be reused and sequential extraction must run.
+    """
+    logger = get_logger()
+    execution_id = context.get("execution_id")
+
+    async def _speculative_periods() -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        snapshot = await get_period_availability_from_db(None, available_databases)
+        all_bank_ids = [
+            int(bid) if str(bid).isdigit() else bid for bid in snapshot.get("availability", {})
+        ]
+        if not all_bank_ids:
+            return snapshot, None
+        result = await extract_periods(
+            query,
+            all_bank_ids,
+            context,
+            available_databases,
+            messages,
+            None,
+            period_availability=snapshot,
+        )
+        return snapshot, result
+
+    bank_result, (snapshot, period_result) = await asyncio.gather(
+        extract_banks(query, context, available_databases, messages),
+        _speculative_periods(),
+    )
+
+    if bank_result["status"] == "success":
+        validated = _validate_speculative_periods(
+            period_result, bank_result.get("bank_ids", []), snapshot
+        )
+        logger.info(
+            "clarifier.speculative.resolved",
+            execution_id=execution_id,
+            reused=validated is not None,
+            speculative_status=period_result.get("status") if period_result else None,
+        )
+        return bank_result, validated
+
+    if bank_result["status"] == "needs_clarification" and period_result:
+        # Only the clarify-or-clear signal is needed here, which any bank scope answers
+        if period_result.get("status") in ("success", "needs_clarification"):
+            return bank_result, period_result
+
+    return bank_result, None
+
+
+def _is_first_turn(messages: Optional[List[Dict[str, str]]]) -> bool:
+    """
+    Check whether the latest message is the only user turn in the conversation.
+
+    Follow-ups can inherit banks or periods from earlier turns, so only first
+    turns are eligible for deterministic resolution. A rolling summary message
+    means earlier turns were folded out of the window, so it also rules out a
+    first turn.
+
+    Args:
+        messages: Windowed conversation history (latest message last)
+
+    Returns:
+        True if there is at most one user message and no summary of older turns
+    """
+    if not messages:
+        return True
+    if any(is_summary_message(msg) for msg in messages):
+        return False
+    return sum(1 for msg in messages if msg.get("role") == "user") <= 1
+
+
+async def _resolve_fast_path(
+    query: str,
+    context: Dict[str, Any],
+    available_databases: Optional[List[str]],
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Resolve banks and periods deterministically, skipping both LLM extraction calls.
+
+    Args:
+        query: User's query text (latest message)
+        context: Runtime context
+        available_databases: Optional database filter
+
+    Returns:
+        Bank-period combinations, or None to fall through to LLM extraction
+    """
+    logger = get_logger()
+    execution_id = context.get("execution_id")
+
+    banks_data = await load_banks_from_db(available_databases)
+    if not banks_data.get("banks"):
+        return None
+
+    resolved = resolve_banks_and_periods(query, banks_data)
+    if resolved is None:
+        return None
+    bank_ids, periods = resolved
+
+    period_availability = await get_period_availability_from_db(bank_ids, available_databases)
+    if not all(
+        _periods_available(bid, periods["fiscal_year"], periods["quarters"], period_availability)
+        for bid in bank_ids
+    ):
+        # Unavailable periods need the LLM's clarification wording
+        return None
+
+    bank_result = {
+        "status": "success",
+        "decision": "banks_selected",
+        "bank_ids": bank_ids,
+        "banks_detail": {bid: banks_data["banks"][bid] for bid in bank_ids},
+        "query_intent": query.strip(),
+    }
+    period_result = {
+        "status": "success",
+        "decision": "periods_selected",
+        "periods": {"apply_all": periods},
+    }
+
+    logger.info(
+        "clarifier.fast_path.resolved",
+        execution_id=execution_id,
+        bank_ids=bank_ids,
+        fiscal_year=periods["fiscal_year"],
+        quarters=periods["quarters"],
+    )
+
+    return _create_bank_period_combinations(bank_result, period_result)
+
+
 async def clarify_query(
     query: str,
     context: Dict[str, Any],
@@ -1139,8 +1445,21 @@ async def clarify_query(
             message="Clarifier received NO conversation messages from main",
         )
 
-    # Stage 1: Extract banks and query intent
-    bank_result = await extract_banks(query, context, available_databases, messages)
+    # Stage 0: Deterministic resolution for unambiguous first-turn queries
+    if config.clarifier.fast_path and _is_first_turn(messages):
+        fast_path_combinations = await _resolve_fast_path(query, context, available_databases)
+        if fast_path_combinations:
+            return fast_path_combinations
+
+    # Stage 1: Extract banks and query intent. When the query names a period, period
+    # extraction runs speculatively alongside it and is reused if it validates.
+    speculative_period_result = None
+    if config.clarifier.speculative_periods and _mentions_explicit_period(query):
+        bank_result, speculative_period_result = await _extract_banks_and_periods_speculatively(
+            query, context, available_databases, messages
+        )
+    else:
+        bank_result = await extract_banks(query, context, available_databases, messages)
 
     # Handle bank extraction error
     if bank_result["status"] == "error":
@@ -1155,9 +1474,11 @@ async def clarify_query(
         bank_ids = bank_result.get("bank_ids", [])
         query_intent = bank_result.get("query_intent", "")  # Get intent from banks extraction
 
-        period_result = await extract_periods(
-            query, bank_ids, context, available_databases, messages, query_intent
-        )
+        period_result = speculative_period_result
+        if period_result is None:
+            period_result = await extract_periods(
+                query, bank_ids, context, available_databases, messages, query_intent
+            )
 
         # Handle period extraction error
         if period_result.get("status") == "error":
@@ -1207,9 +1528,11 @@ async def clarify_query(
     elif bank_result["status"] == "needs_clarification":
         # Banks need clarification, check if periods also need clarification
         # No query_intent available yet since banks aren't identified
-        period_check = await extract_periods(
-            query, None, context, available_databases, messages, None
-        )
+        period_check = speculative_period_result
+        if period_check is None:
+            period_check = await extract_periods(
+                query, None, context, available_databases, messages, None
+            )
 
         # Collect clarification questions
         clarifications = []
@@ -0,0 +1,371 @@
+"""
+Deterministic fast path for the clarifier.
+
+Resolves banks and fiscal periods from the latest message without an LLM call
+when the text is unambiguous: every bank mention maps to exactly one bank (or a
+known category), and exactly one fiscal year with explicit quarters is named.
+Queries that pair different periods with different banks ("RBC Q1 and TD
+Q3") or exclude or contrast banks ("RBC excluding TD") are also left to the
+LLM, since a single bank set and period set cannot express them. Anything
+else returns None so the clarifier falls through to the LLM tools.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Quarter/year grammar. Two-digit years need an FY prefix or apostrophe ("FY25", "'25"),
+# or a leading quarter token ("3Q25"), so bare numbers like "25 bps" are never read as years.
+_YEAR = r"(?:(?:fy\s*|fiscal\s+(?:year\s+)?)?(?:20\d{2})|(?:fy\s*|')\d{2})"
+_QUARTER_YEAR_PATTERN = re.compile(rf"\bq([1-4])\s*(?:of\s+)?({_YEAR})\b", re.IGNORECASE)
+_YEAR_QUARTER_PATTERN = re.compile(rf"(?<![\w'])({_YEAR})\s*q([1-4])\b", re.IGNORECASE)
+_COMPACT_PATTERN = re.compile(r"\b([1-4])q\s*'?(\d{2}|20\d{2})\b", re.IGNORECASE)
+_QUARTER_PATTERN = re.compile(r"\bq([1-4])\b", re.IGNORECASE)
+_ORDINAL_QUARTER_PATTERN = re.compile(
+    r"\b(first|second|third|fourth|1st|2nd|3rd|4th)\s+quarter\b", re.IGNORECASE
+)
+_STANDALONE_YEAR_PATTERN = re.compile(rf"(?<![\w'])({_YEAR})\b", re.IGNORECASE)
+
+_ORDINAL_QUARTERS = {
+    "first": "Q1",
+    "1st": "Q1",
+    "second": "Q2",
+    "2nd": "Q2",
+    "third": "Q3",
+    "3rd": "Q3",
+    "fourth": "Q4",
+    "4th": "Q4",
+}
+
+# Relative, ranged or non-quarterly period language is left to the LLM
+_PERIOD_DISQUALIFIER_PATTERN = re.compile(
+    r"\b(?:calendar|h[12]|half|ytd|year[- ]to[- ]date|full[- ]year|annual|trailing|ttm|"
+    r"since|between|through|last|latest|previous|prior|recent|next|current|this\s+quarter)\b"
+    r"|\bq[1-4]\s*(?:-|–|to)\s*q[1-4]\b",
+    re.IGNORECASE,
+)
+
+# Exclusion or contrast between banks cannot be expressed as one bank set
+_NEGATION_PATTERN = re.compile(
+    r"\b(?:exclud(?:e|es|ed|ing)|excl|except|not|without|other\s+than|vs|versus)\b|n't\b",
+    re.IGNORECASE,
+)
+
+# Upper-case tokens that commonly appear in questions without naming a bank
+_COMMON_ACRONYMS = {
+    "AI",
+    "AUA",
+    "AUM",
+    "BPS",
+    "CAD",
+    "CEO",
+    "CFO",
+    "CRE",
+    "CRO",
+    "DCM",
+    "ECM",
+    "EPS",
+    "ESG",
+    "FX",
+    "FY",
+    "GAAP",
+    "HELOC",
+    "IB",
+    "IFRS",
+    "KPI",
+    "LCR",
+    "LTV",
+    "NII",
+    "NIM",
+    "NSFR",
+    "OCI",
+    "PCL",
+    "PPPT",
+    "PTPP",
+    "QOQ",
+    "ROA",
+    "ROE",
+    "RWA",
+    "TLAC",
+    "US",
+    "USA",
+    "USD",
+    "WM",
+    "YOY",
+}
+_ACRONYM_PATTERN = re.compile(r"\b[A-Z]{2,5}\b")
+_UNMATCHED_BANK_WORD_PATTERN = re.compile(r"\b\w*(?:bank|banque)\w*\b", re.IGNORECASE)
+_PROPER_NOUN_PATTERN = re.compile(r"\b[A-Z][a-z]+\b")
+_SENTENCE_START_PATTERN = re.compile(r"(?:^|[.?!:;]\s*)$")
+
+_MAX_CACHED_MATCHERS = 8
+_matcher_cache: Dict[str, "BankMatcher"] = {}
+
+
+def _normalize_year(raw: str) -> int:
+    """Convert a matched year token ("2025", "FY25", "'25", "fiscal 2025") to an int."""
+    digits = re.sub(r"\D", "", raw)
+    year = int(digits)
+    return year + 2000 if year < 100 else year
+
+
+def parse_fiscal_periods(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse an explicit fiscal year and quarter set from text.
+
+    Recognizes forms such as "Q3 2025", "Q3 FY25", "FY2025 Q3", "3Q25",
+    "Q2 and Q3 2025" and "third quarter of fiscal 2025".
+
+    Args:
+        text: Latest user message
+
+    Returns:
+        {"fiscal_year": int, "quarters": [...]} when exactly one fiscal year and
+        at least one quarter are named, otherwise None
+    """
+    if not text or _PERIOD_DISQUALIFIER_PATTERN.search(text):
+        return None
+
+    quarters: Set[str] = set()
+    years: Set[int] = set()
+
+    for match in _QUARTER_YEAR_PATTERN.finditer(text):
+        quarters.add(f"Q{match.group(1)}")
+        years.add(_normalize_year(match.group(2)))
+    for match in _YEAR_QUARTER_PATTERN.finditer(text):
+        years.add(_normalize_year(match.group(1)))
+        quarters.add(f"Q{match.group(2)}")
+    for match in _COMPACT_PATTERN.finditer(text):
+        quarters.add(f"Q{match.group(1)}")
+        years.add(_normalize_year(match.group(2)))
+    for match in _QUARTER_PATTERN.finditer(text):
+        quarters.add(f"Q{match.group(1)}")
+    for match in _ORDINAL_QUARTER_PATTERN.finditer(text):
+        quarters.add(_ORDINAL_QUARTERS[match.group(1).lower()])
+    for match in _STANDALONE_YEAR_PATTERN.finditer(text):
+        years.add(_normalize_year(match.group(1)))
+
+    if len(years) != 1 or not quarters:
+        return None
+
+    return {"fiscal_year": years.pop(), "quarters": sorted(quarters)}
+
+
+class BankMatcher:
+    """
+    Compiled matcher over bank names, aliases, symbols and category aliases.
+
+    Names and aliases match case-insensitively; symbols only match in upper
+    case so tickers such as "MS" or "ING" are not read from ordinary words.
+    Terms are alternated longest-first so "Bank of Montreal" wins over "Montreal".
+    """
+
+    def __init__(self, banks_data: Dict[str, Any]):
+        """
+        Build the matcher from load_banks_from_db output.
+
+        Args:
+            banks_data: {"banks": {...}, "categories": {...}} from the clarifier
+        """
+        self._name_terms: Dict[str, Set[Any]] = {}
+        self._symbol_terms: Dict[str, Set[Any]] = {}
+
+        for bank_id, info in banks_data.get("banks", {}).items():
+            for term in [info.get("name", "")] + list(info.get("aliases") or []):
+                self._add(self._name_terms, term.strip().lower(), {bank_id})
+            symbol = (info.get("symbol") or "").strip().upper()
+            for term in {symbol, symbol.split("-")[0]}:
+                if len(term) >= 2:
+                    self._add(self._symbol_terms, term, {bank_id})
+
+        for category in banks_data.get("categories", {}).values():
+            bank_ids = set(category.get("bank_ids", []))
+            for term in category.get("aliases", []):
+                self._add(self._name_terms, term.strip().lower(), bank_ids, category=True)
+
+        self._name_pattern = self._compile(self._name_terms, re.IGNORECASE)
+        self._symbol_pattern = self._compile(self._symbol_terms, 0)
+
+    @staticmethod
+    def _add(
+        terms: Dict[str, Set[Any]], term: str, bank_ids: Set[Any], category: bool = False
+    ) -> None:
+        """Register a term, marking it ambiguous when two banks share it."""
+        if not term:
+            return
+        key = f"category:{term}" if category else term
+        terms.setdefault(key, set()).update(bank_ids)
+
+    @staticmethod
+    def _compile(terms: Dict[str, Set[Any]], flags: int) -> Optional[re.Pattern]:
+        """Compile terms into a single longest-first alternation."""
+        literals = sorted({key.split(":", 1)[-1] for key in terms}, key=len, reverse=True)
+        if not literals:
+            return None
+        alternation = "|".join(re.escape(literal) for literal in literals)
+        return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", flags)
+
+    def _lookup(self, terms: Dict[str, Set[Any]], literal: str) -> Set[Any]:
+        """Return bank IDs for a matched literal, or an ambiguous multi-bank set."""
+        category_ids = terms.get(f"category:{literal}")
+        if category_ids:
+            return category_ids
+        return terms.get(literal, set())
+
+    def match(self, text: str) -> Optional[Tuple[List[Any], List[Tuple[int, int]]]]:
+        """
+        Resolve bank mentions in text.
+
+        Args:
+            text: Latest user message
+
+        Returns:
+            (sorted bank IDs, matched spans) when every mention is unambiguous,
+            or None if nothing matched or any non-category term maps to several banks
+        """
+        bank_ids: Set[Any] = set()
+        spans: List[Tuple[int, int]] = []
+
+        matches = []
+        if self._name_pattern is not None:
+            matches.extend(
+                (m, self._lookup(self._name_terms, m.group(0).lower()), m.group(0).lower())
+                for m in self._name_pattern.finditer(text)
+            )
+        if self._symbol_pattern is not None:
+            matches.extend(
+                (m, self._symbol_terms.get(m.group(0), set()), m.group(0))
+                for m in self._symbol_pattern.finditer(text)
+            )
+
+        for match, ids, literal in matches:
+            is_category = f"category:{literal}" in self._name_terms
+            if not ids or (len(ids) > 1 and not is_category):
+                return None
+            bank_ids.update(ids)
+            spans.append(match.span())
+
+        if not bank_ids:
+            return None
+        return sorted(bank_ids, key=lambda bid: (isinstance(bid, str), bid)), spans
+
+
+def get_bank_matcher(banks_data: Dict[str, Any]) -> BankMatcher:
+    """
+    Return a compiled matcher for this bank index, reusing one built earlier.
+
+    Args:
+        banks_data: Output of load_banks_from_db
+
+    Returns:
+        BankMatcher for the given banks and categories
+    """
+    fingerprint = hashlib.sha1(
+        json.dumps(banks_data, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    matcher = _matcher_cache.get(fingerprint)
+    if matcher is None:
+        if len(_matcher_cache) >= _MAX_CACHED_MATCHERS:
+            _matcher_cache.pop(next(iter(_matcher_cache)))
+        matcher = BankMatcher(banks_data)
+        _matcher_cache[fingerprint] = matcher
+    return matcher
+
+
+def has_unresolved_entities(text: str, spans: List[Tuple[int, int]]) -> bool:
+    """
+    Check for bank-like mentions the matcher did not cover.
+
+    Guards against silently dropping a bank the index has no alias for
+    (e.g. "RBC and Scotiabank" when only RBC is known). Deliberately
+    conservative: a false alarm only costs the normal LLM extraction.
+
+    Args:
+        text: Latest user message
+        spans: Character spans already matched to banks
+
+    Returns:
+        True if an unmatched bank word, mid-sentence proper noun or unknown
+        ticker-like token remains
+    """
+    residual = list(text)
+    for start, end in spans:
+        residual[start:end] = " " * (end - start)
+    remaining = "".join(residual)
+
+    if _UNMATCHED_BANK_WORD_PATTERN.search(remaining):
+        return True
+    for match in _PROPER_NOUN_PATTERN.finditer(remaining):
+        # Capitalized words mid-sentence are likely names the index does not know
+        if not _SENTENCE_START_PATTERN.search(remaining[: match.start()].rstrip()):
+            return True
+    for token in _ACRONYM_PATTERN.findall(remaining):
+        if token not in _COMMON_ACRONYMS:
+            return True
+    return False
+
+
+def _quarter_spans(text: str) -> List[Tuple[int, str]]:
+    """Return (position, quarter) for every quarter mention in text."""
+    mentions = [(m.start(), f"Q{m.group(1)}") for m in _QUARTER_PATTERN.finditer(text)]
+    mentions.extend((m.start(), f"Q{m.group(1)}") for m in _COMPACT_PATTERN.finditer(text))
+    mentions.extend(
+        (m.start(), _ORDINAL_QUARTERS[m.group(1).lower()])
+        for m in _ORDINAL_QUARTER_PATTERN.finditer(text)
+    )
+    return sorted(mentions)
+
+
+def has_paired_periods(text: str, spans: List[Tuple[int, int]]) -> bool:
+    """
+    Check whether different quarters are attached to different bank mentions.
+
+    "RBC Q1 2025 and TD Q3 2025" (or "Q1 for RBC and Q3 for TD") has a
+    quarter between two bank mentions; applying every quarter to every bank
+    would answer a different question.
+
+    Args:
+        text: Latest user message
+        spans: Character spans matched to banks
+
+    Returns:
+        True if several distinct quarters are interleaved with several bank mentions
+    """
+    quarters = _quarter_spans(text)
+    if len(spans) < 2 or len({quarter for _, quarter in quarters}) < 2:
+        return False
+    first_bank_end = min(end for _, end in spans)
+    last_bank_start = max(start for start, _ in spans)
+    return any(first_bank_end <= position < last_bank_start for position, _ in quarters)
+
+
+def resolve_banks_and_periods(
+    query: str, banks_data: Dict[str, Any]
+) -> Optional[Tuple[List[Any], Dict[str, Any]]]:
+    """
+    Resolve banks and periods from a query without calling an LLM.
+
+    Args:
+        query: Latest user message
+        banks_data: Output of load_banks_from_db
+
+    Returns:
+        (bank_ids, {"fiscal_year", "quarters"}) for an unambiguous query, else None
+    """
+    if not query or _NEGATION_PATTERN.search(query):
+        return None
+
+    periods = parse_fiscal_periods(query)
+    if periods is None:
+        return None
+
+    matched = get_bank_matcher(banks_data).match(query)
+    if matched is None:
+        return None
+
+    bank_ids, spans = matched
+    if has_unresolved_entities(query, spans) or has_paired_periods(query, spans):
+        return None
+
+    return bank_ids, periods
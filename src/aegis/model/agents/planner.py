@@ -12,6 +12,7 @@ from typing import Any, Dict, List, Optional
 
 from ...connections.postgres_connector import fetch_all
 from ...connections.llm_connector import complete_with_tools
+from ...utils.context_window import recent_history
 from ...utils.logging import get_logger
 from ...utils.prompt_loader import load_prompt_from_db
 from ...utils.settings import config
@@ -348,7 +349,7 @@ async def plan_database_queries(
 
         # Build conversation context for the planner
         conversation_context = "Previous conversation:\n"
-        for msg in conversation[-5:]:  # Last 5 messages for context
+        for msg in recent_history(conversation, 5):  # Last 5 messages for context
             conversation_context += f"{msg['role']}: {msg['content']}\n"
 
         # Load and format user prompt template
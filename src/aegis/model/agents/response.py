@@ -9,6 +9,7 @@ assistance about the Aegis system.
 from typing import Any, AsyncGenerator, Dict, List, Union
 
 from ...connections.llm_connector import complete, stream
+from ...utils.context_window import recent_history
 from ...utils.logging import get_logger
 from ...utils.prompt_loader import load_prompt_from_db
 
@@ -87,7 +88,7 @@ async def generate_response(
         messages = [{"role": "system", "content": system_prompt}]
 
         # Add recent conversation history (last 10 messages)
-        for msg in conversation_history[-10:]:
+        for msg in recent_history(conversation_history, 10):
             messages.append({"role": msg.get("role", "user"), "content": msg.get("content", "")})
 
         # Load and format user prompt template
@@ -9,8 +9,11 @@ import json
 from typing import Any, Dict, List
 
 from ...connections.llm_connector import complete_with_tools
+from ...utils.context_window import recent_history
 from ...utils.logging import get_logger
 from ...utils.prompt_loader import load_prompt_from_db
+from ...utils.settings import config
+from .router_cache import build_context_key, get_router_cache
 
 
 async def route_query(
@@ -33,6 +36,7 @@ async def route_query(
             "rationale": "Explanation of decision",
             "confidence": 0.0-1.0,
             "status": "Success" or "Error",
+            "cache": "exact", "similar" or "miss" (absent when caching is disabled),
             "error": Optional error message,
             "prompt_version": Prompt version string,
             "prompt_last_updated": Prompt last updated date
@@ -65,9 +69,7 @@ async def route_query(
 
         # Build user message from template (limit to last 10 messages for context)
         user_prompt_template = router_data.get("user_prompt", "")
-        conversation_json = json.dumps(
-            conversation_history[-10:] if conversation_history else [], indent=2
-        )
+        conversation_json = json.dumps(recent_history(conversation_history or [], 10), indent=2)
         user_content = user_prompt_template.format(
             conversation_history=conversation_json, current_query=latest_message
         )
@@ -100,8 +102,6 @@ async def route_query(
             }
 
         # Get model configuration (medium is optimal for fast binary decisions)
-        from ...utils.settings import config
-
         model_tier_override = context.get("model_tier_override")
         if model_tier_override == "small":
             model = config.llm.small.model
@@ -113,6 +113,40 @@ async def route_query(
             model = config.llm.medium.model  # Default to medium for speed and accuracy balance
             max_tokens = config.llm.medium.max_tokens
 
+        # Reuse a cached decision for the same (or a near-identical) turn in the same context
+        cache = get_router_cache() if config.router_cache.enabled else None
+        cache_context_key = None
+        if cache is not None:
+            cache_context_key = build_context_key(
+                conversation_history,
+                latest_message,
+                available_dbs,
+                prompt_version,
+                model,
+                config.router_cache.history_window,
+            )
+            cached = cache.get(cache_context_key, latest_message)
+            if cached is not None:
+                decision, match_type, similarity = cached
+                logger.info(
+                    "router.cache_hit",
+                    execution_id=execution_id,
+                    route=decision["route"],
+                    match_type=match_type,
+                    similarity=round(similarity, 3),
+                )
+                return {
+                    "status": "Success",
+                    **decision,
+                    "tokens_used": 0,
+                    "cost": 0,
+                    "response_time_ms": 0,
+                    "model_used": model,
+                    "prompt_version": prompt_version,
+                    "prompt_last_updated": prompt_last_updated,
+                    "cache": match_type,
+                }
+
         # Attempt tool call up to 3 times (initial + 2 retries)
         max_attempts = 3
         tokens_used = 0
@@ -168,10 +202,18 @@ async def route_query(
                             cost=cost,
                         )
 
+                        if cache is not None:
+                            cache.put(
+                                cache_context_key,
+                                latest_message,
+                                {"route": route, "rationale": rationale},
+                            )
+
                         return {
                             "status": "Success",
                             "route": route,
                             "rationale": rationale,
+                            "cache": "miss" if cache is not None else None,
                             "tokens_used": tokens_used,
                             "cost": cost,
                             "response_time_ms": metrics.get("response_time", 0) * 1000,
@@ -0,0 +1,274 @@
+"""
+Routing decision cache for the router agent.
+
+Caches successful routing decisions keyed on the normalized latest message,
+a hash of the recent conversation history, the database filter and the router
+prompt version. Lookups try an exact match first, then a similarity match
+against other messages cached for the same conversation context.
+
+Similarity is a local character-trigram cosine rather than an embedding call,
+so a cache lookup never adds a network round trip of its own.
+"""
+
+import hashlib
+import json
+import math
+import re
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ...utils.settings import config
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t\n.,!?;:\"'`"
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a message for cache keys.
+
+    Args:
+        message: Raw message text
+
+    Returns:
+        Lowercased, NFKC-normalized text with collapsed whitespace and no
+        leading/trailing punctuation
+    """
+    text = unicodedata.normalize("NFKC", message or "").lower()
+    text = _WHITESPACE_PATTERN.sub(" ", text)
+    return text.strip(_EDGE_PUNCTUATION)
+
+
+def _trigram_vector(text: str) -> Counter:
+    """Build a character-trigram count vector for similarity scoring."""
+    padded = f"  {text} "
+    return Counter(padded[i : i + 3] for i in range(len(padded) - 2))  # noqa: E203
+
+
+def _cosine(left: Counter, right: Counter) -> float:
+    """Cosine similarity between two sparse count vectors."""
+    if not left or not right:
+        return 0.0
+    if len(left) > len(right):
+        left, right = right, left
+    dot = sum(count * right.get(gram, 0) for gram, count in left.items())
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(c * c for c in left.values())) * math.sqrt(
+        sum(c * c for c in right.values())
+    )
+    return dot / norm
+
+
+def build_context_key(
+    conversation_history: List[Dict[str, str]],
+    latest_message: str,
+    available_databases: Optional[List[str]],
+    prompt_version: str,
+    model: str,
+    history_window: int,
+) -> str:
+    """
+    Hash everything besides the latest message that influences the routing decision.
+
+    Args:
+        conversation_history: Conversation passed to the router (may end with the latest message)
+        latest_message: The current user query
+        available_databases: Database filter for this request
+        prompt_version: Router prompt version
+        model: Model used for routing
+        history_window: Number of prior messages to include
+
+    Returns:
+        Hex digest identifying the conversation context
+    """
+    prior = list(conversation_history or [])
+    latest = normalize_message(latest_message)
+    if prior and normalize_message(prior[-1].get("content", "")) == latest:
+        prior = prior[:-1]
+    recent = prior[-history_window:] if history_window > 0 else []
+
+    payload = {
+        "history": [
+            {"role": msg.get("role"), "content": normalize_message(msg.get("content", ""))}
+            for msg in recent
+        ],
+        "databases": sorted(available_databases or []),
+        "prompt_version": prompt_version,
+        "model": model,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _CacheEntry:
+    """A cached routing decision."""
+
+    decision: Dict[str, Any]
+    vector: Counter
+    expires_at: float
+
+
+class RouterDecisionCache:
+    """
+    Bounded TTL cache of routing decisions with exact and similarity lookup.
+
+    Entries are evicted when they expire or, once max_entries is reached, in
+    least-recently-used order.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int, similarity_threshold: float):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl_seconds: Lifetime of each entry
+            max_entries: Maximum number of cached decisions
+            similarity_threshold: Minimum trigram cosine for a similarity hit (0-1)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[Tuple[str, str], _CacheEntry]" = OrderedDict()
+        self._by_context: Dict[str, Set[str]] = {}
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        """Drop an entry and its context index reference."""
+        self._entries.pop(key, None)
+        messages = self._by_context.get(key[0])
+        if messages is not None:
+            messages.discard(key[1])
+            if not messages:
+                del self._by_context[key[0]]
+
+    def get(self, context_key: str, message: str) -> Optional[Tuple[Dict[str, Any], str, float]]:
+        """
+        Look up a routing decision.
+
+        Args:
+            context_key: Output of build_context_key
+            message: Latest user message (raw)
+
+        Returns:
+            (decision, match_type, similarity) on a hit, where match_type is
+            "exact" or "similar", otherwise None
+        """
+        now = time.monotonic()
+        normalized = normalize_message(message)
+        key = (context_key, normalized)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry.decision, "exact", 1.0
+            self._remove(key)
+
+        vector = _trigram_vector(normalized)
+        best_key = None
+        best_score = 0.0
+        for candidate in list(self._by_context.get(context_key, ())):
+            candidate_key = (context_key, candidate)
+            candidate_entry = self._entries[candidate_key]
+            if candidate_entry.expires_at <= now:
+                self._remove(candidate_key)
+                continue
+            score = _cosine(vector, candidate_entry.vector)
+            if score > best_score:
+                best_key, best_score = candidate_key, score
+
+        if best_key is not None and best_score >= self.similarity_threshold:
+            self._entries.move_to_end(best_key)
+            self.similar_hits += 1
+            return self._entries[best_key].decision, "similar", best_score
+
+        self.misses += 1
+        return None
+
+    def put(self, context_key: str, message: str, decision: Dict[str, Any]) -> None:
+        """
+        Store a routing decision.
+
+        Args:
+            context_key: Output of build_context_key
+            message: Latest user message (raw)
+            decision: Routing decision fields to replay on a hit
+        """
+        normalized = normalize_message(message)
+        key = (context_key, normalized)
+        self._remove(key)
+        self._entries[key] = _CacheEntry(
+            decision=dict(decision),
+            vector=_trigram_vector(normalized),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._by_context.setdefault(context_key, set()).add(normalized)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache size and hit-rate metrics.
+
+        Returns:
+            Dict with entry count, hit/miss counters and hit_rate
+        """
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.exact_hits + self.similar_hits) / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        self._entries.clear()
+        self._by_context.clear()
+        self.exact_hits = self.similar_hits = self.misses = self.evictions = 0
+
+
+_router_cache: Optional[RouterDecisionCache] = None
+
+
+def get_router_cache() -> RouterDecisionCache:
+    """
+    Get the process-wide router decision cache, creating it from settings.
+
+    Returns:
+        Shared RouterDecisionCache instance
+    """
+    global _router_cache  # pylint: disable=global-statement
+    # Single shared cache so repeated requests in this process reuse decisions.
+    if _router_cache is None:
+        _router_cache = RouterDecisionCache(
+            ttl_seconds=config.router_cache.ttl_seconds,
+            max_entries=config.router_cache.max_entries,
+            similarity_threshold=config.router_cache.similarity_threshold,
+        )
+    return _router_cache
+
+
+def get_router_cache_stats() -> Dict[str, Any]:
+    """
+    Get hit-rate metrics for the router decision cache.
+
+    Returns:
+        Cache statistics, or {"enabled": False} when caching is disabled
+    """
+    if not config.router_cache.enabled:
+        return {"enabled": False}
+    return {"enabled": True, **get_router_cache().stats()}
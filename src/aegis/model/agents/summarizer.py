@@ -8,6 +8,7 @@ original query while preserving source attribution.
 
 from typing import Any, AsyncGenerator, Dict, List
 from ...connections.llm_connector import stream
+from ...utils.context_window import recent_history
 from ...utils.logging import get_logger
 from ...utils.prompt_loader import load_prompt_from_db
 
@@ -98,7 +99,7 @@ Response:
         messages = [{"role": "system", "content": system_prompt}]
 
         # Add limited conversation history for context (last 5 messages)
-        for msg in conversation_history[-5:]:
+        for msg in recent_history(conversation_history, 5):
             messages.append({"role": msg.get("role", "user"), "content": msg.get("content", "")})
 
         # Add user message with database responses and synthesis request
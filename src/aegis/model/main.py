@@ -7,10 +7,12 @@ the agent pipeline for processing requests.
 
 import uuid
 import asyncio
+from contextlib import aclosing
 from datetime import datetime, timezone
 from typing import Any, Dict, AsyncGenerator, List, Optional, Union
 
 from ..connections.oauth_connector import setup_authentication
+from ..utils.context_window import window_messages
 from ..utils.conversation import process_conversation
 from ..utils.database_filter import filter_databases, get_database_prompt
 from ..utils.logging import setup_logging, get_logger
@@ -19,9 +21,10 @@ from ..utils.monitor import (
     initialize_monitor,
     post_monitor_entries_async,
 )
+from ..utils import sql_prompt
 from ..utils.settings import config
 from ..utils.ssl import setup_ssl
-from ..utils.sql_prompt import postgresql_prompts
+from ..utils.streaming import StreamTiming, merge_streams
 from .agents import route_query, generate_response, clarify_query, synthesize_responses
 import re
 
@@ -151,8 +154,9 @@ async def model(
     setup_logging()
     logger = get_logger()
 
-    # Initialize PostgreSQL prompts cache
-    postgresql_prompts()
+    # Reuse this worker's prompt cache (loaded at warmup); load it on first use
+    if sql_prompt.prompt_manager is None:
+        sql_prompt.postgresql_prompts()
 
     # Generate execution ID for this request
     execution_id = str(uuid.uuid4())
@@ -233,9 +237,20 @@ async def model(
             "messages_in": processed_conversation.get("original_message_count", 0),
             "messages_out": processed_conversation.get("message_count", 0),
             "has_latest_message": bool(processed_conversation.get("latest_message")),
+            "history_tokens": processed_conversation.get("history_tokens", 0),
+            "summarized_messages": processed_conversation.get("summarized_message_count", 0),
+            "has_summary": bool(processed_conversation.get("summary")),
         },
     )
 
+    def agent_history(agent: str) -> List[Dict[str, str]]:
+        """History view for one agent, trimmed to its token budget."""
+        return window_messages(
+            processed_conversation.get("messages", []),
+            processed_conversation.get("summary", ""),
+            agent,
+        )
+
     # Stage 4: Process database filters (internal - no yield)
     logger.info("model.stage.filter_processing.started", execution_id=execution_id)
     filter_start = datetime.now(timezone.utc)
@@ -292,7 +307,7 @@ async def model(
 
     # Get routing decision
     routing_decision = await route_query(
-        conversation_history=processed_conversation.get("messages", []),
+        conversation_history=agent_history("router"),
         latest_message=processed_conversation.get("latest_message", {}).get("content", ""),
         context=router_context,
     )
@@ -302,6 +317,7 @@ async def model(
         execution_id=execution_id,
         route=routing_decision.get("route"),
         confidence=routing_decision.get("confidence"),
+        cache=routing_decision.get("cache"),
     )
 
     # Format LLM call info if we have tokens
@@ -329,6 +345,7 @@ async def model(
         custom_metadata={
             "route": routing_decision.get("route"),
             "confidence": routing_decision.get("confidence"),
+            "cache": routing_decision.get("cache"),
         },
     )
 
@@ -347,7 +364,7 @@ async def model(
 
         # Stream response from response agent
         response_generator = await generate_response(
-            conversation_history=processed_conversation.get("messages", []),
+            conversation_history=agent_history("response"),
             latest_message=processed_conversation.get("latest_message", {}).get("content", ""),
             context=response_context,
             streaming=True,
@@ -420,7 +437,7 @@ async def model(
             query=processed_conversation.get("latest_message", {}).get("content", ""),
             context=clarifier_context,
             available_databases=list(filtered_databases.keys()),
-            messages=processed_conversation.get("messages", []),
+            messages=agent_history("clarifier"),
         )
 
         # Determine status based on result type
@@ -570,7 +587,7 @@ async def model(
             # Call planner with new standardized format
             planner_result = await plan_database_queries(
                 query=processed_conversation.get("latest_message", {}).get("content", ""),
-                conversation=processed_conversation.get("messages", []),
+                conversation=agent_history("planner"),
                 bank_period_combinations=bank_period_combinations,
                 context=planner_context,
                 available_databases=list(filtered_databases.keys()),
@@ -656,119 +673,121 @@ async def model(
                 # Import subagent mapping
                 from .subagents import SUBAGENT_MAPPING
 
-                # Create a queue for collecting subagent outputs
-                output_queue = asyncio.Queue()
                 # Collect all database responses for summarization
                 database_responses = []
+                subagent_history = agent_history("subagents")
 
-                async def run_subagent(database_id, queue, response_collector):
-                    """Run a single subagent and put outputs in the queue."""
-                    async with invocation_semaphore:  # Limit concurrency per request
-                        subagent_start = datetime.now(timezone.utc)
-                        # Normalize database_id to lowercase for consistency
-                        normalized_db_id = database_id.lower()
-
-                        try:
-                            # Apply 200 second timeout for subagent execution
-                            async with asyncio.timeout(200):
-                                # Add monitoring entry for subagent start
-                                logger.info(
-                                    f"subagent.{normalized_db_id}.started",
-                                    execution_id=execution_id,
-                                    database_id=normalized_db_id,
-                                )
+                async def stream_subagent(database_id, response_collector):
+                    """Run a single subagent, yielding its chunks as they are produced."""
+                    # Normalize database_id to lowercase for consistency
+                    normalized_db_id = database_id.lower()
+                    subagent_start = datetime.now(timezone.utc)
+                    timing = StreamTiming(name=normalized_db_id, started_at=subagent_start)
+                    deadline = config.subagents.timeout_for(normalized_db_id)
 
-                                # Get the appropriate subagent function using normalized ID
-                                subagent_func = SUBAGENT_MAPPING.get(normalized_db_id)
-
-                                if not subagent_func:
-                                    await queue.put(
-                                        {
-                                            "type": "subagent",
-                                            "name": normalized_db_id,
-                                            "content": (
-                                                f"⚠️ No subagent found for database: {normalized_db_id}\n"
-                                            ),
-                                        }
-                                    )
-                                    return
-
-                                # Collect the full response for this database
-                                full_response = ""
-
-                                # Call the subagent with new standardized format
-                                # Now both basic_intent and full_intent use the clarifier's comprehensive intent
-                                async for chunk in subagent_func(
-                                    conversation=processed_conversation.get("messages", []),
-                                    latest_message=processed_conversation.get("latest_message", {}).get(
-                                        "content", ""
-                                    ),
-                                    bank_period_combinations=bank_period_combinations,
-                                    basic_intent=clarifier_intent,  # Comprehensive intent from clarifier
-                                    full_intent=clarifier_intent,  # Same comprehensive intent
-                                    database_id=normalized_db_id,
-                                    context=planner_context,
-                                ):
-                                    await queue.put(chunk)
-                                    # Collect content for summarization
-                                    if chunk.get("type") == "subagent" and chunk.get("content"):
-                                        full_response += chunk["content"]
-
-                                # Store the complete response for summarization
-                                response_collector.append(
-                                    {
-                                        "database_id": normalized_db_id,
-                                        "full_intent": clarifier_intent,
-                                        "response": full_response,
-                                    }
-                                )
+                    try:
+                        # Apply the per-subagent deadline to the whole stream
+                        async with asyncio.timeout(deadline):
+                            logger.info(
+                                f"subagent.{normalized_db_id}.started",
+                                execution_id=execution_id,
+                                database_id=normalized_db_id,
+                                timeout_seconds=deadline,
+                            )
 
-                                # Add monitoring entry for successful subagent completion
-                                add_monitor_entry(
-                                    stage_name=f"Subagent_{normalized_db_id}",
-                                    stage_start_time=subagent_start,
-                                    stage_end_time=datetime.now(timezone.utc),
-                                    status="Success",
-                                    decision_details=f"Retrieved data from {normalized_db_id}",
-                                    custom_metadata={
-                                        "database_id": normalized_db_id,
-                                        "response_length": len(full_response),
-                                    },
-                                )
+                            # Get the appropriate subagent function using normalized ID
+                            subagent_func = SUBAGENT_MAPPING.get(normalized_db_id)
 
-                        except Exception as e:
-                            logger.error(f"subagent.{normalized_db_id}.error", error=str(e))
-                            await queue.put(
-                                {
+                            if not subagent_func:
+                                yield {
                                     "type": "subagent",
                                     "name": normalized_db_id,
-                                    "content": f"⚠️ Error in {normalized_db_id}: {str(e)}\n",
+                                    "content": (
+                                        f"⚠️ No subagent found for database: {normalized_db_id}\n"
+                                    ),
                                 }
-                            )
-                            # Still add error response for summarization
+                                return
+
+                            # Collect the full response for this database
+                            full_response = ""
+
+                            # Call the subagent with new standardized format
+                            # Now both basic_intent and full_intent use the clarifier's comprehensive intent
+                            async for chunk in subagent_func(
+                                conversation=subagent_history,
+                                latest_message=processed_conversation.get("latest_message", {}).get(
+                                    "content", ""
+                                ),
+                                bank_period_combinations=bank_period_combinations,
+                                basic_intent=clarifier_intent,  # Comprehensive intent from clarifier
+                                full_intent=clarifier_intent,  # Same comprehensive intent
+                                database_id=normalized_db_id,
+                                context=planner_context,
+                            ):
+                                timing.record_chunk()
+                                yield chunk
+                                # Collect content for summarization
+                                if chunk.get("type") == "subagent" and chunk.get("content"):
+                                    full_response += chunk["content"]
+
+                            # Store the complete response for summarization
                             response_collector.append(
                                 {
                                     "database_id": normalized_db_id,
                                     "full_intent": clarifier_intent,
-                                    "response": f"Error retrieving data: {str(e)}",
+                                    "response": full_response,
                                 }
                             )
 
-                            # Add monitoring entry for failed subagent
+                            # Add monitoring entry for successful subagent completion
                             add_monitor_entry(
                                 stage_name=f"Subagent_{normalized_db_id}",
                                 stage_start_time=subagent_start,
                                 stage_end_time=datetime.now(timezone.utc),
-                                status="Error",
-                                decision_details=f"Failed to retrieve data from {normalized_db_id}",
-                                error_message=str(e),
+                                status="Success",
+                                decision_details=f"Retrieved data from {normalized_db_id}",
                                 custom_metadata={
                                     "database_id": normalized_db_id,
+                                    "response_length": len(full_response),
+                                    "timeout_seconds": deadline,
+                                    **timing.to_metadata(),
                                 },
                             )
-                        finally:
-                            # Signal this subagent is done
-                            await queue.put({"type": "done", "database_id": normalized_db_id})
+
+                    except Exception as e:
+                        if isinstance(e, TimeoutError):
+                            error_text = f"timed out after {deadline} seconds"
+                        else:
+                            error_text = str(e)
+                        logger.error(f"subagent.{normalized_db_id}.error", error=error_text)
+                        yield {
+                            "type": "subagent",
+                            "name": normalized_db_id,
+                            "content": f"⚠️ Error in {normalized_db_id}: {error_text}\n",
+                        }
+                        # Still add error response for summarization
+                        response_collector.append(
+                            {
+                                "database_id": normalized_db_id,
+                                "full_intent": clarifier_intent,
+                                "response": f"Error retrieving data: {error_text}",
+                            }
+                        )
+
+                        # Add monitoring entry for failed subagent
+                        add_monitor_entry(
+                            stage_name=f"Subagent_{normalized_db_id}",
+                            stage_start_time=subagent_start,
+                            stage_end_time=datetime.now(timezone.utc),
+                            status="Error",
+                            decision_details=f"Failed to retrieve data from {normalized_db_id}",
+                            error_message=error_text,
+                            custom_metadata={
+                                "database_id": normalized_db_id,
+                                "timeout_seconds": deadline,
+                                **timing.to_metadata(),
+                            },
+                        )
 
                 # Send ALL subagent_start signals at once (creates all dropdowns immediately)
                 # This ensures dropdowns appear simultaneously in the UI
@@ -780,62 +799,43 @@ async def model(
                         "name": database_id.lower(),
                     }
 
-                # Per-invocation concurrency limit (max 5 concurrent subagents per request)
-                invocation_semaphore = asyncio.Semaphore(5)
-
-                # Now start tasks for each subagent to run concurrently
-                tasks = []
-                active_subagents = set()
-
-                for database_id in databases:
-                    active_subagents.add(database_id)
-
-                    task = asyncio.create_task(
-                        run_subagent(database_id, output_queue, database_responses)
-                    )
-                    tasks.append(task)
-
                 # Collect S3 file info from reports subagent
                 s3_files_found = []
 
-                # Stream outputs from all subagents as they arrive
-                while active_subagents:
-                    try:
-                        # Get next message from any subagent with timeout
-                        msg = await asyncio.wait_for(output_queue.get(), timeout=0.1)
+                # Stream outputs from all subagents as they arrive. The merged stream ends
+                # when the last subagent finishes; closing it (e.g. on client disconnect)
+                # cancels any subagents still running.
+                subagent_streams = {
+                    database_id.lower(): stream_subagent(database_id, database_responses)
+                    for database_id in databases
+                }
+                async with aclosing(
+                    merge_streams(
+                        subagent_streams, max_concurrency=config.subagents.max_concurrency
+                    )
+                ) as merged:
+                    async for database_id, msg in merged:
+                        # Extract S3 info before processing (only from reports subagent)
+                        if (
+                            msg.get("type") == "subagent"
+                            and msg.get("name") == "reports"
+                            and msg.get("content")
+                        ):
+                            found_files = extract_s3_info(msg["content"])
+                            if found_files:
+                                s3_files_found.extend(found_files)
+
+                        # Process S3 links in subagent content before yielding
+                        if msg.get("type") == "subagent" and msg.get("content"):
+                            msg["content"] = process_s3_links(msg["content"])
+                        # Stream the message
+                        yield msg
 
-                        if msg.get("type") == "done":
-                            # A subagent finished
-                            database_id = msg.get("database_id")
-                            active_subagents.discard(database_id)
-                            logger.info(
-                                f"subagent.{database_id}.finished",
-                                execution_id=execution_id,
-                                remaining=len(active_subagents),
-                            )
-                        else:
-                            # Extract S3 info before processing (only from reports subagent)
-                            if (
-                                msg.get("type") == "subagent"
-                                and msg.get("name") == "reports"
-                                and msg.get("content")
-                            ):
-                                found_files = extract_s3_info(msg["content"])
-                                if found_files:
-                                    s3_files_found.extend(found_files)
-
-                            # Process S3 links in subagent content before yielding
-                            if msg.get("type") == "subagent" and msg.get("content"):
-                                msg["content"] = process_s3_links(msg["content"])
-                            # Stream the message
-                            yield msg
-                    except asyncio.TimeoutError:
-                        # Timeout - check if tasks are still running
-                        if all(task.done() for task in tasks):
-                            break
-
-                # Wait for all tasks to complete
-                await asyncio.gather(*tasks, return_exceptions=True)
+                logger.info(
+                    "model.subagents.finished",
+                    execution_id=execution_id,
+                    subagent_count=len(subagent_streams),
+                )
 
                 # After all subagents complete, synthesize the responses
                 if database_responses:
@@ -862,7 +862,7 @@ async def model(
 
                     # Stream the synthesized response (continues in same bubble as "Retrieving...")
                     async for chunk in synthesize_responses(
-                        conversation_history=processed_conversation.get("messages", []),
+                        conversation_history=agent_history("summarizer"),
                         latest_message=processed_conversation.get("latest_message", {}).get(
                             "content", ""
                         ),
@@ -0,0 +1,244 @@
+"""
+Pluggable candidate reranking shared by retrieval subagents.
+
+Subagents decide what a candidate is and how the LLM should judge it; the
+backend decides how removals are chosen. The "llm" backend wraps a subagent's
+tool-call reranker. The "local" backend scores candidates on CPU from
+query-term overlap and the retrieval score already attached to each candidate
+(embedding similarity or fused hybrid score), so it costs no LLM round trip.
+Both backends go through the same min-keep floor.
+
+The backend is selected with RERANK_BACKEND.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from ...utils.settings import config
+
+RERANK_BACKENDS = ("llm", "local")
+
+Candidate = Dict[str, Any]
+RemovalFn = Callable[[str, List[Candidate], Dict[str, Any]], Awaitable[Set[int]]]
+TextFn = Callable[[Candidate], str]
+ScoreFn = Callable[[Candidate], float]
+
+_TERM_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_STOPWORDS = frozenset(
+    {
+        "about",
+        "and",
+        "are",
+        "for",
+        "from",
+        "has",
+        "have",
+        "how",
+        "the",
+        "their",
+        "this",
+        "was",
+        "were",
+        "what",
+        "which",
+        "with",
+    }
+)
+
+
+def query_terms(text: str) -> Set[str]:
+    """
+    Extract the distinctive terms of a query.
+
+    Args:
+        text: Query text
+
+    Returns:
+        Lowercased alphanumeric terms of at least three characters, minus stopwords
+    """
+    return {
+        term
+        for term in _TERM_PATTERN.findall((text or "").lower())
+        if len(term) >= 3 and term not in _STOPWORDS
+    }
+
+
+def lexical_overlap(terms: Set[str], text: str) -> float:
+    """
+    Fraction of query terms that appear in a candidate's text.
+
+    Args:
+        terms: Output of query_terms for the query
+        text: Candidate text
+
+    Returns:
+        Overlap in 0.0-1.0 (0.0 when the query has no terms)
+    """
+    if not terms:
+        return 0.0
+    return len(terms & set(_TERM_PATTERN.findall((text or "").lower()))) / len(terms)
+
+
+class Reranker(ABC):
+    """Chooses which retrieval candidates to drop before expansion and synthesis."""
+
+    name = ""
+
+    @abstractmethod
+    async def removals(
+        self, query: str, candidates: List[Candidate], context: Dict[str, Any]
+    ) -> Set[int]:
+        """
+        Choose candidates to remove.
+
+        Args:
+            query: Search query the candidates were retrieved for
+            candidates: Retrieved candidates in retrieval order
+            context: Execution context
+
+        Returns:
+            Indices into candidates to remove
+        """
+
+
+class LLMReranker(Reranker):
+    """Delegates removals to a subagent's tool-call reranking prompt."""
+
+    name = "llm"
+
+    def __init__(self, removal_fn: RemovalFn):
+        """
+        Initialize with the subagent's LLM removal function.
+
+        Args:
+            removal_fn: Coroutine (query, candidates, context) returning indices to remove
+        """
+        self.removal_fn = removal_fn
+
+    async def removals(
+        self, query: str, candidates: List[Candidate], context: Dict[str, Any]
+    ) -> Set[int]:
+        """Ask the LLM which candidates are irrelevant."""
+        return await self.removal_fn(query, candidates, context)
+
+
+class LocalReranker(Reranker):
+    """Scores candidates on CPU from query-term overlap and retrieval score."""
+
+    name = "local"
+
+    def __init__(
+        self,
+        text_fn: TextFn,
+        score_fn: ScoreFn,
+        min_score: float,
+        lexical_weight: float,
+    ):
+        """
+        Initialize the local scorer.
+
+        Args:
+            text_fn: Extracts the text matched against query terms
+            score_fn: Extracts the retrieval score (higher is better)
+            min_score: Candidates below this fraction of the best combined score are removed
+            lexical_weight: Weight (0-1) of term overlap versus the normalized retrieval score
+        """
+        self.text_fn = text_fn
+        self.score_fn = score_fn
+        self.min_score = min_score
+        self.lexical_weight = lexical_weight
+
+    def score(self, query: str, candidates: List[Candidate]) -> List[float]:
+        """
+        Combine term overlap and retrieval score for each candidate.
+
+        Args:
+            query: Search query
+            candidates: Retrieved candidates
+
+        Returns:
+            Combined scores aligned with candidates
+        """
+        terms = query_terms(query)
+        retrieval = [max(float(self.score_fn(candidate) or 0.0), 0.0) for candidate in candidates]
+        best_retrieval = max(retrieval, default=0.0)
+        lexical_weight = self.lexical_weight if terms else 0.0
+        if best_retrieval <= 0:
+            # No usable retrieval signal; rank on term overlap alone
+            lexical_weight = 1.0
+        scores = []
+        for candidate, retrieval_score in zip(candidates, retrieval):
+            lexical = lexical_overlap(terms, self.text_fn(candidate))
+            normalized = retrieval_score / best_retrieval if best_retrieval > 0 else 0.0
+            scores.append(lexical_weight * lexical + (1.0 - lexical_weight) * normalized)
+        return scores
+
+    async def removals(
+        self, query: str, candidates: List[Candidate], context: Dict[str, Any]
+    ) -> Set[int]:
+        """Remove candidates scoring well below the best one."""
+        scores = self.score(query, candidates)
+        best = max(scores, default=0.0)
+        if best <= 0:
+            return set()
+        cutoff = self.min_score * best
+        return {index for index, score in enumerate(scores) if score < cutoff}
+
+
+def build_reranker(
+    llm_removals: RemovalFn,
+    text_fn: TextFn,
+    score_fn: ScoreFn,
+    backend: Optional[str] = None,
+) -> Reranker:
+    """
+    Build the configured reranker for a subagent.
+
+    Args:
+        llm_removals: The subagent's LLM removal function (used by the "llm" backend)
+        text_fn: Candidate text for the local backend
+        score_fn: Candidate retrieval score for the local backend
+        backend: Override RERANK_BACKEND
+
+    Returns:
+        Reranker instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = (backend or config.rerank.backend).lower()
+    if backend == "llm":
+        return LLMReranker(llm_removals)
+    if backend == "local":
+        return LocalReranker(
+            text_fn=text_fn,
+            score_fn=score_fn,
+            min_score=config.rerank.local_min_score,
+            lexical_weight=config.rerank.local_lexical_weight,
+        )
+    raise ValueError(f"Unknown rerank backend: {backend} (expected one of {RERANK_BACKENDS})")
+
+
+def apply_min_keep(
+    candidates: List[Candidate], remove: Set[int], min_keep: int, score_fn: ScoreFn
+) -> Set[int]:
+    """
+    Restore the best-scoring removals when a reranker would keep too few candidates.
+
+    Args:
+        candidates: Candidates that were reranked
+        remove: Indices the reranker chose to remove
+        min_keep: Minimum candidates to keep (capped at the candidate count)
+        score_fn: Retrieval score used to pick which removals to restore
+
+    Returns:
+        Indices to remove after the floor is applied
+    """
+    min_keep = min(min_keep, len(candidates))
+    would_keep = len(candidates) - len(remove)
+    if would_keep >= min_keep:
+        return remove
+    scored_removals = sorted(remove, key=lambda index: score_fn(candidates[index]))
+    restored = set(scored_removals[-(min_keep - would_keep) :])  # noqa: E203
+    return remove - restored
@@ -1,20 +1,36 @@
-"""Staged retrieval pipeline for supplementary financials."""
+"""
+Staged retrieval pipeline for supplementary financials.
+
+Bank-period combos run through a sliding window of MAX_PARALLEL_COMBOS slots:
+a new combo starts as soon as any running combo finishes. Database searches
+and LLM calls draw from separate budgets (MAX_PARALLEL_SEARCH_QUERIES and
+MAX_PARALLEL_LLM_CALLS), so combos waiting on rerank or research calls do not
+hold back other combos' searches.
+
+Gap-fill sheets are loaded through a per-request SheetChunkCache: requests
+from concurrently running combos are coalesced into one set-based query, and
+sheets already loaded (e.g. in an earlier research iteration) are not fetched
+again.
+"""
 
 import asyncio
 import json
 import re
+from contextlib import nullcontext
 from pathlib import Path
 from time import perf_counter
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import yaml
 from sqlalchemy import text
 
 from ....connections.llm_connector import complete_with_tools, embed_batch
-from ....connections.postgres_connector import get_connection
+from ....connections.postgres_connector import get_read_connection
 from ....utils.logging import get_logger
 from ....utils.prompt_loader import load_prompt_from_db
 from ....utils.settings import config
+from ..reranking import apply_min_keep, build_reranker
 
 DATA_TABLE = 'public."aegis-financial-supp-data"'
 EMBEDDINGS_TABLE = 'public."aegis-financial-supp-embeddings"'
@@ -31,10 +47,14 @@ RESEARCH_MAX_ITERATIONS = 2
 RESEARCH_CONFIDENCE_STOP_THRESHOLD = 0.8
 RESEARCH_ADDITIONAL_SEARCH_TOP_K = 10
 MAX_ADDITIONAL_QUERIES = 3
-MAX_PARALLEL_COMBOS_PER_PERIOD = 6
+MAX_PARALLEL_COMBOS = 12
 MAX_PARALLEL_SEARCH_QUERIES = 18
+MAX_PARALLEL_LLM_CALLS = 6
+FUSION_MODE = "minmax"
+RRF_K = 60
 
 SearchBatch = Tuple[str, List[Dict[str, Any]], bool, float]
+SheetSpec = Tuple[str, int]
 SearchFactory = Callable[[], Awaitable[List[Dict[str, Any]]]]
 
 FUSION_WEIGHTS = {
@@ -154,25 +174,28 @@ async def run_retrieval_pipeline(
         bank_period_combinations=bank_period_combinations,
         context=context,
     )
-    combo_results = []
     search_semaphore = asyncio.Semaphore(MAX_PARALLEL_SEARCH_QUERIES)
+    llm_semaphore = asyncio.Semaphore(MAX_PARALLEL_LLM_CALLS)
+    sheet_cache = SheetChunkCache(search_semaphore)
+    ordered_combos = [
+        combo
+        for period_group in group_combinations_by_period(bank_period_combinations)
+        for combo in period_group
+    ]
 
-    for period_group in group_combinations_by_period(bank_period_combinations):
-        for combo_batch in chunk_sequence(period_group, MAX_PARALLEL_COMBOS_PER_PERIOD):
-            combo_results.extend(
-                await asyncio.gather(
-                    *[
-                        process_combo_retrieval(
-                            combo=combo,
-                            prepared=prepared,
-                            context=context,
-                            search_top_k=search_top_k,
-                            search_semaphore=search_semaphore,
-                        )
-                        for combo in combo_batch
-                    ]
-                )
-            )
+    combo_results, peak_in_flight = await run_sliding_window(
+        ordered_combos,
+        lambda combo: process_combo_retrieval(
+            combo=combo,
+            prepared=prepared,
+            context=context,
+            search_top_k=search_top_k,
+            search_semaphore=search_semaphore,
+            llm_semaphore=llm_semaphore,
+            sheet_cache=sheet_cache,
+        ),
+        MAX_PARALLEL_COMBOS,
+    )
 
     chunks = []
     findings = []
@@ -186,6 +209,7 @@ async def run_retrieval_pipeline(
         combo_count=len(bank_period_combinations),
         finding_count=len(findings),
         chunk_count=len(chunks),
+        peak_combos_in_flight=peak_in_flight,
         wall_time_seconds=round(perf_counter() - start_time, 3),
     )
 
@@ -200,18 +224,52 @@ async def run_retrieval_pipeline(
             "combo_count": len(combo_results),
             "chunk_count": len(chunks),
             "finding_count": len(findings),
+            "peak_combos_in_flight": peak_in_flight,
+            "gap_fill": sheet_cache.stats(),
         },
     }
 
 
+async def run_sliding_window(
+    items: Sequence[Any],
+    worker: Callable[[Any], Awaitable[Any]],
+    max_in_flight: int,
+) -> Tuple[List[Any], int]:
+    """Run items in a sliding window; return results in input order and peak in flight."""
+    if max_in_flight <= 0:
+        raise ValueError("max_in_flight must be positive")
+    results: List[Any] = [None] * len(items)
+    pending = iter(enumerate(items))
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def drain() -> None:
+        nonlocal in_flight, peak_in_flight
+        # Workers pull from one shared iterator, so a fast worker takes the next item.
+        for index, item in pending:
+            in_flight += 1
+            peak_in_flight = max(peak_in_flight, in_flight)
+            try:
+                results[index] = await worker(item)
+            finally:
+                in_flight -= 1
+
+    await asyncio.gather(*[drain() for _ in range(min(max_in_flight, len(items)))])
+    return results, peak_in_flight
+
+
 async def process_combo_retrieval(
     combo: Dict[str, Any],
     prepared: Dict[str, Any],
     context: Dict[str, Any],
     search_top_k: int,
     search_semaphore: asyncio.Semaphore,
+    llm_semaphore: Optional[asyncio.Semaphore] = None,
+    sheet_cache: Optional["SheetChunkCache"] = None,
 ) -> Dict[str, Any]:
     """Run retrieval and research for one bank-period combination."""
+    llm_semaphore = llm_semaphore or asyncio.Semaphore(MAX_PARALLEL_LLM_CALLS)
+    sheet_cache = sheet_cache or SheetChunkCache(search_semaphore)
     combo_start = perf_counter()
     candidates = await multi_strategy_search(
         combo=combo,
@@ -236,16 +294,21 @@ async def process_combo_retrieval(
 
     rerank_pool = candidates[:RERANK_CANDIDATE_LIMIT]
     if len(candidates) > search_top_k:
-        reranked = await rerank_candidates(
-            query=prepared["rewritten_query"],
-            combo=combo,
-            candidates=rerank_pool,
-            context=context,
-        )
+        # Only the LLM backend needs an LLM slot; local reranking runs immediately
+        rerank_slot = llm_semaphore if config.rerank.backend == "llm" else nullcontext()
+        async with rerank_slot:
+            reranked = await rerank_candidates(
+                query=prepared["rewritten_query"],
+                combo=combo,
+                candidates=rerank_pool,
+                context=context,
+            )
     else:
         reranked = candidates
     reranked = reranked[:search_top_k]
-    expanded = await gap_fill_one_sheet_gaps(reranked, search_semaphore=search_semaphore)
+    expanded = await gap_fill_one_sheet_gaps(
+        reranked, search_semaphore=search_semaphore, sheet_cache=sheet_cache
+    )
     expanded = cap_gap_filled_chunks(expanded, reranked, search_top_k)
     if expanded:
         research = await run_research_loop(
@@ -254,6 +317,8 @@ async def process_combo_retrieval(
             initial_chunks=expanded,
             context=context,
             search_semaphore=search_semaphore,
+            llm_semaphore=llm_semaphore,
+            sheet_cache=sheet_cache,
         )
     else:
         research = {"chunks": [], "findings": [], "iterations": []}
@@ -272,6 +337,11 @@ async def process_combo_retrieval(
             "expanded_chunks": len(research["chunks"]),
             "findings": len(research["findings"]),
             "research_iterations": len(research["iterations"]),
+            "research_stopping_reason": research.get("stopping_reason"),
+            "research_prompt_tokens": sum(
+                iteration.get("metrics", {}).get("prompt_tokens", 0)
+                for iteration in research["iterations"]
+            ),
         },
     }
 
@@ -564,7 +634,7 @@ async def search_embedding_type(
             "top_k": top_k,
         }
     )
-    async with get_connection() as conn:
+    async with get_read_connection(stage="supplementary_financials.search_embedding_type") as conn:
         result = await conn.execute(query, params)
         return [row_to_candidate(row, float(row.raw_score or 0.0)) for row in result]
 
@@ -616,7 +686,7 @@ async def search_section_summary(
     )
     params = combo_params(combo)
     params.update({"embedding": format_vector(embedding_vector), "top_k": top_k})
-    async with get_connection() as conn:
+    async with get_read_connection(stage="supplementary_financials.search_section_summary") as conn:
         result = await conn.execute(query, params)
         return [row_to_candidate(row, float(row.raw_score or 0.0)) for row in result]
 
@@ -670,7 +740,7 @@ async def bm25_search(
     )
     params = combo_params(combo)
     params.update({"query_text": clean_query, "top_k": top_k})
-    async with get_connection() as conn:
+    async with get_read_connection(stage="supplementary_financials.bm25_search") as conn:
         result = await conn.execute(query, params)
         return [row_to_candidate(row, float(row.raw_score or 0.0)) for row in result]
 
@@ -720,7 +790,9 @@ async def jsonb_containment_search(
         LIMIT :limit
         """
     )
-    async with get_connection() as conn:
+    async with get_read_connection(
+        stage="supplementary_financials.jsonb_containment_search"
+    ) as conn:
         result = await conn.execute(query, params)
         candidates = []
         for row in result:
@@ -736,69 +808,118 @@ async def jsonb_containment_search(
 
 def fuse_strategy_batches(
     batches: List[Tuple[str, List[Dict[str, Any]], bool, float]],
+    mode: str = FUSION_MODE,
+    top_k: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
-    """Normalize and fuse candidate scores across search strategies."""
-    raw_by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
-    combined: Dict[Tuple[str, str], Dict[str, Any]] = {}
-
-    for strategy_name, hits, invert, scale in batches:
-        normalized = normalize_strategy_scores(hits, invert=invert)
+    """Fuse strategy scores over a candidate x strategy matrix, best first."""
+    if mode not in ("minmax", "rrf"):
+        raise ValueError(f"Unknown fusion mode: {mode}")
+    key_rows: Dict[Tuple[str, str], int] = {}
+    raw_hits: List[Dict[str, Any]] = []
+    strategy_columns: Dict[str, int] = {}
+    batch_rows = []
+    for strategy_name, hits, _invert, _scale in batches:
+        strategy_columns.setdefault(strategy_name, len(strategy_columns))
+        rows = []
         for hit in hits:
             key = candidate_key(hit)
-            raw_by_key.setdefault(key, hit)
-            if key not in combined:
-                combined[key] = {
-                    "score": 0.0,
-                    "strategy_scores": {},
-                    "match_sources": [],
-                }
-            strategy_score = normalized.get(key, 0.0)
-            weighted_score = FUSION_WEIGHTS.get(strategy_name, 0.0) * scale * strategy_score
-            combined[key]["score"] += weighted_score
-            current_strategy_score = combined[key]["strategy_scores"].get(strategy_name, 0.0)
-            combined[key]["strategy_scores"][strategy_name] = max(
-                current_strategy_score, strategy_score
-            )
-            if strategy_name not in combined[key]["match_sources"]:
-                combined[key]["match_sources"].append(strategy_name)
-
-    fused = []
-    for key, scoring in combined.items():
-        candidate = dict(raw_by_key[key])
-        candidate["score"] = scoring["score"]
-        candidate["strategy_scores"] = scoring["strategy_scores"]
-        candidate["match_sources"] = scoring["match_sources"]
+            if key not in key_rows:
+                key_rows[key] = len(raw_hits)
+                raw_hits.append(hit)
+            rows.append(key_rows[key])
+        batch_rows.append(np.asarray(rows, dtype=np.intp))
+
+    candidate_count = len(raw_hits)
+    if not candidate_count:
+        return []
+    fused = np.zeros(candidate_count)
+    strategy_matrix = np.zeros((candidate_count, len(strategy_columns)))
+    # Batch sequence in which each candidate first matched each strategy; orders match_sources
+    first_match = np.full(strategy_matrix.shape, len(batches), dtype=np.intp)
+
+    for sequence, ((strategy_name, hits, invert, scale), rows) in enumerate(
+        zip(batches, batch_rows)
+    ):
+        if not len(rows):
+            continue
+        raw_scores = np.fromiter(
+            (float(hit.get("raw_score", 0.0)) for hit in hits), dtype=float, count=len(hits)
+        )
+        hit_scores = strategy_hit_scores(rows, raw_scores, invert, mode)
+        column = strategy_columns[strategy_name]
+        # add.at applies hits in order, so sums match sequential accumulation exactly
+        np.add.at(fused, rows, FUSION_WEIGHTS.get(strategy_name, 0.0) * scale * hit_scores)
+        np.maximum.at(strategy_matrix, (rows, column), hit_scores)
+        np.minimum.at(first_match, (rows, column), sequence)
+
+    strategy_names = list(strategy_columns)
+    fused_candidates = []
+    for row in rank_fused_scores(fused, top_k):
+        matched = np.flatnonzero(first_match[row] < len(batches))
+        matched = matched[np.argsort(first_match[row, matched], kind="stable")]
+        candidate = dict(raw_hits[row])
+        candidate["score"] = float(fused[row])
+        candidate["strategy_scores"] = {
+            strategy_names[column]: float(strategy_matrix[row, column]) for column in matched
+        }
+        candidate["match_sources"] = [strategy_names[column] for column in matched]
         candidate["is_gap_fill"] = False
-        fused.append(candidate)
-    fused.sort(key=lambda item: item["score"], reverse=True)
-    return fused
+        fused_candidates.append(candidate)
+    return fused_candidates
+
+
+def rank_fused_scores(fused: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+    """Order rows by score descending, ties by first appearance, optionally keeping top_k."""
+    rows = np.arange(len(fused))
+    if top_k is not None and top_k < len(fused):
+        if top_k <= 0:
+            return rows[:0]
+        kth_score = fused[np.argpartition(-fused, top_k - 1)[:top_k]].min()
+        rows = np.flatnonzero(fused >= kth_score)
+    ordered = rows[np.lexsort((rows, -fused[rows]))]
+    return ordered if top_k is None else ordered[:top_k]
+
+
+def strategy_hit_scores(
+    rows: np.ndarray,
+    raw_scores: np.ndarray,
+    invert: bool,
+    mode: str = FUSION_MODE,
+) -> np.ndarray:
+    """Score each hit of one strategy from the best raw score of its candidate row."""
+    unique_rows, inverse = np.unique(rows, return_inverse=True)
+    best = np.full(len(unique_rows), np.inf if invert else -np.inf)
+    (np.minimum if invert else np.maximum).at(best, inverse, raw_scores)
+
+    if mode == "rrf":
+        # Rank-based, scaled so the top-ranked candidate scores 1.0 like min-max
+        order = np.lexsort((unique_rows, best if invert else -best))
+        ranks = np.empty(len(best))
+        ranks[order] = np.arange(1, len(best) + 1)
+        return ((RRF_K + 1) / (RRF_K + ranks))[inverse]
+
+    max_value = best.max()
+    if max_value == 0:
+        return np.ones(len(rows))
+    ratio = best / max_value
+    normalized = np.maximum(0.0, 1.0 - ratio if invert else ratio)
+    return normalized[inverse]
 
 
 def normalize_strategy_scores(
     hits: List[Dict[str, Any]],
     invert: bool,
+    mode: str = FUSION_MODE,
 ) -> Dict[Tuple[str, str], float]:
     """Normalize one strategy's raw scores to 0.0-1.0 by chunk key."""
     if not hits:
         return {}
-    best_raw: Dict[Tuple[str, str], float] = {}
-    for hit in hits:
-        key = candidate_key(hit)
-        raw_score = float(hit.get("raw_score", 0.0))
-        if key not in best_raw:
-            best_raw[key] = raw_score
-            continue
-        if invert:
-            best_raw[key] = min(best_raw[key], raw_score)
-        else:
-            best_raw[key] = max(best_raw[key], raw_score)
-
-    max_value = max(best_raw.values()) if best_raw else 0.0
-    if max_value == 0:
-        return {key: 1.0 for key in best_raw}
-    if invert:
-        return {key: max(0.0, 1.0 - value / max_value) for key, value in best_raw.items()}
-    return {key: max(0.0, value / max_value) for key, value in best_raw.items()}
+    keys = [candidate_key(hit) for hit in hits]
+    key_rows: Dict[Tuple[str, str], int] = {}
+    rows = np.asarray([key_rows.setdefault(key, len(key_rows)) for key in keys], dtype=np.intp)
+    raw_scores = np.asarray([float(hit.get("raw_score", 0.0)) for hit in hits])
+    hit_scores = strategy_hit_scores(rows, raw_scores, invert, mode)
+    return {key: float(score) for key, score in zip(keys, hit_scores)}
 
 
 async def rerank_candidates(
@@ -807,26 +928,28 @@ async def rerank_candidates(
     candidates: List[Dict[str, Any]],
     context: Dict[str, Any],
 ) -> List[Dict[str, Any]]:
-    """Filter clearly irrelevant chunks using metadata-only LLM reranking."""
+    """Filter clearly irrelevant chunks with the configured reranker backend."""
     logger = get_logger()
     if not candidates:
         return []
+
+    async def llm_removals(
+        rerank_query: str, rerank_pool: List[Dict[str, Any]], rerank_context: Dict[str, Any]
+    ) -> set[int]:
+        return await llm_rerank_removals(rerank_query, combo, rerank_pool, rerank_context)
+
+    reranker = build_reranker(
+        llm_removals=llm_removals,
+        text_fn=rerank_candidate_text,
+        score_fn=lambda candidate: float(candidate.get("score", 0.0)),
+    )
     try:
-        parsed, _usage = await call_tool_prompt(
-            prompt_name="rerank",
-            replacements={
-                "user_input": query,
-                "research_scope": format_scope([combo]),
-                "candidates": format_rerank_candidates(candidates),
-            },
-            context=context,
-            max_tokens=800,
-        )
-        valid_remove = normalize_remove_indices(parsed.get("remove_indices", []), len(candidates))
+        valid_remove = await reranker.removals(query, candidates, context)
     except Exception as exc:  # pylint: disable=broad-except
         logger.warning(
             "subagent.supplementary_financials.rerank_keep_all",
             execution_id=context.get("execution_id"),
+            backend=reranker.name,
             candidate_count=len(candidates),
             error_type=type(exc).__name__,
             error=str(exc),
@@ -837,6 +960,7 @@ async def rerank_candidates(
     logger.info(
         "subagent.supplementary_financials.rerank_complete",
         execution_id=context.get("execution_id"),
+        backend=reranker.name,
         candidate_count=len(candidates),
         removed_count=len(valid_remove),
         kept_count=len(candidates) - len(valid_remove),
@@ -844,14 +968,48 @@ async def rerank_candidates(
     return [candidate for index, candidate in enumerate(candidates) if index not in valid_remove]
 
 
+async def llm_rerank_removals(
+    query: str,
+    combo: Dict[str, Any],
+    candidates: List[Dict[str, Any]],
+    context: Dict[str, Any],
+) -> set[int]:
+    """Ask the rerank prompt which candidates to remove using metadata only."""
+    parsed, _usage = await call_tool_prompt(
+        prompt_name="rerank",
+        replacements={
+            "user_input": query,
+            "research_scope": format_scope([combo]),
+            "candidates": format_rerank_candidates(candidates),
+        },
+        context=context,
+        max_tokens=800,
+    )
+    return normalize_remove_indices(parsed.get("remove_indices", []), len(candidates))
+
+
+def rerank_candidate_text(candidate: Dict[str, Any]) -> str:
+    """Metadata text the local reranker matches against query terms."""
+    return " ".join(
+        [
+            str(candidate.get("name") or ""),
+            str(candidate.get("summary") or ""),
+            " ".join(candidate.get("keywords", [])),
+            " ".join(candidate.get("metrics", [])),
+        ]
+    )
+
+
 async def gap_fill_one_sheet_gaps(
     chunks: List[Dict[str, Any]],
     search_semaphore: Optional[asyncio.Semaphore] = None,
+    sheet_cache: Optional["SheetChunkCache"] = None,
 ) -> List[Dict[str, Any]]:
     """Fill exactly one missing sheet between retrieved chunks from the same file."""
     if not chunks:
         return []
     search_semaphore = search_semaphore or asyncio.Semaphore(MAX_PARALLEL_SEARCH_QUERIES)
+    sheet_cache = sheet_cache or SheetChunkCache(search_semaphore)
     expanded: Dict[Tuple[str, str], Dict[str, Any]] = {
         candidate_key(chunk): chunk for chunk in chunks
     }
@@ -881,17 +1039,13 @@ async def gap_fill_one_sheet_gaps(
             seen_gap_specs.add(gap_spec)
             gap_specs.append(gap_spec)
 
-    gap_results = await asyncio.gather(
-        *[
-            load_sheet_chunks_limited(file_id, gap_sheet, search_semaphore)
-            for file_id, gap_sheet in gap_specs
-        ]
-    )
-    for gap_chunks in gap_results:
-        for gap_chunk in gap_chunks:
-            key = candidate_key(gap_chunk)
+    gap_results = await sheet_cache.load(gap_specs)
+    for gap_spec in gap_specs:
+        for cached_chunk in gap_results[gap_spec]:
+            key = candidate_key(cached_chunk)
             if key in expanded:
                 continue
+            gap_chunk = dict(cached_chunk)
             gap_chunk["score"] = 0.0
             gap_chunk["strategy_scores"] = {}
             gap_chunk["match_sources"] = ["gap_fill"]
@@ -903,18 +1057,66 @@ async def gap_fill_one_sheet_gaps(
     return result
 
 
-async def load_sheet_chunks_limited(
-    file_id: str,
-    sheet_number: int,
-    search_semaphore: asyncio.Semaphore,
-) -> List[Dict[str, Any]]:
-    """Load sheet chunks behind the shared retrieval concurrency limit."""
-    async with search_semaphore:
-        return await load_sheet_chunks(file_id, sheet_number)
-
-
-async def load_sheet_chunks(file_id: str, sheet_number: int) -> List[Dict[str, Any]]:
-    """Load every chunk for one spreadsheet sheet number."""
+class SheetChunkCache:
+    """Per-request cache of gap-fill sheets with coalesced, set-based loading."""
+
+    def __init__(self, search_semaphore: Optional[asyncio.Semaphore] = None):
+        self.search_semaphore = search_semaphore or asyncio.Semaphore(MAX_PARALLEL_SEARCH_QUERIES)
+        self._sheets: Dict[SheetSpec, "asyncio.Future[List[Dict[str, Any]]]"] = {}
+        self._pending: List[SheetSpec] = []
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+        self.queries = 0
+        self.hits = 0
+
+    async def load(self, sheet_specs: Sequence[SheetSpec]) -> Dict[SheetSpec, List[Dict[str, Any]]]:
+        """Return chunks per (file_id, sheet_number), querying only sheets not seen before."""
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for spec in sheet_specs:
+            if spec in self._sheets:
+                self.hits += 1
+            else:
+                self._sheets[spec] = loop.create_future()
+                self._pending.append(spec)
+            # Hold the future itself: a failed load evicts the spec from the cache
+            futures[spec] = self._sheets[spec]
+        if self._pending and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        # shield: a cancelled caller must not cancel a future other callers share
+        return {spec: await asyncio.shield(future) for spec, future in futures.items()}
+
+    async def _flush(self) -> None:
+        """Load every pending sheet in one query once concurrent callers have queued theirs."""
+        await asyncio.sleep(0)
+        specs, self._pending, self._flush_task = self._pending, [], None
+        futures = [(spec, self._sheets[spec]) for spec in specs]
+        try:
+            async with self.search_semaphore:
+                self.queries += 1
+                loaded = await load_sheet_chunks_batch(specs)
+        except Exception as exc:  # pylint: disable=broad-except
+            for spec, future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+                # Evict after resolving so a later load retries the sheet
+                if self._sheets.get(spec) is future:
+                    del self._sheets[spec]
+            return
+        for spec, future in futures:
+            if not future.done():
+                future.set_result(loaded.get(spec, []))
+
+    def stats(self) -> Dict[str, int]:
+        """Report sheets cached, queries issued and cache hits."""
+        return {"sheets": len(self._sheets), "queries": self.queries, "hits": self.hits}
+
+
+async def load_sheet_chunks_batch(
+    sheet_specs: Sequence[SheetSpec],
+) -> Dict[SheetSpec, List[Dict[str, Any]]]:
+    """Load every chunk for many (file_id, sheet_number) pairs in one query."""
+    if not sheet_specs:
+        return {}
     query = text(
         f"""
         SELECT
@@ -933,22 +1135,34 @@ async def load_sheet_chunks(file_id: str, sheet_number: int) -> List[Dict[str, A
             d.chunk_content,
             d.keywords,
             d.metrics,
+            g.sheet_number,
             0.0 AS raw_score
-        FROM {DATA_TABLE} d
-        WHERE d.file_id = :file_id
-          AND d.chunk_id LIKE :chunk_prefix
-        ORDER BY d.page_number, d.chunk_id
+        FROM unnest(
+            CAST(:file_ids AS text[]),
+            CAST(:chunk_prefixes AS text[]),
+            CAST(:sheet_numbers AS int[])
+        ) AS g(file_id, chunk_prefix, sheet_number)
+        JOIN {DATA_TABLE} d
+          ON d.file_id = g.file_id
+         AND d.chunk_id LIKE g.chunk_prefix
+        ORDER BY d.file_id, d.page_number, d.chunk_id
         """
     )
-    async with get_connection() as conn:
-        result = await conn.execute(
-            query,
-            {
-                "file_id": file_id,
-                "chunk_prefix": f"sheet_{sheet_number}.%",
-            },
-        )
-        return [row_to_candidate(row, 0.0) for row in result]
+    params = {
+        "file_ids": [file_id for file_id, _ in sheet_specs],
+        "chunk_prefixes": [f"sheet_{sheet_number}.%" for _, sheet_number in sheet_specs],
+        "sheet_numbers": [sheet_number for _, sheet_number in sheet_specs],
+    }
+    loaded: Dict[SheetSpec, List[Dict[str, Any]]] = {}
+    async with get_read_connection(
+        stage="supplementary_financials.load_sheet_chunks_batch"
+    ) as conn:
+        result = await conn.execute(query, params)
+        for row in result:
+            loaded.setdefault((row.file_id, row.sheet_number), []).append(
+                row_to_candidate(row, 0.0)
+            )
+    return loaded
 
 
 async def run_research_loop(
@@ -957,26 +1171,33 @@ async def run_research_loop(
     initial_chunks: List[Dict[str, Any]],
     context: Dict[str, Any],
     search_semaphore: Optional[asyncio.Semaphore] = None,
+    llm_semaphore: Optional[asyncio.Semaphore] = None,
+    sheet_cache: Optional["SheetChunkCache"] = None,
 ) -> Dict[str, Any]:
-    """Run iterative research extraction with follow-up vector searches."""
+    """Run iterative research, sending each iteration only evidence it has not seen."""
     logger = get_logger()
     search_semaphore = search_semaphore or asyncio.Semaphore(MAX_PARALLEL_SEARCH_QUERIES)
+    llm_semaphore = llm_semaphore or asyncio.Semaphore(MAX_PARALLEL_LLM_CALLS)
+    sheet_cache = sheet_cache or SheetChunkCache(search_semaphore)
     chunks = list(initial_chunks)
-    seen_ids = {chunk["chunk_id"] for chunk in chunks}
+    seen_keys = {candidate_key(chunk) for chunk in chunks}
+    evidence = chunks
     iterations = []
     previous_queries: List[str] = []
     stopping_reason = "max_iterations"
 
     for iteration_number in range(1, RESEARCH_MAX_ITERATIONS + 1):
         try:
-            iteration = await call_research_iteration(
-                prepared=prepared,
-                combo=combo,
-                chunks=chunks,
-                previous_iterations=iterations,
-                context=context,
-                iteration_number=iteration_number,
-            )
+            async with llm_semaphore:
+                iteration = await call_research_iteration(
+                    prepared=prepared,
+                    combo=combo,
+                    chunks=chunks,
+                    previous_iterations=iterations,
+                    context=context,
+                    iteration_number=iteration_number,
+                    evidence_chunks=evidence,
+                )
         except Exception as exc:  # pylint: disable=broad-except
             logger.warning(
                 "subagent.supplementary_financials.research_iteration_failed",
@@ -987,6 +1208,13 @@ async def run_research_loop(
             stopping_reason = "research_llm_error"
             break
 
+        usage = iteration.get("usage") or {}
+        iteration["metrics"] = {
+            "evidence_chunks": len(evidence),
+            "prompt_tokens": int(usage.get("prompt_tokens", 0) or 0),
+            "completion_tokens": int(usage.get("completion_tokens", 0) or 0),
+            "new_evidence_chunks": 0,
+        }
         iterations.append(iteration)
         additional_queries = limit_unique_texts(
             iteration.get("additional_queries", []),
@@ -995,6 +1223,9 @@ async def run_research_loop(
         if float(iteration.get("confidence", 0.0) or 0.0) >= RESEARCH_CONFIDENCE_STOP_THRESHOLD:
             stopping_reason = "high_confidence"
             break
+        if iteration_number == RESEARCH_MAX_ITERATIONS:
+            # Only findings leave the loop, so evidence no iteration will read is not fetched
+            break
         if not additional_queries:
             stopping_reason = "no_additional_queries"
             break
@@ -1007,16 +1238,29 @@ async def run_research_loop(
             combo=combo,
             queries=additional_queries,
             context=context,
-            seen_ids=seen_ids,
+            seen_keys=seen_keys,
             search_semaphore=search_semaphore,
         )
         if not new_chunks:
             stopping_reason = "no_new_chunks"
             break
-        chunks.extend(new_chunks)
-        chunks = await gap_fill_one_sheet_gaps(chunks, search_semaphore=search_semaphore)
-        seen_ids = {chunk["chunk_id"] for chunk in chunks}
+        chunks = await gap_fill_one_sheet_gaps(
+            chunks + new_chunks, search_semaphore=search_semaphore, sheet_cache=sheet_cache
+        )
+        evidence = [chunk for chunk in chunks if candidate_key(chunk) not in seen_keys]
+        seen_keys.update(candidate_key(chunk) for chunk in evidence)
+        iteration["metrics"]["new_evidence_chunks"] = len(evidence)
 
+    logger.info(
+        "subagent.supplementary_financials.research_complete",
+        execution_id=context.get("execution_id"),
+        bank=combo_bank_label(combo),
+        period=combo_period_label(combo),
+        iterations=len(iterations),
+        stopping_reason=stopping_reason,
+        evidence_per_iteration=[item["metrics"]["evidence_chunks"] for item in iterations],
+        prompt_tokens=sum(item["metrics"]["prompt_tokens"] for item in iterations),
+    )
     return {
         "iterations": iterations,
         "findings": combine_findings(iterations),
@@ -1032,16 +1276,26 @@ async def call_research_iteration(
     previous_iterations: List[Dict[str, Any]],
     context: Dict[str, Any],
     iteration_number: int,
+    evidence_chunks: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
-    """Call the research prompt and parse one structured iteration."""
+    """Call the research prompt on evidence_chunks (default all), citing refs over all chunks."""
     source_catalog = build_source_catalog(chunks)
+    evidence_text = format_evidence_chunks(
+        chunks if evidence_chunks is None else evidence_chunks, source_catalog
+    )
+    if previous_iterations and evidence_chunks is not None:
+        evidence_text = (
+            "Only evidence retrieved since the previous iteration is shown below; "
+            "findings from earlier evidence are listed in the previous research.\n\n"
+            + evidence_text
+        )
     replacements = {
         "query": prepared["original_query"],
         "source_label": "Supplementary financials package",
         "bank": combo_bank_label(combo),
         "period": combo_period_label(combo),
         "previous_research": format_previous_research(previous_iterations),
-        "chunks": format_evidence_chunks(chunks, source_catalog),
+        "chunks": evidence_text,
     }
     parsed, usage = await call_tool_prompt(
         prompt_name="research",
@@ -1087,10 +1341,10 @@ async def search_additional_queries(
     combo: Dict[str, Any],
     queries: List[str],
     context: Dict[str, Any],
-    seen_ids: set[str],
+    seen_keys: set[Tuple[str, str]],
     search_semaphore: Optional[asyncio.Semaphore] = None,
 ) -> List[Dict[str, Any]]:
-    """Embed additional research queries and run focused content-vector search."""
+    """Embed additional research queries and return hits not already in seen_keys."""
     if not queries:
         return []
     search_semaphore = search_semaphore or asyncio.Semaphore(MAX_PARALLEL_SEARCH_QUERIES)
@@ -1112,10 +1366,8 @@ async def search_additional_queries(
     )
     for hits in search_results:
         for hit in hits:
-            if hit["chunk_id"] in seen_ids:
-                continue
             key = candidate_key(hit)
-            if key in new_chunks:
+            if key in seen_keys or key in new_chunks:
                 continue
             hit["score"] = max(0.0, 1.0 - float(hit.get("raw_score", 1.0)))
             hit["strategy_scores"] = {"additional_content_vector": hit["score"]}
@@ -1391,17 +1643,6 @@ def group_combinations_by_period(
     return [grouped[key] for key in period_order]
 
 
-def chunk_sequence(values: Sequence[Any], chunk_size: int) -> List[List[Any]]:
-    """Split a sequence into ordered chunks of at most chunk_size."""
-    if chunk_size <= 0:
-        raise ValueError("chunk_size must be positive")
-    chunks = []
-    for index in range(0, len(values), chunk_size):
-        stop_index = min(index + chunk_size, len(values))
-        chunks.append([values[item_index] for item_index in range(index, stop_index)])
-    return chunks
-
-
 def format_scope(bank_period_combinations: List[Dict[str, Any]]) -> str:
     """Format bank-period combinations for query-prep prompts."""
     lines = []
@@ -1558,14 +1799,12 @@ def soften_hyde_answer(text_value: str) -> str:
 
 def apply_min_keep_floor(candidates: List[Dict[str, Any]], remove_set: set[int]) -> set[int]:
     """Restore best-scoring removals if rerank would keep too few chunks."""
-    min_keep = min(RERANK_MIN_KEEP, len(candidates))
-    would_keep = len(candidates) - len(remove_set)
-    if would_keep >= min_keep:
-        return remove_set
-    scored_removals = sorted(remove_set, key=lambda index: candidates[index].get("score", 0.0))
-    restore_count = min_keep - would_keep
-    restored = set(scored_removals[-restore_count:])
-    return remove_set - restored
+    return apply_min_keep(
+        candidates,
+        remove_set,
+        RERANK_MIN_KEEP,
+        lambda candidate: float(candidate.get("score", 0.0)),
+    )
 
 
 def normalize_remove_indices(raw_indices: Any, candidate_count: int) -> set[int]:
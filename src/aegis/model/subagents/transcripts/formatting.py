@@ -8,15 +8,19 @@ Handles:
 - Research statement generation
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set
 import json
 
-from ....connections.postgres_connector import get_connection
+from ....connections.postgres_connector import get_read_connection
 from ....connections.llm_connector import complete, complete_with_tools
 from ....utils.logging import get_logger
 from ....utils.settings import config
+from ..reranking import apply_min_keep, build_reranker
 from sqlalchemy import text
 
+# Reranking never leaves fewer similarity chunks than this
+RERANK_MIN_KEEP = 3
+
 
 async def format_full_section_chunks(
     chunks: List[Dict[str, Any]],
@@ -152,6 +156,9 @@ async def rerank_similarity_chunks(
     """
     Rerank similarity search results by filtering irrelevant chunks.
 
+    Uses the backend selected by RERANK_BACKEND: the reranking prompt ("llm")
+    or local scoring on term overlap and similarity ("local").
+
     Args:
         chunks: Top-k chunks from similarity search
         search_phrase: Original search phrase
@@ -166,6 +173,61 @@ async def rerank_similarity_chunks(
     logger = get_logger()
     execution_id = context.get("execution_id")
 
+    reranker = build_reranker(
+        llm_removals=llm_irrelevant_indices,
+        text_fn=_rerank_text,
+        score_fn=_similarity_score,
+    )
+    irrelevant_indices = await reranker.removals(search_phrase, chunks, context)
+    irrelevant_indices = apply_min_keep(
+        chunks, irrelevant_indices, RERANK_MIN_KEEP, _similarity_score
+    )
+
+    # Filter out irrelevant chunks (keep chunks NOT in irrelevant_indices)
+    relevant_chunks = [chunk for i, chunk in enumerate(chunks) if i not in irrelevant_indices]
+
+    logger.info(
+        "subagent.transcripts.reranking",
+        execution_id=execution_id,
+        backend=reranker.name,
+        original_count=len(chunks),
+        filtered_count=len(irrelevant_indices),
+        kept_count=len(relevant_chunks),
+    )
+
+    return relevant_chunks
+
+
+def _rerank_text(chunk: Dict[str, Any]) -> str:
+    """Text the local reranker matches against the search phrase."""
+    return f"{chunk.get('block_summary') or ''} {chunk.get('content') or ''}"
+
+
+def _similarity_score(chunk: Dict[str, Any]) -> float:
+    """Embedding similarity attached by retrieve_by_similarity."""
+    return float(chunk.get("similarity_score") or 0.0)
+
+
+async def llm_irrelevant_indices(
+    search_phrase: str, chunks: List[Dict[str, Any]], context: Dict[str, Any]
+) -> Set[int]:
+    """
+    Ask the reranking prompt which similarity chunks are irrelevant.
+
+    Args:
+        search_phrase: Original search phrase
+        chunks: Top-k chunks from similarity search
+        context: Execution context
+
+    Returns:
+        Indices of irrelevant chunks (empty if the LLM call fails, keeping all chunks)
+
+    Raises:
+        RuntimeError: If the reranking prompts cannot be loaded
+    """
+    logger = get_logger()
+    execution_id = context.get("execution_id")
+
     # Load reranking prompts from database with global contexts
     from ....utils.prompt_loader import load_prompt_from_db
 
@@ -230,22 +292,11 @@ async def rerank_similarity_chunks(
             if message.get("tool_calls"):
                 tool_call = message["tool_calls"][0]
                 function_args = json.loads(tool_call["function"]["arguments"])
-                irrelevant_indices = function_args.get("irrelevant_indices", [])
-
-                # Filter out irrelevant chunks (keep chunks NOT in irrelevant_indices)
-                relevant_chunks = [
-                    chunk for i, chunk in enumerate(chunks) if i not in irrelevant_indices
-                ]
-
-                logger.info(
-                    "subagent.transcripts.reranking",
-                    execution_id=execution_id,
-                    original_count=len(chunks),
-                    filtered_count=len(irrelevant_indices),
-                    kept_count=len(relevant_chunks),
-                )
-
-                return relevant_chunks
+                return {
+                    index
+                    for index in function_args.get("irrelevant_indices", [])
+                    if isinstance(index, int) and 0 <= index < len(chunks)
+                }
 
         logger.warning(
             "subagent.transcripts.reranking_no_tool_call",
@@ -257,8 +308,8 @@ async def rerank_similarity_chunks(
             "subagent.transcripts.reranking_error", execution_id=execution_id, error=str(e)
         )
 
-    # If reranking fails, return original chunks
-    return chunks
+    # If reranking fails, keep all chunks
+    return set()
 
 
 async def expand_speaker_blocks(
@@ -298,7 +349,7 @@ async def expand_speaker_blocks(
         if speaker_block_ids:
             # Fetch all chunks for these speaker blocks
             try:
-                async with get_connection() as conn:
+                async with get_read_connection(stage="transcripts.expand_speaker_blocks") as conn:
                     bank_id_filter = "institution_id::text = :bank_id_str"
                     query = text(
                         f"""
@@ -420,7 +471,7 @@ async def fill_gaps_in_speaker_blocks(
 
         # Fetch gap chunks
         try:
-            async with get_connection() as conn:
+            async with get_read_connection(stage="transcripts.fill_gaps_in_speaker_blocks") as conn:
                 query = text(
                     """
                     SELECT
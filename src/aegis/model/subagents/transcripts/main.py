@@ -65,7 +65,11 @@ async def transcripts_agent(
         context: Runtime context with auth and execution_id
 
     Yields:
-        Dict with type="subagent", name="transcripts", content=research
+        Dict with type="subagent", name="transcripts", content=research. The header
+        is yielded first, then one research statement per bank-period combination in
+        completion order; statement chunks carry a "metadata" dict (combo_index,
+        completion_index, total_combinations, bank_symbol, period) so the UI can
+        restore request order.
     """
 
     # Initialize logging and tracking
@@ -93,7 +97,7 @@ async def transcripts_agent(
                 name="method_selection",
                 compose_with_globals=True,
                 available_databases=None,  # Transcripts doesn't filter databases
-                execution_id=execution_id
+                execution_id=execution_id,
             )
 
             # Use composed prompt if available (includes fiscal, project globals)
@@ -226,21 +230,6 @@ async def transcripts_agent(
                     "success": False,
                 }
 
-        # Execute parallel retrieval decisions
-        retrieval_decisions = {}
-
-        # Create tasks for parallel execution
-        tasks = [determine_retrieval_method(combo) for combo in bank_period_combinations]
-
-        # Execute all tasks concurrently
-        results = await asyncio.gather(*tasks)
-
-        # Collect results
-        for result in results:
-            combo = result["combo"]
-            key = f"{combo['bank_id']}_{combo['fiscal_year']}_{combo['quarter']}"
-            retrieval_decisions[key] = result
-
         # ==================================================
         # STEP 3: Execute retrievals and format research statements (PARALLEL)
         # ==================================================
@@ -362,25 +351,64 @@ async def transcripts_agent(
                     f"No transcript data available for this period.\n"
                 )
 
-        # Execute all retrievals in parallel
-        retrieval_tasks = [process_single_combo(result) for result in retrieval_decisions.values()]
-        all_research_statements = await asyncio.gather(*retrieval_tasks)
-
         # ==================================================
-        # STEP 4: Output final combined research
+        # STEP 4: Stream research statements as each combination completes
         # ==================================================
 
-        # Combine all research statements
-        final_output = "\n".join(all_research_statements)
+        # Each combination runs its method decision, retrieval and synthesis as one
+        # pipeline, so a fast bank is never held back by a slow bank's earlier stage.
+        # Combinations sharing a bank-period key are only researched once.
+        unique_combos = {}
+        for combo in bank_period_combinations:
+            key = f"{combo['bank_id']}_{combo['fiscal_year']}_{combo['quarter']}"
+            unique_combos.setdefault(key, combo)
+        retrieval_decisions = {}
+
+        async def research_combo(key, combo):
+            """Decide the retrieval method for one combination, then research it."""
+            result = await determine_retrieval_method(combo)
+            retrieval_decisions[key] = result
+            return await process_single_combo(result)
 
-        # Add header
+        # Header goes out immediately so the UI can open the section before any bank finishes
         header = "## Earnings Transcript Analysis\n\n"
         header += f"**Query**: {full_intent}\n"
         header += f"**Coverage**: {len(bank_period_combinations)} bank-period combinations\n"
         header += "\n---\n\n"
+        yield {"type": "subagent", "name": database_id, "content": header}
 
-        # Yield the complete research output
-        yield {"type": "subagent", "name": database_id, "content": header + final_output}
+        combo_tasks = {
+            asyncio.create_task(research_combo(key, combo)): (combo_index, combo)
+            for combo_index, (key, combo) in enumerate(unique_combos.items())
+        }
+        pending = set(combo_tasks)
+        completion_index = 0
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Stable order within a batch that finished together
+                for task in sorted(done, key=lambda finished: combo_tasks[finished][0]):
+                    combo_index, combo = combo_tasks[task]
+                    research_statement = task.result()
+
+                    # Ordering metadata lets the UI re-sort statements into request order
+                    yield {
+                        "type": "subagent",
+                        "name": database_id,
+                        "content": research_statement + "\n",
+                        "metadata": {
+                            "combo_index": combo_index,
+                            "completion_index": completion_index,
+                            "total_combinations": len(combo_tasks),
+                            "bank_symbol": combo["bank_symbol"],
+                            "period": f"{combo['quarter']} {combo['fiscal_year']}",
+                        },
+                    }
+                    completion_index += 1
+        finally:
+            # A failed combination or a closed stream stops the remaining work
+            for task in pending:
+                task.cancel()
 
         # ==================================================
         # STEP 5: Add monitoring entry
@@ -406,7 +434,7 @@ async def transcripts_agent(
             f"subagent.{database_id}.completed",
             execution_id=execution_id,
             total_duration_ms=int((stage_end - stage_start).total_seconds() * 1000),
-            research_statements=len(all_research_statements),
+            research_statements=completion_index,
         )
 
     except Exception as e:
@@ -6,7 +6,7 @@ from typing import Any, Dict, List
 from sqlalchemy import text
 
 from ....utils.logging import get_logger
-from ....connections.postgres_connector import get_connection
+from ....connections.postgres_connector import get_read_connection
 from ....connections.llm_connector import embed
 
 from .utils import get_filter_diagnostics
@@ -55,7 +55,7 @@ async def retrieve_full_section(
     )
 
     try:
-        async with get_connection() as conn:
+        async with get_read_connection(stage="transcripts.retrieve_full_section") as conn:
             # Build query to fetch all chunks for specified sections
             # Handle both TEXT and INTEGER institution_id columns
             query = text(
@@ -179,7 +179,7 @@ async def retrieve_by_categories(
     )
 
     try:
-        async with get_connection() as conn:
+        async with get_read_connection(stage="transcripts.retrieve_by_categories") as conn:
             # Query chunks that contain any of the specified category IDs
             # Convert integer array to text array for comparison
             category_ids_text = [str(cat_id) for cat_id in category_ids]
@@ -317,7 +317,7 @@ async def retrieve_by_similarity(
         # Format embedding for PostgreSQL
         embedding_str = f"[{','.join(map(str, embedding_vector))}]"
 
-        async with get_connection() as conn:
+        async with get_read_connection(stage="transcripts.retrieve_by_similarity") as conn:
             # Similarity search using cosine distance (<=>)
             # Note: PostgreSQL pgvector uses <=> for cosine distance
             query = text(
@@ -472,7 +472,7 @@ async def expand_chunks_to_blocks(
     expanded_blocks = []
 
     try:
-        async with get_connection() as conn:
+        async with get_read_connection(stage="transcripts.expand_chunks_to_blocks") as conn:
             # Expand MD speaker blocks
             if md_block_ids:
                 query = text(
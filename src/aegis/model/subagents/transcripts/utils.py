@@ -9,7 +9,7 @@ from sqlalchemy import text
 
 from ....utils.logging import get_logger
 from ....utils.sql_prompt import prompt_manager
-from ....connections.postgres_connector import get_connection
+from ....connections.postgres_connector import get_read_connection
 
 
 def load_transcripts_yaml(filename: str, compose_with_globals: bool = False) -> Dict[str, Any]:
@@ -191,7 +191,7 @@ async def get_filter_diagnostics(combo: Dict[str, Any], context: Dict[str, Any])
     diagnostics = {}
     
     try:
-        async with get_connection() as conn:
+        async with get_read_connection(stage="transcripts.get_filter_diagnostics") as conn:
             # Total records
             result = await conn.execute(text("SELECT COUNT(*) FROM aegis_transcripts"))
             diagnostics['total_records'] = result.scalar()
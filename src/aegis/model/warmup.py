@@ -0,0 +1,169 @@
+"""
+Per-worker warm state for the FastAPI server.
+
+Each uvicorn worker is its own interpreter, so every cache the model relies
+on starts cold in every worker: the first chat turn would otherwise pay for
+opening the database pool, reading the prompts table, authenticating the LLM
+client and loading the availability snapshot. The server lifespan calls
+warm_worker_state() before the worker accepts connections and
+release_worker_state() when it stops.
+
+Warmup never stops a worker from serving: a step that fails or exceeds
+SERVER_WARMUP_TIMEOUT is logged and skipped, and the state it would have
+loaded is built lazily on the first request as before.
+"""
+
+import asyncio
+import importlib
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..connections.llm_connector import _get_or_create_async_client
+from ..connections.oauth_connector import setup_authentication
+from ..connections.postgres_connector import fetch_one
+from ..utils import sql_prompt
+from ..utils.logging import get_logger
+from ..utils.settings import config
+from ..utils.ssl import setup_ssl
+from .agents import clarifier
+
+logger = get_logger()
+
+WARMUP_EXECUTION_ID = "worker_warmup"
+
+# Modules the server imports lazily inside endpoints, relative to the aegis package
+PRELOAD_MODULES = (
+    "connections.query_stats",
+    "model.agents.router_cache",
+    "utils.database_overview",
+    "utils.database_streaming",
+    "utils.monitor_rollups",
+)
+
+# "aegis" or "src.aegis", depending on how the server imported this package
+_PACKAGE_ROOT = __package__.rsplit(".", 1)[0]
+
+
+def preload_modules() -> int:
+    """
+    Import the modules the server otherwise imports on first use.
+
+    Returns:
+        Number of modules imported
+    """
+    loaded = 0
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(f"{_PACKAGE_ROOT}.{module_name}")
+            loaded += 1
+        except ImportError as e:
+            logger.warning("warmup.preload_failed", module=module_name, error=str(e))
+    return loaded
+
+
+async def _warm_database() -> Dict[str, str]:
+    """Open one pooled connection per configured engine."""
+    for name in config.postgres_engines:
+        await fetch_one("SELECT 1", execution_id=WARMUP_EXECUTION_ID, engine=name)
+    return {"engines": ", ".join(config.postgres_engines)}
+
+
+async def _warm_prompts() -> Dict[str, int]:
+    """Load the latest prompts into the shared prompt manager."""
+    manager = sql_prompt.prompt_manager
+    if manager is None:
+        # pandas.read_sql is blocking; keep the event loop free for the other steps
+        manager = await asyncio.to_thread(sql_prompt.postgresql_prompts)
+    return {"prompts": len(manager.df_prompts)}
+
+
+async def _warm_llm_client() -> Dict[str, str]:
+    """
+    Authenticate and create the cached LLM client.
+
+    With OAuth the token, and so the cached client, rotates; the step then
+    mainly proves the credentials work before traffic arrives.
+    """
+    ssl_config = setup_ssl()
+    auth_config = await setup_authentication(WARMUP_EXECUTION_ID, ssl_config)
+    if not auth_config.get("success"):
+        raise RuntimeError(auth_config.get("error") or "Authentication failed")
+    await _get_or_create_async_client(auth_config["token"], ssl_config)
+    return {"method": auth_config.get("method", "")}
+
+
+WARMUP_STEPS: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]] = {
+    "database": _warm_database,
+    "prompts": _warm_prompts,
+    "llm_client": _warm_llm_client,
+    "availability": clarifier.warm_availability_snapshot,
+}
+
+
+async def _run_step(
+    name: str, step: Callable[[], Awaitable[Dict[str, Any]]], timeout: float
+) -> Dict[str, Any]:
+    """Run one warmup step, recording its outcome instead of raising."""
+    started = time.perf_counter()
+    try:
+        detail = await asyncio.wait_for(step(), timeout=timeout if timeout > 0 else None)
+        status = "ok"
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        # A cold cache only costs the first request; never keep the worker from serving.
+        detail = {"error": str(e) or type(e).__name__}
+        status = "failed"
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    log = logger.info if status == "ok" else logger.warning
+    log(f"warmup.step_{status}", step=name, duration_ms=duration_ms, **detail)
+    return {"status": status, "duration_ms": duration_ms, **detail}
+
+
+async def warm_worker_state(timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Load this worker's pools, clients and caches before it serves traffic.
+
+    The steps run concurrently; each is bounded by the timeout and a failure
+    in one does not affect the others.
+
+    Args:
+        timeout: Seconds each step may take (default SERVER_WARMUP_TIMEOUT; 0 waits)
+
+    Returns:
+        Dictionary with per-step status, timing and detail, and the total duration
+    """
+    timeout = config.server.warmup_timeout if timeout is None else timeout
+    started = time.perf_counter()
+
+    preloaded = preload_modules()
+    results = await asyncio.gather(
+        *(_run_step(name, step, timeout) for name, step in WARMUP_STEPS.items())
+    )
+    steps = dict(zip(WARMUP_STEPS, results))
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    logger.info(
+        "warmup.completed",
+        pid=os.getpid(),
+        preloaded_modules=preloaded,
+        failed_steps=[name for name, result in steps.items() if result["status"] != "ok"],
+        duration_ms=duration_ms,
+    )
+    return {"steps": steps, "preloaded_modules": preloaded, "duration_ms": duration_ms}
+
+
+def release_worker_state() -> None:
+    """
+    Drop the warm state that the connector shutdown hooks do not cover.
+
+    Disposes the prompt manager's synchronous engine and clears the
+    availability snapshot. LLM clients and async pools are closed by
+    close_all_clients() and close_all_connections().
+    """
+    manager = sql_prompt.prompt_manager
+    if manager is not None:
+        manager.engine.dispose()
+        sql_prompt.prompt_manager = None
+    clarifier._availability_cache.clear()  # pylint: disable=protected-access
+    logger.info("warmup.released", pid=os.getpid())
@@ -0,0 +1,228 @@
+"""
+Token-aware conversation windowing.
+
+Keeps the most recent turns verbatim within a token budget and folds older
+turns into a rolling summary. The summary is extractive (a condensed line per
+folded message) so maintaining it never costs an LLM call, and it is capped at
+CONVERSATION_SUMMARY_MAX_TOKENS by dropping its oldest lines.
+
+Token counts use tiktoken when it is installed and its encoding is available
+locally, otherwise a characters-per-token estimate.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from .logging import get_logger
+from .settings import config
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - exercised via runtime environment
+    tiktoken = None
+
+SUMMARY_PREFIX = "Summary of earlier conversation:"
+
+# Per-message framing overhead (role and separators) added by chat formats
+_MESSAGE_OVERHEAD_TOKENS = 4
+_CHARS_PER_TOKEN = 4
+_SUMMARY_LINE_CHARS = 240
+
+
+@lru_cache(maxsize=1)
+def _get_encoder() -> Optional[Any]:
+    """Load the configured tiktoken encoding once, or None if it is unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(config.conversation.tokenizer_encoding)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        # Encodings are downloaded on first use; fall back to estimates when offline.
+        get_logger().warning(
+            "context_window.tokenizer_unavailable",
+            encoding=config.conversation.tokenizer_encoding,
+            error=str(e),
+        )
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens in a piece of text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Token count from the local tokenizer, or an estimate if none is available
+    """
+    if not text:
+        return 0
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """
+    Count tokens across chat messages, including per-message overhead.
+
+    Args:
+        messages: Messages with role and content
+
+    Returns:
+        Total token count
+    """
+    return sum(count_tokens(msg.get("content", "")) + _MESSAGE_OVERHEAD_TOKENS for msg in messages)
+
+
+def _condense(message: Dict[str, str]) -> str:
+    """Reduce a message to a single summary line."""
+    content = " ".join(message.get("content", "").split())
+    if len(content) > _SUMMARY_LINE_CHARS:
+        content = content[: _SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+    return f"- {message.get('role', 'user').capitalize()}: {content}"
+
+
+def merge_summary(summary: str, messages: List[Dict[str, str]], max_tokens: int) -> str:
+    """
+    Fold messages into a rolling summary.
+
+    Args:
+        summary: Existing summary text (may be empty)
+        messages: Messages leaving the verbatim window, oldest first
+        max_tokens: Size cap; the oldest summary lines are dropped to stay under it
+
+    Returns:
+        Updated summary text
+    """
+    lines = [line for line in (summary or "").splitlines() if line.strip()]
+    lines.extend(_condense(msg) for msg in messages if msg.get("content", "").strip())
+
+    line_tokens = [count_tokens(line) + 1 for line in lines]
+    total = sum(line_tokens)
+    start = 0
+    while total > max_tokens and start < len(lines) - 1:
+        total -= line_tokens[start]
+        start += 1
+    return "\n".join(lines[start:])
+
+
+def fold_history(
+    messages: List[Dict[str, str]],
+    summary: str,
+    token_budget: int,
+    max_messages: Optional[int] = None,
+) -> Tuple[List[Dict[str, str]], str, int]:
+    """
+    Split history into a verbatim tail and a summary of everything older.
+
+    The latest message is always kept, even if it alone exceeds the budget.
+
+    Args:
+        messages: Conversation messages, oldest first
+        summary: Rolling summary of turns folded earlier
+        token_budget: Tokens available for verbatim messages
+        max_messages: Optional cap on the number of verbatim messages
+
+    Returns:
+        (kept messages, updated summary, number of messages folded)
+    """
+    start = len(messages)
+    used = 0
+    while start > 0:
+        cost = count_message_tokens([messages[start - 1]])
+        within_count = max_messages is None or len(messages) - start < max_messages
+        if start < len(messages) and (used + cost > token_budget or not within_count):
+            break
+        used += cost
+        start -= 1
+
+    folded = messages[:start]
+    if not folded:
+        return list(messages), summary or "", 0
+    updated = merge_summary(summary, folded, config.conversation.summary_max_tokens)
+    return list(messages[start:]), updated, len(folded)
+
+
+def summary_message(summary: str) -> Dict[str, str]:
+    """
+    Wrap a rolling summary as a system message.
+
+    Args:
+        summary: Summary text
+
+    Returns:
+        Message dict placed ahead of the verbatim history
+    """
+    return {"role": "system", "content": f"{SUMMARY_PREFIX}\n{summary}"}
+
+
+def is_summary_message(message: Dict[str, str]) -> bool:
+    """Check whether a message is a rolling summary added by this module."""
+    return message.get("role") == "system" and message.get("content", "").startswith(SUMMARY_PREFIX)
+
+
+def window_messages(
+    messages: List[Dict[str, str]], summary: str, agent: str
+) -> List[Dict[str, str]]:
+    """
+    Build the history view for one agent within its token budget.
+
+    Args:
+        messages: Processed conversation messages
+        summary: Rolling summary of older turns
+        agent: Agent name used to look up CONVERSATION_AGENT_TOKEN_BUDGETS
+
+    Returns:
+        Messages that fit the agent's budget, preceded by a summary message
+        when older turns exist
+    """
+    budget = config.conversation.budget_for(agent)
+    available = max(budget - count_tokens(summary), 0)
+    kept, view_summary, _ = fold_history(messages, summary, available)
+    if not view_summary:
+        return kept
+    return [summary_message(view_summary)] + kept
+
+
+def recent_history(messages: List[Dict[str, str]], limit: int) -> List[Dict[str, str]]:
+    """
+    Take the last `limit` messages, keeping a leading summary message.
+
+    Args:
+        messages: Windowed history, possibly starting with a summary message
+        limit: Maximum number of conversation messages to return
+
+    Returns:
+        Summary message (if present) followed by the most recent messages
+    """
+    if messages and is_summary_message(messages[0]):
+        return [messages[0]] + messages[1:][-limit:]
+    return messages[-limit:]
+
+
+def compact_conversation(conversation_state: Dict[str, Any]) -> int:
+    """
+    Fold overflowing turns of a live session into its rolling summary.
+
+    Mutates conversation_state so long sessions keep a bounded message list and
+    each message is summarized once, when it leaves the window.
+
+    Args:
+        conversation_state: Session dict with "messages" and optional "summary"
+
+    Returns:
+        Number of messages folded into the summary
+    """
+    kept, summary, folded = fold_history(
+        conversation_state.get("messages", []),
+        conversation_state.get("summary", ""),
+        config.conversation.token_budget,
+        config.max_history_length,
+    )
+    if folded:
+        conversation_state["messages"] = kept
+        conversation_state["summary"] = summary
+    return folded
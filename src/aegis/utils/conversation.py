@@ -7,6 +7,7 @@ for the Aegis agent workflow system.
 
 from typing import Any, Dict, Optional
 
+from .context_window import count_message_tokens, fold_history
 from .logging import get_logger
 from .settings import config
 
@@ -24,12 +25,14 @@ def process_conversation(  # pylint: disable=too-many-branches
     2. Filters messages by role based on configuration:
        - Removes system messages if INCLUDE_SYSTEM_MESSAGES=false
        - Only keeps roles listed in ALLOWED_ROLES
-    3. Trims to MAX_HISTORY_LENGTH most recent messages (default: 10)
+    3. Keeps the most recent messages within CONVERSATION_TOKEN_BUDGET and
+       MAX_HISTORY_LENGTH (default: 10), folding older ones into the rolling summary
     4. Returns processed messages with metadata
 
     Args:
         conversation_input: Raw conversation data from API call. Accepts either:
-                          1. {"messages": [{"role": str, "content": str}, ...]}
+                          1. {"messages": [{"role": str, "content": str}, ...],
+                              "summary": str (optional rolling summary)}
                           2. [{"role": str, "content": str}, ...] (will be wrapped)
         execution_id: Unique identifier for this execution.
 
@@ -37,6 +40,9 @@ def process_conversation(  # pylint: disable=too-many-branches
         Processed conversation data with status and metadata:
         - "success": bool - Whether processing succeeded
         - "messages": list - Filtered & trimmed messages (only if success=True)
+        - "summary": str - Rolling summary of turns outside the verbatim window
+        - "summarized_message_count": int - Messages folded into the summary this call
+        - "history_tokens": int - Token count of the verbatim messages
         - "message_count": int - Count after filtering/trimming
         - "original_message_count": int - Count before processing
         - "latest_message": dict - Last message after processing
@@ -87,9 +93,14 @@ def process_conversation(  # pylint: disable=too-many-branches
         if not processed_messages:
             raise ValueError("No valid messages after filtering")
 
-        # Keep only the most recent messages based on config
-        if len(processed_messages) > config.max_history_length:
-            processed_messages = processed_messages[-config.max_history_length :]  # noqa: E203
+        # Keep the most recent messages verbatim and fold the rest into the summary
+        processed_messages, summary, folded_count = fold_history(
+            processed_messages,
+            str(conversation_input.get("summary") or ""),
+            config.conversation.token_budget,
+            config.max_history_length,
+        )
+        history_tokens = count_message_tokens(processed_messages)
 
         # Extract the latest message (what we need to respond to)
         latest_message = processed_messages[-1]
@@ -99,6 +110,8 @@ def process_conversation(  # pylint: disable=too-many-branches
             "Conversation processed",
             message_count=len(processed_messages),
             latest_role=latest_message["role"],
+            history_tokens=history_tokens,
+            summarized_messages=folded_count,
         )
 
         # Prepare latest message preview
@@ -110,6 +123,9 @@ def process_conversation(  # pylint: disable=too-many-branches
             "success": True,
             "status": "Success",
             "messages": processed_messages,
+            "summary": summary,
+            "summarized_message_count": folded_count,
+            "history_tokens": history_tokens,
             "latest_message": latest_message,
             "message_count": len(processed_messages),
             "original_message_count": original_count,
@@ -136,6 +152,9 @@ def process_conversation(  # pylint: disable=too-many-branches
             "success": False,
             "status": "Failure",
             "messages": [],
+            "summary": "",
+            "summarized_message_count": 0,
+            "history_tokens": 0,
             "latest_message": {},
             "message_count": 0,
             "original_message_count": original_count,
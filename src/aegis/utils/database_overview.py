@@ -0,0 +1,303 @@
+"""
+Schema metadata and row counts for the database viewer.
+
+The viewer used to run SELECT COUNT(*) on every table each time it opened,
+one table after another. Several tables (aegis_transcripts and the
+supplementary embedding tables with 3072-dim vectors) are large enough that
+each count is a full sequential scan. Row counts now come from the planner
+statistics by default:
+
+- pg_class.reltuples, maintained by VACUUM/ANALYZE
+- pg_stat_user_tables.n_live_tup, used when the table was never analyzed
+
+Exact counts are only run for the tables a caller asks for. They run
+concurrently (DATABASE_VIEWER_COUNT_CONCURRENCY), each bounded by
+DATABASE_VIEWER_COUNT_TIMEOUT, and a count that times out falls back to the
+estimate. Schema metadata is read from pg_catalog in one query and cached for
+DATABASE_VIEWER_SCHEMA_TTL seconds.
+"""
+
+import asyncio
+import time
+from contextlib import aclosing
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, TypeVar
+
+from ..connections.postgres_connector import fetch_all, get_table_schema, stream_rows
+from .logging import get_logger
+from .settings import config
+
+logger = get_logger()
+
+EXECUTION_ID = "database_viewer"
+
+# One row per table in the public schema; row estimates come from planner statistics
+SCHEMA_OVERVIEW_SQL = """
+SELECT
+    c.relname AS table,
+    (
+        SELECT COUNT(*) FROM pg_attribute a
+        WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    ) AS columns,
+    (SELECT COUNT(*) FROM pg_index i WHERE i.indrelid = c.oid) AS indexes,
+    (
+        SELECT string_agg(a.attname, ', ' ORDER BY array_position(i.indkey::int2[], a.attnum))
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = c.oid AND i.indisprimary
+    ) AS primary_key,
+    (
+        SELECT COUNT(*) FROM pg_constraint con
+        WHERE con.conrelid = c.oid AND con.contype = 'f'
+    ) AS foreign_keys,
+    c.reltuples::bigint AS reltuples,
+    s.n_live_tup AS live_tuples
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p')
+ORDER BY c.relname
+"""
+
+T = TypeVar("T")
+
+
+class TTLCache(Generic[T]):
+    """
+    Small keyed cache whose entries expire after a fixed number of seconds.
+
+    A ttl of 0 or less disables caching (every get misses).
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, tuple] = {}
+
+    def get(self, key: str) -> Optional[T]:
+        """Return the cached value, or None when missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry[0]:
+            return None
+        return entry[1]
+
+    def set(self, key: str, value: T) -> None:
+        """Store a value for ttl seconds."""
+        if self.ttl > 0:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+
+_schema_cache: TTLCache[List[Dict[str, Any]]] = TTLCache(config.database_viewer.schema_cache_ttl)
+_columns_cache: TTLCache[List[Dict[str, Any]]] = TTLCache(config.database_viewer.schema_cache_ttl)
+_schema_lock = asyncio.Lock()
+
+
+def estimate_row_count(reltuples: Optional[float], live_tuples: Optional[int]) -> int:
+    """
+    Pick the best planner estimate of a table's row count.
+
+    reltuples is -1 on PostgreSQL 14+ (0 before) for a table that was never
+    vacuumed or analyzed; n_live_tup from the statistics collector covers that
+    case.
+
+    Args:
+        reltuples: pg_class.reltuples
+        live_tuples: pg_stat_user_tables.n_live_tup
+
+    Returns:
+        Estimated number of rows (never negative)
+    """
+    if reltuples is not None and reltuples > 0:
+        return int(reltuples)
+    return max(int(live_tuples or 0), 0)
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a table name for interpolation into SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+async def get_schema_overview(refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Get per-table schema metadata and estimated row counts, cached for the TTL.
+
+    Args:
+        refresh: Bypass the cache and re-read the catalog
+
+    Returns:
+        One dict per table with table, columns, indexes, primary_key,
+        foreign_keys and estimated_rows (copies, safe to mutate)
+    """
+    async with _schema_lock:
+        tables = None if refresh else _schema_cache.get("overview")
+        if tables is None:
+            rows = await fetch_all(SCHEMA_OVERVIEW_SQL, execution_id=EXECUTION_ID)
+            tables = [
+                {
+                    "table": row["table"],
+                    "columns": int(row["columns"] or 0),
+                    "indexes": int(row["indexes"] or 0),
+                    "primary_key": row["primary_key"] or "",
+                    "foreign_keys": int(row["foreign_keys"] or 0),
+                    "estimated_rows": estimate_row_count(row["reltuples"], row["live_tuples"]),
+                }
+                for row in rows
+            ]
+            _schema_cache.set("overview", tables)
+            logger.debug("database_viewer.schema_loaded", tables=len(tables))
+    return [dict(table) for table in tables]
+
+
+async def get_table_overview(table_name: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Get the cached overview entry for one table.
+
+    Args:
+        table_name: Table name
+        refresh: Bypass the cache and re-read the catalog
+
+    Returns:
+        The table's overview dict, or None when it is not a table in the public schema
+    """
+    for table in await get_schema_overview(refresh=refresh):
+        if table["table"] == table_name:
+            return table
+    return None
+
+
+async def get_table_columns(table_name: str, refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Get a table's information_schema column rows, cached for the TTL.
+
+    Args:
+        table_name: Table name
+        refresh: Bypass the cache
+
+    Returns:
+        Column information dictionaries (see get_table_schema)
+    """
+    columns = None if refresh else _columns_cache.get(table_name)
+    if columns is None:
+        columns = await get_table_schema(table_name, execution_id=EXECUTION_ID)
+        _columns_cache.set(table_name, columns)
+    return [dict(column) for column in columns]
+
+
+async def _count_rows(table_name: str, timeout: float) -> int:
+    """Run an exact COUNT(*) with a transaction-scoped statement timeout."""
+    # stream_rows runs the count in its own READ ONLY transaction with SET LOCAL
+    # statement_timeout, so the timeout ends with the transaction even when the
+    # count is cancelled and never leaks into the pooled connection.
+    async with aclosing(
+        stream_rows(
+            f"SELECT COUNT(*) AS count FROM {quote_identifier(table_name)}",
+            execution_id=EXECUTION_ID,
+            batch_size=1,
+            statement_timeout_ms=max(int(timeout * 1000), 1),
+            stage="database_viewer.count",
+        )
+    ) as batches:
+        async for batch in batches:
+            return int(batch[0]["count"] or 0)
+    return 0
+
+
+async def count_rows_exact(
+    table_names: Iterable[str],
+    timeout: Optional[float] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Optional[int]]:
+    """
+    Count rows exactly for several tables concurrently.
+
+    Callers must pass known table names (from get_schema_overview); names are
+    quoted but not otherwise validated.
+
+    Args:
+        table_names: Tables to count
+        timeout: Seconds each count may run (default DATABASE_VIEWER_COUNT_TIMEOUT)
+        concurrency: Counts run at once (default DATABASE_VIEWER_COUNT_CONCURRENCY)
+
+    Returns:
+        Exact count per table, or None for tables whose count timed out or failed
+    """
+    settings = config.database_viewer
+    timeout = settings.exact_count_timeout if timeout is None else timeout
+    semaphore = asyncio.Semaphore(max(concurrency or settings.exact_count_concurrency, 1))
+
+    async def count_one(table_name: str) -> Optional[int]:
+        async with semaphore:
+            try:
+                # The client-side bound backs up statement_timeout if the server is unresponsive
+                return await asyncio.wait_for(_count_rows(table_name, timeout), timeout + 1)
+            except Exception as e:  # pylint: disable=broad-except
+                # A slow or failing count must not fail the overview; the estimate is used.
+                logger.warning(
+                    "database_viewer.exact_count_failed",
+                    table=table_name,
+                    timeout=timeout,
+                    error=str(e) or type(e).__name__,
+                )
+                return None
+
+    names = list(dict.fromkeys(table_names))
+    counts = await asyncio.gather(*(count_one(name) for name in names))
+    return dict(zip(names, counts))
+
+
+def summarize_overview(tables: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the overview summary block from per-table entries.
+
+    Args:
+        tables: Entries with rows, columns and indexes
+
+    Returns:
+        Totals and averages for the viewer's summary cards
+    """
+    num_tables = len(tables)
+    total_columns = sum(table["columns"] for table in tables)
+    return {
+        "total_tables": num_tables,
+        "total_rows": sum(table["rows"] for table in tables),
+        "rows_estimated": any(table["rows_estimated"] for table in tables),
+        "avg_columns": round(total_columns / num_tables) if num_tables > 0 else 0,
+        "total_indexes": sum(table["indexes"] for table in tables),
+    }
+
+
+async def build_database_overview(
+    exact_tables: Optional[Sequence[str]] = None, refresh: bool = False
+) -> Dict[str, Any]:
+    """
+    Build the database viewer overview.
+
+    Args:
+        exact_tables: Tables to count exactly; every other table uses its
+            estimate. Names that are not tables in the public schema are ignored.
+        refresh: Bypass the schema cache
+
+    Returns:
+        Dict with summary and tables; each table has rows, rows_estimated and
+        estimated_rows
+    """
+    tables = await get_schema_overview(refresh=refresh)
+    known = {table["table"] for table in tables}
+    requested = [name for name in exact_tables or [] if name in known]
+    exact_counts = await count_rows_exact(requested) if requested else {}
+
+    for table in tables:
+        exact = exact_counts.get(table["table"])
+        table["rows"] = table["estimated_rows"] if exact is None else exact
+        table["rows_estimated"] = exact is None
+        table["has_pk"] = bool(table["primary_key"])
+
+    return {"summary": summarize_overview(tables), "tables": tables}
+
+
+def clear_schema_cache() -> None:
+    """Drop cached schema metadata (e.g. after a migration)."""
+    _schema_cache.clear()
+    _columns_cache.clear()
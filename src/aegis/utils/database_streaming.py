@@ -0,0 +1,339 @@
+"""
+Bounded-memory query results for the database viewer.
+
+Ad-hoc queries and table browsing used to load the full result set into a
+Python list (or a pandas DataFrame), clean every cell, and serialize the lot
+as one JSON document. A large result could exhaust server memory. Results
+are now streamed instead:
+
+- Rows come from a server-side cursor (postgres_connector.stream_rows) in
+  batches of DATABASE_VIEWER_STREAM_BATCH_SIZE.
+- JSON responses stop reading after DATABASE_VIEWER_MAX_QUERY_ROWS rows and
+  report truncated=true.
+- Exports are streamed as NDJSON or CSV, one batch at a time, with no row
+  limit.
+- Table browsing pages by primary key (keyset pagination): each page
+  returns an opaque cursor for the next one. OFFSET scans and discards every
+  skipped row, so it is kept only for custom orderings and tables without a
+  usable key.
+
+The encoders and the keyset query builder are synchronous so the Flask
+viewer (interfaces/database.py) can share them.
+"""
+
+import base64
+import csv
+import io
+import json
+import math
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Tuple
+
+from ..connections.postgres_connector import stream_rows
+from .database_overview import EXECUTION_ID, quote_identifier
+from .logging import get_logger
+from .settings import config
+
+logger = get_logger()
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# information_schema data types whose text form casts back losslessly for keyset comparison.
+# "character" is left out: a bare CAST(... AS character) means char(1) and truncates the key.
+KEYSET_TYPES = frozenset(
+    {
+        "smallint",
+        "integer",
+        "bigint",
+        "numeric",
+        "text",
+        "character varying",
+        "uuid",
+        "date",
+        "timestamp without time zone",
+        "timestamp with time zone",
+    }
+)
+
+
+def clean_for_json(obj: Any) -> Any:
+    """
+    Convert PostgreSQL types to JSON-serializable types.
+
+    Args:
+        obj: Cell value from a result row
+
+    Returns:
+        JSON-serializable value (NaN and infinity become None)
+    """
+    if obj is None:
+        return None
+    if isinstance(obj, (Decimal, float)):
+        if math.isnan(obj) or math.isinf(obj):
+            return None
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (bytes, memoryview)):
+        return bytes(obj).decode("utf-8", errors="ignore")
+    if isinstance(obj, dict):
+        # Recursively clean nested dicts (for JSONB columns)
+        return {key: clean_for_json(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        # Recursively clean lists (for array and vector columns)
+        return [clean_for_json(item) for item in obj]
+    return obj
+
+
+def clean_rows(rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Clean every cell of a batch of rows for JSON."""
+    return [{key: clean_for_json(value) for key, value in row.items()} for row in rows]
+
+
+def encode_ndjson(rows: Sequence[Dict[str, Any]]) -> str:
+    """
+    Encode cleaned rows as newline-delimited JSON.
+
+    Args:
+        rows: Rows already passed through clean_rows
+
+    Returns:
+        One JSON object per line, each line newline-terminated
+    """
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return "" if value is None else value
+
+
+def encode_csv(rows: Sequence[Dict[str, Any]], columns: Sequence[str], header: bool) -> str:
+    """
+    Encode cleaned rows as CSV.
+
+    Args:
+        rows: Rows already passed through clean_rows
+        columns: Column order (from the first batch)
+        header: Write the header line first
+
+    Returns:
+        CSV text; JSON values are written as JSON strings and None as empty
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_cell(row.get(column)) for column in columns])
+    return buffer.getvalue()
+
+
+def encode_keyset_cursor(row: Dict[str, Any], key_columns: Sequence[str]) -> str:
+    """
+    Build the opaque next-page cursor from the last row of a page.
+
+    Values are kept as text (Decimal via str, not float) so they cast back
+    exactly on the server.
+
+    Args:
+        row: Last row of the page (raw, not cleaned)
+        key_columns: Primary key columns in key order
+
+    Returns:
+        URL-safe cursor token
+    """
+    values = []
+    for column in key_columns:
+        value = row[column]
+        values.append(value.isoformat() if isinstance(value, (datetime, date)) else str(value))
+    payload = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_keyset_cursor(token: str, key_columns: Sequence[str]) -> List[str]:
+    """
+    Decode a cursor from encode_keyset_cursor.
+
+    Args:
+        token: Cursor token from a previous page
+        key_columns: Primary key columns the cursor must cover
+
+    Returns:
+        Key values as text, in key order
+
+    Raises:
+        ValueError: If the token is malformed or does not match the key
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(values, list) or len(values) != len(key_columns):
+        raise ValueError("Invalid pagination cursor")
+    return [str(value) for value in values]
+
+
+def build_table_page_query(
+    table_name: str,
+    key_columns: Sequence[str],
+    column_types: Dict[str, str],
+    limit: int,
+    after: Optional[str] = None,
+    offset: int = 0,
+    order_by: Optional[str] = None,
+    filter_condition: Optional[str] = None,
+) -> Tuple[str, Dict[str, Any], bool]:
+    """
+    Build the query for one page of a table.
+
+    Pages are keyed on the primary key when there is no custom ordering and
+    every key column has a type in KEYSET_TYPES; otherwise LIMIT/OFFSET is used.
+
+    Args:
+        table_name: Known table name
+        key_columns: Primary key columns in key order (may be empty)
+        column_types: information_schema data_type per column
+        limit: Rows per page
+        after: Cursor from the previous page (keyset pagination only)
+        offset: Rows to skip (offset pagination only)
+        order_by: Custom ORDER BY expression (forces offset pagination)
+        filter_condition: SQL WHERE condition
+
+    Returns:
+        (query, params, uses_keyset)
+
+    Raises:
+        ValueError: If a cursor is given but the table cannot be keyset-paged
+    """
+    keyset = (
+        not order_by
+        and bool(key_columns)
+        and all(column_types.get(column) in KEYSET_TYPES for column in key_columns)
+    )
+    if after and not keyset:
+        raise ValueError("Cursor pagination needs a primary key and the default ordering")
+
+    conditions = [f"({filter_condition})"] if filter_condition else []
+    params: Dict[str, Any] = {"limit": limit}
+    if keyset:
+        quoted = ", ".join(quote_identifier(column) for column in key_columns)
+        if after:
+            placeholders = []
+            for index, (column, value) in enumerate(
+                zip(key_columns, decode_keyset_cursor(after, key_columns))
+            ):
+                # Cast through text so the driver never has to encode the key's own type
+                placeholders.append(f"CAST(CAST(:k{index} AS text) AS {column_types[column]})")
+                params[f"k{index}"] = value
+            conditions.append(f"({quoted}) > ({', '.join(placeholders)})")
+        order_clause = f" ORDER BY {quoted}"
+    else:
+        order_clause = f" ORDER BY {order_by}" if order_by else ""
+
+    query = f"SELECT * FROM {quote_identifier(table_name)}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += order_clause + " LIMIT :limit"
+    if not keyset:
+        query += " OFFSET :offset"
+        params["offset"] = offset
+    return query, params, keyset
+
+
+async def stream_query_batches(
+    query: str, params: Optional[Dict[str, Any]] = None
+) -> AsyncGenerator[List[Dict[str, Any]], None]:
+    """
+    Stream a read query in cleaned batches from a server-side cursor.
+
+    Args:
+        query: SQL SELECT query
+        params: Query parameters
+
+    Yields:
+        Lists of JSON-ready rows, DATABASE_VIEWER_STREAM_BATCH_SIZE at a time
+    """
+    batches = stream_rows(
+        query,
+        params,
+        execution_id=EXECUTION_ID,
+        batch_size=config.database_viewer.stream_batch_size,
+        stage="database_viewer.stream",
+    )
+    try:
+        async for batch in batches:
+            yield clean_rows(batch)
+    finally:
+        # Release the cursor and connection even when the consumer stops early
+        await batches.aclose()
+
+
+async def collect_query_rows(
+    query: str, params: Optional[Dict[str, Any]] = None, max_rows: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Read at most max_rows cleaned rows of a query.
+
+    Args:
+        query: SQL SELECT query
+        params: Query parameters
+        max_rows: Row cap (default DATABASE_VIEWER_MAX_QUERY_ROWS)
+
+    Returns:
+        (rows, truncated) where truncated is True when the query had more rows
+    """
+    max_rows = config.database_viewer.max_query_rows if max_rows is None else max_rows
+    rows: List[Dict[str, Any]] = []
+    batches = stream_query_batches(query, params)
+    try:
+        async for batch in batches:
+            rows.extend(batch)
+            if len(rows) > max_rows:
+                logger.info("database_viewer.query_truncated", max_rows=max_rows)
+                return rows[:max_rows], True
+    finally:
+        await batches.aclose()
+    return rows, False
+
+
+async def iter_export(
+    query: str, export_format: str, params: Optional[Dict[str, Any]] = None
+) -> AsyncGenerator[str, None]:
+    """
+    Stream a query as NDJSON or CSV text chunks (one chunk per batch).
+
+    Args:
+        query: SQL SELECT query
+        export_format: "ndjson" or "csv"
+        params: Query parameters
+
+    Yields:
+        Encoded text chunks
+
+    Raises:
+        ValueError: If the export format is unknown
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    columns: Optional[List[str]] = None
+    batches = stream_query_batches(query, params)
+    try:
+        async for batch in batches:
+            if export_format == "ndjson":
+                yield encode_ndjson(batch)
+                continue
+            header = columns is None
+            if header:
+                columns = list(batch[0].keys()) if batch else []
+            yield encode_csv(batch, columns, header=header)
+    finally:
+        await batches.aclose()
@@ -9,8 +9,11 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy.ext.asyncio import AsyncConnection
+
 from ..connections.postgres_connector import insert_many
 from .logging import get_logger
+from .monitor_rollups import apply_monitor_rollups
 from .settings import config
 
 logger = get_logger()
@@ -234,6 +237,22 @@ def post_monitor_entries(execution_id: Optional[str] = None) -> int:
         raise
 
 
+async def _merge_rollups(
+    conn: AsyncConnection, entries: List[Dict[str, Any]], execution_id: Optional[str]
+) -> None:
+    """Fold posted entries into the dashboard rollups; failures are repaired by the refresh job."""
+    try:
+        # A savepoint keeps a failed merge from rolling back the entries themselves
+        async with conn.begin_nested():
+            await apply_monitor_rollups(entries, execution_id=execution_id, conn=conn)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning(
+            "Failed to merge monitor entries into rollups",
+            error=str(e),
+            entry_count=len(entries),
+        )
+
+
 async def post_monitor_entries_async(execution_id: Optional[str] = None) -> int:
     """
     Post all collected monitor entries to the database asynchronously.
@@ -252,15 +271,18 @@ async def post_monitor_entries_async(execution_id: Optional[str] = None) -> int:
         return 0
 
     try:
-        # Import async version
-        from ..connections.postgres_connector import insert_many_async
-
-        # Insert all entries to database
-        rows_inserted = await insert_many_async(
-            "process_monitor_logs",
-            _monitor_entries,
-            execution_id=execution_id,
-        )
+        # COPY all entries in one round trip
+        from ..connections.postgres_connector import copy_records, get_connection
+
+        # The rollup merge commits with the entries, so a rollup refresh sees both or neither
+        async with get_connection(execution_id) as conn:
+            rows_inserted = await copy_records(
+                "process_monitor_logs",
+                _monitor_entries,
+                execution_id=execution_id,
+                conn=conn,
+            )
+            await _merge_rollups(conn, _monitor_entries, execution_id)
 
         logger.info(
             "Monitor entries posted to database",
@@ -0,0 +1,622 @@
+"""
+Materialized rollups of process monitor logs for the monitoring dashboard.
+
+The dashboard used to aggregate the raw process_monitor_logs table on every
+page load (GROUP BY run_uuid with STRING_AGG, GROUP BY stage_name), which
+slows down as the log grows and competes with production queries. Two rollup
+tables (schemas/process_monitor_rollups_schema.sql) are maintained instead:
+
+- process_monitor_run_rollups: one row per run
+- process_monitor_stage_hourly: one row per stage per UTC hour, with a
+  duration histogram so p50/p95/p99 can be estimated for any window
+
+The monitor flush path merges each batch of entries into the rollups in the
+transaction that writes it, so a rebuild never counts a batch twice. A periodic job rebuilds the most recent hours from the raw log.
+That job repairs anything the flush path missed: a failed merge, entries
+written by other tools, or a first deployment backfill. Every server worker
+runs the job, so each rebuild first takes a transaction-level advisory lock
+and is skipped when another worker already holds it.
+"""
+
+import asyncio
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..connections.postgres_connector import fetch_all, get_connection
+from .logging import get_logger
+from .settings import config
+
+logger = get_logger()
+
+# Upper bounds (inclusive) of the stage duration histogram; one overflow bucket follows
+STAGE_DURATION_BUCKETS_MS = (
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+    60000,
+    120000,
+    300000,
+)
+# pg_try_advisory_xact_lock key ("AEGIS" in ASCII) serializing rebuilds across workers
+REFRESH_LOCK_KEY = 0x4145474953
+PERCENTILES = (("p50_duration_ms", 0.5), ("p95_duration_ms", 0.95), ("p99_duration_ms", 0.99))
+
+RUN_MERGE_SQL = """
+INSERT INTO process_monitor_run_rollups AS r (
+    run_uuid, model_name, start_time, end_time, stage_count, total_duration_ms,
+    total_tokens, total_cost, statuses, has_errors, updated_at
+)
+VALUES (
+    CAST(:run_uuid AS UUID), :model_name, :start_time, :end_time, :stage_count,
+    :total_duration_ms, :total_tokens, :total_cost, CAST(:statuses AS TEXT[]), :has_errors, NOW()
+)
+ON CONFLICT (run_uuid) DO UPDATE SET
+    model_name = COALESCE(r.model_name, EXCLUDED.model_name),
+    start_time = LEAST(r.start_time, EXCLUDED.start_time),
+    end_time = GREATEST(r.end_time, EXCLUDED.end_time),
+    stage_count = r.stage_count + EXCLUDED.stage_count,
+    total_duration_ms = r.total_duration_ms + EXCLUDED.total_duration_ms,
+    total_tokens = r.total_tokens + EXCLUDED.total_tokens,
+    total_cost = r.total_cost + EXCLUDED.total_cost,
+    statuses = ARRAY(
+        SELECT DISTINCT s FROM unnest(r.statuses || EXCLUDED.statuses) AS s ORDER BY s
+    ),
+    has_errors = r.has_errors OR EXCLUDED.has_errors,
+    updated_at = NOW()
+"""
+
+STAGE_MERGE_SQL = """
+INSERT INTO process_monitor_stage_hourly AS h (
+    stage_name, hour, execution_count, success_count, failure_count, total_duration_ms,
+    min_duration_ms, max_duration_ms, total_tokens, total_cost, duration_histogram, updated_at
+)
+VALUES (
+    :stage_name, :hour, :execution_count, :success_count, :failure_count, :total_duration_ms,
+    :min_duration_ms, :max_duration_ms, :total_tokens, :total_cost,
+    CAST(:duration_histogram AS INTEGER[]), NOW()
+)
+ON CONFLICT (stage_name, hour) DO UPDATE SET
+    execution_count = h.execution_count + EXCLUDED.execution_count,
+    success_count = h.success_count + EXCLUDED.success_count,
+    failure_count = h.failure_count + EXCLUDED.failure_count,
+    total_duration_ms = h.total_duration_ms + EXCLUDED.total_duration_ms,
+    min_duration_ms = LEAST(h.min_duration_ms, EXCLUDED.min_duration_ms),
+    max_duration_ms = GREATEST(h.max_duration_ms, EXCLUDED.max_duration_ms),
+    total_tokens = h.total_tokens + EXCLUDED.total_tokens,
+    total_cost = h.total_cost + EXCLUDED.total_cost,
+    duration_histogram = ARRAY(
+        SELECT COALESCE(a, 0) + COALESCE(b, 0)
+        FROM unnest(h.duration_histogram, EXCLUDED.duration_histogram)
+            WITH ORDINALITY AS m(a, b, i)
+        ORDER BY i
+    ),
+    updated_at = NOW()
+"""
+
+_UTC_HOUR_SQL = "DATE_TRUNC('hour', stage_start_time AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+_FAILED_SQL = "COALESCE(status, '') != 'Success'"
+
+
+def _histogram_sql() -> str:
+    """SQL array of per-bucket counts matching duration_bucket()."""
+    clauses = []
+    lower = None
+    for bound in STAGE_DURATION_BUCKETS_MS:
+        condition = f"COALESCE(duration_ms, 0) <= {bound}"
+        if lower is not None:
+            condition = f"duration_ms > {lower} AND {condition}"
+        clauses.append(f"COUNT(*) FILTER (WHERE {condition})")
+        lower = bound
+    clauses.append(f"COUNT(*) FILTER (WHERE duration_ms > {lower})")
+    return "ARRAY[" + ", ".join(clauses) + "]::INTEGER[]"
+
+
+REBUILD_STAGE_SQL = f"""
+INSERT INTO process_monitor_stage_hourly (
+    stage_name, hour, execution_count, success_count, failure_count, total_duration_ms,
+    min_duration_ms, max_duration_ms, total_tokens, total_cost, duration_histogram, updated_at
+)
+SELECT
+    stage_name,
+    {_UTC_HOUR_SQL} AS hour,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE NOT ({_FAILED_SQL})),
+    COUNT(*) FILTER (WHERE {_FAILED_SQL}),
+    COALESCE(SUM(duration_ms), 0),
+    MIN(duration_ms),
+    MAX(duration_ms),
+    COALESCE(SUM(total_tokens), 0),
+    COALESCE(SUM(total_cost), 0),
+    {_histogram_sql()},
+    NOW()
+FROM process_monitor_logs
+WHERE stage_start_time >= :window_start
+GROUP BY stage_name, {_UTC_HOUR_SQL}
+"""
+
+REBUILD_RUNS_SQL = f"""
+INSERT INTO process_monitor_run_rollups (
+    run_uuid, model_name, start_time, end_time, stage_count, total_duration_ms,
+    total_tokens, total_cost, statuses, has_errors, updated_at
+)
+SELECT
+    run_uuid,
+    MAX(model_name),
+    MIN(stage_start_time),
+    MAX(stage_end_time),
+    COUNT(*),
+    COALESCE(SUM(duration_ms), 0),
+    COALESCE(SUM(total_tokens), 0),
+    COALESCE(SUM(total_cost), 0),
+    COALESCE(
+        ARRAY_AGG(DISTINCT status ORDER BY status) FILTER (WHERE status IS NOT NULL), '{{}}'
+    ),
+    BOOL_OR({_FAILED_SQL}),
+    NOW()
+FROM process_monitor_logs
+WHERE run_uuid IN (
+    SELECT DISTINCT run_uuid FROM process_monitor_logs WHERE stage_start_time >= :window_start
+)
+GROUP BY run_uuid
+ON CONFLICT (run_uuid) DO UPDATE SET
+    model_name = EXCLUDED.model_name,
+    start_time = EXCLUDED.start_time,
+    end_time = EXCLUDED.end_time,
+    stage_count = EXCLUDED.stage_count,
+    total_duration_ms = EXCLUDED.total_duration_ms,
+    total_tokens = EXCLUDED.total_tokens,
+    total_cost = EXCLUDED.total_cost,
+    statuses = EXCLUDED.statuses,
+    has_errors = EXCLUDED.has_errors,
+    updated_at = NOW()
+"""
+
+
+def duration_bucket(duration_ms: Optional[int]) -> int:
+    """
+    Histogram bucket index for a stage duration.
+
+    Args:
+        duration_ms: Stage duration (None counts as 0)
+
+    Returns:
+        Index into a histogram of len(STAGE_DURATION_BUCKETS_MS) + 1 buckets
+    """
+    duration_ms = duration_ms or 0
+    for index, bound in enumerate(STAGE_DURATION_BUCKETS_MS):
+        if duration_ms <= bound:
+            return index
+    return len(STAGE_DURATION_BUCKETS_MS)
+
+
+def histogram_percentile(
+    histogram: Sequence[int], fraction: float, max_ms: Optional[float] = None
+) -> Optional[float]:
+    """
+    Estimate a duration percentile as the upper bound of its histogram bucket.
+
+    Args:
+        histogram: Per-bucket counts
+        fraction: Percentile as a fraction (0.95 for p95)
+        max_ms: Observed maximum, reported for the overflow bucket and used to
+            cap bucket bounds above it
+
+    Returns:
+        Estimated duration in ms, or None for an empty histogram
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    target = fraction * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen >= target:
+            if index >= len(STAGE_DURATION_BUCKETS_MS):
+                return float(max_ms) if max_ms is not None else None
+            bound = float(STAGE_DURATION_BUCKETS_MS[index])
+            return min(bound, float(max_ms)) if max_ms is not None else bound
+    return float(max_ms) if max_ms is not None else None
+
+
+def _utc_hour(timestamp: datetime) -> datetime:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _is_failure(status: Optional[str]) -> bool:
+    return (status or "") != "Success"
+
+
+def build_rollup_deltas(
+    entries: Iterable[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Aggregate monitor entries into run and stage-hour rollup increments.
+
+    Args:
+        entries: Monitor entries as built by add_monitor_entry
+
+    Returns:
+        Tuple of (run rows, stage-hour rows) shaped for RUN_MERGE_SQL and STAGE_MERGE_SQL
+    """
+    runs: Dict[str, Dict[str, Any]] = {}
+    stages: Dict[Tuple[str, datetime], Dict[str, Any]] = {}
+
+    for entry in entries:
+        duration_ms = entry.get("duration_ms")
+        tokens = entry.get("total_tokens") or 0
+        cost = Decimal(str(entry.get("total_cost") or 0))
+        status = entry.get("status")
+        failed = _is_failure(status)
+
+        run_key = str(entry["run_uuid"])
+        run = runs.get(run_key)
+        if run is None:
+            run = runs[run_key] = {
+                "run_uuid": run_key,
+                "model_name": entry.get("model_name"),
+                "start_time": entry["stage_start_time"],
+                "end_time": entry.get("stage_end_time"),
+                "stage_count": 0,
+                "total_duration_ms": 0,
+                "total_tokens": 0,
+                "total_cost": Decimal("0"),
+                "statuses": set(),
+                "has_errors": False,
+            }
+        run["start_time"] = min(run["start_time"], entry["stage_start_time"])
+        end_time = entry.get("stage_end_time")
+        if end_time is not None and (run["end_time"] is None or end_time > run["end_time"]):
+            run["end_time"] = end_time
+        run["stage_count"] += 1
+        run["total_duration_ms"] += duration_ms or 0
+        run["total_tokens"] += tokens
+        run["total_cost"] += cost
+        if status is not None:
+            run["statuses"].add(status)
+        run["has_errors"] = run["has_errors"] or failed
+
+        stage_key = (entry["stage_name"], _utc_hour(entry["stage_start_time"]))
+        stage = stages.get(stage_key)
+        if stage is None:
+            stage = stages[stage_key] = {
+                "stage_name": stage_key[0],
+                "hour": stage_key[1],
+                "execution_count": 0,
+                "success_count": 0,
+                "failure_count": 0,
+                "total_duration_ms": 0,
+                "min_duration_ms": None,
+                "max_duration_ms": None,
+                "total_tokens": 0,
+                "total_cost": Decimal("0"),
+                "duration_histogram": [0] * (len(STAGE_DURATION_BUCKETS_MS) + 1),
+            }
+        stage["execution_count"] += 1
+        stage["failure_count" if failed else "success_count"] += 1
+        stage["total_duration_ms"] += duration_ms or 0
+        if duration_ms is not None:
+            current_min = stage["min_duration_ms"]
+            stage["min_duration_ms"] = (
+                duration_ms if current_min is None else min(current_min, duration_ms)
+            )
+            stage["max_duration_ms"] = max(stage["max_duration_ms"] or 0, duration_ms)
+        stage["total_tokens"] += tokens
+        stage["total_cost"] += cost
+        stage["duration_histogram"][duration_bucket(duration_ms)] += 1
+
+    for run in runs.values():
+        run["statuses"] = sorted(run["statuses"])
+    return list(runs.values()), list(stages.values())
+
+
+async def apply_monitor_rollups(
+    entries: List[Dict[str, Any]],
+    execution_id: Optional[str] = None,
+    conn: Optional[AsyncConnection] = None,
+) -> Dict[str, int]:
+    """
+    Merge a batch of freshly written monitor entries into the rollup tables.
+
+    Args:
+        entries: Entries just inserted into process_monitor_logs
+        execution_id: Optional execution ID for logging
+        conn: Connection that inserted the entries, so the merge commits with them
+            (default: a transaction of its own)
+
+    Returns:
+        Number of run and stage-hour rows merged
+    """
+    run_rows, stage_rows = build_rollup_deltas(entries)
+    if not run_rows:
+        return {"runs": 0, "stage_hours": 0}
+    async with AsyncExitStack() as stack:
+        if conn is None:
+            conn = await stack.enter_async_context(get_connection(execution_id))
+        await conn.execute(text(RUN_MERGE_SQL), run_rows)
+        await conn.execute(text(STAGE_MERGE_SQL), stage_rows)
+    logger.debug(
+        "monitor.rollups_merged",
+        execution_id=execution_id,
+        runs=len(run_rows),
+        stage_hours=len(stage_rows),
+    )
+    return {"runs": len(run_rows), "stage_hours": len(stage_rows)}
+
+
+async def refresh_monitor_rollups(
+    lookback_hours: Optional[int] = None,
+    execution_id: Optional[str] = None,
+    wait: bool = False,
+) -> Dict[str, int]:
+    """
+    Rebuild the rollups for recent hours from the raw log.
+
+    Whole UTC hours from the window start onwards are recomputed, along with
+    every run that has a stage in the window. Idempotent; also used to
+    backfill after the rollup tables are first created. When another
+    rebuild holds the refresh lock, nothing is written unless wait is set.
+
+    Args:
+        lookback_hours: Hours to rebuild (default MONITOR_ROLLUP_LOOKBACK_HOURS)
+        execution_id: Optional execution ID for logging
+        wait: Block until the refresh lock is free instead of skipping
+
+    Returns:
+        Number of run and stage-hour rows written (both 0 when skipped)
+    """
+    if lookback_hours is None:
+        lookback_hours = config.monitor_rollups.lookback_hours
+    window_start = _utc_hour(datetime.now(timezone.utc) - timedelta(hours=lookback_hours))
+    params = {"window_start": window_start}
+    async with get_connection(execution_id) as conn:
+        # Concurrent rebuilds would insert the same stage-hours after each other's DELETE
+        if wait:
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": REFRESH_LOCK_KEY}
+            )
+            locked = True
+        else:
+            result = await conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": REFRESH_LOCK_KEY}
+            )
+            locked = result.scalar()
+        if not locked:
+            logger.debug(
+                "monitor.rollups_refresh_skipped",
+                execution_id=execution_id,
+                reason="another refresh holds the lock",
+            )
+            return {"runs": 0, "stage_hours": 0}
+        await conn.execute(
+            text("DELETE FROM process_monitor_stage_hourly WHERE hour >= :window_start"), params
+        )
+        stage_result = await conn.execute(text(REBUILD_STAGE_SQL), params)
+        run_result = await conn.execute(text(REBUILD_RUNS_SQL), params)
+    counts = {"runs": run_result.rowcount, "stage_hours": stage_result.rowcount}
+    logger.info(
+        "monitor.rollups_refreshed",
+        execution_id=execution_id,
+        window_start=window_start.isoformat(),
+        **counts,
+    )
+    return counts
+
+
+async def run_rollup_refresh_loop(interval_seconds: Optional[int] = None) -> None:
+    """
+    Periodically rebuild recent rollups until cancelled.
+
+    Args:
+        interval_seconds: Seconds between refreshes (default MONITOR_ROLLUP_REFRESH_SECONDS)
+    """
+    interval_seconds = interval_seconds or config.monitor_rollups.refresh_seconds
+    while True:
+        try:
+            await refresh_monitor_rollups(execution_id="monitor_rollups")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Keep the loop alive; the next refresh rebuilds the same window
+            logger.warning("monitor.rollups_refresh_failed", error=str(e))
+        await asyncio.sleep(interval_seconds)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _to_iso(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _merge_histograms(histograms: Iterable[Optional[Sequence[int]]]) -> List[int]:
+    merged = [0] * (len(STAGE_DURATION_BUCKETS_MS) + 1)
+    for histogram in histograms:
+        for index, count in enumerate(histogram or []):
+            merged[index] += count or 0
+    return merged
+
+
+def _with_duration_stats(row: Dict[str, Any], histogram: List[int]) -> Dict[str, Any]:
+    count = row["execution_count"]
+    row["avg_duration_ms"] = row["total_duration_ms"] / count if count else 0
+    for key, fraction in PERCENTILES:
+        row[key] = histogram_percentile(histogram, fraction, row["max_duration_ms"])
+    row["duration_histogram"] = histogram
+    return row
+
+
+def summarize_stage_hours(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Combine stage-hour rollup rows into per-stage statistics for a window.
+
+    Args:
+        rows: process_monitor_stage_hourly rows
+
+    Returns:
+        One row per stage, most executed first, with averages and p50/p95/p99
+    """
+    grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        grouped[row["stage_name"]].append(row)
+
+    stages = []
+    for stage_name, stage_rows in grouped.items():
+        minimums = [r["min_duration_ms"] for r in stage_rows if r["min_duration_ms"] is not None]
+        maximums = [r["max_duration_ms"] for r in stage_rows if r["max_duration_ms"] is not None]
+        stage = {
+            "stage_name": stage_name,
+            "execution_count": sum(r["execution_count"] for r in stage_rows),
+            "success_count": sum(r["success_count"] for r in stage_rows),
+            "failure_count": sum(r["failure_count"] for r in stage_rows),
+            "total_duration_ms": sum(r["total_duration_ms"] for r in stage_rows),
+            "min_duration_ms": min(minimums) if minimums else None,
+            "max_duration_ms": max(maximums) if maximums else None,
+            "total_tokens": sum(r["total_tokens"] or 0 for r in stage_rows),
+            "total_cost": float(sum(Decimal(str(r["total_cost"] or 0)) for r in stage_rows)),
+        }
+        _with_duration_stats(stage, _merge_histograms(r["duration_histogram"] for r in stage_rows))
+        # Keys used by the earlier raw-log summary endpoint
+        stage["count"] = stage["execution_count"]
+        stage["avg_duration"] = stage["avg_duration_ms"]
+        stages.append(stage)
+
+    stages.sort(key=lambda stage: stage["execution_count"], reverse=True)
+    return stages
+
+
+def format_stage_trend(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Format one stage's hourly rollup rows as a JSON-ready trend series.
+
+    Args:
+        rows: process_monitor_stage_hourly rows ordered by hour
+
+    Returns:
+        One point per hour with averages and p50/p95/p99
+    """
+    trend = []
+    for row in rows:
+        point = {
+            "hour": _to_iso(row["hour"]),
+            "execution_count": row["execution_count"],
+            "success_count": row["success_count"],
+            "failure_count": row["failure_count"],
+            "total_duration_ms": row["total_duration_ms"],
+            "min_duration_ms": row["min_duration_ms"],
+            "max_duration_ms": row["max_duration_ms"],
+            "total_tokens": row["total_tokens"],
+            "total_cost": _to_float(row["total_cost"]),
+        }
+        trend.append(_with_duration_stats(point, _merge_histograms([row["duration_histogram"]])))
+    return trend
+
+
+def format_run_rollup(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Format a run rollup row like the former raw-log run summary.
+
+    Args:
+        row: process_monitor_run_rollups row
+
+    Returns:
+        JSON-ready run summary
+    """
+    return {
+        "run_uuid": str(row["run_uuid"]),
+        "model_name": row.get("model_name"),
+        "start_time": _to_iso(row["start_time"]),
+        "end_time": _to_iso(row["end_time"]),
+        "stage_count": row["stage_count"],
+        "total_duration_ms": row["total_duration_ms"],
+        "total_tokens": row["total_tokens"],
+        "total_cost": _to_float(row["total_cost"]),
+        "statuses": ", ".join(row["statuses"] or []),
+        "has_errors": row["has_errors"],
+    }
+
+
+async def fetch_recent_runs(hours: int, limit: int) -> List[Dict[str, Any]]:
+    """
+    Most recent runs started within the window, from the run rollups.
+
+    Args:
+        hours: Hours to look back
+        limit: Maximum runs returned
+
+    Returns:
+        Run summaries, newest first
+    """
+    rows = await fetch_all(
+        """
+        SELECT * FROM process_monitor_run_rollups
+        WHERE start_time >= :threshold
+        ORDER BY start_time DESC
+        LIMIT :limit
+        """,
+        params={"threshold": datetime.now(timezone.utc) - timedelta(hours=hours), "limit": limit},
+        execution_id="monitoring",
+    )
+    return [format_run_rollup(row) for row in rows]
+
+
+async def fetch_stage_statistics(hours: int) -> List[Dict[str, Any]]:
+    """
+    Per-stage statistics for the window, from the hourly stage rollups.
+
+    The window is widened to whole hours, so it can include up to an hour of
+    extra history.
+
+    Args:
+        hours: Hours to look back
+
+    Returns:
+        Output of summarize_stage_hours
+    """
+    rows = await fetch_all(
+        "SELECT * FROM process_monitor_stage_hourly WHERE hour >= :threshold",
+        params={"threshold": _utc_hour(datetime.now(timezone.utc) - timedelta(hours=hours))},
+        execution_id="monitoring",
+    )
+    return summarize_stage_hours(rows)
+
+
+async def fetch_stage_trend(stage_name: str, hours: int) -> List[Dict[str, Any]]:
+    """
+    Hourly trend for one stage, from the hourly stage rollups.
+
+    Args:
+        stage_name: Stage to report
+        hours: Hours to look back
+
+    Returns:
+        Output of format_stage_trend
+    """
+    rows = await fetch_all(
+        """
+        SELECT * FROM process_monitor_stage_hourly
+        WHERE stage_name = :stage_name AND hour >= :threshold
+        ORDER BY hour
+        """,
+        params={
+            "stage_name": stage_name,
+            "threshold": _utc_hour(datetime.now(timezone.utc) - timedelta(hours=hours)),
+        },
+        execution_id="monitoring",
+    )
+    return format_stage_trend(rows)
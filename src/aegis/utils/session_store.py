@@ -0,0 +1,415 @@
+"""
+Session-scoped conversation store.
+
+Conversation state used to live only in a websocket handler's local
+variables (lost on reconnect, invisible to other uvicorn workers), and the
+Flask interface shared one global history between all users. Conversations
+are now keyed by a session ID and kept in a store:
+
+- SessionCache: an in-memory LRU bounded by SESSION_MAX_SESSIONS whose
+  entries expire SESSION_TTL_SECONDS after their last write. It is
+  synchronous so the Flask interface can use it directly.
+- SessionStore: the async store used by the FastAPI server. It puts a
+  SessionCache in front of an optional durable backend
+  (SESSION_STORE_BACKEND = memory, postgres or sqlite). Writes are queued
+  and flushed by a background task in batches (SESSION_FLUSH_INTERVAL,
+  SESSION_FLUSH_BATCH_SIZE), so a turn never waits on the database.
+
+Reads go to the backend first, so a session that reconnects to a different
+worker picks up the latest flushed state. Every stored state is compacted
+to the conversation token budget first (context_window.compact_conversation).
+The stored history is therefore capped however long a session runs.
+
+The postgres backend needs schemas/aegis_conversation_sessions_schema.sql.
+The sqlite backend creates its table on first use and suits several workers
+on one host.
+"""
+
+import asyncio
+import copy
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from ..connections.postgres_connector import PRIMARY_ENGINE, bulk_upsert, execute_query, fetch_one
+from .context_window import compact_conversation
+from .logging import get_logger
+from .settings import config
+
+logger = get_logger()
+
+SESSION_TABLE = "aegis_conversation_sessions"
+SESSION_BACKENDS = ("memory", "postgres", "sqlite")
+
+# Keys of a conversation state that are persisted; everything else is per-connection
+PERSISTED_KEYS = ("messages", "summary")
+
+
+def new_session_state() -> Dict[str, Any]:
+    """Return an empty conversation state."""
+    return {"messages": [], "summary": ""}
+
+
+def prepare_session_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the capped, persistable form of a conversation state.
+
+    Args:
+        state: Live conversation state (not modified)
+
+    Returns:
+        Copy holding only PERSISTED_KEYS, compacted to the token budget
+    """
+    stored = copy.deepcopy(
+        {key: state.get(key, new_session_state()[key]) for key in PERSISTED_KEYS}
+    )
+    compact_conversation(stored)
+    return stored
+
+
+class SessionCache:
+    """
+    Thread-safe LRU of conversation states with expiry after the last write.
+
+    Attributes:
+        max_sessions: Entries kept before the least recently used is evicted
+        ttl_seconds: Seconds an entry lives after its last write (0 keeps it forever)
+    """
+
+    def __init__(self, max_sessions: int, ttl_seconds: float):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the session's state, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            if self.ttl_seconds > 0 and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[session_id]
+                return None
+            self._entries.move_to_end(session_id)
+            return copy.deepcopy(entry[1])
+
+    def put(self, session_id: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a capped copy of a session's state.
+
+        Args:
+            session_id: Session ID
+            state: Conversation state
+
+        Returns:
+            The stored (compacted) state
+        """
+        stored = prepare_session_state(state)
+        with self._lock:
+            self._entries[session_id] = (time.monotonic(), stored)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+        return copy.deepcopy(stored)
+
+    def delete(self, session_id: str) -> None:
+        """Forget a session."""
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class PostgresSessionBackend:
+    """Sessions in the aegis_conversation_sessions table (see schemas/)."""
+
+    async def load(self, session_id: str, ttl_seconds: float) -> Optional[Dict[str, Any]]:
+        """Load a session written within the TTL, or None."""
+        query = f"SELECT state, updated_at FROM {SESSION_TABLE} WHERE session_id = :session_id"
+        # Read-after-write across workers: a replica may not have the latest flush yet
+        row = await fetch_one(
+            query, {"session_id": session_id}, execution_id="session_store", engine=PRIMARY_ENGINE
+        )
+        if row is None:
+            return None
+        if ttl_seconds > 0 and row["updated_at"] < datetime.now(timezone.utc) - timedelta(
+            seconds=ttl_seconds
+        ):
+            return None
+        state = row["state"]
+        return json.loads(state) if isinstance(state, str) else state
+
+    async def save_many(self, states: Dict[str, Dict[str, Any]]) -> None:
+        """Upsert several sessions in one merge."""
+        now = datetime.now(timezone.utc)
+        records = [
+            {"session_id": session_id, "state": state, "updated_at": now}
+            for session_id, state in states.items()
+        ]
+        await bulk_upsert(SESSION_TABLE, records, ["session_id"], execution_id="session_store")
+
+    async def delete(self, session_id: str) -> None:
+        """Delete a session."""
+        await execute_query(
+            f"DELETE FROM {SESSION_TABLE} WHERE session_id = :session_id",
+            {"session_id": session_id},
+            execution_id="session_store",
+        )
+
+    async def purge_expired(self, ttl_seconds: float) -> None:
+        """Delete sessions not written within the TTL."""
+        await execute_query(
+            f"DELETE FROM {SESSION_TABLE} WHERE updated_at < :cutoff",
+            {"cutoff": datetime.now(timezone.utc) - timedelta(seconds=ttl_seconds)},
+            execution_id="session_store",
+        )
+
+
+class SQLiteSessionBackend:
+    """Sessions in a local SQLite file, shared by workers on the same host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._initialized:
+            # WAL lets several worker processes read while one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {SESSION_TABLE} ("
+                "session_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._initialized = True
+        return conn
+
+    def _load(self, session_id: str, ttl_seconds: float) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT state, updated_at FROM {SESSION_TABLE} WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None or (ttl_seconds > 0 and row[1] < time.time() - ttl_seconds):
+            return None
+        return json.loads(row[0])
+
+    def _save_many(self, states: Dict[str, Dict[str, Any]]) -> None:
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO {SESSION_TABLE} (session_id, state, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET "
+                    "state = excluded.state, updated_at = excluded.updated_at",
+                    [
+                        (session_id, json.dumps(state, ensure_ascii=False), now)
+                        for session_id, state in states.items()
+                    ],
+                )
+        finally:
+            conn.close()
+
+    def _execute(self, statement: str, params: tuple) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(statement, params)
+        finally:
+            conn.close()
+
+    async def load(self, session_id: str, ttl_seconds: float) -> Optional[Dict[str, Any]]:
+        """Load a session written within the TTL, or None."""
+        return await asyncio.to_thread(self._load, session_id, ttl_seconds)
+
+    async def save_many(self, states: Dict[str, Dict[str, Any]]) -> None:
+        """Upsert several sessions in one transaction."""
+        await asyncio.to_thread(self._save_many, states)
+
+    async def delete(self, session_id: str) -> None:
+        """Delete a session."""
+        await asyncio.to_thread(
+            self._execute, f"DELETE FROM {SESSION_TABLE} WHERE session_id = ?", (session_id,)
+        )
+
+    async def purge_expired(self, ttl_seconds: float) -> None:
+        """Delete sessions not written within the TTL."""
+        await asyncio.to_thread(
+            self._execute,
+            f"DELETE FROM {SESSION_TABLE} WHERE updated_at < ?",
+            (time.time() - ttl_seconds,),
+        )
+
+
+class SessionStore:
+    """
+    Async conversation store: an LRU cache with batched write-behind to a backend.
+
+    Attributes:
+        cache: In-process LRU of recent sessions
+        backend: Durable backend, or None for memory only
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        max_sessions: int = 1000,
+        ttl_seconds: float = 86400,
+        flush_interval: float = 1.0,
+        batch_size: int = 50,
+    ):
+        self.cache = SessionCache(max_sessions, ttl_seconds)
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+        self._last_purge = time.monotonic()
+
+    async def start(self) -> None:
+        """Start the background flush task (no-op without a backend)."""
+        if self.backend is not None and self._flusher is None:
+            self._closing = False
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """Stop the flush task and write any pending sessions."""
+        if self._flusher is not None:
+            # Let an in-flight batch finish instead of cancelling it mid-write
+            self._closing = True
+            self._wakeup.set()
+            await self._flusher
+            self._flusher = None
+        await self.flush()
+
+    async def get(self, session_id: str) -> Dict[str, Any]:
+        """
+        Load a session's conversation state.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            The stored state, or a new empty state for unknown or expired sessions
+        """
+        if session_id in self._pending:
+            return copy.deepcopy(self._pending[session_id])
+        if self.backend is not None:
+            try:
+                state = await self.backend.load(session_id, self.ttl_seconds)
+                if state is not None:
+                    return self.cache.put(session_id, state)
+            except Exception as e:  # pylint: disable=broad-except
+                # An unavailable backend degrades to this worker's cache
+                logger.warning("session_store.load_failed", session_id=session_id, error=str(e))
+        return self.cache.get(session_id) or new_session_state()
+
+    async def put(self, session_id: str, state: Dict[str, Any]) -> None:
+        """
+        Save a session's conversation state; the backend write is batched.
+
+        Args:
+            session_id: Session ID
+            state: Conversation state (only PERSISTED_KEYS are stored)
+        """
+        stored = self.cache.put(session_id, state)
+        if self.backend is None:
+            return
+        self._pending[session_id] = stored
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def delete(self, session_id: str) -> None:
+        """Forget a session everywhere."""
+        self.cache.delete(session_id)
+        self._pending.pop(session_id, None)
+        if self.backend is not None:
+            await self.backend.delete(session_id)
+
+    async def flush(self) -> int:
+        """
+        Write pending sessions to the backend now.
+
+        Returns:
+            Number of sessions written
+        """
+        if self.backend is None or not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        try:
+            await self.backend.save_many(batch)
+        except asyncio.CancelledError:
+            self._requeue(batch)
+            raise
+        except Exception as e:  # pylint: disable=broad-except
+            self._requeue(batch)
+            logger.warning("session_store.flush_failed", sessions=len(batch), error=str(e))
+            return 0
+        logger.debug("session_store.flushed", sessions=len(batch))
+        return len(batch)
+
+    def _requeue(self, batch: Dict[str, Dict[str, Any]]) -> None:
+        """Keep an unwritten batch for the next flush unless a newer write replaced it."""
+        for session_id, state in batch.items():
+            self._pending.setdefault(session_id, state)
+
+    async def _flush_loop(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self.ttl_seconds > 0 and time.monotonic() - self._last_purge > self.ttl_seconds:
+                self._last_purge = time.monotonic()
+                try:
+                    await self.backend.purge_expired(self.ttl_seconds)
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.warning("session_store.purge_failed", error=str(e))
+
+
+def create_session_store(backend_name: Optional[str] = None) -> SessionStore:
+    """
+    Build a SessionStore from SESSION_* settings.
+
+    Args:
+        backend_name: Override SESSION_STORE_BACKEND
+
+    Returns:
+        Configured (not yet started) store
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    settings = config.session_store
+    backend_name = (backend_name or settings.backend).lower()
+    if backend_name not in SESSION_BACKENDS:
+        raise ValueError(f"Unknown session store backend: {backend_name}")
+    backend: Optional[Any] = None
+    if backend_name == "postgres":
+        backend = PostgresSessionBackend()
+    elif backend_name == "sqlite":
+        backend = SQLiteSessionBackend(settings.sqlite_path)
+    return SessionStore(
+        backend=backend,
+        max_sessions=settings.max_sessions,
+        ttl_seconds=settings.ttl_seconds,
+        flush_interval=settings.flush_interval,
+        batch_size=settings.flush_batch_size,
+    )
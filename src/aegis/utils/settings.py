@@ -7,7 +7,7 @@ from .env files and system environment.
 
 import os
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from dotenv import load_dotenv
 
@@ -39,6 +39,138 @@ class ConversationConfig:
     include_system_messages: bool
     allowed_roles: List[str]
     max_history_length: int
+    token_budget: int
+    agent_token_budgets: Dict[str, int]
+    summary_max_tokens: int
+    tokenizer_encoding: str
+
+    def budget_for(self, agent: str) -> int:
+        """Return the history token budget for an agent, falling back to the overall budget."""
+        return self.agent_token_budgets.get(agent.lower(), self.token_budget)
+
+
+@dataclass
+class ClarifierConfig:
+    """Clarifier agent configuration."""
+
+    speculative_periods: bool
+    fast_path: bool
+    availability_ttl: int
+
+
+@dataclass
+class RouterCacheConfig:
+    """Router decision cache configuration."""
+
+    enabled: bool
+    ttl_seconds: int
+    max_entries: int
+    similarity_threshold: float
+    history_window: int
+
+
+@dataclass
+class SubagentConfig:
+    """Subagent execution configuration."""
+
+    default_timeout: int
+    timeouts: Dict[str, int]
+    max_concurrency: int
+
+    def timeout_for(self, database_id: str) -> int:
+        """Return the deadline in seconds for a subagent, falling back to the default."""
+        return self.timeouts.get(database_id.lower(), self.default_timeout)
+
+
+@dataclass
+class RerankConfig:
+    """Retrieval reranking backend configuration."""
+
+    backend: str
+    local_min_score: float
+    local_lexical_weight: float
+
+
+@dataclass
+class QueryStatsConfig:
+    """Per-statement query instrumentation configuration."""
+
+    enabled: bool
+    max_fingerprints: int
+    explain_threshold_ms: float
+    explain_sample_rate: float
+    slow_sample_limit: int
+
+
+@dataclass
+class RenderingConfig:
+    """ETL document rendering pool configuration."""
+
+    workers: int
+
+
+@dataclass
+class MonitorRollupConfig:
+    """Monitoring dashboard rollup refresh configuration."""
+
+    refresh_seconds: int
+    lookback_hours: int
+
+
+@dataclass
+class DatabaseViewerConfig:
+    """Database viewer schema cache and row count configuration."""
+
+    schema_cache_ttl: int
+    exact_count_timeout: float
+    exact_count_concurrency: int
+    stream_batch_size: int
+    max_query_rows: int
+
+
+@dataclass
+class SessionStoreConfig:
+    """Conversation session store configuration."""
+
+    backend: str
+    max_sessions: int
+    ttl_seconds: int
+    flush_interval: float
+    flush_batch_size: int
+    sqlite_path: str
+
+
+@dataclass
+class ServerConfig:
+    """FastAPI serving mode and per-worker warmup configuration."""
+
+    workers: int
+    warmup: bool
+    warmup_timeout: float
+    graceful_shutdown: int
+
+
+@dataclass
+class CategoryCacheConfig:
+    """ETL category workbook artifact cache configuration."""
+
+    cache_dir: str
+    persist: bool
+
+
+@dataclass
+class PostgresEngineConfig:
+    """Connection and pool settings for one named PostgreSQL engine."""
+
+    host: str
+    port: str
+    database: str
+    user: str
+    password: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    read_only: bool
 
 
 @dataclass
@@ -76,6 +208,28 @@ class LLMConfig:
     embedding: LLMEmbeddingConfig
 
 
+def _parse_int_mapping(raw: str) -> Dict[str, int]:
+    """
+    Parse a "key=value,key=value" environment string into an int mapping.
+
+    Args:
+        raw: Raw environment variable value
+
+    Returns:
+        Mapping of lowercase keys to integer values (malformed pairs are skipped)
+    """
+    mapping = {}
+    for pair in raw.split(","):
+        key, sep, value = pair.partition("=")
+        if not sep or not key.strip():
+            continue
+        try:
+            mapping[key.strip().lower()] = int(value.strip())
+        except ValueError:
+            continue
+    return mapping
+
+
 class Config:  # pylint: disable=too-many-instance-attributes
     # Config class needs many attributes to centralize all app settings in one place.
     """
@@ -100,6 +254,21 @@ class Config:  # pylint: disable=too-many-instance-attributes
         INCLUDE_SYSTEM_MESSAGES: "true"/"false" to include/exclude system messages
         ALLOWED_ROLES: Comma-separated list of allowed message roles
         MAX_HISTORY_LENGTH: Number of recent messages to keep
+        CONVERSATION_TOKEN_BUDGET: Token budget for verbatim history; older turns are
+            folded into a rolling summary
+        CONVERSATION_AGENT_TOKEN_BUDGETS: Per-agent history budgets ("router=1500,...")
+        CONVERSATION_SUMMARY_MAX_TOKENS: Maximum size of the rolling summary
+        CONVERSATION_TOKENIZER_ENCODING: tiktoken encoding used for token counts
+        POSTGRES_STATEMENT_CACHE_SIZE: Prepared statements cached per connection
+            (set to 0 behind a transaction-pooling proxy such as pgbouncer)
+        POSTGRES_POOL_PRE_PING: "true"/"false" to ping replica connections on checkout
+            (primary connections are always pinged)
+        POSTGRES_POOL_SIZE / POSTGRES_MAX_OVERFLOW / POSTGRES_POOL_TIMEOUT: Primary pool sizing
+        POSTGRES_REPLICA_HOST: Read replica host; read-only helpers route here when set
+        POSTGRES_REPLICA_PORT / _DATABASE / _USER / _PASSWORD: Replica overrides
+            (default to the primary values)
+        POSTGRES_REPLICA_POOL_SIZE / _MAX_OVERFLOW / _POOL_TIMEOUT: Replica pool sizing
+        POSTGRES_REPLICA_COOLDOWN: Seconds a failed replica is skipped before retrying it
         SSL_VERIFY: "true"/"false" to enable/disable SSL verification
         SSL_CERT_PATH: Path to certificate file when SSL_VERIFY=true
         OAUTH_ENDPOINT: OAuth token endpoint URL
@@ -109,6 +278,62 @@ class Config:  # pylint: disable=too-many-instance-attributes
         OAUTH_MAX_RETRIES: Maximum retry attempts for token generation
         OAUTH_RETRY_DELAY: Initial retry delay in seconds
         S3_REPORTS_BASE_URL: Base URL for S3 reports (e.g., https://s3.amazonaws.com/bucket/reports/)
+        CLARIFIER_SPECULATIVE_PERIODS: "true"/"false" to run period extraction alongside
+            bank extraction when the query names a period
+        CLARIFIER_FAST_PATH: "true"/"false" to resolve unambiguous first-turn queries
+            without an LLM call
+        CLARIFIER_AVAILABILITY_TTL: Seconds each process reuses its bank/period
+            availability snapshot (0 reads the table on every call)
+        ROUTER_CACHE_ENABLED: "true"/"false" to reuse routing decisions for repeated turns
+        ROUTER_CACHE_TTL: Seconds a cached routing decision stays valid
+        ROUTER_CACHE_MAX_ENTRIES: Maximum cached routing decisions
+        ROUTER_CACHE_SIMILARITY: Minimum similarity (0-1) for a near-duplicate message hit
+        ROUTER_CACHE_HISTORY_WINDOW: Prior messages included in the cache key
+        SUBAGENT_TIMEOUT: Default per-subagent deadline in seconds
+        SUBAGENT_TIMEOUTS: Per-database overrides, e.g. "transcripts=240,rts=120"
+        SUBAGENT_MAX_CONCURRENCY: Maximum subagents run concurrently per request
+        RERANK_BACKEND: "llm" (tool-call reranking) or "local" (CPU scoring, no LLM call)
+        RERANK_LOCAL_MIN_SCORE: Local backend drops candidates scoring below this
+            fraction (0-1) of the best candidate
+        RERANK_LOCAL_LEXICAL_WEIGHT: Weight (0-1) of query-term overlap versus the
+            retrieval score in the local backend
+        QUERY_STATS_ENABLED: "true"/"false" to time every statement by fingerprint
+        QUERY_STATS_MAX_FINGERPRINTS: Distinct statement fingerprints tracked
+        QUERY_EXPLAIN_THRESHOLD_MS: Capture EXPLAIN (ANALYZE, BUFFERS) for reads slower
+            than this (0 disables capture)
+        QUERY_EXPLAIN_SAMPLE_RATE: Fraction (0-1) of slow reads that get a plan captured
+        QUERY_SLOW_SAMPLES: Most recent slow-query plans kept
+        RENDERING_WORKERS: Worker processes for ETL DOCX/HTML rendering (0 renders on
+            a thread of the calling process)
+        CATEGORY_CACHE_DIR: Directory for parsed category workbook artifacts (empty
+            writes a .category_cache directory next to each workbook)
+        CATEGORY_CACHE_PERSIST: "true"/"false" to keep parsed workbooks on disk
+            between runs (false caches in process memory only)
+        MONITOR_ROLLUP_REFRESH_SECONDS: Seconds between rebuilds of recent monitoring
+            rollups by the server (0 disables the periodic job)
+        MONITOR_ROLLUP_LOOKBACK_HOURS: Hours of raw monitor logs each rebuild recomputes
+        SESSION_STORE_BACKEND: Where conversation sessions are kept: "memory" (this
+            process only), "postgres" or "sqlite" (shared by workers)
+        SESSION_MAX_SESSIONS: Sessions kept in each process's LRU cache
+        SESSION_TTL_SECONDS: Seconds a session lives after its last message (0 never expires)
+        SESSION_FLUSH_INTERVAL: Seconds between batched session writes to the backend
+        SESSION_FLUSH_BATCH_SIZE: Pending sessions that trigger an early flush
+        SESSION_SQLITE_PATH: Database file for the sqlite session backend
+        SERVER_WORKERS: Uvicorn worker processes in --production mode (0 uses one per CPU)
+        SERVER_WARMUP: "true"/"false" to load the database pool, LLM client, prompt cache
+            and availability snapshot in each worker before it accepts connections
+        SERVER_WARMUP_TIMEOUT: Seconds each warmup step may take before it is skipped
+        SERVER_GRACEFUL_SHUTDOWN: Seconds a stopping worker waits for open requests and
+            chat turns before closing them
+        DATABASE_VIEWER_SCHEMA_TTL: Seconds the database viewer reuses cached schema
+            metadata and row estimates (0 disables the cache)
+        DATABASE_VIEWER_COUNT_TIMEOUT: Seconds each exact COUNT(*) may run before the
+            viewer falls back to the estimate
+        DATABASE_VIEWER_COUNT_CONCURRENCY: Exact row counts run at the same time
+        DATABASE_VIEWER_STREAM_BATCH_SIZE: Rows fetched per server-side cursor round trip
+            when streaming viewer queries and exports
+        DATABASE_VIEWER_MAX_QUERY_ROWS: Rows returned by a JSON viewer query before it
+            is truncated (exports are not limited)
     """
 
     _instance = None
@@ -154,6 +379,48 @@ class Config:  # pylint: disable=too-many-instance-attributes
                 role.strip() for role in os.getenv("ALLOWED_ROLES", "user,assistant").split(",")
             ],
             max_history_length=int(os.getenv("MAX_HISTORY_LENGTH", "10")),
+            token_budget=int(os.getenv("CONVERSATION_TOKEN_BUDGET", "6000")),
+            agent_token_budgets=_parse_int_mapping(
+                os.getenv(
+                    "CONVERSATION_AGENT_TOKEN_BUDGETS",
+                    "router=1500,clarifier=3000,planner=2000,response=4000,"
+                    "summarizer=3000,subagents=3000",
+                )
+            ),
+            summary_max_tokens=int(os.getenv("CONVERSATION_SUMMARY_MAX_TOKENS", "600")),
+            tokenizer_encoding=os.getenv("CONVERSATION_TOKENIZER_ENCODING", "o200k_base"),
+        )
+
+        # Clarifier Configuration
+        self.clarifier = ClarifierConfig(
+            speculative_periods=(
+                os.getenv("CLARIFIER_SPECULATIVE_PERIODS", "true").lower() == "true"
+            ),
+            fast_path=os.getenv("CLARIFIER_FAST_PATH", "true").lower() == "true",
+            availability_ttl=int(os.getenv("CLARIFIER_AVAILABILITY_TTL", "300")),
+        )
+
+        # Router Cache Configuration
+        self.router_cache = RouterCacheConfig(
+            enabled=os.getenv("ROUTER_CACHE_ENABLED", "true").lower() == "true",
+            ttl_seconds=int(os.getenv("ROUTER_CACHE_TTL", "600")),
+            max_entries=int(os.getenv("ROUTER_CACHE_MAX_ENTRIES", "1000")),
+            similarity_threshold=float(os.getenv("ROUTER_CACHE_SIMILARITY", "0.92")),
+            history_window=int(os.getenv("ROUTER_CACHE_HISTORY_WINDOW", "4")),
+        )
+
+        # Subagent Configuration
+        self.subagents = SubagentConfig(
+            default_timeout=int(os.getenv("SUBAGENT_TIMEOUT", "200")),
+            timeouts=_parse_int_mapping(os.getenv("SUBAGENT_TIMEOUTS", "")),
+            max_concurrency=int(os.getenv("SUBAGENT_MAX_CONCURRENCY", "5")),
+        )
+
+        # Rerank Configuration
+        self.rerank = RerankConfig(
+            backend=os.getenv("RERANK_BACKEND", "llm").strip().lower(),
+            local_min_score=float(os.getenv("RERANK_LOCAL_MIN_SCORE", "0.35")),
+            local_lexical_weight=float(os.getenv("RERANK_LOCAL_LEXICAL_WEIGHT", "0.4")),
         )
 
         # SSL Configuration
@@ -178,6 +445,90 @@ class Config:  # pylint: disable=too-many-instance-attributes
         self.postgres_database = os.getenv("POSTGRES_DATABASE", "")
         self.postgres_user = os.getenv("POSTGRES_USER", "")
         self.postgres_password = os.getenv("POSTGRES_PASSWORD", "")
+        self.postgres_statement_cache_size = int(os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", "256"))
+        self.postgres_pool_pre_ping = os.getenv("POSTGRES_POOL_PRE_PING", "false").lower() == "true"
+        self.postgres_replica_cooldown = int(os.getenv("POSTGRES_REPLICA_COOLDOWN", "30"))
+
+        # Query Instrumentation Configuration
+        self.query_stats = QueryStatsConfig(
+            enabled=os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true",
+            max_fingerprints=int(os.getenv("QUERY_STATS_MAX_FINGERPRINTS", "500")),
+            explain_threshold_ms=float(os.getenv("QUERY_EXPLAIN_THRESHOLD_MS", "0")),
+            explain_sample_rate=float(os.getenv("QUERY_EXPLAIN_SAMPLE_RATE", "0.1")),
+            slow_sample_limit=int(os.getenv("QUERY_SLOW_SAMPLES", "50")),
+        )
+
+        # ETL Rendering Configuration
+        self.rendering = RenderingConfig(
+            workers=int(os.getenv("RENDERING_WORKERS", "2")),
+        )
+
+        # Monitoring Rollup Configuration
+        self.monitor_rollups = MonitorRollupConfig(
+            refresh_seconds=int(os.getenv("MONITOR_ROLLUP_REFRESH_SECONDS", "900")),
+            lookback_hours=int(os.getenv("MONITOR_ROLLUP_LOOKBACK_HOURS", "2")),
+        )
+
+        # Conversation Session Store Configuration
+        self.session_store = SessionStoreConfig(
+            backend=os.getenv("SESSION_STORE_BACKEND", "memory").lower(),
+            max_sessions=int(os.getenv("SESSION_MAX_SESSIONS", "1000")),
+            ttl_seconds=int(os.getenv("SESSION_TTL_SECONDS", "86400")),
+            flush_interval=float(os.getenv("SESSION_FLUSH_INTERVAL", "1.0")),
+            flush_batch_size=int(os.getenv("SESSION_FLUSH_BATCH_SIZE", "50")),
+            sqlite_path=os.getenv("SESSION_SQLITE_PATH", "aegis_sessions.sqlite3"),
+        )
+
+        # FastAPI Serving Configuration
+        self.server = ServerConfig(
+            workers=int(os.getenv("SERVER_WORKERS", "0")),
+            warmup=os.getenv("SERVER_WARMUP", "true").lower() == "true",
+            warmup_timeout=float(os.getenv("SERVER_WARMUP_TIMEOUT", "30")),
+            graceful_shutdown=int(os.getenv("SERVER_GRACEFUL_SHUTDOWN", "30")),
+        )
+
+        # Database Viewer Configuration
+        self.database_viewer = DatabaseViewerConfig(
+            schema_cache_ttl=int(os.getenv("DATABASE_VIEWER_SCHEMA_TTL", "60")),
+            exact_count_timeout=float(os.getenv("DATABASE_VIEWER_COUNT_TIMEOUT", "5")),
+            exact_count_concurrency=int(os.getenv("DATABASE_VIEWER_COUNT_CONCURRENCY", "4")),
+            stream_batch_size=int(os.getenv("DATABASE_VIEWER_STREAM_BATCH_SIZE", "1000")),
+            max_query_rows=int(os.getenv("DATABASE_VIEWER_MAX_QUERY_ROWS", "10000")),
+        )
+
+        # ETL Category Workbook Cache Configuration
+        self.category_cache = CategoryCacheConfig(
+            cache_dir=os.getenv("CATEGORY_CACHE_DIR", ""),
+            persist=os.getenv("CATEGORY_CACHE_PERSIST", "true").lower() == "true",
+        )
+
+        # Named engines: the primary always exists, the replica only when a host is set
+        self.postgres_engines = {
+            "primary": PostgresEngineConfig(
+                host=self.postgres_host,
+                port=self.postgres_port,
+                database=self.postgres_database,
+                user=self.postgres_user,
+                password=self.postgres_password,
+                pool_size=int(os.getenv("POSTGRES_POOL_SIZE", "20")),
+                max_overflow=int(os.getenv("POSTGRES_MAX_OVERFLOW", "40")),
+                pool_timeout=int(os.getenv("POSTGRES_POOL_TIMEOUT", "30")),
+                read_only=False,
+            )
+        }
+        replica_host = os.getenv("POSTGRES_REPLICA_HOST", "")
+        if replica_host:
+            self.postgres_engines["replica"] = PostgresEngineConfig(
+                host=replica_host,
+                port=os.getenv("POSTGRES_REPLICA_PORT", self.postgres_port),
+                database=os.getenv("POSTGRES_REPLICA_DATABASE", self.postgres_database),
+                user=os.getenv("POSTGRES_REPLICA_USER", self.postgres_user),
+                password=os.getenv("POSTGRES_REPLICA_PASSWORD", self.postgres_password),
+                pool_size=int(os.getenv("POSTGRES_REPLICA_POOL_SIZE", "20")),
+                max_overflow=int(os.getenv("POSTGRES_REPLICA_MAX_OVERFLOW", "20")),
+                pool_timeout=int(os.getenv("POSTGRES_REPLICA_POOL_TIMEOUT", "10")),
+                read_only=True,
+            )
 
         # S3 Configuration for Reports
         self.s3_reports_base_url = os.getenv("S3_REPORTS_BASE_URL", "")
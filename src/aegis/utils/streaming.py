@@ -0,0 +1,132 @@
+"""
+Async stream utilities.
+
+Provides an event-driven fan-in merger for concurrent async generators and
+a small timing record used to report first-byte/last-byte latency per stream.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional, Tuple
+
+# Sentinel pushed by a pump task once its source stream is exhausted
+_STREAM_DONE = object()
+
+
+@dataclass
+class _StreamFailure:
+    """Wraps an exception raised by a source so it can travel through the queue."""
+
+    error: Exception
+
+
+@dataclass
+class StreamTiming:
+    """Arrival timing for a single stream, relative to when it started."""
+
+    name: str
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    first_chunk_at: Optional[datetime] = None
+    last_chunk_at: Optional[datetime] = None
+    chunk_count: int = 0
+
+    def record_chunk(self) -> None:
+        """Record the arrival of one chunk."""
+        now = datetime.now(timezone.utc)
+        if self.first_chunk_at is None:
+            self.first_chunk_at = now
+        self.last_chunk_at = now
+        self.chunk_count += 1
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """
+        Format timing for monitor custom_metadata.
+
+        Returns:
+            Dict with first_byte_ms, last_byte_ms and chunk_count
+        """
+
+        def _offset_ms(moment: Optional[datetime]) -> Optional[int]:
+            if moment is None:
+                return None
+            return int((moment - self.started_at).total_seconds() * 1000)
+
+        return {
+            "first_byte_ms": _offset_ms(self.first_chunk_at),
+            "last_byte_ms": _offset_ms(self.last_chunk_at),
+            "chunk_count": self.chunk_count,
+        }
+
+
+async def merge_streams(
+    streams: Dict[str, AsyncIterator[Any]],
+    max_concurrency: Optional[int] = None,
+) -> AsyncGenerator[Tuple[str, Any], None]:
+    """
+    Merge several async iterators into one stream in arrival order.
+
+    Each source is drained by its own task into a shared queue; the consumer
+    awaits the queue directly, so chunks are yielded the moment they arrive
+    and the merged stream ends as soon as the last source finishes.
+
+    Sources are expected to handle their own errors. An unhandled exception
+    from a source cancels the remaining sources and is re-raised here. When
+    the consumer stops early (client disconnect, aclose, cancellation) all
+    still-running sources are cancelled before this generator returns.
+
+    Args:
+        streams: Mapping of stream name to async iterator
+        max_concurrency: Optional cap on sources drained at the same time
+
+    Yields:
+        (stream_name, chunk) tuples in arrival order
+    """
+    if not streams:
+        return
+
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def _pump(name: str, source: AsyncIterator[Any]) -> None:
+        try:
+            if semaphore is not None:
+                async with semaphore:
+                    async for chunk in source:
+                        await queue.put((name, chunk))
+            else:
+                async for chunk in source:
+                    await queue.put((name, chunk))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Hand the failure to the consumer so it surfaces in the caller's task.
+            await queue.put((name, _StreamFailure(e)))
+            return
+        await queue.put((name, _STREAM_DONE))
+
+    tasks = [asyncio.create_task(_pump(name, source)) for name, source in streams.items()]
+    remaining = len(tasks)
+
+    try:
+        while remaining:
+            name, item = await queue.get()
+            if item is _STREAM_DONE:
+                remaining -= 1
+                continue
+            if isinstance(item, _StreamFailure):
+                raise item.error
+            yield name, item
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for source in streams.values():
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception:  # pylint: disable=broad-exception-caught
+                    # Best-effort cleanup of sources that never started or already failed.
+                    pass
@@ -0,0 +1,178 @@
+"""Tests for streamed tool-call completions."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from aegis.connections import llm_connector
+from aegis.connections.llm_connector import ToolArgumentParser, stream_with_tools
+
+CONTEXT = {"execution_id": "test", "auth_config": {"token": "t"}}
+
+
+class _Chunk:
+    """Minimal stand-in for an OpenAI stream chunk."""
+
+    def __init__(self, payload: dict):
+        self.payload = payload
+
+    def model_dump(self) -> dict:
+        return self.payload
+
+
+class _Stream:
+    """Async iterator over chunks that records whether it was closed."""
+
+    def __init__(self, payloads: list):
+        self.payloads = payloads
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> _Chunk:
+        if self.consumed >= len(self.payloads):
+            raise StopAsyncIteration
+        self.consumed += 1
+        return _Chunk(self.payloads[self.consumed - 1])
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _argument_chunks(arguments: str, size: int) -> list:
+    chunks = [
+        {
+            "choices": [
+                {
+                    "delta": {
+                        "tool_calls": [{"index": 0, "id": "call_1", "function": {"name": "emit"}}]
+                    },
+                    "finish_reason": None,
+                }
+            ]
+        }
+    ]
+    for start in range(0, len(arguments), size):
+        fragment = arguments[start : start + size]
+        tool_delta = {"index": 0, "function": {"arguments": fragment}}
+        chunks.append({"choices": [{"delta": {"tool_calls": [tool_delta]}}]})
+    chunks.append({"choices": [{"delta": {}, "finish_reason": "tool_calls"}]})
+    chunks.append({"choices": [], "usage": {"prompt_tokens": 10, "completion_tokens": 5}})
+    return chunks
+
+
+def _install_stream(monkeypatch: pytest.MonkeyPatch, stream: _Stream) -> dict:
+    calls = {}
+
+    async def create(**kwargs):
+        calls.update(kwargs)
+        return stream
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    async def fake_client(*_args):
+        return client
+
+    monkeypatch.setattr(llm_connector, "_get_or_create_async_client", fake_client)
+    return calls
+
+
+def test_parser_yields_array_elements_as_they_complete() -> None:
+    """Elements of top-level arrays are decoded as soon as their closing character arrives."""
+    arguments = json.dumps(
+        {
+            "summary": "a, [b] {c}",
+            "findings": [{"index": 1, "tags": ["x", "y]"]}, {"index": 2, "note": 'q"}'}],
+            "scores": [1, 2.5, "three", None],
+        }
+    )
+    parser = ToolArgumentParser()
+    completed = []
+    seen_after_first = None
+    for char in arguments:
+        completed.extend(parser.feed(char))
+        if seen_after_first is None and completed:
+            seen_after_first = len(parser.buffer)
+
+    assert completed == [
+        ("findings", {"index": 1, "tags": ["x", "y]"]}),
+        ("findings", {"index": 2, "note": 'q"}'}),
+        ("scores", 1),
+        ("scores", 2.5),
+        ("scores", "three"),
+        ("scores", None),
+    ]
+    assert seen_after_first < arguments.index('{"index": 2')
+    assert parser.result() == json.loads(arguments)
+
+
+@pytest.mark.asyncio
+async def test_stream_with_tools_yields_items_and_final_response(monkeypatch) -> None:
+    """Items stream out first and the final response matches the complete_with_tools shape."""
+    arguments = json.dumps({"findings": [{"index": 1}, {"index": 2}]})
+    stream = _Stream(_argument_chunks(arguments, size=7))
+    calls = _install_stream(monkeypatch, stream)
+
+    events = [
+        event async for event in stream_with_tools([{"role": "user", "content": "x"}], [], CONTEXT)
+    ]
+
+    assert [event["item"] for event in events if event["type"] == "item"] == [
+        {"index": 1},
+        {"index": 2},
+    ]
+    response = events[-1]["response"]
+    (choice,) = response["choices"]
+    assert choice["finish_reason"] == "tool_calls"
+    (tool_call,) = choice["message"]["tool_calls"]
+    assert tool_call["id"] == "call_1"
+    assert tool_call["function"] == {"name": "emit", "arguments": arguments}
+    assert response["usage"]["completion_tokens"] == 5
+    assert calls["stream"] is True
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_stream_with_tools_skips_malformed_elements(monkeypatch) -> None:
+    """A malformed streamed element is not yielded and does not abort the stream."""
+    arguments = '{"conversations": [{"block_indices": [1, 2]}, {"block_indices": [3,}, 4x]}'
+    stream = _Stream(_argument_chunks(arguments, size=5))
+    _install_stream(monkeypatch, stream)
+
+    events = [
+        event async for event in stream_with_tools([{"role": "user", "content": "x"}], [], CONTEXT)
+    ]
+
+    assert [event["item"] for event in events if event["type"] == "item"] == [
+        {"block_indices": [1, 2]}
+    ]
+    (tool_call,) = events[-1]["response"]["choices"][0]["message"]["tool_calls"]
+    assert tool_call["function"]["arguments"] == arguments
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(arguments)
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_early_stops_reading(monkeypatch) -> None:
+    """A caller that stops after the first item closes the HTTP stream."""
+    arguments = json.dumps({"findings": [{"index": n} for n in range(50)]})
+    stream = _Stream(_argument_chunks(arguments, size=4))
+    _install_stream(monkeypatch, stream)
+
+    events = stream_with_tools([{"role": "user", "content": "x"}], [], CONTEXT)
+    async for event in events:
+        assert event == {
+            "type": "item",
+            "tool_index": 0,
+            "name": "emit",
+            "key": "findings",
+            "item": {"index": 0},
+        }
+        break
+    await events.aclose()
+
+    assert stream.closed
+    assert stream.consumed < len(stream.payloads) // 2
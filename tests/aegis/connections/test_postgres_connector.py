@@ -0,0 +1,392 @@
+"""Tests for the PostgreSQL connector read path."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from aegis.connections import postgres_connector
+from aegis.utils.settings import PostgresEngineConfig, config
+
+
+class _FakeResult:
+    """Minimal stand-in for a SQLAlchemy result."""
+
+    def __init__(self, rows):
+        self._rows = [SimpleNamespace(_mapping=row) for row in rows]
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+class _FakeEngine:
+    """Engine exposing only connect(); begin() is deliberately missing."""
+
+    def __init__(self, rows, failures=None, connect_error=None):
+        self.rows = rows
+        self.failures = list(failures or [])
+        self.connect_error = connect_error
+        self.isolation_levels = []
+        self.executions = 0
+        self.connects = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        engine = self
+        self.connects += 1
+        if self.connect_error is not None:
+            raise self.connect_error
+
+        class _Connection:
+            info = {}
+
+            async def execution_options(self, **options):
+                engine.isolation_levels.append(options.get("isolation_level"))
+                return self
+
+            async def execute(self, statement, params):
+                engine.executions += 1
+                if engine.failures:
+                    raise engine.failures.pop(0)
+                return _FakeResult(engine.rows)
+
+        yield _Connection()
+
+
+def _dead_connection_error(invalidated: bool = True) -> DBAPIError:
+    """Build the error SQLAlchemy raises when the server closed the connection."""
+    return DBAPIError(
+        "SELECT 1", {}, ConnectionError("connection closed"), connection_invalidated=invalidated
+    )
+
+
+def _use_engine(monkeypatch, engine) -> None:
+    async def _get_engine(name="primary"):
+        return engine
+
+    monkeypatch.setattr(postgres_connector, "_get_async_engine", _get_engine)
+
+
+def _replica_settings() -> PostgresEngineConfig:
+    return PostgresEngineConfig(
+        host="replica",
+        port="5432",
+        database="db",
+        user="user",
+        password="",
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=1,
+        read_only=True,
+    )
+
+
+def _use_replica(monkeypatch, primary, replica) -> None:
+    """Configure a replica engine alongside the primary."""
+    monkeypatch.setitem(config.postgres_engines, "replica", _replica_settings())
+    monkeypatch.setattr(postgres_connector, "_engine_states", {})
+    engines = {"primary": primary, "replica": replica}
+
+    async def _get_engine(name="primary"):
+        return engines[name]
+
+    monkeypatch.setattr(postgres_connector, "_get_async_engine", _get_engine)
+
+
+@pytest.mark.asyncio
+async def test_primary_always_pre_pings_and_replica_follows_setting(monkeypatch) -> None:
+    """Writes have no retry, so only replica pools may skip the checkout ping."""
+    pre_pings = {}
+
+    def fake_create_async_engine(url, **kwargs):
+        pre_pings[url.split("@")[1].split(":")[0]] = kwargs["pool_pre_ping"]
+        return SimpleNamespace(url=url)
+
+    monkeypatch.setitem(config.postgres_engines, "replica", _replica_settings())
+    monkeypatch.setattr(postgres_connector, "create_async_engine", fake_create_async_engine)
+    monkeypatch.setattr(postgres_connector, "_engines", {})
+    monkeypatch.setattr(postgres_connector, "_async_session_factory", None)
+    monkeypatch.setattr(config.query_stats, "enabled", False)
+    monkeypatch.setattr(config, "postgres_pool_pre_ping", False)
+
+    await postgres_connector._get_async_engine("primary")  # pylint: disable=protected-access
+    await postgres_connector._get_async_engine("replica")  # pylint: disable=protected-access
+
+    assert pre_pings == {config.postgres_engines["primary"].host: True, "replica": False}
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_uses_autocommit_read_connection(monkeypatch) -> None:
+    """Reads run in autocommit on engine.connect() instead of a begin() transaction."""
+    engine = _FakeEngine([{"id": 1}, {"id": 2}])
+    _use_engine(monkeypatch, engine)
+
+    rows = await postgres_connector.fetch_all("SELECT id FROM t")
+
+    assert rows == [{"id": 1}, {"id": 2}]
+    assert engine.isolation_levels == ["AUTOCOMMIT"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_one_retries_after_invalidated_connection(monkeypatch) -> None:
+    """A read on a dead pooled connection is retried once on a fresh one."""
+    engine = _FakeEngine([{"id": 7}], failures=[_dead_connection_error()])
+    _use_engine(monkeypatch, engine)
+
+    row = await postgres_connector.fetch_one("  with x as (select 1) SELECT id FROM t")
+
+    assert row == {"id": 7}
+    assert engine.executions == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_one_does_not_retry_writes(monkeypatch) -> None:
+    """Statements that may have side effects are never replayed."""
+    engine = _FakeEngine([{"id": 7}], failures=[_dead_connection_error()])
+    _use_engine(monkeypatch, engine)
+
+    with pytest.raises(DBAPIError):
+        await postgres_connector.fetch_one("INSERT INTO t (a) VALUES (1) RETURNING id")
+
+    assert engine.executions == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_does_not_retry_ordinary_errors(monkeypatch) -> None:
+    """Only disconnects are retried; query errors surface immediately."""
+    engine = _FakeEngine([], failures=[_dead_connection_error(invalidated=False)])
+    _use_engine(monkeypatch, engine)
+
+    with pytest.raises(DBAPIError):
+        await postgres_connector.fetch_all("SELECT broken")
+
+    assert engine.executions == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_prefer_healthy_replica(monkeypatch) -> None:
+    """With a replica configured, plain reads never touch the primary pool."""
+    primary = _FakeEngine([{"source": "primary"}])
+    replica = _FakeEngine([{"source": "replica"}])
+    _use_replica(monkeypatch, primary, replica)
+
+    rows = await postgres_connector.fetch_all("SELECT source FROM t")
+    pinned = await postgres_connector.fetch_one("SELECT source FROM t", engine="primary")
+
+    assert rows == [{"source": "replica"}]
+    assert pinned == {"source": "primary"}
+    assert postgres_connector.get_pool_stats()["replica"]["checkouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_primary_and_cool_down_replica(monkeypatch) -> None:
+    """A replica that cannot hand out connections is skipped until its cooldown ends."""
+    primary = _FakeEngine([{"source": "primary"}])
+    replica = _FakeEngine([], connect_error=OSError("connection refused"))
+    _use_replica(monkeypatch, primary, replica)
+
+    first = await postgres_connector.fetch_one("SELECT source FROM t")
+    second = await postgres_connector.fetch_one("SELECT source FROM t")
+
+    assert first == second == {"source": "primary"}
+    assert replica.connects == 1
+    stats = postgres_connector.get_pool_stats()
+    assert stats["replica"]["healthy"] is False
+    assert stats["replica"]["fallbacks"] == 1
+    assert stats["primary"]["checkouts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_non_read_fetch_runs_on_primary(monkeypatch) -> None:
+    """Writes issued through fetch_* are never sent to a read-only replica."""
+    primary = _FakeEngine([{"id": 1}])
+    replica = _FakeEngine([{"id": 2}])
+    _use_replica(monkeypatch, primary, replica)
+
+    row = await postgres_connector.fetch_one("INSERT INTO t (a) VALUES (1) RETURNING id")
+
+    assert row == {"id": 1}
+    assert replica.connects == 0
+
+
+@pytest.mark.asyncio
+async def test_data_modifying_cte_runs_once_on_primary(monkeypatch) -> None:
+    """A WITH query that writes is neither routed to the replica nor retried."""
+    primary = _FakeEngine([{"id": 1}], failures=[_dead_connection_error()])
+    replica = _FakeEngine([{"id": 2}])
+    _use_replica(monkeypatch, primary, replica)
+
+    with pytest.raises(DBAPIError):
+        await postgres_connector.fetch_all(
+            "WITH d AS (DELETE FROM t WHERE a = 1 RETURNING id) SELECT id FROM d"
+        )
+
+    assert replica.connects == 0
+    assert primary.executions == 1
+
+
+def test_is_read_statement_rejects_writes_inside_reads() -> None:
+    """Only statements without data-modifying keywords count as reads."""
+    assert postgres_connector.is_read_statement("WITH x AS (SELECT 1) SELECT * FROM x")
+    assert postgres_connector.is_read_statement("SELECT updated_at FROM t")
+    assert not postgres_connector.is_read_statement(
+        "WITH u AS (UPDATE t SET a = 1 RETURNING *) SELECT * FROM u"
+    )
+    assert not postgres_connector.is_read_statement("SELECT * FROM t FOR UPDATE")
+    assert not postgres_connector.is_read_statement(
+        "with m as (merge into t using s on true) select 1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_explain_runs_in_a_rolled_back_read_only_transaction(monkeypatch) -> None:
+    """EXPLAIN ANALYZE re-executes the statement, so it can never commit a write."""
+    events = []
+
+    class _Transaction:
+        async def rollback(self):
+            events.append("ROLLBACK")
+
+    class _Connection:
+        async def begin(self):
+            events.append("BEGIN")
+            return _Transaction()
+
+        async def execute(self, statement, params=None):
+            events.append(str(statement))
+
+        async def exec_driver_sql(self, statement, parameters):
+            events.append(statement)
+            return SimpleNamespace(scalar=lambda: "[]")
+
+    async def fake_checkout(stack, name):
+        events.append(name)
+        return _Connection()
+
+    monkeypatch.setattr(postgres_connector, "_checkout", fake_checkout)
+
+    plan = await postgres_connector._explain_statement("replica", "SELECT 1", ())
+
+    assert plan == "[]"
+    assert events == [
+        "replica",
+        "BEGIN",
+        "SET TRANSACTION READ ONLY",
+        "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT 1",
+        "ROLLBACK",
+    ]
+
+
+MONITOR_COLUMN_TYPES = {
+    "run_uuid": "uuid",
+    "stage_name": "character varying",
+    "total_cost": "numeric",
+    "llm_calls": "jsonb",
+    "tags": "ARRAY",
+}
+
+
+def test_build_copy_rows_converts_only_typed_columns() -> None:
+    """JSON, numeric and UUID values are converted; arrays and text pass through."""
+    records = [
+        {
+            "run_uuid": "12345678-1234-5678-1234-567812345678",
+            "stage_name": "Router",
+            "total_cost": 0.125,
+            "llm_calls": [{"model": "m", "cost": 0.1}],
+            "tags": ["a", "b"],
+        },
+        {"stage_name": "Planner"},
+    ]
+
+    rows = postgres_connector.build_copy_rows(
+        records, list(MONITOR_COLUMN_TYPES), MONITOR_COLUMN_TYPES
+    )
+
+    run_uuid, stage_name, total_cost, llm_calls, tags = rows[0]
+    assert str(run_uuid) == "12345678-1234-5678-1234-567812345678"
+    assert stage_name == "Router"
+    assert str(total_cost) == "0.125"
+    assert llm_calls == '[{"model": "m", "cost": 0.1}]'
+    assert tags == ["a", "b"]
+    assert rows[1] == (None, "Planner", None, None, None)
+
+
+def test_build_upsert_sql_merges_on_conflict_columns() -> None:
+    """Non-key columns are overwritten by default; an empty update list does nothing."""
+    sql = postgres_connector.build_upsert_sql(
+        "aegis_data_availability",
+        "_stage_x",
+        ["bank_id", "quarter", "bank_name"],
+        ["bank_id", "quarter"],
+    )
+    assert sql == (
+        "INSERT INTO aegis_data_availability (bank_id, quarter, bank_name) "
+        "SELECT bank_id, quarter, bank_name FROM _stage_x "
+        "ON CONFLICT (bank_id, quarter) DO UPDATE SET bank_name = EXCLUDED.bank_name"
+    )
+
+    sql = postgres_connector.build_upsert_sql("t", "s", ["a"], ["a"], update_columns=[])
+    assert sql.endswith("ON CONFLICT (a) DO NOTHING")
+
+
+@pytest.mark.asyncio
+async def test_copy_records_sends_one_copy(monkeypatch) -> None:
+    """Records are copied in a single COPY using the union of record keys."""
+    copies = []
+
+    class _Driver:
+        async def copy_records_to_table(self, table_name, records, columns, schema_name):
+            copies.append((table_name, list(records), columns, schema_name))
+            return f"COPY {len(records)}"
+
+    class _Connection:
+        async def execute(self, statement, params):
+            return [
+                SimpleNamespace(column_name=c, data_type=t) for c, t in MONITOR_COLUMN_TYPES.items()
+            ]
+
+        async def get_raw_connection(self):
+            return SimpleNamespace(driver_connection=_Driver())
+
+    @asynccontextmanager
+    async def _get_connection(execution_id=None):
+        yield _Connection()
+
+    monkeypatch.setattr(postgres_connector, "get_connection", _get_connection)
+    monkeypatch.setattr(postgres_connector, "_column_types_cache", {})
+
+    copied = await postgres_connector.copy_records(
+        "process_monitor_logs",
+        [{"stage_name": "Router"}, {"stage_name": "Planner", "total_cost": 0.5}],
+    )
+
+    assert copied == 2
+    assert len(copies) == 1
+    table_name, rows, columns, schema_name = copies[0]
+    assert (table_name, columns, schema_name) == (
+        "process_monitor_logs",
+        ["stage_name", "total_cost"],
+        None,
+    )
+    assert rows[0] == ("Router", None)
+    assert str(rows[1][1]) == "0.5"
+
+
+@pytest.mark.asyncio
+async def test_copy_records_rejects_unsafe_identifiers() -> None:
+    """Table and column names are interpolated, so only plain identifiers are accepted."""
+    with pytest.raises(ValueError, match="Invalid SQL identifier"):
+        await postgres_connector.copy_records("logs; DROP TABLE x", [{"a": 1}])
+
+
+@pytest.mark.asyncio
+async def test_stream_rows_rejects_statements_with_side_effects() -> None:
+    """Only plain reads can hold a server-side cursor."""
+    with pytest.raises(ValueError, match="can be streamed"):
+        async for _ in postgres_connector.stream_rows("DELETE FROM t"):
+            pass
@@ -0,0 +1,148 @@
+"""Tests for per-statement query instrumentation."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from aegis.connections import query_stats
+from aegis.connections.query_stats import (
+    QueryStatsRegistry,
+    fingerprint_statement,
+    install_query_instrumentation,
+    query_stage,
+)
+from aegis.utils.settings import config
+
+
+@pytest.fixture(name="registry")
+def _registry(monkeypatch):
+    """Give each test an empty process registry."""
+    registry = QueryStatsRegistry(max_fingerprints=50, slow_sample_limit=5)
+    monkeypatch.setattr(query_stats, "_registry", registry)
+    return registry
+
+
+@pytest.fixture(name="engine")
+def _engine(registry):
+    """An instrumented in-memory SQLite engine with a small table."""
+    engine = create_engine("sqlite://")
+    install_query_instrumentation(engine, "primary")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER, bank TEXT)"))
+        conn.execute(text("INSERT INTO t VALUES (1, 'RY'), (2, 'TD'), (3, 'BMO')"))
+    registry.clear()
+    return engine
+
+
+def test_fingerprint_collapses_values_and_lists() -> None:
+    """Executions differing only in values, IN-list or OR-chain length share a fingerprint."""
+    first = fingerprint_statement(
+        "SELECT *  FROM t WHERE id IN ($1, $2, $3) AND bank = 'RY' -- bank filter\nLIMIT 10"
+    )
+    second = fingerprint_statement("select * from t where id in ($1, $2) and bank = 'TD' limit 5")
+    assert first == second == "select * from t where id in (?) and bank = ? limit ?"
+
+    chained = fingerprint_statement(
+        "SELECT 1 FROM t WHERE (bank = :b0 AND year = :y0) OR (bank = :b1 AND year = :y1)"
+    )
+    single = fingerprint_statement("SELECT 1 FROM t WHERE (bank = :b0 AND year = :y0)")
+    assert chained == single + " or ..."
+    assert fingerprint_statement("SELECT t1.x::jsonb FROM t1") == "select t1.x::jsonb from t1"
+
+
+def test_registry_histogram_and_percentiles(registry) -> None:
+    """Latencies land in histogram buckets and percentiles use bucket upper bounds."""
+    for elapsed in [0.5] * 90 + [40.0] * 9 + [20000.0]:
+        registry.record("SELECT 1", elapsed, rows=1, pool_wait_ms=0.0, stage="s")
+
+    (stats,) = registry.snapshot()
+
+    assert stats["count"] == 100
+    assert stats["histogram"]["<=1ms"] == 90
+    assert stats["histogram"]["<=50ms"] == 9
+    assert stats["histogram"][">10000ms"] == 1
+    assert stats["p50_ms"] == 1.0
+    assert stats["p95_ms"] == 50.0
+    assert stats["p99_ms"] == 50.0
+    assert stats["max_ms"] == 20000.0
+
+
+def test_registry_caps_distinct_fingerprints() -> None:
+    """Fingerprints beyond the cap are folded into a single bucket."""
+    registry = QueryStatsRegistry(max_fingerprints=2, slow_sample_limit=1)
+    for table in ("a", "b", "c", "d"):
+        registry.record(f"SELECT * FROM {table}", 1.0, rows=0, pool_wait_ms=0.0, stage="s")
+
+    fingerprints = {item["fingerprint"]: item for item in registry.snapshot()}
+
+    assert len(fingerprints) == 3
+    assert fingerprints["other"]["count"] == 2
+
+
+def test_listeners_record_rows_stage_and_pool_wait(engine, registry) -> None:
+    """Cursor events attribute timings, rows and the checkout wait to the calling stage."""
+    with query_stage("transcripts.expand_speaker_blocks"):
+        with engine.connect() as conn:
+            conn.info["aegis_pool_wait_ms"] = 12.0
+            conn.execute(text("SELECT id FROM t WHERE id > :min_id"), {"min_id": 0}).fetchall()
+            conn.execute(text("SELECT id FROM t WHERE id > :min_id"), {"min_id": 1}).fetchall()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT id FROM t WHERE id > :min_id"), {"min_id": 2}).fetchall()
+
+    (stats,) = registry.snapshot()
+
+    assert stats["sql"] == "select id from t where id > ?"
+    assert stats["count"] == 3
+    assert stats["stages"] == {"transcripts.expand_speaker_blocks": 2, "unknown": 1}
+    assert stats["avg_pool_wait_ms"] == 4.0
+    assert registry.snapshot(stage="unknown")[0]["count"] == 3
+    assert registry.snapshot(stage="other.stage") == []
+
+
+@pytest.mark.asyncio
+async def test_slow_reads_are_sampled_for_explain(monkeypatch, registry) -> None:
+    """Reads above the threshold get a plan captured in the background; writes never do."""
+    monkeypatch.setattr(config.query_stats, "explain_threshold_ms", 0.000001)
+    monkeypatch.setattr(config.query_stats, "explain_sample_rate", 1.0)
+    explained = []
+
+    async def _runner(engine_name, statement, parameters):
+        explained.append((engine_name, statement))
+        return '[{"Plan": {"Node Type": "Seq Scan"}}]'
+
+    engine = create_engine("sqlite://")
+    install_query_instrumentation(engine, "replica", explain_runner=_runner)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+        with query_stage("supplementary_financials.bm25_search"):
+            conn.execute(text("SELECT id FROM t")).fetchall()
+    assert len(query_stats._explain_tasks) == 1
+    await asyncio.sleep(0)
+
+    assert explained == [("replica", "SELECT id FROM t")]
+    await asyncio.sleep(0)
+    assert query_stats._explain_tasks == set()
+    (sample,) = registry.slow_samples
+    assert sample["engine"] == "replica"
+    assert sample["stage"] == "supplementary_financials.bm25_search"
+    assert sample["plan"] == [{"Plan": {"Node Type": "Seq Scan"}}]
+
+
+def test_writing_ctes_are_never_explained() -> None:
+    """EXPLAIN ANALYZE would run the write again, so only plain reads qualify."""
+    assert query_stats._is_explainable("WITH x AS (SELECT 1) SELECT * FROM x")
+    assert not query_stats._is_explainable(
+        "WITH d AS (DELETE FROM t RETURNING id) SELECT id FROM d"
+    )
+    assert not query_stats._is_explainable("UPDATE t SET id = 1")
+
+
+def test_explain_disabled_by_default(engine, registry) -> None:
+    """With no threshold configured no plans are captured."""
+    assert config.query_stats.explain_threshold_ms == 0
+    with engine.connect() as conn:
+        conn.execute(text("SELECT id FROM t")).fetchall()
+
+    assert not registry.slow_samples
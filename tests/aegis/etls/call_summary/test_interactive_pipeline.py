@@ -1,5 +1,7 @@
 """Tests for the interactive pipeline helpers."""
 
+import asyncio
+import json
 import re
 from unittest.mock import AsyncMock, patch
 
@@ -10,6 +12,7 @@ from aegis.etls.call_summary.interactive_pipeline import (
     _primary_from_scores,
     _seed_selected_report_sentences,
     analyze_config_coverage,
+    build_interactive_bank_data,
     build_md_grouping_context,
     classify_md_block,
     classify_qa_conversation,
@@ -139,6 +142,57 @@ async def test_detect_qa_boundaries_retries_until_valid_output():
     assert "Only the integers inside `<index>` tags are valid block indices." in retry_prompt
 
 
+@pytest.mark.asyncio
+async def test_detect_qa_boundaries_stops_stream_on_out_of_order_conversation():
+    qa_raw_blocks = [
+        {"id": f"RY_QA_{idx}", "speaker": "Speaker", "paragraphs": ["Text."]}
+        for idx in (1, 2, 3)
+    ]
+    calls = []
+
+    async def fake_stream_with_tools(*, messages, **_kwargs):
+        calls.append(messages)
+        if len(calls) == 1:
+            yield {"type": "item", "key": "conversations", "item": {"block_indices": [2, 3]}}
+            raise AssertionError("stream should be closed after the invalid conversation")
+        conversations = [
+            {"conversation_id": "conv_1", "block_indices": [1, 2]},
+            {"conversation_id": "conv_2", "block_indices": [3]},
+        ]
+        for conversation in conversations:
+            yield {"type": "item", "key": "conversations", "item": conversation}
+        arguments = json.dumps({"conversations": conversations})
+        yield {
+            "type": "response",
+            "response": {
+                "choices": [
+                    {
+                        "message": {"tool_calls": [{"function": {"arguments": arguments}}]},
+                        "finish_reason": "tool_calls",
+                    }
+                ]
+            },
+        }
+
+    with patch(
+        "aegis.etls.call_summary.interactive_pipeline.stream_with_tools",
+        new=fake_stream_with_tools,
+    ):
+        conversations = await detect_qa_boundaries(
+            qa_raw_blocks=qa_raw_blocks,
+            categories_text_qa="",
+            context={"execution_id": "test-exec"},
+            llm_params={"model": "gpt-test"},
+        )
+
+    assert [[block["id"] for block in conv] for conv in conversations] == [
+        ["RY_QA_1", "RY_QA_2"],
+        ["RY_QA_3"],
+    ]
+    assert len(calls) == 2
+    assert "do not continue from block 1" in calls[1][-1]["content"]
+
+
 @pytest.mark.asyncio
 async def test_detect_qa_boundaries_raises_after_three_invalid_attempts():
     qa_raw_blocks = [
@@ -1884,3 +1938,104 @@ async def test_classify_qa_conversation_skips_operator_for_executive_attribution
     assert result["answer_sentences"][1]["speaker_title"] == "CFO"
     assert result["answer_sentences"][1]["speaker_affiliation"] == "RBC"
     assert result["answer_sentences"][1]["selected_bucket_id"] == "bucket_0"
+
+
+@pytest.mark.asyncio
+async def test_build_interactive_bank_data_overlaps_md_and_qa_work():
+    """MD blocks run during boundary detection and QA work starts before MD finishes."""
+    events = []
+    md_started = asyncio.Event()
+    qa_started = asyncio.Event()
+
+    async def fake_detect_qa_boundaries(*, qa_raw_blocks, **_kwargs):
+        events.append("boundary_start")
+        await asyncio.wait_for(md_started.wait(), timeout=1)
+        events.append("boundary_done")
+        return [qa_raw_blocks]
+
+    async def fake_classify_md_block(*, block_raw, block_index, **_kwargs):
+        events.append(f"md_start_{block_index}")
+        md_started.set()
+        if block_index == 1:
+            await asyncio.wait_for(qa_started.wait(), timeout=1)
+        events.append(f"md_done_{block_index}")
+        return {"id": block_raw["id"], "sentences": []}
+
+    async def fake_classify_qa_conversation(*, conv_idx, **_kwargs):
+        events.append("qa_start")
+        qa_started.set()
+        return {"id": f"RY_QA_{conv_idx}", "question_sentences": [], "answer_sentences": []}
+
+    module = "aegis.etls.call_summary.interactive_pipeline"
+    with (
+        patch(f"{module}.detect_qa_boundaries", new=fake_detect_qa_boundaries),
+        patch(f"{module}.classify_md_block", new=fake_classify_md_block),
+        patch(f"{module}.classify_qa_conversation", new=fake_classify_qa_conversation),
+    ):
+        bank_data = await build_interactive_bank_data(
+            md_raw_blocks=[{"id": "RY_MD_1"}, {"id": "RY_MD_2"}],
+            qa_raw_blocks=[{"id": "RY_QA_B1"}],
+            categories=[],
+            bank_info={"bank_symbol": "RY", "bank_name": "Royal Bank of Canada"},
+            fiscal_year=2026,
+            fiscal_quarter="Q1",
+            transcript_title="",
+            context={"execution_id": "test"},
+            qa_boundary_llm_params={},
+            md_llm_params={},
+            qa_llm_params={},
+            report_inclusion_threshold=4.0,
+            selected_importance_threshold=6.5,
+            candidate_importance_threshold=4.0,
+            min_bucket_score_for_assignment=6.0,
+            max_concurrent_md_blocks=3,
+        )
+
+    assert events.index("md_start_0") < events.index("boundary_done")
+    assert events.index("qa_start") < events.index("md_done_1")
+    assert [block["id"] for block in bank_data["md_blocks"]] == ["RY_MD_1", "RY_MD_2"]
+    assert [conv["id"] for conv in bank_data["qa_conversations"]] == ["RY_QA_1"]
+
+
+@pytest.mark.asyncio
+async def test_build_interactive_bank_data_cancels_md_work_when_boundaries_fail():
+    """A boundary-detection failure cancels in-flight MD classification and re-raises."""
+    cancelled = asyncio.Event()
+
+    async def failing_detect_qa_boundaries(**_kwargs):
+        await asyncio.sleep(0)
+        raise RuntimeError("boundary detection failed")
+
+    async def slow_classify_md_block(**_kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    module = "aegis.etls.call_summary.interactive_pipeline"
+    with (
+        patch(f"{module}.detect_qa_boundaries", new=failing_detect_qa_boundaries),
+        patch(f"{module}.classify_md_block", new=slow_classify_md_block),
+    ):
+        with pytest.raises(RuntimeError, match="boundary detection failed"):
+            await build_interactive_bank_data(
+                md_raw_blocks=[{"id": "RY_MD_1"}],
+                qa_raw_blocks=[{"id": "RY_QA_B1"}],
+                categories=[],
+                bank_info={"bank_symbol": "RY", "bank_name": "Royal Bank of Canada"},
+                fiscal_year=2026,
+                fiscal_quarter="Q1",
+                transcript_title="",
+                context={"execution_id": "test"},
+                qa_boundary_llm_params={},
+                md_llm_params={},
+                qa_llm_params={},
+                report_inclusion_threshold=4.0,
+                selected_importance_threshold=6.5,
+                candidate_importance_threshold=4.0,
+                min_bucket_score_for_assignment=6.0,
+                max_concurrent_md_blocks=2,
+            )
+
+    assert cancelled.is_set()
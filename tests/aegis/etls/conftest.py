@@ -0,0 +1,21 @@
+"""Shared fixtures for ETL tests."""
+
+import pytest
+
+from aegis.etls import category_registry
+from aegis.utils.settings import config
+
+
+@pytest.fixture(autouse=True)
+def isolated_category_cache(tmp_path, monkeypatch):
+    """Keep parsed category artifacts out of the source tree and between tests."""
+    monkeypatch.setattr(config.category_cache, "cache_dir", str(tmp_path / "category_cache"))
+    category_registry.clear_category_cache()
+    yield
+    category_registry.clear_category_cache()
+
+
+@pytest.fixture(autouse=True)
+def in_process_rendering(monkeypatch):
+    """Render on a thread so ETL tests do not spawn real process pools."""
+    monkeypatch.setattr(config.rendering, "workers", 0)
@@ -0,0 +1,95 @@
+"""Tests for cached category workbook loading and prompt memoization."""
+
+import os
+
+import pandas as pd
+
+from aegis.etls import category_registry
+from aegis.etls.category_registry import load_workbook_categories, memoize_category_prompt
+
+
+def _write_workbook(path, names) -> None:
+    pd.DataFrame(
+        {
+            "transcript_sections": ["ALL"] * len(names),
+            "category_name": names,
+            "category_description": [f"{name} commentary." for name in names],
+        }
+    ).to_excel(path, index=False)
+
+
+def _counting_parser(calls):
+    def parse(xlsx_path):
+        calls.append(xlsx_path)
+        df = pd.read_excel(xlsx_path)
+        return [{"category_name": name} for name in df["category_name"]]
+
+    return parse
+
+
+def test_workbook_parsed_once_and_artifact_reused(tmp_path) -> None:
+    """Repeat loads hit memory; a fresh process reuses the on-disk artifact."""
+    xlsx_path = tmp_path / "categories.xlsx"
+    _write_workbook(xlsx_path, ["Revenue", "Capital"])
+    calls = []
+    parse = _counting_parser(calls)
+
+    first = load_workbook_categories(str(xlsx_path), parse, namespace="test")
+    first[0]["category_name"] = "mutated"
+    second = load_workbook_categories(str(xlsx_path), parse, namespace="test")
+    category_registry.clear_category_cache()
+    third = load_workbook_categories(str(xlsx_path), parse, namespace="test")
+
+    assert len(calls) == 1
+    assert second == third == [{"category_name": "Revenue"}, {"category_name": "Capital"}]
+
+
+def test_changed_workbook_is_reparsed(tmp_path) -> None:
+    """Editing the workbook invalidates both cache layers."""
+    xlsx_path = tmp_path / "categories.xlsx"
+    _write_workbook(xlsx_path, ["Revenue"])
+    calls = []
+    parse = _counting_parser(calls)
+    load_workbook_categories(str(xlsx_path), parse, namespace="test")
+
+    _write_workbook(xlsx_path, ["Revenue", "Credit"])
+    stat = os.stat(xlsx_path)
+    os.utime(xlsx_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    categories = load_workbook_categories(str(xlsx_path), parse, namespace="test")
+
+    assert len(calls) == 2
+    assert [category["category_name"] for category in categories] == ["Revenue", "Credit"]
+
+
+def test_unwritable_cache_dir_falls_back_to_memory(tmp_path, monkeypatch) -> None:
+    """A cache dir that cannot be created does not fail the load."""
+    xlsx_path = tmp_path / "categories.xlsx"
+    _write_workbook(xlsx_path, ["Revenue"])
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    monkeypatch.setattr(
+        category_registry.config.category_cache, "cache_dir", str(blocker / "cache")
+    )
+    calls = []
+
+    categories = load_workbook_categories(str(xlsx_path), _counting_parser(calls), "test")
+
+    assert categories == [{"category_name": "Revenue"}]
+
+
+def test_prompt_rendering_memoized_by_content_and_arguments() -> None:
+    """Equal category content reuses a rendering; new content or arguments do not."""
+    calls = []
+
+    @memoize_category_prompt
+    def render(categories, section="ALL"):
+        calls.append(section)
+        return f"{section}:" + ",".join(category["category_name"] for category in categories)
+
+    categories = [{"category_name": "Revenue"}]
+
+    assert render(categories, "MD") == "MD:Revenue"
+    assert render([dict(categories[0])], "MD") == "MD:Revenue"
+    assert render(categories, "QA") == "QA:Revenue"
+    assert render([{"category_name": "Capital"}], "MD") == "MD:Capital"
+    assert calls == ["MD", "QA", "MD"]
@@ -0,0 +1,91 @@
+"""Tests for the out-of-process ETL rendering service."""
+
+import json
+import os
+import sys
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from aegis.etls import rendering
+from aegis.etls.call_summary import interactive_html
+from aegis.utils.settings import config
+
+
+@pytest.mark.asyncio
+async def test_render_runs_builders_in_worker_processes(tmp_path, monkeypatch) -> None:
+    """Builders run in a separate process and render_to_file writes from the worker."""
+    monkeypatch.setattr(config.rendering, "workers", 1)
+    output_path = tmp_path / "report.json"
+    try:
+        worker_pid = await rendering.render(os.getpid)
+        written = await rendering.render(
+            rendering.render_to_file,
+            builder=json.dumps,
+            output_path=str(output_path),
+            obj={"bank": "RY"},
+        )
+    finally:
+        rendering.shutdown_rendering_service()
+
+    assert worker_pid != os.getpid()
+    assert output_path.read_text(encoding="utf-8") == '{"bank": "RY"}'
+    assert written == len('{"bank": "RY"}')
+
+
+@pytest.mark.asyncio
+async def test_render_uses_a_thread_when_workers_disabled(monkeypatch) -> None:
+    """RENDERING_WORKERS=0 keeps rendering in-process without creating a pool."""
+    monkeypatch.setattr(config.rendering, "workers", 0)
+
+    assert await rendering.render(os.getpid) == os.getpid()
+    assert rendering.get_rendering_executor() is None
+
+
+def test_warm_worker_preloads_templates() -> None:
+    """The worker initializer imports modules and fills their template caches."""
+    interactive_html._load_html_template.cache_clear()
+
+    rendering._warm_worker(("aegis.etls.call_summary.interactive_html", "not_a_module"))
+
+    assert interactive_html._load_html_template.cache_info().currsize == 1
+
+
+def test_warm_worker_survives_modules_that_fail_to_import(tmp_path, monkeypatch) -> None:
+    """Errors other than ImportError are logged instead of breaking the pool."""
+    (tmp_path / "broken_render_module.py").write_text("raise SyntaxError('f-string')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    interactive_html._load_html_template.cache_clear()
+
+    rendering._warm_worker(("broken_render_module", "aegis.etls.call_summary.interactive_html"))
+
+    assert "broken_render_module" not in sys.modules
+    assert interactive_html._load_html_template.cache_info().currsize == 1
+
+
+class _BrokenExecutor:
+    """Executor whose every job fails as if a worker process died."""
+
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+@pytest.mark.asyncio
+async def test_render_replaces_a_broken_pool_and_falls_back_to_a_thread(monkeypatch) -> None:
+    """A broken pool is dropped and the render still completes in-process."""
+    broken = _BrokenExecutor()
+    monkeypatch.setattr(config.rendering, "workers", 1)
+    monkeypatch.setattr(rendering, "_executor", broken)
+
+    assert await rendering.render(os.getpid) == os.getpid()
+    assert broken.shut_down is True
+    assert rendering._executor is None
@@ -0,0 +1,180 @@
+"""Round-trip tests for the compact interactive report state encoding."""
+
+import json
+import re
+
+import pytest
+
+from aegis.etls.call_summary import interactive_html as call_summary_html
+from aegis.etls.cm_readthrough import interactive_html as cm_readthrough_html
+from aegis.etls.report_state_codec import (
+    COMPACT_STATE_FORMAT,
+    decode_report_state,
+    encode_report_state,
+)
+
+
+def _sentence(sid: str, text: str, **extra) -> dict:
+    sentence = {
+        "sid": sid,
+        "text": text,
+        "verbatim_text": text,
+        "condensed": text,
+        "span_id": sid,
+        "sentence_ids": [sid],
+        "transcript_section": "QA" if sid.startswith("qa") else "MD",
+        "primary": "bucket_0",
+        "selected_bucket_id": "bucket_0",
+        "candidate_bucket_ids": ["bucket_0", "bucket_1"],
+        "scores": {"bucket_0": 8.5, "bucket_1": 2},
+        "importance_score": 7.0,
+        "status": "selected",
+        "emerging_topic": None,
+        "classification_error": None,
+    }
+    sentence.update(extra)
+    return sentence
+
+
+def _banks_data() -> dict:
+    return {
+        "RY-CA": {
+            "ticker": "RY",
+            "company_name": "Royal Bank of Canada",
+            "md_blocks": [
+                {
+                    "id": "md_block_1",
+                    "speaker": "Chief Financial Officer",
+                    "sentences": [
+                        _sentence("md_1", "Advisory pipelines improved."),
+                        _sentence(
+                            "md_2",
+                            "Trading revenue rose 12%.",
+                            verbatim_text="Trading revenue, uh, rose 12%.",
+                            span_id=None,
+                            status="rejected",
+                            para_idx=3,
+                            speaker="Jane Doe",
+                        ),
+                    ],
+                }
+            ],
+            "qa_conversations": [
+                {
+                    "analyst_name": "John Smith",
+                    "question_sentences": [
+                        _sentence("qa_1", "How are clients responding?", custom_flag=True)
+                    ],
+                    "answer_sentences": [],
+                }
+            ],
+        },
+        "TD-CA": {
+            "ticker": "TD",
+            "company_name": "Toronto-Dominion Bank",
+            "md_blocks": [],
+            "qa_conversations": [],
+        },
+    }
+
+
+def _categories() -> list:
+    return [
+        {
+            "transcript_sections": "ALL",
+            "report_section": "Outlook",
+            "category_name": "Advisory Pipeline",
+            "category_description": "Capital markets advisory outlook.",
+        },
+        {
+            "transcript_sections": "QA",
+            "report_section": "Q&A",
+            "category_name": "Trading Questions",
+            "category_description": "Analyst questions about trading.",
+        },
+    ]
+
+
+def _report_state(module) -> dict:
+    return module.build_report_state(
+        banks_data=_banks_data(),
+        categories=_categories(),
+        fiscal_year=2025,
+        fiscal_quarter="Q2",
+        min_importance=4.0,
+    )
+
+
+def _inline_state(html: str) -> dict:
+    match = re.search(r"/\* __BEGIN_STATE__ \*/(.*?)/\* __END_STATE__ \*/", html, re.S)
+    return json.loads(match.group(1))
+
+
+@pytest.mark.parametrize("module", [call_summary_html, cm_readthrough_html])
+@pytest.mark.parametrize("compress", [False, True])
+def test_encoding_round_trips_report_state(module, compress) -> None:
+    """decode(encode(state)) reproduces build_report_state output exactly."""
+    state = _report_state(module)
+    original = json.loads(json.dumps(state))
+
+    encoded = encode_report_state(state, compress=compress)
+
+    assert encoded["format"] == COMPACT_STATE_FORMAT
+    assert state == original
+    assert decode_report_state(json.loads(json.dumps(encoded))) == original
+    if compress:
+        assert all(set(bank) == {"$gz"} for bank in encoded["state"]["banks"].values())
+
+
+def test_encoding_interns_bucket_ids_and_shrinks_payload() -> None:
+    """Repeated bucket ids are stored once and the inline payload is smaller."""
+    state = _report_state(call_summary_html)
+
+    encoded = encode_report_state(state)
+
+    assert encoded["strings"].count("bucket_0") == 1
+    assert len(json.dumps(encoded["state"]["banks"])) < len(json.dumps(state["banks"]))
+
+
+def test_decode_passes_plain_state_through() -> None:
+    """Saved reports carry plain state, which must load unchanged."""
+    state = _report_state(call_summary_html)
+
+    assert decode_report_state(state) is state
+
+
+@pytest.mark.parametrize(
+    "module, expected_encoding",
+    [(call_summary_html, "compact"), (cm_readthrough_html, "compact-gzip")],
+)
+def test_generate_html_inlines_decodable_state(module, expected_encoding) -> None:
+    """generate_html embeds encoded state that decodes back to the input."""
+    state = _report_state(module)
+
+    html = module.generate_html(
+        state=state, fiscal_year=2025, fiscal_quarter="Q2", min_importance=4.0
+    )
+    inline = _inline_state(html)
+
+    assert inline["format"] == COMPACT_STATE_FORMAT
+    bank_chunk = inline["state"]["banks"]["RY-CA"]
+    assert (set(bank_chunk) == {"$gz"}) == (expected_encoding == "compact-gzip")
+    assert decode_report_state(inline) == {**state, "banner_src": inline["state"]["banner_src"]}
+    assert "async function decodeReportState(" in html
+
+    plain = module.generate_html(
+        state=state,
+        fiscal_year=2025,
+        fiscal_quarter="Q2",
+        min_importance=4.0,
+        state_encoding="plain",
+    )
+    assert "format" not in _inline_state(plain)
+    with pytest.raises(ValueError, match="Unknown state encoding"):
+        module.generate_html(
+            state=state,
+            fiscal_year=2025,
+            fiscal_quarter="Q2",
+            min_importance=4.0,
+            state_encoding="brotli",
+        )
@@ -0,0 +1,295 @@
+"""Tests for the clarifier agent orchestration."""
+
+import asyncio
+
+import pytest
+
+from aegis.model.agents import clarifier
+from aegis.utils.context_window import summary_message
+
+AVAILABILITY = {
+    "latest_reported": {"fiscal_year": 2025, "quarter": "Q3"},
+    "availability": {
+        "1": {
+            "name": "Royal Bank of Canada",
+            "symbol": "RY",
+            "databases": {"transcripts": {2025: ["Q1", "Q2", "Q3"]}},
+        },
+        "2": {
+            "name": "Toronto-Dominion Bank",
+            "symbol": "TD",
+            "databases": {"transcripts": {2025: ["Q1", "Q2"]}},
+        },
+    },
+}
+
+BANKS_DETAIL = {
+    1: {"id": 1, "name": "Royal Bank of Canada", "symbol": "RY", "aliases": ["RBC"]},
+    2: {"id": 2, "name": "Toronto-Dominion Bank", "symbol": "TD", "aliases": ["TD Bank"]},
+}
+
+
+def _bank_result(bank_ids):
+    """Build a successful extract_banks result."""
+    return {
+        "status": "success",
+        "decision": "banks_selected",
+        "bank_ids": bank_ids,
+        "banks_detail": {bid: BANKS_DETAIL[bid] for bid in bank_ids},
+        "query_intent": "revenue",
+    }
+
+
+def _apply_all(fiscal_year, quarters):
+    """Build a successful periods_all result."""
+    return {
+        "status": "success",
+        "decision": "periods_selected",
+        "periods": {"apply_all": {"fiscal_year": fiscal_year, "quarters": quarters}},
+    }
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("RBC and TD Q3 2025 revenue", True),
+        ("What did RY say in FY24?", True),
+        ("latest quarter results for BMO", True),
+        ("what about TD?", False),
+        ("compare their efficiency ratios", False),
+    ],
+)
+def test_mentions_explicit_period(query: str, expected: bool) -> None:
+    """Only queries that name a period themselves are eligible for speculation."""
+    assert clarifier._mentions_explicit_period(query) is expected
+
+
+def test_validate_speculative_periods_accepts_available_apply_all() -> None:
+    """An apply_all result is reused when every selected bank has those quarters."""
+    result = _apply_all(2025, ["Q2"])
+
+    assert clarifier._validate_speculative_periods(result, [1, 2], AVAILABILITY) is result
+
+
+def test_validate_speculative_periods_rejects_unavailable_bank_period() -> None:
+    """A period missing for any selected bank forces sequential extraction."""
+    result = _apply_all(2025, ["Q3"])
+
+    assert clarifier._validate_speculative_periods(result, [1, 2], AVAILABILITY) is None
+
+
+def test_validate_speculative_periods_narrows_bank_specific_periods() -> None:
+    """Bank-specific results are narrowed to the banks actually selected."""
+    result = {
+        "status": "success",
+        "decision": "periods_selected",
+        "periods": {
+            "1_2025": {"bank_id": "1", "fiscal_year": 2025, "quarters": ["Q3"]},
+            "2_2025": {"bank_id": "2", "fiscal_year": 2025, "quarters": ["Q2"]},
+        },
+    }
+
+    validated = clarifier._validate_speculative_periods(result, [1], AVAILABILITY)
+
+    assert validated["periods"] == {
+        "1_2025": {"bank_id": "1", "fiscal_year": 2025, "quarters": ["Q3"]}
+    }
+    assert clarifier._validate_speculative_periods(result, [1, 3], AVAILABILITY) is None
+
+
+@pytest.mark.asyncio
+async def test_clarify_query_runs_period_extraction_concurrently(monkeypatch) -> None:
+    """Speculative mode overlaps the two LLM calls and reuses a valid period result."""
+    calls = []
+
+    async def fake_extract_banks(query, context, available_databases, messages):
+        calls.append("banks_started")
+        await asyncio.sleep(0.02)
+        calls.append("banks_finished")
+        return _bank_result([1, 2])
+
+    async def fake_extract_periods(query, bank_ids, context, *args, **kwargs):
+        calls.append(("periods_started", tuple(bank_ids or [])))
+        await asyncio.sleep(0.02)
+        return _apply_all(2025, ["Q2"])
+
+    async def fake_availability(bank_ids=None, available_databases=None):
+        return AVAILABILITY
+
+    monkeypatch.setattr(clarifier.config.clarifier, "fast_path", False)
+    monkeypatch.setattr(clarifier.config.clarifier, "speculative_periods", True)
+    monkeypatch.setattr(clarifier, "extract_banks", fake_extract_banks)
+    monkeypatch.setattr(clarifier, "extract_periods", fake_extract_periods)
+    monkeypatch.setattr(clarifier, "get_period_availability_from_db", fake_availability)
+
+    result = await clarifier.clarify_query("RBC and TD Q2 2025 revenue", {"execution_id": "t"})
+
+    assert [(c["bank_symbol"], c["quarter"]) for c in result] == [("RY", "Q2"), ("TD", "Q2")]
+    assert calls.index(("periods_started", (1, 2))) < calls.index("banks_finished")
+    assert sum(1 for c in calls if isinstance(c, tuple)) == 1
+
+
+@pytest.mark.asyncio
+async def test_clarify_query_falls_back_to_sequential_periods(monkeypatch) -> None:
+    """An invalid speculative result is discarded and periods are re-extracted."""
+    period_calls = []
+
+    async def fake_extract_banks(query, context, available_databases, messages):
+        return _bank_result([2])
+
+    async def fake_extract_periods(query, bank_ids, context, *args, **kwargs):
+        period_calls.append(list(bank_ids or []))
+        if len(period_calls) == 1:
+            return _apply_all(2025, ["Q3"])
+        return {"status": "needs_clarification", "clarification": "Q3 2025 is not available"}
+
+    async def fake_availability(bank_ids=None, available_databases=None):
+        return AVAILABILITY
+
+    monkeypatch.setattr(clarifier.config.clarifier, "fast_path", False)
+    monkeypatch.setattr(clarifier.config.clarifier, "speculative_periods", True)
+    monkeypatch.setattr(clarifier, "extract_banks", fake_extract_banks)
+    monkeypatch.setattr(clarifier, "extract_periods", fake_extract_periods)
+    monkeypatch.setattr(clarifier, "get_period_availability_from_db", fake_availability)
+
+    result = await clarifier.clarify_query("TD Q3 2025 revenue", {"execution_id": "t"})
+
+    assert result == {
+        "status": "needs_clarification",
+        "clarifications": ["Q3 2025 is not available"],
+    }
+    assert period_calls == [[1, 2], [2]]
+
+
+@pytest.mark.asyncio
+async def test_clarify_query_fast_path_skips_llm_extraction(monkeypatch) -> None:
+    """Unambiguous first-turn queries resolve without calling either extraction."""
+
+    async def fail_extraction(*args, **kwargs):
+        raise AssertionError("LLM extraction should be skipped")
+
+    async def fake_banks(available_databases=None):
+        return {"banks": BANKS_DETAIL, "categories": {}}
+
+    async def fake_availability(bank_ids=None, available_databases=None):
+        return AVAILABILITY
+
+    monkeypatch.setattr(clarifier.config.clarifier, "fast_path", True)
+    monkeypatch.setattr(clarifier, "extract_banks", fail_extraction)
+    monkeypatch.setattr(clarifier, "extract_periods", fail_extraction)
+    monkeypatch.setattr(clarifier, "load_banks_from_db", fake_banks)
+    monkeypatch.setattr(clarifier, "get_period_availability_from_db", fake_availability)
+
+    query = "RBC and TD Q2 2025 revenue"
+    result = await clarifier.clarify_query(
+        query, {"execution_id": "t"}, messages=[{"role": "user", "content": query}]
+    )
+
+    assert [(c["bank_id"], c["fiscal_year"], c["quarter"]) for c in result] == [
+        (1, 2025, "Q2"),
+        (2, 2025, "Q2"),
+    ]
+    assert result[0]["query_intent"] == query
+
+
+@pytest.mark.asyncio
+async def test_clarify_query_fast_path_ignores_follow_ups(monkeypatch) -> None:
+    """Follow-up turns always go through LLM extraction."""
+    called = []
+
+    async def fake_extract_banks(query, context, available_databases, messages):
+        called.append("banks")
+        return {"status": "error", "error": "stop"}
+
+    monkeypatch.setattr(clarifier.config.clarifier, "fast_path", True)
+    monkeypatch.setattr(clarifier.config.clarifier, "speculative_periods", False)
+    monkeypatch.setattr(clarifier, "extract_banks", fake_extract_banks)
+
+    messages = [
+        {"role": "user", "content": "RBC Q2 2025 revenue"},
+        {"role": "assistant", "content": "..."},
+        {"role": "user", "content": "And TD Q2 2025?"},
+    ]
+    result = await clarifier.clarify_query(
+        "And TD Q2 2025?", {"execution_id": "t"}, messages=messages
+    )
+
+    assert result["status"] == "error"
+    assert called == ["banks"]
+
+
+@pytest.mark.asyncio
+async def test_clarify_query_fast_path_ignores_follow_ups_after_compaction(monkeypatch) -> None:
+    """A window shrunk to the summary and the latest message is still a follow-up."""
+    called = []
+
+    async def fake_extract_banks(query, context, available_databases, messages):
+        called.append("banks")
+        return {"status": "error", "error": "stop"}
+
+    async def fake_banks(available_databases=None):
+        return {"banks": BANKS_DETAIL, "categories": {}}
+
+    async def fake_availability(bank_ids=None, available_databases=None):
+        return AVAILABILITY
+
+    monkeypatch.setattr(clarifier.config.clarifier, "fast_path", True)
+    monkeypatch.setattr(clarifier.config.clarifier, "speculative_periods", False)
+    monkeypatch.setattr(clarifier, "extract_banks", fake_extract_banks)
+    monkeypatch.setattr(clarifier, "load_banks_from_db", fake_banks)
+    monkeypatch.setattr(clarifier, "get_period_availability_from_db", fake_availability)
+
+    messages = [
+        summary_message("User asked for RBC Q2 2025 revenue; assistant answered."),
+        {"role": "user", "content": "And TD Q2 2025?"},
+    ]
+    result = await clarifier.clarify_query(
+        "And TD Q2 2025?", {"execution_id": "t"}, messages=messages
+    )
+
+    assert result["status"] == "error"
+    assert called == ["banks"]
+
+
+@pytest.mark.asyncio
+async def test_period_availability_reuses_snapshot_and_filters_banks(monkeypatch) -> None:
+    """The availability table is read once per TTL; bank filtering happens in Python."""
+    queries = []
+    rows = [
+        {
+            "bank_id": 1,
+            "bank_name": "Royal Bank of Canada",
+            "bank_symbol": "RY",
+            "fiscal_year": 2025,
+            "quarter": "Q3",
+            "database_names": ["transcripts"],
+        },
+        {
+            "bank_id": 2,
+            "bank_name": "Toronto-Dominion Bank",
+            "bank_symbol": "TD",
+            "fiscal_year": 2025,
+            "quarter": "Q2",
+            "database_names": ["transcripts", "rts"],
+        },
+    ]
+
+    async def fake_fetch_all(query, params=None, execution_id=None, engine=None):
+        queries.append(execution_id)
+        return rows
+
+    monkeypatch.setattr(clarifier, "fetch_all", fake_fetch_all)
+    monkeypatch.setattr(clarifier, "_availability_cache", {})
+    monkeypatch.setattr(clarifier.config.clarifier, "availability_ttl", 300)
+
+    everything = await clarifier.get_period_availability_from_db()
+    td_only = await clarifier.get_period_availability_from_db([2], ["rts"])
+
+    assert queries == ["clarifier_periods"]
+    assert sorted(everything["availability"]) == ["1", "2"]
+    assert td_only["availability"] == {
+        "2": {"name": "Toronto-Dominion Bank", "symbol": "TD", "databases": {"rts": {2025: ["Q2"]}}}
+    }
+
+    assert await clarifier.warm_availability_snapshot() == {"banks": 2, "periods": 2}
+    assert queries == ["clarifier_periods", "clarifier_banks", "clarifier_periods"]
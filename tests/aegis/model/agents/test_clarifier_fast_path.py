@@ -0,0 +1,130 @@
+"""Tests for the deterministic clarifier fast path."""
+
+import pytest
+
+from aegis.model.agents.clarifier_fast_path import (
+    BankMatcher,
+    get_bank_matcher,
+    parse_fiscal_periods,
+    resolve_banks_and_periods,
+)
+
+BANKS_DATA = {
+    "banks": {
+        1: {"name": "Royal Bank of Canada", "symbol": "RY", "aliases": ["RBC", "Royal Bank"]},
+        2: {"name": "Bank of Montreal", "symbol": "BMO", "aliases": ["BMO"]},
+        6: {"name": "Toronto-Dominion Bank", "symbol": "TD", "aliases": ["TD Bank"]},
+        12: {"name": "Morgan Stanley", "symbol": "MS-US", "aliases": []},
+    },
+    "categories": {
+        "big_six": {"aliases": ["Big Six", "Big 6"], "bank_ids": [1, 2, 6]},
+        "us_banks": {"aliases": ["US banks"], "bank_ids": [12]},
+    },
+}
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("Q3 2025", {"fiscal_year": 2025, "quarters": ["Q3"]}),
+        ("q3 fy25", {"fiscal_year": 2025, "quarters": ["Q3"]}),
+        ("FY2025 Q1", {"fiscal_year": 2025, "quarters": ["Q1"]}),
+        ("3Q25", {"fiscal_year": 2025, "quarters": ["Q3"]}),
+        ("Q2 and Q3 2025", {"fiscal_year": 2025, "quarters": ["Q2", "Q3"]}),
+        ("third quarter of fiscal 2025", {"fiscal_year": 2025, "quarters": ["Q3"]}),
+    ],
+)
+def test_parse_fiscal_periods_accepts_explicit_periods(text, expected) -> None:
+    """Explicit quarter and fiscal year forms parse to one period set."""
+    assert parse_fiscal_periods(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Q3 2024 vs Q3 2025",
+        "Q1-Q3 2025",
+        "latest quarter",
+        "2025 revenue",
+        "Q3",
+        "calendar Q3 2025",
+        "margin up 25 bps in Q3",
+    ],
+)
+def test_parse_fiscal_periods_rejects_ambiguous_periods(text) -> None:
+    """Multi-year, ranged, relative or incomplete periods fall through to the LLM."""
+    assert parse_fiscal_periods(text) is None
+
+
+def test_bank_matcher_resolves_names_aliases_symbols_and_categories() -> None:
+    """Every kind of bank mention resolves to bank IDs."""
+    matcher = BankMatcher(BANKS_DATA)
+
+    assert matcher.match("Royal Bank of Canada and TD")[0] == [1, 6]
+    assert matcher.match("the big six")[0] == [1, 2, 6]
+    assert matcher.match("MS and BMO")[0] == [2, 12]
+    assert matcher.match("ms word") is None
+
+
+def test_bank_matcher_rejects_shared_aliases() -> None:
+    """An alias shared by two banks is ambiguous."""
+    banks_data = {
+        "banks": {
+            1: {"name": "First Bank", "symbol": "FB", "aliases": ["National"]},
+            2: {"name": "Second Bank", "symbol": "SB", "aliases": ["National"]},
+        },
+        "categories": {},
+    }
+
+    assert BankMatcher(banks_data).match("National Q3 2025") is None
+
+
+def test_get_bank_matcher_reuses_compiled_matcher() -> None:
+    """The same bank index compiles once."""
+    assert get_bank_matcher(BANKS_DATA) is get_bank_matcher(dict(BANKS_DATA))
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "Compare RBC and Scotiabank Q3 2025",
+        "RBC and Desjardins Q3 2025",
+        "RBC and CIBC Q3 2025",
+    ],
+)
+def test_resolve_banks_and_periods_rejects_unknown_bank_mentions(query) -> None:
+    """A bank the index does not know is never silently dropped."""
+    assert resolve_banks_and_periods(query, BANKS_DATA) is None
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "RBC Q1 2025 and TD Q3 2025",
+        "Q1 2025 for RBC and Q3 2025 for TD",
+        "RBC Q3 2025 excluding TD",
+        "RBC but not TD in Q3 2025",
+        "Big Six except BMO in Q3 2025",
+        "RBC vs TD Q3 2025",
+        "RBC without TD Bank for Q2 2025",
+    ],
+)
+def test_resolve_banks_and_periods_leaves_pairings_and_negation_to_the_llm(query) -> None:
+    """Per-bank periods and excluded banks cannot be expressed as one bank and period set."""
+    assert resolve_banks_and_periods(query, BANKS_DATA) is None
+
+
+def test_resolve_banks_and_periods_applies_shared_periods_to_every_bank() -> None:
+    """Several quarters named once for all banks still resolve as a cross product."""
+    assert resolve_banks_and_periods("RBC and TD NIM in Q2 and Q3 2025", BANKS_DATA) == (
+        [1, 6],
+        {"fiscal_year": 2025, "quarters": ["Q2", "Q3"]},
+    )
+
+
+def test_resolve_banks_and_periods_resolves_unambiguous_query() -> None:
+    """Known banks plus one explicit period resolve deterministically."""
+    assert resolve_banks_and_periods("What was RBC and TD's NIM in Q3 2025?", BANKS_DATA) == (
+        [1, 6],
+        {"fiscal_year": 2025, "quarters": ["Q3"]},
+    )
@@ -0,0 +1,116 @@
+"""Tests for the router decision cache."""
+
+import pytest
+
+from aegis.model.agents import router, router_cache
+from aegis.model.agents.router_cache import (
+    RouterDecisionCache,
+    build_context_key,
+    normalize_message,
+)
+
+DECISION = {"route": "research_workflow", "rationale": "Data retrieval required"}
+
+
+def _context_key(history=None, databases=None, prompt_version="2.1.0"):
+    """Build a context key with test defaults."""
+    return build_context_key(history or [], "", databases, prompt_version, "model", 4)
+
+
+def test_normalize_message_ignores_case_whitespace_and_edge_punctuation() -> None:
+    """Trivially different phrasings normalize to the same key."""
+    assert normalize_message("  What is RBC's   NIM?? ") == normalize_message("what is rbc's nim")
+
+
+def test_context_key_excludes_latest_message_and_tracks_filters() -> None:
+    """The key covers prior history, database filter and prompt version only."""
+    history = [{"role": "user", "content": "hi"}, {"role": "user", "content": "RBC NIM"}]
+
+    key = build_context_key(history, "RBC NIM", ["rts"], "2.1.0", "model", 4)
+
+    assert key == build_context_key(history[:1], "RBC NIM", ["rts"], "2.1.0", "model", 4)
+    assert key != build_context_key(history, "RBC NIM", ["transcripts"], "2.1.0", "model", 4)
+    assert key != build_context_key(history, "RBC NIM", ["rts"], "2.2.0", "model", 4)
+
+
+def test_cache_exact_and_similar_hits_are_counted() -> None:
+    """Exact and near-duplicate messages hit; unrelated messages miss."""
+    cache = RouterDecisionCache(ttl_seconds=60, max_entries=10, similarity_threshold=0.9)
+    key = _context_key()
+    cache.put(key, "What was RBC's net interest margin in Q3 2025?", DECISION)
+
+    assert cache.get(key, "what was RBC's net interest margin in Q3 2025")[1] == "exact"
+    assert cache.get(key, "What was RBCs net interest margin in Q3 2025?")[1] == "similar"
+    assert cache.get(key, "Thanks!") is None
+    other_filter = _context_key(databases=["rts"])
+    assert cache.get(other_filter, "What was RBC's net interest margin in Q3 2025?") is None
+
+    stats = cache.stats()
+    assert (stats["exact_hits"], stats["similar_hits"], stats["misses"]) == (1, 1, 2)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cache_expires_and_evicts_entries(monkeypatch) -> None:
+    """Entries expire after the TTL and the oldest is evicted at capacity."""
+    now = [1000.0]
+    monkeypatch.setattr(router_cache.time, "monotonic", lambda: now[0])
+    cache = RouterDecisionCache(ttl_seconds=10, max_entries=2, similarity_threshold=0.99)
+    key = _context_key()
+
+    cache.put(key, "alpha", DECISION)
+    cache.put(key, "bravo", DECISION)
+    cache.put(key, "charlie", DECISION)
+    assert cache.get(key, "alpha") is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] += 11
+    assert cache.get(key, "bravo") is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_route_query_skips_llm_on_cache_hit(monkeypatch) -> None:
+    """A repeated turn is answered from the cache without another tool call."""
+    calls = []
+
+    async def fake_complete_with_tools(**kwargs):
+        calls.append(kwargs)
+        return {
+            "choices": [
+                {
+                    "message": {
+                        "tool_calls": [{"function": {"arguments": '{"routing_decision": 1}'}}]
+                    }
+                }
+            ],
+            "usage": {"total_tokens": 42},
+            "metrics": {"total_cost": 0.01},
+        }
+
+    def fake_load_prompt_from_db(**kwargs):
+        return {
+            "version": "2.1.0",
+            "composed_prompt": "system",
+            "user_prompt": "{conversation_history}\n{current_query}",
+            "tool_definition": {"type": "function", "function": {"name": "route"}},
+        }
+
+    monkeypatch.setattr(router, "complete_with_tools", fake_complete_with_tools)
+    monkeypatch.setattr(router, "load_prompt_from_db", fake_load_prompt_from_db)
+    monkeypatch.setattr(router.config.router_cache, "enabled", True)
+    monkeypatch.setattr(
+        router,
+        "get_router_cache",
+        lambda cache=RouterDecisionCache(60, 10, 0.9): cache,
+    )
+
+    message = [{"role": "user", "content": "RBC Q3 2025 revenue"}]
+    context = {"execution_id": "t", "available_databases": ["rts"]}
+    first = await router.route_query(message, "RBC Q3 2025 revenue", context)
+    second = await router.route_query(message, "rbc q3 2025 revenue", context)
+
+    assert len(calls) == 1
+    assert first["cache"] == "miss"
+    assert second["cache"] == "exact"
+    assert second["route"] == first["route"] == "research_workflow"
+    assert second["tokens_used"] == 0
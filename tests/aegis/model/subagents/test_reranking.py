@@ -0,0 +1,113 @@
+"""Tests for the pluggable retrieval reranker backends."""
+
+import pytest
+
+from aegis.model.subagents import reranking
+from aegis.model.subagents.supplementary_financials import pipeline
+from aegis.model.subagents.transcripts import formatting
+from aegis.utils.settings import config
+
+
+def _chunk(summary: str, similarity: float) -> dict:
+    """Build a minimal transcripts similarity chunk."""
+    return {"block_summary": summary, "content": "", "similarity_score": similarity}
+
+
+def _text(chunk: dict) -> str:
+    return chunk["block_summary"]
+
+
+def _score(chunk: dict) -> float:
+    return chunk["similarity_score"]
+
+
+async def _no_llm(*_args: object) -> set[int]:
+    raise AssertionError("the local backend must not call the LLM")
+
+
+@pytest.mark.asyncio
+async def test_local_reranker_drops_weak_candidates() -> None:
+    """Candidates far below the best combined score are removed."""
+    reranker = reranking.LocalReranker(_text, _score, min_score=0.5, lexical_weight=0.5)
+    chunks = [
+        _chunk("CET1 ratio and capital outlook", 0.82),
+        _chunk("Capital ratio commentary", 0.80),
+        _chunk("Branch opening ceremony", 0.30),
+    ]
+
+    removals = await reranker.removals("What was the CET1 capital ratio?", chunks, {})
+
+    assert removals == {2}
+    scores = reranker.score("What was the CET1 capital ratio?", chunks)
+    assert scores[0] == pytest.approx(0.5 * 1.0 + 0.5 * 1.0)
+    assert scores[1] == pytest.approx(0.5 * (2 / 3) + 0.5 * (0.80 / 0.82))
+
+
+def test_apply_min_keep_restores_best_removals() -> None:
+    """The shared floor restores the highest-scoring removals first."""
+    chunks = [_chunk(str(index), index / 10) for index in range(6)]
+
+    assert reranking.apply_min_keep(chunks, {0, 1, 2, 3, 4}, 3, _score) == {0, 1, 2}
+    assert reranking.apply_min_keep(chunks, {0, 1}, 3, _score) == {0, 1}
+    assert reranking.apply_min_keep(chunks[:2], {0, 1}, 3, _score) == set()
+
+
+def test_build_reranker_selects_configured_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    """RERANK_BACKEND picks the backend; unknown names are rejected."""
+    assert reranking.build_reranker(_no_llm, _text, _score).name == "llm"
+
+    monkeypatch.setattr(config.rerank, "backend", "local")
+    assert isinstance(reranking.build_reranker(_no_llm, _text, _score), reranking.LocalReranker)
+
+    with pytest.raises(ValueError, match="Unknown rerank backend"):
+        reranking.build_reranker(_no_llm, _text, _score, backend="onnx")
+
+
+@pytest.mark.asyncio
+async def test_supplementary_rerank_uses_local_backend_without_llm(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """With the local backend the rerank prompt is never called and the floor still applies."""
+    monkeypatch.setattr(config.rerank, "backend", "local")
+    monkeypatch.setattr(pipeline, "call_tool_prompt", _no_llm)
+    candidates = []
+    for index in range(12):
+        candidate = {
+            "name": "Net interest income" if index < 2 else f"Sheet {index}",
+            "summary": "",
+            "keywords": [],
+            "metrics": [],
+            "score": 1.0 if index < 2 else 0.05,
+        }
+        candidates.append(candidate)
+
+    kept = await pipeline.rerank_candidates(
+        query="net interest income",
+        combo={"bank_symbol": "RY", "quarter": "Q1", "fiscal_year": "2026"},
+        candidates=candidates,
+        context={"execution_id": "test"},
+    )
+
+    assert len(kept) == pipeline.RERANK_MIN_KEEP
+    assert kept[:2] == candidates[:2]
+
+
+@pytest.mark.asyncio
+async def test_transcripts_rerank_keeps_all_when_llm_call_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An LLM failure in the llm backend keeps every similarity chunk."""
+
+    def fake_load_prompt_from_db(**_kwargs: object) -> dict:
+        return {"system_prompt": "s", "user_prompt": "{search_phrase}", "tool_definition": {}}
+
+    async def failing_complete_with_tools(**_kwargs: object) -> dict:
+        raise TimeoutError("llm timed out")
+
+    monkeypatch.setattr("aegis.utils.prompt_loader.load_prompt_from_db", fake_load_prompt_from_db)
+    monkeypatch.setattr(formatting, "complete_with_tools", failing_complete_with_tools)
+    chunks = [_chunk("a", 0.9), _chunk("b", 0.1)]
+
+    kept = await formatting.rerank_similarity_chunks(chunks, "capital", {"execution_id": "t"})
+
+    assert kept == chunks
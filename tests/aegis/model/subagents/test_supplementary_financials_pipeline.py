@@ -1,6 +1,7 @@
 """Tests for the supplementary financials retrieval pipeline."""
 
 import asyncio
+import random
 
 import pytest
 
@@ -89,16 +90,16 @@ def test_combo_params_uses_base_ticker_for_supplementary_sql() -> None:
 
 
 @pytest.mark.asyncio
-async def test_run_retrieval_pipeline_parallelizes_combos_by_period(
+async def test_run_retrieval_pipeline_starts_combos_as_slots_free(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    """Pipeline runs up to six combos in parallel, one period group at a time."""
-    combos = [_combo(f"BANK{index}", "Q1") for index in range(7)]
+    """Combos run in a sliding window: one slow combo does not hold back the rest."""
+    monkeypatch.setattr(pipeline, "MAX_PARALLEL_COMBOS", 3)
+    combos = [_combo("SLOW", "Q1")] + [_combo(f"BANK{index}", "Q1") for index in range(6)]
     combos.extend([_combo("RY", "Q2"), _combo("TD", "Q2")])
     active_combos = 0
     max_active_combos = 0
-    active_period_counts = {}
-    mixed_periods = False
+    finished = []
 
     async def fake_prepare_query(**_kwargs: object) -> dict:
         return {
@@ -115,18 +116,16 @@ async def test_run_retrieval_pipeline_parallelizes_combos_by_period(
         context: dict,
         search_top_k: int,
         search_semaphore: asyncio.Semaphore,
+        llm_semaphore: asyncio.Semaphore,
+        sheet_cache: pipeline.SheetChunkCache,
     ) -> dict:
-        nonlocal active_combos, max_active_combos, mixed_periods
-        _ = prepared, context, search_top_k, search_semaphore
-        period = (combo["fiscal_year"], combo["quarter"])
+        nonlocal active_combos, max_active_combos
+        _ = prepared, context, search_top_k, search_semaphore, llm_semaphore, sheet_cache
         active_combos += 1
         max_active_combos = max(max_active_combos, active_combos)
-        active_period_counts[period] = active_period_counts.get(period, 0) + 1
-        if len([count for count in active_period_counts.values() if count]) > 1:
-            mixed_periods = True
-        await asyncio.sleep(0.01)
-        active_period_counts[period] -= 1
+        await asyncio.sleep(0.1 if combo["bank_symbol"] == "SLOW" else 0.01)
         active_combos -= 1
+        finished.append(combo["bank_symbol"])
         return {
             "combo": combo,
             "expanded_chunks": [_candidate("sheet_1.1", score=0.5)],
@@ -144,8 +143,38 @@ async def test_run_retrieval_pipeline_parallelizes_combos_by_period(
     )
 
     assert results["metrics"]["combo_count"] == len(combos)
-    assert max_active_combos == pipeline.MAX_PARALLEL_COMBOS_PER_PERIOD
-    assert mixed_periods is False
+    assert results["metrics"]["peak_combos_in_flight"] == max_active_combos == 3
+    # Every other combo, including the next period's, finished while SLOW held one slot
+    assert finished[-1] == "SLOW"
+    assert [result["combo"]["bank_symbol"] for result in results["combo_results"]] == [
+        combo["bank_symbol"] for combo in combos
+    ]
+
+
+@pytest.mark.asyncio
+async def test_research_loop_llm_calls_use_llm_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Research LLM calls wait on the LLM semaphore, not the database search budget."""
+    llm_semaphore = asyncio.Semaphore(1)
+    search_semaphore = asyncio.Semaphore(1)
+    observed = []
+
+    async def fake_call_research_iteration(**_kwargs: object) -> dict:
+        observed.append((llm_semaphore.locked(), search_semaphore.locked()))
+        return {"confidence": 1.0, "findings": [], "additional_queries": []}
+
+    monkeypatch.setattr(pipeline, "call_research_iteration", fake_call_research_iteration)
+
+    research = await pipeline.run_research_loop(
+        prepared={"rewritten_query": "test"},
+        combo=_combo("RY"),
+        initial_chunks=[_candidate("sheet_1.1")],
+        context={"execution_id": "test"},
+        search_semaphore=search_semaphore,
+        llm_semaphore=llm_semaphore,
+    )
+
+    assert research["stopping_reason"] == "high_confidence"
+    assert observed == [(True, False)]
 
 
 @pytest.mark.asyncio
@@ -240,8 +269,9 @@ async def test_process_combo_caps_fused_results_after_rerank(
     async def fake_gap_fill_one_sheet_gaps(
         chunks: list[dict],
         search_semaphore: asyncio.Semaphore | None = None,
+        sheet_cache: pipeline.SheetChunkCache | None = None,
     ) -> list[dict]:
-        _ = search_semaphore
+        _ = search_semaphore, sheet_cache
         return chunks
 
     async def fake_run_research_loop(**kwargs: object) -> dict:
@@ -286,8 +316,9 @@ async def test_process_combo_skips_rerank_when_fused_results_are_within_top_k(
     async def fake_gap_fill_one_sheet_gaps(
         chunks: list[dict],
         search_semaphore: asyncio.Semaphore | None = None,
+        sheet_cache: pipeline.SheetChunkCache | None = None,
     ) -> list[dict]:
-        _ = search_semaphore
+        _ = search_semaphore, sheet_cache
         return chunks
 
     async def fake_run_research_loop(**kwargs: object) -> dict:
@@ -345,6 +376,90 @@ async def test_research_loop_stops_on_high_confidence(
     assert len(result["iterations"]) == 1
 
 
+@pytest.mark.asyncio
+async def test_research_loop_sends_only_new_evidence(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Later iterations see only new evidence; same chunk IDs from other files count as new."""
+    monkeypatch.setattr(pipeline, "RESEARCH_MAX_ITERATIONS", 3)
+    shown = []
+    searches = []
+
+    async def fake_call_research_iteration(**kwargs: object) -> dict:
+        shown.append([chunk["chunk_id"] for chunk in kwargs["evidence_chunks"]])
+        number = kwargs["iteration_number"]
+        return {
+            "iteration": number,
+            "findings": [],
+            "additional_queries": [f"follow up {number}"],
+            "confidence": 0.2,
+            "usage": {"prompt_tokens": 100 * number, "completion_tokens": 10},
+        }
+
+    async def fake_search_additional_queries(**kwargs: object) -> list[dict]:
+        searches.append(set(kwargs["seen_keys"]))
+        if len(searches) > 1:
+            return []
+        other_file = dict(_candidate("sheet_1.1"), file_id="financial-supp_2026_Q1_RY")
+        return [_candidate("sheet_3.1"), other_file]
+
+    async def fake_gap_fill_one_sheet_gaps(chunks: list[dict], **_kwargs: object) -> list[dict]:
+        return chunks + [_candidate("sheet_2.1")]
+
+    monkeypatch.setattr(pipeline, "call_research_iteration", fake_call_research_iteration)
+    monkeypatch.setattr(pipeline, "search_additional_queries", fake_search_additional_queries)
+    monkeypatch.setattr(pipeline, "gap_fill_one_sheet_gaps", fake_gap_fill_one_sheet_gaps)
+
+    result = await pipeline.run_research_loop(
+        prepared={"original_query": "revenue"},
+        combo=_combo("CM"),
+        initial_chunks=[_candidate("sheet_1.1")],
+        context={"execution_id": "test"},
+    )
+
+    assert shown == [["sheet_1.1"], ["sheet_3.1", "sheet_1.1", "sheet_2.1"]]
+    assert result["stopping_reason"] == "no_new_chunks"
+    assert [item["metrics"] for item in result["iterations"]] == [
+        {
+            "evidence_chunks": 1,
+            "prompt_tokens": 100,
+            "completion_tokens": 10,
+            "new_evidence_chunks": 3,
+        },
+        {
+            "evidence_chunks": 3,
+            "prompt_tokens": 200,
+            "completion_tokens": 10,
+            "new_evidence_chunks": 0,
+        },
+    ]
+    assert len(searches[1]) == 4
+
+
+@pytest.mark.asyncio
+async def test_research_loop_skips_search_after_final_iteration(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """No follow-up search runs once no further iteration could read its results."""
+    monkeypatch.setattr(pipeline, "RESEARCH_MAX_ITERATIONS", 1)
+
+    async def fake_call_research_iteration(**_kwargs: object) -> dict:
+        return {"iteration": 1, "findings": [], "additional_queries": ["more"], "confidence": 0.1}
+
+    async def fake_search_additional_queries(**_kwargs: object) -> list[dict]:
+        raise AssertionError("search results after the final iteration would be unused")
+
+    monkeypatch.setattr(pipeline, "call_research_iteration", fake_call_research_iteration)
+    monkeypatch.setattr(pipeline, "search_additional_queries", fake_search_additional_queries)
+
+    result = await pipeline.run_research_loop(
+        prepared={"original_query": "revenue"},
+        combo=_combo("CM"),
+        initial_chunks=[_candidate("sheet_1.1")],
+        context={"execution_id": "test"},
+    )
+
+    assert result["stopping_reason"] == "max_iterations"
+
+
 def test_apply_min_keep_floor_restores_highest_scoring_removals() -> None:
     """Rerank cannot remove below the configured keep floor."""
     candidates = [_candidate(f"sheet_{index}.1", score=index) for index in range(12)]
@@ -527,12 +642,11 @@ async def test_rerank_candidates_coerces_string_indices(
 async def test_gap_fill_one_sheet_gap(monkeypatch: pytest.MonkeyPatch) -> None:
     """Gap fill inserts the only missing sheet between selected chunks."""
 
-    async def fake_load_sheet_chunks(file_id: str, sheet_number: int) -> list[dict]:
-        assert file_id == "financial-supp_2026_Q1_CM"
-        assert sheet_number == 11
-        return [_candidate("sheet_11.1")]
+    async def fake_load_sheet_chunks_batch(sheet_specs: list[tuple]) -> dict:
+        assert sheet_specs == [("financial-supp_2026_Q1_CM", 11)]
+        return {sheet_specs[0]: [_candidate("sheet_11.1")]}
 
-    monkeypatch.setattr(pipeline, "load_sheet_chunks", fake_load_sheet_chunks)
+    monkeypatch.setattr(pipeline, "load_sheet_chunks_batch", fake_load_sheet_chunks_batch)
 
     expanded = await pipeline.gap_fill_one_sheet_gaps(
         [_candidate("sheet_10.1", score=0.8), _candidate("sheet_12.1", score=0.7)]
@@ -547,6 +661,78 @@ async def test_gap_fill_one_sheet_gap(monkeypatch: pytest.MonkeyPatch) -> None:
     assert expanded[1]["match_sources"] == ["gap_fill"]
 
 
+@pytest.mark.asyncio
+async def test_gap_fill_coalesces_concurrent_combos_and_caches_sheets(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Concurrent gap fills share one query and later iterations reuse loaded sheets."""
+    batches = []
+
+    async def fake_load_sheet_chunks_batch(sheet_specs: list[tuple]) -> dict:
+        batches.append(list(sheet_specs))
+        return {
+            (file_id, sheet): [dict(_candidate(f"sheet_{sheet}.1"), file_id=file_id)]
+            for file_id, sheet in sheet_specs
+        }
+
+    monkeypatch.setattr(pipeline, "load_sheet_chunks_batch", fake_load_sheet_chunks_batch)
+    cache = pipeline.SheetChunkCache()
+
+    def _chunks(file_id: str, sheets: list[int]) -> list[dict]:
+        return [dict(_candidate(f"sheet_{sheet}.1"), file_id=file_id) for sheet in sheets]
+
+    first, second = await asyncio.gather(
+        pipeline.gap_fill_one_sheet_gaps(_chunks("file-a", [1, 3, 5]), sheet_cache=cache),
+        pipeline.gap_fill_one_sheet_gaps(_chunks("file-b", [7, 9]), sheet_cache=cache),
+    )
+    again = await pipeline.gap_fill_one_sheet_gaps(_chunks("file-a", [1, 3]), sheet_cache=cache)
+
+    assert batches == [[("file-a", 2), ("file-a", 4), ("file-b", 8)]]
+    assert [chunk["chunk_id"] for chunk in first] == [f"sheet_{n}.1" for n in range(1, 6)]
+    assert [chunk["chunk_id"] for chunk in second] == ["sheet_7.1", "sheet_8.1", "sheet_9.1"]
+    assert [chunk["chunk_id"] for chunk in again] == ["sheet_1.1", "sheet_2.1", "sheet_3.1"]
+    assert cache.stats() == {"sheets": 3, "queries": 1, "hits": 1}
+
+
+@pytest.mark.asyncio
+async def test_sheet_cache_survives_cancelled_waiters_and_failed_loads(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A cancelled caller leaves shared loads intact; a failure reaches every waiter."""
+    release = asyncio.Event()
+    calls = []
+
+    async def fake_load_sheet_chunks_batch(sheet_specs: list[tuple]) -> dict:
+        calls.append(list(sheet_specs))
+        await release.wait()
+        if len(calls) == 2:
+            raise ConnectionError("database unavailable")
+        return {spec: [dict(_candidate("sheet_2.1"), file_id=spec[0])] for spec in sheet_specs}
+
+    monkeypatch.setattr(pipeline, "load_sheet_chunks_batch", fake_load_sheet_chunks_batch)
+    cache = pipeline.SheetChunkCache()
+
+    cancelled = asyncio.create_task(cache.load([("file-a", 2)]))
+    survivor = asyncio.create_task(cache.load([("file-a", 2), ("file-b", 4)]))
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+    release.set()
+
+    result = await survivor
+    assert sorted(result) == [("file-a", 2), ("file-b", 4)]
+    assert cancelled.cancelled()
+
+    release.clear()
+    first = asyncio.create_task(cache.load([("file-c", 6)]))
+    second = asyncio.create_task(cache.load([("file-c", 6)]))
+    await asyncio.sleep(0.01)
+    release.set()
+    for waiter in (first, second):
+        with pytest.raises(ConnectionError):
+            await waiter
+    assert cache.stats()["sheets"] == 2
+
+
 def test_parse_research_findings_enriches_source_references() -> None:
     """Findings get deterministic file references from source_ref_ids."""
     catalog = pipeline.build_source_catalog([_candidate("sheet_11.1")])
@@ -664,3 +850,107 @@ def test_format_retrieval_response_reports_no_content_for_empty_search() -> None
     )
 
     assert "No supplementary financials content was found for this bank/period." in output
+
+
+def _loop_fusion(batches: list) -> list[dict]:
+    """Reference dict-based fusion the matrix implementation must reproduce."""
+    raw_by_key, combined = {}, {}
+    for strategy_name, hits, invert, scale in batches:
+        best_raw = {}
+        for hit in hits:
+            key = pipeline.candidate_key(hit)
+            raw_score = float(hit.get("raw_score", 0.0))
+            if key not in best_raw:
+                best_raw[key] = raw_score
+            else:
+                best_raw[key] = (min if invert else max)(best_raw[key], raw_score)
+        max_value = max(best_raw.values()) if best_raw else 0.0
+        if max_value == 0:
+            normalized = {key: 1.0 for key in best_raw}
+        elif invert:
+            normalized = {key: max(0.0, 1.0 - value / max_value) for key, value in best_raw.items()}
+        else:
+            normalized = {key: max(0.0, value / max_value) for key, value in best_raw.items()}
+        for hit in hits:
+            key = pipeline.candidate_key(hit)
+            raw_by_key.setdefault(key, hit)
+            entry = combined.setdefault(
+                key, {"score": 0.0, "strategy_scores": {}, "match_sources": []}
+            )
+            entry["score"] += (
+                pipeline.FUSION_WEIGHTS.get(strategy_name, 0.0) * scale * (normalized[key])
+            )
+            entry["strategy_scores"][strategy_name] = max(
+                entry["strategy_scores"].get(strategy_name, 0.0), normalized[key]
+            )
+            if strategy_name not in entry["match_sources"]:
+                entry["match_sources"].append(strategy_name)
+    fused = [
+        {**raw_by_key[key], **scoring, "is_gap_fill": False} for key, scoring in combined.items()
+    ]
+    fused.sort(key=lambda item: item["score"], reverse=True)
+    return fused
+
+
+def _random_batches(seed: int) -> list:
+    """Search batches with overlapping keys, duplicate hits, ties and zero scores."""
+    rng = random.Random(seed)
+    strategies = [
+        ("content_vector", True, 1.0),
+        ("subquery_vector", True, 0.5),
+        ("subquery_vector", True, 0.5),
+        ("bm25", False, 1.0),
+        ("keyword_array", False, 1.0),
+        ("section_summary", True, 1.0),
+    ]
+    batches = []
+    for strategy_name, invert, scale in strategies:
+        hits = []
+        for _ in range(rng.randint(0, 25)):
+            hit = _candidate(f"sheet_{rng.randint(1, 30)}.{rng.randint(1, 2)}")
+            hit["raw_score"] = rng.choice([0.0, 0.25, 0.5, round(rng.random(), 3)])
+            hits.append(hit)
+        batches.append((strategy_name, hits, invert, scale))
+    return batches
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_matrix_fusion_matches_loop_fusion(seed: int) -> None:
+    """Min-max matrix fusion reproduces the dict-based scores, sources and ranking."""
+    batches = _random_batches(seed)
+
+    expected = _loop_fusion(batches)
+    fused = pipeline.fuse_strategy_batches(batches)
+
+    assert [item["chunk_id"] for item in fused] == [item["chunk_id"] for item in expected]
+    assert [item["score"] for item in fused] == [item["score"] for item in expected]
+    assert [item["match_sources"] for item in fused] == [item["match_sources"] for item in expected]
+    assert [item["strategy_scores"] for item in fused] == [
+        item["strategy_scores"] for item in expected
+    ]
+    top = pipeline.fuse_strategy_batches(batches, top_k=7)
+    assert [item["chunk_id"] for item in top] == [item["chunk_id"] for item in expected[:7]]
+
+
+def test_rrf_fusion_ranks_by_position_not_raw_scale() -> None:
+    """Reciprocal-rank fusion ignores raw score magnitudes and rewards consensus."""
+
+    def _hits(scores: dict) -> list[dict]:
+        hits = []
+        for chunk_id, raw_score in scores.items():
+            hit = _candidate(chunk_id)
+            hit["raw_score"] = raw_score
+            hits.append(hit)
+        return hits
+
+    batches = [
+        ("bm25", _hits({"sheet_1.1": 1000.0, "sheet_2.1": 2.0, "sheet_3.1": 1.0}), False, 1.0),
+        ("keyword_vector", _hits({"sheet_2.1": 0.1, "sheet_3.1": 0.2}), True, 1.0),
+    ]
+
+    fused = pipeline.fuse_strategy_batches(batches, mode="rrf")
+
+    assert [item["chunk_id"] for item in fused] == ["sheet_2.1", "sheet_3.1", "sheet_1.1"]
+    assert fused[0]["strategy_scores"] == {"bm25": 61 / 62, "keyword_vector": 1.0}
+    with pytest.raises(ValueError, match="Unknown fusion mode"):
+        pipeline.fuse_strategy_batches(batches, mode="borda")
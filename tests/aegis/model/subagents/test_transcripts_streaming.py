@@ -0,0 +1,102 @@
+"""Tests for completion-order streaming in the transcripts subagent."""
+
+import asyncio
+import json
+
+import pytest
+
+from aegis.model.subagents.transcripts import main as transcripts_main
+
+DELAYS = {"RY": 0.03, "TD": 0.0, "BMO": 0.015}
+
+
+def _combo(symbol: str) -> dict:
+    return {
+        "bank_id": symbol,
+        "bank_name": f"{symbol} Bank",
+        "bank_symbol": symbol,
+        "fiscal_year": 2025,
+        "quarter": "Q3",
+    }
+
+
+@pytest.fixture(name="fake_pipeline")
+def _fake_pipeline(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Replace prompts, retrieval and LLM calls with per-bank delayed fakes."""
+
+    def fake_load_prompt_from_db(**_kwargs: object) -> dict:
+        return {"system_prompt": "{category_mapping}", "user_prompt": "", "tool_definition": {}}
+
+    async def fake_categories() -> dict:
+        return {}
+
+    async def fake_priority_blocks(**_kwargs: object) -> list:
+        return []
+
+    async def fake_complete_with_tools(**_kwargs: object) -> dict:
+        arguments = json.dumps({"method": 0, "sections": "ALL"})
+        tool_call = {"function": {"arguments": arguments}}
+        return {"choices": [{"message": {"tool_calls": [tool_call]}}]}
+
+    async def fake_retrieve_full_section(combo: dict, _sections: str, _context: dict) -> list:
+        return [{"section_name": "MD", "bank": combo["bank_symbol"]}]
+
+    async def fake_format(chunks: list, _combo: dict, _context: dict, **_kwargs: object) -> str:
+        return "formatted"
+
+    async def fake_generate(_content: str, combo: dict, _context: dict) -> str:
+        await asyncio.sleep(DELAYS[combo["bank_symbol"]])
+        if combo["bank_symbol"] == "FAIL":
+            raise RuntimeError("synthesis failed")
+        return f"### {combo['bank_symbol']}\n"
+
+    monkeypatch.setattr(transcripts_main, "load_prompt_from_db", fake_load_prompt_from_db)
+    monkeypatch.setattr(transcripts_main, "load_financial_categories", fake_categories)
+    monkeypatch.setattr(transcripts_main, "get_priority_blocks", fake_priority_blocks)
+    monkeypatch.setattr(transcripts_main, "complete_with_tools", fake_complete_with_tools)
+    monkeypatch.setattr(transcripts_main, "retrieve_full_section", fake_retrieve_full_section)
+    monkeypatch.setattr(transcripts_main, "format_full_section_chunks", fake_format)
+    monkeypatch.setattr(transcripts_main, "generate_research_statement", fake_generate)
+    monkeypatch.setattr(transcripts_main, "add_monitor_entry", lambda **_kwargs: None)
+
+
+async def _collect(combos: list) -> list:
+    chunks = []
+    async for chunk in transcripts_main.transcripts_agent(
+        conversation=[],
+        latest_message="capital outlook",
+        bank_period_combinations=combos,
+        basic_intent="capital outlook",
+        full_intent="capital outlook",
+        database_id="transcripts",
+        context={"execution_id": "test"},
+    ):
+        chunks.append(chunk)
+    return chunks
+
+
+@pytest.mark.asyncio
+async def test_statements_stream_in_completion_order(fake_pipeline: None) -> None:
+    """The header comes first, then each bank as it finishes, with metadata to re-sort."""
+    chunks = await _collect([_combo("RY"), _combo("TD"), _combo("BMO"), _combo("TD")])
+
+    header, *statements = chunks
+    assert header["content"].startswith("## Earnings Transcript Analysis")
+    assert "metadata" not in header
+    assert [chunk["metadata"]["bank_symbol"] for chunk in statements] == ["TD", "BMO", "RY"]
+    assert [chunk["metadata"]["completion_index"] for chunk in statements] == [0, 1, 2]
+    assert [chunk["metadata"]["combo_index"] for chunk in statements] == [1, 2, 0]
+    assert {chunk["metadata"]["total_combinations"] for chunk in statements} == {3}
+    assert statements[0]["content"].startswith("### TD")
+
+
+@pytest.mark.asyncio
+async def test_failed_combo_cancels_remaining_work(
+    fake_pipeline: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A failing combination ends the stream with the error chunk and no late statements."""
+    monkeypatch.setitem(DELAYS, "FAIL", 0.0)
+    chunks = await _collect([_combo("RY"), _combo("FAIL")])
+
+    assert len(chunks) == 2
+    assert "Error in Transcripts subagent: synthesis failed" in chunks[-1]["content"]
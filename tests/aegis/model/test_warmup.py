@@ -0,0 +1,100 @@
+"""Tests for per-worker warm state loading and release."""
+
+import asyncio
+
+import pytest
+
+from aegis.model import main, warmup
+from aegis.model.agents import clarifier
+from aegis.utils import sql_prompt
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_state_runs_steps_and_tolerates_failures(monkeypatch) -> None:
+    """A failing or slow step is recorded and skipped; the others still load."""
+    started = []
+
+    async def ok_step():
+        started.append("ok")
+        return {"prompts": 12}
+
+    async def failing_step():
+        started.append("failing")
+        raise ConnectionError("database unavailable")
+
+    async def slow_step():
+        started.append("slow")
+        await asyncio.sleep(5)
+        return {}
+
+    monkeypatch.setattr(
+        warmup,
+        "WARMUP_STEPS",
+        {"prompts": ok_step, "database": failing_step, "llm_client": slow_step},
+    )
+
+    report = await warmup.warm_worker_state(timeout=0.05)
+
+    assert sorted(started) == ["failing", "ok", "slow"]
+    steps = report["steps"]
+    assert steps["prompts"]["status"] == "ok"
+    assert steps["prompts"]["prompts"] == 12
+    assert steps["database"] == {
+        "status": "failed",
+        "duration_ms": steps["database"]["duration_ms"],
+        "error": "database unavailable",
+    }
+    assert steps["llm_client"]["status"] == "failed"
+    assert steps["llm_client"]["error"] == "TimeoutError"
+    assert report["preloaded_modules"] == len(warmup.PRELOAD_MODULES)
+
+
+def test_release_worker_state_disposes_prompt_engine_and_snapshot(monkeypatch) -> None:
+    """Shutdown drops the prompt manager and the availability snapshot."""
+    disposed = []
+
+    class _Engine:
+        def dispose(self):
+            disposed.append(True)
+
+    class _Manager:
+        engine = _Engine()
+
+    monkeypatch.setattr(sql_prompt, "prompt_manager", _Manager())
+    monkeypatch.setattr(clarifier, "_availability_cache", {"clarifier_banks": (0.0, [])})
+
+    warmup.release_worker_state()
+
+    assert disposed == [True]
+    assert sql_prompt.prompt_manager is None
+    assert clarifier._availability_cache == {}  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("warmed", [True, False])
+async def test_model_reuses_the_warmed_prompt_manager(monkeypatch, warmed) -> None:
+    """A request keeps the worker's prompt manager; it only loads one when none exists."""
+    loaded = []
+    warmed_manager = object()
+
+    class _StopAfterPrompts(Exception):
+        pass
+
+    def fake_setup_ssl():
+        raise _StopAfterPrompts()
+
+    def fake_postgresql_prompts():
+        loaded.append(True)
+        sql_prompt.prompt_manager = object()
+        return sql_prompt.prompt_manager
+
+    monkeypatch.setattr(sql_prompt, "prompt_manager", warmed_manager if warmed else None)
+    monkeypatch.setattr(sql_prompt, "postgresql_prompts", fake_postgresql_prompts)
+    monkeypatch.setattr(main, "initialize_monitor", lambda *args: None)
+    monkeypatch.setattr(main, "setup_ssl", fake_setup_ssl)
+
+    with pytest.raises(_StopAfterPrompts):
+        await main.model({"messages": [{"role": "user", "content": "hi"}]}).__anext__()
+
+    assert loaded == ([] if warmed else [True])
+    assert (sql_prompt.prompt_manager is warmed_manager) is warmed
@@ -0,0 +1,67 @@
+"""Tests for the concurrent chat session load test."""
+
+import json
+
+import pytest
+import websockets
+
+from scripts import load_test_chat
+from scripts.load_test_chat import LevelResult, summarize_level, sustained_sessions
+
+
+def test_summarize_level_applies_latency_and_error_limits() -> None:
+    """A level is sustained only while p95 latency and errors stay within limits."""
+    fast = LevelResult(sessions=8, duration=10, latencies=[1.0] * 19 + [4.0], errors=0)
+    slow = LevelResult(sessions=16, duration=10, latencies=[1.0] * 18 + [9.0, 9.5])
+    failing = LevelResult(sessions=32, duration=10, latencies=[1.0] * 9, errors=1)
+
+    summaries = [
+        summarize_level(result, max_p95=5, max_error_rate=0.05) for result in (fast, slow, failing)
+    ]
+
+    assert summaries[0]["sustained"] is True
+    assert summaries[0]["p95"] == 1.0
+    assert summaries[0]["turns_per_second"] == 2.0
+    assert summaries[1]["p95"] == 9.0
+    assert summaries[1]["sustained"] is False
+    assert summaries[2]["error_rate"] == 0.1
+    assert sustained_sessions(summaries) == 8
+    assert sustained_sessions(summaries[1:]) == 0
+
+
+@pytest.mark.asyncio
+async def test_run_level_drives_concurrent_websocket_sessions() -> None:
+    """Each session sends messages until the deadline and records complete turns."""
+    connected = []
+
+    async def fake_chat_server(websocket):
+        connected.append(websocket.path)
+        await websocket.send(json.dumps({"type": "session", "session_id": "s"}))
+        async for message in websocket:
+            assert json.loads(message)["type"] == "message"
+            await websocket.send(json.dumps({"type": "status", "content": "Processing"}))
+            await websocket.send(json.dumps({"type": "agent", "name": "aegis", "content": "ok"}))
+            await websocket.send(json.dumps({"type": "status", "content": "Ready"}))
+
+    async with websockets.serve(fake_chat_server, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        args = load_test_chat.build_parser().parse_args(
+            [
+                "--url",
+                f"ws://127.0.0.1:{port}/ws",
+                "--duration",
+                "0.3",
+                "--ramp",
+                "0",
+                "--think-time",
+                "0.05",
+            ]
+        )
+        result = await load_test_chat.run_level(args, sessions=3)
+
+    assert len(connected) == 3
+    assert all(path.startswith("/ws?session_id=loadtest-") for path in connected)
+    assert result.errors == 0
+    assert result.dropped_sessions == 0
+    assert len(result.latencies) >= 3
+    assert len(result.first_chunk_latencies) == len(result.latencies)
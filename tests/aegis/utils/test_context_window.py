@@ -0,0 +1,145 @@
+"""Tests for token-aware conversation windowing."""
+
+import pytest
+
+from aegis.utils import context_window
+from aegis.utils.context_window import (
+    compact_conversation,
+    count_message_tokens,
+    count_tokens,
+    fold_history,
+    is_summary_message,
+    merge_summary,
+    recent_history,
+    window_messages,
+)
+from aegis.utils.conversation import process_conversation
+from aegis.utils.settings import config
+
+
+@pytest.fixture(autouse=True)
+def _estimated_tokens(monkeypatch):
+    """Use the character estimate so counts do not depend on tiktoken being installed."""
+    monkeypatch.setattr(context_window, "_get_encoder", lambda: None)
+
+
+def _turns(count: int, size: int = 40):
+    """Build alternating user/assistant messages of roughly `size` characters."""
+    return [
+        {
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"message {i} " + "x" * size,
+        }
+        for i in range(count)
+    ]
+
+
+def test_count_tokens_estimates_without_tokenizer() -> None:
+    """Without a tokenizer, tokens are estimated at four characters each."""
+    assert count_tokens("") == 0
+    assert count_tokens("abcd" * 10) == 10
+    assert count_tokens("abcde") == 2
+
+
+def test_fold_history_keeps_recent_messages_within_budget() -> None:
+    """Older messages beyond the budget are folded into the summary."""
+    messages = _turns(6)
+    per_message = count_message_tokens([messages[-1]])
+
+    kept, summary, folded = fold_history(messages, "", token_budget=per_message * 2)
+
+    assert kept == messages[-2:]
+    assert folded == 4
+    assert summary.splitlines()[0].startswith("- User: message 0")
+    assert len(summary.splitlines()) == 4
+
+
+def test_fold_history_respects_message_cap_and_keeps_latest() -> None:
+    """The latest message survives even when it alone exceeds the budget."""
+    messages = _turns(4)
+
+    kept, _, folded = fold_history(messages, "", token_budget=1)
+    assert kept == messages[-1:]
+    assert folded == 3
+
+    kept, _, folded = fold_history(messages, "", token_budget=10_000, max_messages=3)
+    assert kept == messages[-3:]
+    assert folded == 1
+
+
+def test_merge_summary_drops_oldest_lines_over_cap() -> None:
+    """The rolling summary never grows past its token cap."""
+    summary = merge_summary("", _turns(20, size=200), max_tokens=150)
+
+    assert count_tokens(summary) <= 150 + len(summary.splitlines())
+    assert "message 19" in summary
+    assert "message 0 " not in summary
+
+
+def test_window_messages_prepends_summary(monkeypatch) -> None:
+    """Agent views include the summary followed by turns that fit the agent budget."""
+    messages = _turns(6)
+    monkeypatch.setattr(config.conversation, "agent_token_budgets", {"router": 40})
+
+    view = window_messages(messages, "- User: earlier question", "router")
+
+    assert is_summary_message(view[0])
+    assert "earlier question" in view[0]["content"]
+    # 40 tokens less the 6-token summary leaves room for two 17-token messages
+    assert view[1:] == messages[-2:]
+    assert "message 3" in view[0]["content"]
+
+
+def test_window_messages_without_history_is_unchanged() -> None:
+    """Short conversations pass through with no summary message."""
+    messages = _turns(2)
+
+    assert window_messages(messages, "", "planner") == messages
+
+
+def test_recent_history_keeps_leading_summary() -> None:
+    """Slicing recent history does not drop the summary message."""
+    messages = [context_window.summary_message("- User: old")] + _turns(8)
+
+    recent = recent_history(messages, 3)
+
+    assert recent[0] == messages[0]
+    assert recent[1:] == messages[-3:]
+    assert recent_history(_turns(8), 3) == _turns(8)[-3:]
+
+
+def test_compact_conversation_keeps_long_sessions_flat(monkeypatch) -> None:
+    """Over a 50-turn session the retained history and summary stay bounded."""
+    monkeypatch.setattr(config.conversation, "token_budget", 200)
+    monkeypatch.setattr(config.conversation, "summary_max_tokens", 120)
+    state = {"messages": [], "summary": ""}
+
+    sizes = []
+    for turn in range(50):
+        state["messages"].append({"role": "user", "content": f"question {turn} " + "q" * 80})
+        state["messages"].append({"role": "assistant", "content": f"answer {turn} " + "a" * 300})
+        compact_conversation(state)
+        sizes.append(count_message_tokens(state["messages"]) + count_tokens(state["summary"]))
+
+    assert state["messages"][-1]["content"].startswith("answer 49")
+    assert max(sizes[10:]) - min(sizes[10:]) < 150
+    assert count_message_tokens(state["messages"]) <= 200 + count_message_tokens(
+        state["messages"][-1:]
+    )
+
+
+def test_process_conversation_folds_and_carries_summary(monkeypatch) -> None:
+    """Messages beyond MAX_HISTORY_LENGTH are summarized rather than discarded."""
+    monkeypatch.setattr(config, "max_history_length", 4)
+    messages = _turns(7)
+
+    result = process_conversation(
+        {"messages": messages, "summary": "- User: from a previous turn"}, "exec-1"
+    )
+
+    assert result["success"] is True
+    assert result["messages"] == messages[-4:]
+    assert result["summarized_message_count"] == 3
+    assert result["summary"].startswith("- User: from a previous turn")
+    assert "message 2" in result["summary"]
+    assert result["history_tokens"] == count_message_tokens(messages[-4:])
@@ -0,0 +1,163 @@
+"""Tests for database viewer row estimates, exact counts and schema caching."""
+
+import asyncio
+
+import pytest
+
+from aegis.utils import database_overview
+from aegis.utils.database_overview import (
+    TTLCache,
+    build_database_overview,
+    count_rows_exact,
+    estimate_row_count,
+)
+
+
+def _catalog_row(table: str, reltuples: float, live_tuples, primary_key=None) -> dict:
+    return {
+        "table": table,
+        "columns": 4,
+        "indexes": 2,
+        "primary_key": primary_key,
+        "foreign_keys": 0,
+        "reltuples": reltuples,
+        "live_tuples": live_tuples,
+    }
+
+
+@pytest.fixture(name="catalog")
+def fixture_catalog(monkeypatch):
+    """Serve a fake pg_catalog overview and record how often it is queried."""
+    queries = []
+    rows = [
+        _catalog_row("aegis_transcripts", 1_250_000, 1_249_000, primary_key="id"),
+        _catalog_row("process_monitor_logs", -1, 812),
+    ]
+
+    async def fake_fetch_all(query, params=None, execution_id=None, engine=None):
+        queries.append(query)
+        return [dict(row) for row in rows]
+
+    monkeypatch.setattr(database_overview, "fetch_all", fake_fetch_all)
+    monkeypatch.setattr(database_overview, "_schema_cache", TTLCache(60))
+    return queries
+
+
+def test_estimate_row_count_prefers_reltuples_and_falls_back_to_live_tuples() -> None:
+    """Never-analyzed tables (reltuples -1 or 0) use n_live_tup."""
+    assert estimate_row_count(1500.0, 1200) == 1500
+    assert estimate_row_count(-1, 1200) == 1200
+    assert estimate_row_count(0, 7) == 7
+    assert estimate_row_count(None, None) == 0
+
+
+def test_ttl_cache_expires_entries(monkeypatch) -> None:
+    """Entries are served until the TTL passes; a zero TTL disables caching."""
+    now = [100.0]
+    monkeypatch.setattr(database_overview.time, "monotonic", lambda: now[0])
+    cache = TTLCache(30)
+    cache.set("overview", ["t"])
+
+    assert cache.get("overview") == ["t"]
+    now[0] = 131.0
+    assert cache.get("overview") is None
+
+    disabled = TTLCache(0)
+    disabled.set("overview", ["t"])
+    assert disabled.get("overview") is None
+
+
+@pytest.mark.asyncio
+async def test_overview_uses_estimates_and_caches_schema(catalog, monkeypatch) -> None:
+    """The default overview runs no COUNT(*) and reads the catalog once per TTL."""
+
+    async def unexpected_count(table_name, timeout):
+        raise AssertionError(f"exact count ran for {table_name}")
+
+    monkeypatch.setattr(database_overview, "_count_rows", unexpected_count)
+
+    first = await build_database_overview()
+    second = await build_database_overview()
+
+    assert len(catalog) == 1
+    assert first == second
+    assert [(t["table"], t["rows"], t["rows_estimated"]) for t in first["tables"]] == [
+        ("aegis_transcripts", 1_250_000, True),
+        ("process_monitor_logs", 812, True),
+    ]
+    assert first["tables"][0]["has_pk"] is True
+    assert first["summary"]["total_rows"] == 1_250_812
+    assert first["summary"]["rows_estimated"] is True
+
+    await build_database_overview(refresh=True)
+    assert len(catalog) == 2
+
+
+@pytest.mark.asyncio
+async def test_exact_counts_only_for_known_tables_and_fall_back_on_timeout(
+    catalog, monkeypatch
+) -> None:
+    """Requested counts replace estimates; a timed-out count keeps the estimate."""
+    counted = []
+
+    async def fake_count_rows(table_name, timeout):
+        counted.append(table_name)
+        if table_name == "aegis_transcripts":
+            raise asyncio.TimeoutError()
+        return 815
+
+    monkeypatch.setattr(database_overview, "_count_rows", fake_count_rows)
+
+    overview = await build_database_overview(
+        exact_tables=["process_monitor_logs", "aegis_transcripts", "pg_user; DROP TABLE x"]
+    )
+
+    assert sorted(counted) == ["aegis_transcripts", "process_monitor_logs"]
+    rows = {t["table"]: (t["rows"], t["rows_estimated"]) for t in overview["tables"]}
+    assert rows == {"aegis_transcripts": (1_250_000, True), "process_monitor_logs": (815, False)}
+
+
+@pytest.mark.asyncio
+async def test_count_rows_exact_bounds_concurrency(monkeypatch) -> None:
+    """At most `concurrency` counts are in flight at once."""
+    in_flight = []
+    peak = []
+
+    async def fake_count_rows(table_name, timeout):
+        in_flight.append(table_name)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(table_name)
+        return len(table_name)
+
+    monkeypatch.setattr(database_overview, "_count_rows", fake_count_rows)
+
+    counts = await count_rows_exact(["a", "bb", "ccc", "dddd", "a"], timeout=1, concurrency=2)
+
+    assert counts == {"a": 1, "bb": 2, "ccc": 3, "dddd": 4}
+    assert max(peak) == 2
+
+
+@pytest.mark.asyncio
+async def test_count_rows_scopes_the_timeout_to_its_own_transaction(monkeypatch) -> None:
+    """Counts go through stream_rows, whose SET LOCAL timeout ends with the transaction."""
+    calls = []
+    closed = []
+
+    async def fake_stream_rows(query, params=None, **kwargs):
+        calls.append((query, kwargs))
+        try:
+            yield [{"count": 42}]
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(database_overview, "stream_rows", fake_stream_rows)
+
+    count = await database_overview._count_rows(  # pylint: disable=protected-access
+        "aegis_transcripts", 2.5
+    )
+
+    assert count == 42
+    assert calls[0][0] == 'SELECT COUNT(*) AS count FROM "aegis_transcripts"'
+    assert calls[0][1]["statement_timeout_ms"] == 2500
+    assert closed == [True]
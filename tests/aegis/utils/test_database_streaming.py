@@ -0,0 +1,166 @@
+"""Tests for streamed database viewer queries, exports and keyset pagination."""
+
+import json
+import math
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from aegis.utils import database_streaming
+from aegis.utils.database_streaming import (
+    build_table_page_query,
+    clean_for_json,
+    collect_query_rows,
+    decode_keyset_cursor,
+    encode_csv,
+    encode_keyset_cursor,
+    encode_ndjson,
+    iter_export,
+)
+
+COLUMN_TYPES = {
+    "id": "bigint",
+    "created_at": "timestamp with time zone",
+    "embedding": "USER-DEFINED",
+    "code": "character",
+}
+
+
+def _use_batches(monkeypatch, batches, closed=None):
+    """Replace the server-side cursor with fixed batches."""
+
+    async def fake_stream_rows(query, params=None, **kwargs):
+        try:
+            for batch in batches:
+                yield batch
+        finally:
+            if closed is not None:
+                closed.append(query)
+
+    monkeypatch.setattr(database_streaming, "stream_rows", fake_stream_rows)
+
+
+def test_clean_for_json_converts_postgres_types() -> None:
+    """Decimals, timestamps, UUIDs and nested JSONB become JSON-safe values."""
+    row_id = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    value = {
+        "amount": Decimal("1.50"),
+        "nan": float("nan"),
+        "at": datetime(2026, 1, 2, 3, 4, tzinfo=timezone.utc),
+        "id": row_id,
+        "nested": [{"score": Decimal("2")}, b"raw"],
+    }
+
+    assert clean_for_json(value) == {
+        "amount": 1.5,
+        "nan": None,
+        "at": "2026-01-02T03:04:00+00:00",
+        "id": str(row_id),
+        "nested": [{"score": 2.0}, "raw"],
+    }
+    assert not math.isnan(clean_for_json(1.0))
+
+
+def test_encoders_write_ndjson_lines_and_csv_with_single_header() -> None:
+    """NDJSON is one object per line; CSV writes JSON cells as JSON and None as empty."""
+    rows = [{"id": 1, "meta": {"a": 1}, "note": None}, {"id": 2, "meta": [], "note": "x,y"}]
+
+    lines = encode_ndjson(rows).splitlines()
+    first = encode_csv(rows[:1], ["id", "meta", "note"], header=True)
+    second = encode_csv(rows[1:], ["id", "meta", "note"], header=False)
+
+    assert [json.loads(line) for line in lines] == rows
+    assert (first + second).splitlines() == ["id,meta,note", '1,"{""a"": 1}",', '2,[],"x,y"']
+
+
+def test_keyset_cursor_round_trips_key_values_as_text() -> None:
+    """Cursor values keep full precision and reject tokens for a different key."""
+    row = {"id": Decimal("12345678901234567890.5"), "created_at": datetime(2026, 1, 2)}
+
+    token = encode_keyset_cursor(row, ["id", "created_at"])
+
+    assert decode_keyset_cursor(token, ["id", "created_at"]) == [
+        "12345678901234567890.5",
+        "2026-01-02T00:00:00",
+    ]
+    with pytest.raises(ValueError, match="Invalid pagination cursor"):
+        decode_keyset_cursor(token, ["id"])
+    with pytest.raises(ValueError, match="Invalid pagination cursor"):
+        decode_keyset_cursor("not a cursor", ["id"])
+
+
+def test_build_table_page_query_uses_keyset_after_cursor() -> None:
+    """Default ordering pages by primary key, casting cursor values through text."""
+    first, first_params, keyset = build_table_page_query(
+        "aegis_transcripts", ["id"], COLUMN_TYPES, limit=50, filter_condition="bank = 'RY'"
+    )
+    after = encode_keyset_cursor({"id": 250}, ["id"])
+    query, params, _ = build_table_page_query(
+        "aegis_transcripts", ["id"], COLUMN_TYPES, limit=50, after=after
+    )
+
+    assert keyset is True
+    assert first == (
+        'SELECT * FROM "aegis_transcripts" WHERE (bank = \'RY\') ORDER BY "id" LIMIT :limit'
+    )
+    assert first_params == {"limit": 50}
+    assert query == (
+        'SELECT * FROM "aegis_transcripts" WHERE ("id") > (CAST(CAST(:k0 AS text) AS bigint))'
+        ' ORDER BY "id" LIMIT :limit'
+    )
+    assert params == {"limit": 50, "k0": "250"}
+
+
+def test_build_table_page_query_falls_back_to_offset() -> None:
+    """Custom orderings and keys without a castable type use LIMIT/OFFSET."""
+    query, params, keyset = build_table_page_query(
+        "aegis_transcripts", ["id"], COLUMN_TYPES, limit=10, offset=30, order_by="created_at"
+    )
+    _, _, vector_keyset = build_table_page_query("t", ["embedding"], COLUMN_TYPES, limit=10)
+    _, _, char_keyset = build_table_page_query("t", ["code"], COLUMN_TYPES, limit=10)
+
+    assert keyset is False
+    assert vector_keyset is False
+    assert char_keyset is False
+    assert query.endswith("ORDER BY created_at LIMIT :limit OFFSET :offset")
+    assert params == {"limit": 10, "offset": 30}
+    with pytest.raises(ValueError, match="Cursor pagination"):
+        build_table_page_query(
+            "aegis_transcripts",
+            ["id"],
+            COLUMN_TYPES,
+            limit=10,
+            after=encode_keyset_cursor({"id": 1}, ["id"]),
+            order_by="created_at",
+        )
+
+
+@pytest.mark.asyncio
+async def test_collect_query_rows_truncates_and_closes_cursor(monkeypatch) -> None:
+    """JSON results stop at max_rows and release the cursor without reading the rest."""
+    closed = []
+    batches = [[{"id": n} for n in range(start, start + 3)] for start in (0, 3, 6, 9)]
+    _use_batches(monkeypatch, batches, closed)
+
+    rows, truncated = await collect_query_rows("SELECT id FROM t", max_rows=5)
+    all_rows, all_truncated = await collect_query_rows("SELECT id FROM t", max_rows=12)
+
+    assert [row["id"] for row in rows] == [0, 1, 2, 3, 4]
+    assert truncated is True
+    assert len(all_rows) == 12
+    assert all_truncated is False
+    assert closed == ["SELECT id FROM t", "SELECT id FROM t"]
+
+
+@pytest.mark.asyncio
+async def test_iter_export_streams_one_chunk_per_batch(monkeypatch) -> None:
+    """CSV exports write the header once; rows are cleaned batch by batch."""
+    _use_batches(monkeypatch, [[{"id": 1, "amount": Decimal("2.5")}], [{"id": 2, "amount": None}]])
+
+    chunks = [chunk async for chunk in iter_export("SELECT * FROM t", "csv")]
+
+    assert chunks == ["id,amount\r\n1,2.5\r\n", "2,\r\n"]
+    with pytest.raises(ValueError, match="Unknown export format"):
+        [chunk async for chunk in iter_export("SELECT * FROM t", "xlsx")]
@@ -0,0 +1,214 @@
+"""Tests for the monitoring dashboard rollups."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from aegis.utils import monitor, monitor_rollups
+from aegis.utils.monitor_rollups import (
+    STAGE_DURATION_BUCKETS_MS,
+    build_rollup_deltas,
+    duration_bucket,
+    histogram_percentile,
+    summarize_stage_hours,
+)
+
+START = datetime(2026, 3, 2, 14, 5, tzinfo=timezone.utc)
+
+
+def _entry(run_uuid: str, stage: str, offset_min: int, duration_ms: int, status="Success"):
+    start = START + timedelta(minutes=offset_min)
+    return {
+        "run_uuid": run_uuid,
+        "model_name": "aegis",
+        "stage_name": stage,
+        "stage_start_time": start,
+        "stage_end_time": start + timedelta(milliseconds=duration_ms),
+        "duration_ms": duration_ms,
+        "status": status,
+        "total_tokens": 100 if stage == "router" else None,
+        "total_cost": Decimal("0.01") if stage == "router" else None,
+    }
+
+
+def test_build_rollup_deltas_aggregates_runs_and_stage_hours() -> None:
+    """Entries fold into one row per run and one row per stage per UTC hour."""
+    entries = [
+        _entry("run-1", "router", 0, 40),
+        _entry("run-1", "synthesis", 1, 4000, status="Failure"),
+        _entry("run-2", "router", 70, 80),
+    ]
+
+    runs, stages = build_rollup_deltas(entries)
+
+    run_1 = next(run for run in runs if run["run_uuid"] == "run-1")
+    assert run_1["stage_count"] == 2
+    assert run_1["total_duration_ms"] == 4040
+    assert run_1["total_tokens"] == 100
+    assert run_1["total_cost"] == Decimal("0.01")
+    assert run_1["statuses"] == ["Failure", "Success"]
+    assert run_1["has_errors"] is True
+    assert run_1["end_time"] == START + timedelta(minutes=1, milliseconds=4000)
+
+    router_hours = sorted(
+        (stage for stage in stages if stage["stage_name"] == "router"), key=lambda s: s["hour"]
+    )
+    assert [stage["hour"] for stage in router_hours] == [
+        datetime(2026, 3, 2, 14, tzinfo=timezone.utc),
+        datetime(2026, 3, 2, 15, tzinfo=timezone.utc),
+    ]
+    assert router_hours[0]["duration_histogram"][duration_bucket(40)] == 1
+    assert sum(router_hours[0]["duration_histogram"]) == 1
+    assert len(router_hours[0]["duration_histogram"]) == len(STAGE_DURATION_BUCKETS_MS) + 1
+
+
+def test_histogram_percentile_uses_bucket_bounds_and_observed_max() -> None:
+    """Percentiles resolve to bucket upper bounds, capped by the observed maximum."""
+    histogram = [0] * (len(STAGE_DURATION_BUCKETS_MS) + 1)
+    histogram[duration_bucket(20)] = 90
+    histogram[duration_bucket(900)] = 9
+    histogram[-1] = 1
+
+    assert histogram_percentile(histogram, 0.5, max_ms=600000) == 25.0
+    assert histogram_percentile(histogram, 0.95, max_ms=600000) == 1000.0
+    assert histogram_percentile(histogram, 0.995, max_ms=600000) == 600000.0
+    assert histogram_percentile(histogram, 0.5, max_ms=12) == 12.0
+    assert histogram_percentile([0, 0], 0.5) is None
+
+
+def test_summarize_stage_hours_merges_hourly_histograms() -> None:
+    """Per-stage statistics combine every hour in the window."""
+    _, stage_rows = build_rollup_deltas(
+        [_entry("run-1", "router", minute, 40) for minute in range(0, 120, 10)]
+        + [_entry("run-2", "router", 5, 9000, status="Failure")]
+    )
+
+    (router,) = summarize_stage_hours(stage_rows)
+
+    assert router["execution_count"] == router["count"] == 13
+    assert router["success_count"] == 12
+    assert router["failure_count"] == 1
+    assert router["min_duration_ms"] == 40
+    assert router["max_duration_ms"] == 9000
+    assert router["avg_duration_ms"] == pytest.approx((12 * 40 + 9000) / 13)
+    assert router["p50_duration_ms"] == 50.0
+    assert router["p99_duration_ms"] == 9000.0
+    assert router["total_cost"] == pytest.approx(0.13)
+
+
+@pytest.mark.asyncio
+async def test_post_monitor_entries_async_merges_rollups(monkeypatch) -> None:
+    """Entries and their rollup merge share one transaction; a failed merge keeps the entries."""
+    merged = []
+    savepoints = []
+
+    class _Connection:
+        @asynccontextmanager
+        async def begin_nested(self):
+            try:
+                yield
+            except Exception:
+                savepoints.append("rolled back")
+                raise
+
+    connection = _Connection()
+
+    @asynccontextmanager
+    async def fake_get_connection(execution_id=None):
+        yield connection
+
+    async def fake_copy_records(table, records, execution_id=None, conn=None):
+        assert conn is connection
+        return len(records)
+
+    async def failing_apply(entries, execution_id=None, conn=None):
+        assert conn is connection
+        merged.append(list(entries))
+        raise RuntimeError("rollup tables missing")
+
+    monkeypatch.setattr("aegis.connections.postgres_connector.get_connection", fake_get_connection)
+    monkeypatch.setattr("aegis.connections.postgres_connector.copy_records", fake_copy_records)
+    monkeypatch.setattr(monitor, "apply_monitor_rollups", failing_apply)
+    monitor.initialize_monitor("run-1", "aegis")
+    monitor.add_monitor_entry("router", START, START + timedelta(milliseconds=50))
+
+    assert await monitor.post_monitor_entries_async("test") == 1
+    assert [entry["stage_name"] for entry in merged[0]] == ["router"]
+    assert savepoints == ["rolled back"]
+    assert monitor.get_monitor_entries() == []
+
+
+def test_histogram_sql_matches_bucket_count() -> None:
+    """The rebuild query produces one count per histogram bucket."""
+    histogram_sql = monitor_rollups._histogram_sql()  # pylint: disable=protected-access
+
+    assert histogram_sql.count("COUNT(*)") == len(STAGE_DURATION_BUCKETS_MS) + 1
+    assert histogram_sql in monitor_rollups.REBUILD_STAGE_SQL
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("locked", [True, False])
+async def test_refresh_monitor_rollups_runs_only_under_the_advisory_lock(
+    monkeypatch, locked
+) -> None:
+    """A worker that cannot take the refresh lock skips the rebuild instead of racing it."""
+    statements = []
+
+    class _Result:
+        rowcount = 3
+
+        def scalar(self):
+            return locked
+
+    class _Connection:
+        async def execute(self, statement, params=None):
+            statements.append((str(statement), params))
+            return _Result()
+
+    @asynccontextmanager
+    async def fake_get_connection(execution_id=None):
+        yield _Connection()
+
+    monkeypatch.setattr(monitor_rollups, "get_connection", fake_get_connection)
+
+    counts = await monitor_rollups.refresh_monitor_rollups(lookback_hours=2)
+
+    assert statements[0] == (
+        "SELECT pg_try_advisory_xact_lock(:key)",
+        {"key": monitor_rollups.REFRESH_LOCK_KEY},
+    )
+    if locked:
+        assert len(statements) == 4
+        assert statements[1][0].startswith("DELETE FROM process_monitor_stage_hourly")
+        assert counts == {"runs": 3, "stage_hours": 3}
+    else:
+        assert len(statements) == 1
+        assert counts == {"runs": 0, "stage_hours": 0}
+
+
+@pytest.mark.asyncio
+async def test_refresh_monitor_rollups_can_wait_for_the_lock(monkeypatch) -> None:
+    """A backfill blocks on the refresh lock instead of skipping the rebuild."""
+    statements = []
+
+    class _Result:
+        rowcount = 2
+
+    class _Connection:
+        async def execute(self, statement, params=None):
+            statements.append(str(statement))
+            return _Result()
+
+    @asynccontextmanager
+    async def fake_get_connection(execution_id=None):
+        yield _Connection()
+
+    monkeypatch.setattr(monitor_rollups, "get_connection", fake_get_connection)
+
+    counts = await monitor_rollups.refresh_monitor_rollups(lookback_hours=2, wait=True)
+
+    assert statements[0] == "SELECT pg_advisory_xact_lock(:key)"
+    assert len(statements) == 4
+    assert counts == {"runs": 2, "stage_hours": 2}
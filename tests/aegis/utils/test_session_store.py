@@ -0,0 +1,201 @@
+"""Tests for the session-scoped conversation store."""
+
+import asyncio
+
+import pytest
+
+from aegis.utils import context_window, session_store
+from aegis.utils.session_store import (
+    SessionCache,
+    SessionStore,
+    SQLiteSessionBackend,
+    create_session_store,
+)
+from aegis.utils.settings import config
+
+
+class _RecordingBackend:
+    """In-memory backend that records every batched write."""
+
+    def __init__(self, fail_saves: int = 0):
+        self.rows = {}
+        self.saves = []
+        self.fail_saves = fail_saves
+
+    async def load(self, session_id, ttl_seconds):
+        return self.rows.get(session_id)
+
+    async def save_many(self, states):
+        if self.fail_saves:
+            self.fail_saves -= 1
+            raise ConnectionError("database unavailable")
+        self.saves.append(sorted(states))
+        self.rows.update(states)
+
+    async def delete(self, session_id):
+        self.rows.pop(session_id, None)
+
+    async def purge_expired(self, ttl_seconds):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _estimated_tokens(monkeypatch):
+    """Count tokens with the character estimate so budgets are deterministic."""
+    monkeypatch.setattr(context_window, "_get_encoder", lambda: None)
+
+
+def _state(*contents: str) -> dict:
+    roles = ("user", "assistant")
+    return {
+        "messages": [{"role": roles[i % 2], "content": text} for i, text in enumerate(contents)],
+        "summary": "",
+        "connection_id": "conn-1",
+    }
+
+
+def test_session_cache_evicts_least_recently_used_and_expires(monkeypatch) -> None:
+    """The cache holds max_sessions entries and drops entries past the TTL."""
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "monotonic", lambda: now[0])
+    cache = SessionCache(max_sessions=2, ttl_seconds=60)
+
+    cache.put("a", _state("hi"))
+    cache.put("b", _state("hello"))
+    assert cache.get("a") is not None
+    cache.put("c", _state("hey"))
+
+    assert cache.get("b") is None
+    assert cache.get("a")["messages"][0]["content"] == "hi"
+    now[0] += 61
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_stored_state_is_capped_to_the_token_budget(monkeypatch) -> None:
+    """Only messages and summary are kept, folded to the conversation budget."""
+    monkeypatch.setattr(config.conversation, "token_budget", 60)
+    monkeypatch.setattr(config.conversation, "summary_max_tokens", 120)
+    cache = SessionCache(max_sessions=10, ttl_seconds=0)
+    long_state = _state(*[f"turn {n} " + "detail " * 20 for n in range(12)])
+
+    stored = cache.put("s", long_state)
+
+    assert set(stored) == {"messages", "summary"}
+    assert len(stored["messages"]) < 12
+    assert stored["summary"]
+    assert len(long_state["messages"]) == 12
+
+
+@pytest.mark.asyncio
+async def test_session_store_batches_writes_and_resumes_from_backend() -> None:
+    """Writes are flushed together; another worker's store resumes the session."""
+    backend = _RecordingBackend()
+    store = SessionStore(backend=backend, flush_interval=60, batch_size=100)
+
+    await store.put("s1", _state("question one"))
+    await store.put("s2", _state("question two"))
+    await store.put("s1", _state("question one", "answer one"))
+
+    assert backend.saves == []
+    assert len((await store.get("s1"))["messages"]) == 2
+    assert await store.flush() == 2
+    assert backend.saves == [["s1", "s2"]]
+
+    other_worker = SessionStore(backend=backend)
+    resumed = await other_worker.get("s1")
+    assert [m["content"] for m in resumed["messages"]] == ["question one", "answer one"]
+    assert await other_worker.get("unknown") == {"messages": [], "summary": ""}
+
+
+@pytest.mark.asyncio
+async def test_session_store_retries_failed_flush_and_flushes_full_batches() -> None:
+    """A failed batch is retried; reaching batch_size flushes before the interval."""
+    backend = _RecordingBackend(fail_saves=1)
+    store = SessionStore(backend=backend, flush_interval=60, batch_size=2)
+    await store.start()
+    try:
+        await store.put("s1", _state("a"))
+        assert await store.flush() == 0
+        await store.put("s2", _state("b"))
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert backend.saves == [["s1", "s2"]]
+    finally:
+        await store.close()
+
+
+class _SlowBackend(_RecordingBackend):
+    """Backend whose writes block until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def save_many(self, states):
+        self.started.set()
+        await self.release.wait()
+        await super().save_many(states)
+
+
+@pytest.mark.asyncio
+async def test_session_store_close_lets_an_in_flight_flush_finish() -> None:
+    """Closing waits for the batch being written instead of cancelling it."""
+    backend = _SlowBackend()
+    store = SessionStore(backend=backend, flush_interval=60, batch_size=1)
+    await store.start()
+    await store.put("s1", _state("a"))
+    await backend.started.wait()
+
+    closing = asyncio.create_task(store.close())
+    await asyncio.sleep(0)
+    backend.release.set()
+    await closing
+
+    assert backend.saves == [["s1"]]
+    assert store._pending == {}  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_session_store_cancelled_flush_keeps_its_batch() -> None:
+    """A flush cancelled mid-write requeues the batch without overwriting newer writes."""
+    backend = _SlowBackend()
+    store = SessionStore(backend=backend, flush_interval=60, batch_size=100)
+    await store.put("s1", _state("old"))
+    await store.put("s2", _state("b"))
+
+    flushing = asyncio.create_task(store.flush())
+    await backend.started.wait()
+    await store.put("s1", _state("new"))
+    flushing.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flushing
+
+    backend.release.set()
+    assert await store.flush() == 2
+    assert backend.rows["s1"]["messages"][0]["content"] == "new"
+    assert backend.rows["s2"]["messages"][0]["content"] == "b"
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_round_trips_and_expires(tmp_path, monkeypatch) -> None:
+    """The sqlite backend upserts, loads within the TTL and deletes."""
+    backend = SQLiteSessionBackend(str(tmp_path / "sessions.sqlite3"))
+
+    await backend.save_many({"s1": {"messages": [], "summary": "v1"}})
+    await backend.save_many({"s1": {"messages": [], "summary": "v2"}})
+
+    assert (await backend.load("s1", ttl_seconds=60))["summary"] == "v2"
+    monkeypatch.setattr(session_store.time, "time", lambda: 10**12)
+    assert await backend.load("s1", ttl_seconds=60) is None
+    await backend.delete("s1")
+    assert await backend.load("s1", ttl_seconds=0) is None
+
+
+def test_create_session_store_rejects_unknown_backend() -> None:
+    """Misconfigured backends fail at startup rather than on the first message."""
+    assert create_session_store("memory").backend is None
+    with pytest.raises(ValueError, match="Unknown session store backend"):
+        create_session_store("redis")
@@ -0,0 +1,117 @@
+"""Tests for the async stream merger."""
+
+import asyncio
+
+import pytest
+
+from aegis.utils.streaming import StreamTiming, merge_streams
+
+
+async def _delayed(values, delay: float):
+    """Yield each value after a fixed delay."""
+    for value in values:
+        await asyncio.sleep(delay)
+        yield value
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_yields_in_arrival_order() -> None:
+    """Chunks from faster sources are yielded before slower ones."""
+    merged = [
+        item
+        async for item in merge_streams(
+            {"slow": _delayed(["s1"], 0.05), "fast": _delayed(["f1", "f2"], 0.005)}
+        )
+    ]
+
+    assert merged == [("fast", "f1"), ("fast", "f2"), ("slow", "s1")]
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_ends_when_all_sources_finish() -> None:
+    """The merged stream terminates without polling once every source is exhausted."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    merged = [
+        item async for item in merge_streams({"a": _delayed([1], 0.01), "b": _delayed([], 0)})
+    ]
+
+    assert merged == [("a", 1)]
+    assert loop.time() - started < 0.09
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_cancels_sources_on_close() -> None:
+    """Closing the merged stream cancels sources that are still running."""
+    cancelled = asyncio.Event()
+
+    async def _forever():
+        yield "first"
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        yield "never"
+
+    merged = merge_streams({"forever": _forever()})
+    assert await merged.__anext__() == ("forever", "first")
+    await merged.aclose()
+
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_respects_max_concurrency() -> None:
+    """No more than max_concurrency sources are drained at the same time."""
+    active = 0
+    peak = 0
+
+    async def _tracked(name: str):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        yield name
+        active -= 1
+
+    merged = [
+        item
+        async for item in merge_streams(
+            {name: _tracked(name) for name in ("a", "b", "c", "d")}, max_concurrency=2
+        )
+    ]
+
+    assert len(merged) == 4
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_reraises_source_errors() -> None:
+    """An unhandled source exception surfaces to the consumer."""
+
+    async def _broken():
+        yield "ok"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        async for _ in merge_streams({"broken": _broken(), "slow": _delayed([1], 1)}):
+            pass
+
+
+def test_stream_timing_reports_first_and_last_byte() -> None:
+    """Timing metadata is empty until chunks arrive, then counts them."""
+    timing = StreamTiming(name="rts")
+    assert timing.to_metadata() == {
+        "first_byte_ms": None,
+        "last_byte_ms": None,
+        "chunk_count": 0,
+    }
+
+    timing.record_chunk()
+    timing.record_chunk()
+    metadata = timing.to_metadata()
+
+    assert metadata["chunk_count"] == 2
+    assert 0 <= metadata["first_byte_ms"] <= metadata["last_byte_ms"]